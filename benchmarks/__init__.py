@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Benchmark Suite
+================================
+Reproducible performance measurements on a synthetic corpus.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+    - corpus: deterministic corpus generator (CorpusSpec, generate_corpus)
+    - scenarios: walk, literal, regex, many_terms, office, report
+    - runner: runs scenarios in fresh processes, JSON results, compare()
+
+See benchmarks/__main__.py for the command line.
+"""
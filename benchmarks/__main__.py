@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Benchmark CLI
+==============================
+
+Usage (from the repository root):
+    python -m benchmarks generate /tmp/corpus --preset medium
+    python -m benchmarks run --corpus /tmp/corpus --repeat 3 --output before.json
+    python -m benchmarks run --corpus /tmp/corpus --repeat 3 --output after.json
+    python -m benchmarks compare before.json after.json
+    python -m benchmarks refresh --files 1000000 --path /tmp/tree
+    python -m benchmarks xlsx --cells 1000000 --sheets 4
+
+Without --corpus, "run" generates a temporary corpus from --preset.
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import CorpusSpec, PRESETS, generate_corpus
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.runner import run_child, run_suite, compare, format_comparison
+from benchmarks import refresh, spreadsheet
+
+
+def _spec_from_args(args) -> CorpusSpec:
+    return CorpusSpec.preset(args.preset, files=args.files, depth=args.depth, fanout=args.fanout,
+                             hit_density=args.hit_density, office_ratio=args.office_ratio, seed=args.seed)
+
+
+def _add_corpus_options(parser):
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small')
+    parser.add_argument('--files', type=int)
+    parser.add_argument('--depth', type=int)
+    parser.add_argument('--fanout', type=int)
+    parser.add_argument('--hit-density', type=float)
+    parser.add_argument('--office-ratio', type=float)
+    parser.add_argument('--seed', type=int)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Master Search benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='Generate a synthetic corpus')
+    generate.add_argument('path')
+    _add_corpus_options(generate)
+
+    run = commands.add_parser('run', help='Run benchmark scenarios')
+    run.add_argument('--corpus', help='Existing corpus (default: temporary corpus from --preset)')
+    run.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                     help='Scenario to run (repeatable, default: all)')
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--mode', choices=('process', 'thread'), default='process')
+    run.add_argument('--workers', type=int)
+    run.add_argument('--output', help='JSON result file (default: stdout)')
+    _add_corpus_options(run)
+
+    diff = commands.add_parser('compare', help='Compare two result files')
+    diff.add_argument('baseline')
+    diff.add_argument('current')
+
+    tree = commands.add_parser('refresh', help='Change tracking refresh on a large tree of empty files')
+    tree.add_argument('--files', type=int, default=1000000)
+    tree.add_argument('--per-dir', type=int, default=1000)
+    tree.add_argument('--touch', type=int, default=1000, help='Files changed before the last refresh')
+    tree.add_argument('--path', help='Tree directory (reused if it holds the same number of files)')
+    tree.add_argument('--keep', action='store_true', help='Keep the temporary tree')
+
+    workbook = commands.add_parser('xlsx', help='XLSX extraction throughput on a generated workbook')
+    workbook.add_argument('--cells', type=int, default=1000000)
+    workbook.add_argument('--sheets', type=int, default=4)
+    workbook.add_argument('--columns', type=int, default=10)
+    workbook.add_argument('--path', help='Workbook file (reused if it exists)')
+    workbook.add_argument('--keep', action='store_true', help='Keep the temporary workbook')
+
+    child = commands.add_parser('child', help=argparse.SUPPRESS)
+    child.add_argument('scenario')
+    child.add_argument('corpus')
+    child.add_argument('output')
+    child.add_argument('--mode', default='process')
+    child.add_argument('--workers', type=int)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        manifest = generate_corpus(_spec_from_args(args), args.path)
+        print(f"{manifest['files']:,} Dateien, {manifest['total_bytes'] / 1024 / 1024:.1f} MB in {args.path}")
+        return 0
+
+    if args.command == 'refresh':
+        print(json.dumps(refresh.main(args.path, args.files, args.per_dir, args.touch, args.keep), indent=2))
+        return 0
+
+    if args.command == 'xlsx':
+        print(json.dumps(spreadsheet.main(args.path, args.cells, args.sheets, args.columns, args.keep), indent=2))
+        return 0
+
+    if args.command == 'child':
+        run_child(args.scenario, args.corpus, args.output, mode=args.mode, workers=args.workers)
+        return 0
+
+    if args.command == 'compare':
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, 'r', encoding='utf-8') as f:
+            current = json.load(f)
+        print(format_comparison(compare(baseline, current)))
+        return 0
+
+    corpus = args.corpus
+    temp_corpus = None
+    if corpus is None:
+        temp_corpus = corpus = tempfile.mkdtemp(prefix='master_search_corpus_')
+        generate_corpus(_spec_from_args(args), corpus)
+    try:
+        # Fortschritt auf stderr, damit stdout reines JSON bleibt
+        document = run_suite(corpus, args.scenario or list(SCENARIOS), repeat=args.repeat, mode=args.mode,
+                             workers=args.workers, progress=lambda text: print(text, file=sys.stderr))
+    finally:
+        if temp_corpus:
+            shutil.rmtree(temp_corpus, ignore_errors=True)
+
+    text = json.dumps(document, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
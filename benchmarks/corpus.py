@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Benchmark Corpus Generator
+===========================================
+Deterministic synthetic corpus for performance measurements.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+The same CorpusSpec (including the seed) always produces byte-identical
+files, so results from different commits can be compared. The corpus
+contains text files in several encodings, office documents (DOCX, XLSX,
+PPTX) and a few binary files below <corpus>/data. A manifest
+(<corpus>/corpus.json, outside the searched tree) records the spec, file
+counts, total size and the number of hit files per needle.
+"""
+
+import os
+import json
+import math
+import random
+import zipfile
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+MANIFEST_NAME = 'corpus.json'
+DATA_DIR = 'data'
+
+# Begriffe, die mit hit_density in Zeilen eingestreut werden
+NEEDLES = ('needle', 'haystack', 'Zahlungsausfall', 'overflow')
+# Regex-Ziel: jede Trefferzeile enthält einen Fehlercode ERR-0000 .. ERR-9999
+REGEX_PATTERN = r'ERR-\d{4}'
+# Typische Log-Regexes für den Regex-Vorfilter: mit Treffern, mit häufigem Literal, ohne Treffer
+LOG_REGEXES = (
+    r'ERR-\d{4}',
+    r'(?:overflow|haystack) ERR-\d+',
+    r'timeout\s+ERR-\d{4}',
+    r'connection (?:reset|refused) by peer',
+    r'(?i)fatal:\s+\w+',
+)
+# Begriffe, die im Korpus nie vorkommen (für den Many-Term-Benchmark)
+MISSING_TERMS = tuple(f'absent{i:02d}' for i in range(12))
+
+VOCABULARY = (
+    'server', 'client', 'request', 'response', 'datei', 'ordner', 'suche',
+    'index', 'cache', 'thread', 'prozess', 'speicher', 'bericht', 'kunde',
+    'rechnung', 'auftrag', 'config', 'value', 'status', 'update', 'import',
+    'export', 'daten', 'tabelle', 'zeile', 'spalte', 'module', 'function',
+    'return', 'error', 'warning', 'info', 'debug', 'session', 'token',
+    'benutzer', 'gruppe', 'projekt', 'version', 'release', 'build', 'queue',
+    'worker', 'batch', 'result', 'limit', 'timeout', 'retry', 'network',
+    'über', 'größe', 'prüfung', 'schlüssel', 'straße', 'café', 'naïve',
+)
+
+TEXT_EXTENSIONS = ('.txt', '.log', '.py', '.md', '.csv', '.json')
+OFFICE_EXTENSIONS = ('.docx', '.xlsx', '.pptx')
+BINARY_EXTENSIONS = ('.bin', '.dat')
+
+# Feste Zeitstempel, damit ZIP-Inhalte und mtimes reproduzierbar sind
+FIXED_ZIP_DATE = (2025, 11, 1, 12, 0, 0)
+FIXED_MTIME = 1761998400  # 2025-11-01 12:00:00 UTC
+
+PRESETS = {
+    'small': {'files': 300, 'depth': 2, 'fanout': 4},
+    'medium': {'files': 5000, 'depth': 3, 'fanout': 6},
+    'large': {'files': 50000, 'depth': 4, 'fanout': 8},
+}
+
+
+class CorpusSpec:
+    """Parameters of a synthetic corpus."""
+
+    def __init__(self, files: int = 300, depth: int = 2, fanout: int = 4,
+                 median_size: int = 8 * 1024, size_sigma: float = 1.2,
+                 max_size: int = 4 * 1024 * 1024,
+                 encodings: Optional[Dict[str, float]] = None,
+                 office_ratio: float = 0.05, binary_ratio: float = 0.02,
+                 hit_density: float = 0.01, seed: int = 42):
+        """
+        Initialize the spec.
+
+        Args:
+            files: Number of files
+            depth: Directory depth below the corpus root
+            fanout: Sub-directories per directory
+            median_size: Median file size in bytes (log-normal distribution)
+            size_sigma: Sigma of the log-normal size distribution
+            max_size: Upper bound for a single file
+            encodings: Weights of text encodings (default: mostly UTF-8)
+            office_ratio: Share of DOCX/XLSX/PPTX files
+            binary_ratio: Share of binary files
+            hit_density: Share of lines that contain a needle
+            seed: Random seed
+        """
+        self.files = files
+        self.depth = depth
+        self.fanout = fanout
+        self.median_size = median_size
+        self.size_sigma = size_sigma
+        self.max_size = max_size
+        self.encodings = encodings or {'utf-8': 0.8, 'latin-1': 0.1, 'cp1252': 0.05, 'utf-16': 0.05}
+        self.office_ratio = office_ratio
+        self.binary_ratio = binary_ratio
+        self.hit_density = hit_density
+        self.seed = seed
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> 'CorpusSpec':
+        """Create a spec from a named preset (small, medium, large)."""
+        values = dict(PRESETS[name])
+        values.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CorpusSpec':
+        return cls(**data)
+
+
+class _LineSource:
+    """Generates text lines from a fixed vocabulary and a seeded RNG."""
+
+    def __init__(self, rng: random.Random, hit_density: float):
+        self.rng = rng
+        self.hit_density = hit_density
+
+    def line(self):
+        """Return (line, needle) where needle is None for lines without hit."""
+        rng = self.rng
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(6, 16))]
+        needle = None
+        if rng.random() < self.hit_density:
+            needle = rng.choice(NEEDLES)
+            words.insert(rng.randrange(len(words) + 1), f'{needle} ERR-{rng.randrange(10000):04d}')
+        return ' '.join(words), needle
+
+    def lines(self, target_size: int):
+        """Return lines with roughly target_size characters and the needles used."""
+        lines = []
+        needles = set()
+        size = 0
+        while size < target_size:
+            line, needle = self.line()
+            lines.append(line)
+            size += len(line) + 1
+            if needle:
+                needles.add(needle)
+        return lines, needles
+
+
+def _directories(spec: CorpusSpec) -> List[str]:
+    """Relative directory paths of the tree (breadth first, including the root)."""
+    directories = ['']
+    level = ['']
+    for depth in range(spec.depth):
+        next_level = []
+        for parent in level:
+            for index in range(spec.fanout):
+                # Jeder dritte Ordnername enthält einen Suchbegriff (Ordner-Treffer)
+                name = f'dir{depth}_{index}'
+                if index % 3 == 2:
+                    name += f'_{NEEDLES[index % len(NEEDLES)]}'
+                next_level.append(os.path.join(parent, name))
+        directories.extend(next_level)
+        level = next_level
+    return directories
+
+
+def _file_size(rng: random.Random, spec: CorpusSpec) -> int:
+    size = int(rng.lognormvariate(math.log(max(1, spec.median_size)), spec.size_sigma))
+    return max(64, min(size, spec.max_size))
+
+
+def _weighted_choice(rng: random.Random, weights: Dict[str, float]) -> str:
+    keys = sorted(weights)
+    return rng.choices(keys, weights=[weights[key] for key in keys])[0]
+
+
+def _write_zip(path: str, members: Dict[str, str]):
+    """Write a deterministic ZIP file (fixed timestamps, fixed member order)."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            info = zipfile.ZipInfo(name, date_time=FIXED_ZIP_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, content.encode('utf-8'))
+
+
+def _content_types(parts: Dict[str, str]) -> str:
+    overrides = ''.join(f'<Override PartName="/{name}" ContentType="{ctype}"/>' for name, ctype in parts.items())
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'{overrides}</Types>')
+
+
+def _root_rels(target: str) -> str:
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            f'Target="{target}"/></Relationships>')
+
+
+def _write_docx(path: str, lines: List[str]):
+    paragraphs = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    _write_zip(path, {
+        '[Content_Types].xml': _content_types({
+            'word/document.xml': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml'}),
+        '_rels/.rels': _root_rels('word/document.xml'),
+        'word/document.xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{paragraphs}</w:body></w:document>'),
+    })
+
+
+def _write_xlsx(path: str, lines: List[str]):
+    # Wie Excel: Zellen verweisen auf sharedStrings, Zahlen stehen direkt in <v>
+    strings = []
+    rows = []
+    for row_index, line in enumerate(lines, 1):
+        strings.append(line)
+        rows.append(f'<row r="{row_index}">'
+                    f'<c r="A{row_index}"><v>{row_index}</v></c>'
+                    f'<c r="B{row_index}" t="s"><v>{len(strings) - 1}</v></c></row>')
+    shared = ''.join(f'<si><t xml:space="preserve">{escape(text)}</t></si>' for text in strings)
+    main_ns = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    _write_zip(path, {
+        '[Content_Types].xml': _content_types({
+            'xl/workbook.xml': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml',
+            'xl/worksheets/sheet1.xml': 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml',
+            'xl/sharedStrings.xml': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml'}),
+        '_rels/.rels': _root_rels('xl/workbook.xml'),
+        'xl/workbook.xml': (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><workbook xmlns="{main_ns}" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+        'xl/_rels/workbook.xml.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            'Target="worksheets/sheet1.xml"/>'
+            '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+            'Target="sharedStrings.xml"/></Relationships>'),
+        'xl/worksheets/sheet1.xml': (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><worksheet xmlns="{main_ns}">'
+            f'<sheetData>{"".join(rows)}</sheetData></worksheet>'),
+        'xl/sharedStrings.xml': (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><sst xmlns="{main_ns}" '
+            f'count="{len(strings)}" uniqueCount="{len(strings)}">{shared}</sst>'),
+    })
+
+
+def _write_pptx(path: str, lines: List[str], lines_per_slide: int = 10):
+    ns = ('xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+          'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"')
+    members = {}
+    slide_count = max(1, math.ceil(len(lines) / lines_per_slide))
+    members['[Content_Types].xml'] = _content_types(dict(
+        [('ppt/presentation.xml', 'application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml')] +
+        [(f'ppt/slides/slide{i}.xml', 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml')
+         for i in range(1, slide_count + 1)]))
+    members['_rels/.rels'] = _root_rels('ppt/presentation.xml')
+    members['ppt/presentation.xml'] = f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><p:presentation {ns}/>'
+    for i in range(slide_count):
+        chunk = lines[i * lines_per_slide:(i + 1) * lines_per_slide]
+        paragraphs = ''.join(f'<a:p><a:r><a:t>{escape(line)}</a:t></a:r></a:p>' for line in chunk)
+        members[f'ppt/slides/slide{i + 1}.xml'] = (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><p:sld {ns}><p:cSld><p:spTree>'
+            f'<p:sp><p:txBody>{paragraphs}</p:txBody></p:sp></p:spTree></p:cSld></p:sld>')
+    _write_zip(path, members)
+
+
+def generate_corpus(spec: CorpusSpec, path: str) -> Dict[str, Any]:
+    """
+    Generate the corpus described by spec under path/data.
+
+    Existing files with the same names are overwritten; the directory
+    should be empty or a corpus generated from the same spec.
+
+    Returns:
+        The manifest (also written to path/corpus.json)
+    """
+    rng = random.Random(spec.seed)
+    source = _LineSource(rng, spec.hit_density)
+    directories = _directories(spec)
+    data_path = data_dir(path)
+    for directory in directories:
+        os.makedirs(os.path.join(data_path, directory), exist_ok=True)
+
+    kinds = {'text': 0, 'office': 0, 'binary': 0}
+    encodings = {}
+    hit_files = {needle: 0 for needle in NEEDLES}
+    office_files = []
+    total_bytes = 0
+
+    for index in range(spec.files):
+        directory = directories[rng.randrange(len(directories))]
+        target_size = _file_size(rng, spec)
+        roll = rng.random()
+
+        if roll < spec.binary_ratio:
+            kind = 'binary'
+            name = f'blob{index:06d}{rng.choice(BINARY_EXTENSIONS)}'
+            file_path = os.path.join(data_path, directory, name)
+            with open(file_path, 'wb') as f:
+                f.write(b'\x00\x01BIN\x00' + rng.randbytes(target_size))
+            needles = set()
+        elif roll < spec.binary_ratio + spec.office_ratio:
+            kind = 'office'
+            extension = rng.choice(OFFICE_EXTENSIONS)
+            name = f'doc{index:06d}{extension}'
+            file_path = os.path.join(data_path, directory, name)
+            lines, needles = source.lines(target_size)
+            {'.docx': _write_docx, '.xlsx': _write_xlsx, '.pptx': _write_pptx}[extension](file_path, lines)
+            office_files.append(os.path.join(directory, name))
+        else:
+            kind = 'text'
+            encoding = _weighted_choice(rng, spec.encodings)
+            name = f'file{index:06d}{rng.choice(TEXT_EXTENSIONS)}'
+            file_path = os.path.join(data_path, directory, name)
+            lines, needles = source.lines(target_size)
+            content = '\n'.join(lines) + '\n'
+            with open(file_path, 'wb') as f:
+                f.write(content.encode(encoding, errors='replace'))
+            encodings[encoding] = encodings.get(encoding, 0) + 1
+
+        os.utime(file_path, (FIXED_MTIME, FIXED_MTIME))
+        total_bytes += os.path.getsize(file_path)
+        kinds[kind] += 1
+        for needle in needles:
+            hit_files[needle] += 1
+
+    manifest = {
+        'spec': spec.to_dict(),
+        'files': spec.files,
+        'directories': len(directories),
+        'total_bytes': total_bytes,
+        'kinds': kinds,
+        'encodings': encodings,
+        'hit_files': hit_files,
+        'office_files': office_files,
+    }
+    with open(os.path.join(path, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def data_dir(path: str) -> str:
+    """Directory that contains the searchable files of a corpus."""
+    return os.path.join(path, DATA_DIR)
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Load the manifest of a generated corpus."""
+    with open(os.path.join(path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Change Tracking Benchmark
+==========================================
+Measures ChangeTracker refreshes on a large tree of empty files.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Usage (from the repository root):
+    python -m benchmarks refresh --files 1000000 --path /tmp/tree
+
+Measured steps:
+    - generate: creating the tree (skipped if --path already holds it)
+    - initial: first refresh, builds the snapshot (every file is "added")
+    - save / load: persisting and loading the snapshot
+    - nochange_snapshot: refresh of a loaded snapshot without changes (next run)
+    - nochange_inotify: refresh with inotify watches without changes (Linux)
+    - touched_<n>_*: refresh after appending to n files, both backends
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.change_tracker import ChangeTracker, inotify_available
+
+MARKER = '.master_search_refresh_tree'
+
+
+def generate_tree(path: str, files: int, per_dir: int = 1000, fanout: int = 32) -> int:
+    """Create files empty files, per_dir per directory, directories fanout per level."""
+    marker = os.path.join(path, MARKER)
+    if os.path.exists(marker):
+        with open(marker, 'r', encoding='utf-8') as f:
+            if int(f.read() or 0) == files:
+                return 0
+        shutil.rmtree(path)
+    os.makedirs(path, exist_ok=True)
+    created = 0
+    directory_index = 0
+    while created < files:
+        # Zweistufige Verteilung: data/dNN/dNNNNN/
+        directory = os.path.join(path, 'data', f'd{directory_index % fanout:02d}', f'd{directory_index:05d}')
+        os.makedirs(directory, exist_ok=True)
+        for i in range(min(per_dir, files - created)):
+            open(os.path.join(directory, f'f{i:04d}.txt'), 'wb').close()
+        created += min(per_dir, files - created)
+        directory_index += 1
+    with open(marker, 'w', encoding='utf-8') as f:
+        f.write(str(files))
+    return created
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def _touch(root: str, count: int):
+    touched = 0
+    for directory, _dirs, names in os.walk(os.path.join(root, 'data')):
+        for name in names:
+            if touched >= count:
+                return
+            with open(os.path.join(directory, name), 'ab') as f:
+                f.write(b'x')
+            touched += 1
+
+
+def run_refresh_benchmark(path: str, files: int, per_dir: int = 1000, touch: int = 1000) -> Dict[str, Any]:
+    """Run all steps (see module docstring) and return timings in seconds."""
+    timings: Dict[str, Any] = {'files': files}
+    timings['generate_s'], _ = _timed(lambda: generate_tree(path, files, per_dir))
+    snapshot = os.path.join(tempfile.mkdtemp(prefix='master_search_snapshot_'), 'tree.pickle')
+    try:
+        tracker = ChangeTracker(path, use_inotify=False)
+        timings['initial_s'], changes = _timed(tracker.refresh)
+        timings['initial_files'] = len(changes.added)
+        timings['save_s'], _ = _timed(lambda: tracker.save(snapshot))
+        timings['snapshot_mb'] = round(os.path.getsize(snapshot) / (1024 * 1024), 1)
+
+        loaded = ChangeTracker(path, use_inotify=False)
+        loaded.snapshot_path = snapshot
+        timings['load_s'], _ = _timed(loaded.load)
+        loaded.snapshot_path = None  # Messung ohne erneutes Speichern
+        timings['nochange_snapshot_s'], changes = _timed(loaded.refresh)
+        timings['nochange_snapshot_changes'] = len(changes)
+
+        watcher = None
+        if inotify_available():
+            watcher = ChangeTracker(path, use_inotify=True)
+            timings['inotify_setup_s'], _ = _timed(watcher.refresh)
+            timings['inotify_backend'] = watcher.refresh().backend  # 'snapshot' bei zu wenigen Watches
+            timings['nochange_inotify_s'], changes = _timed(watcher.refresh)
+            timings['nochange_inotify_changes'] = len(changes)
+
+        _touch(path, touch)
+        timings[f'touched_{touch}_snapshot_s'], changes = _timed(loaded.refresh)
+        timings[f'touched_{touch}_snapshot_found'] = len(changes.modified)
+        if watcher is not None:
+            timings[f'touched_{touch}_inotify_s'], changes = _timed(watcher.refresh)
+            timings[f'touched_{touch}_inotify_found'] = len(changes.modified)
+            watcher.close()
+    finally:
+        shutil.rmtree(os.path.dirname(snapshot), ignore_errors=True)
+    return {key: round(value, 4) if isinstance(value, float) else value for key, value in timings.items()}
+
+
+def main(path: Optional[str], files: int, per_dir: int, touch: int, keep: bool) -> Dict[str, Any]:
+    temp_path = None
+    if path is None:
+        temp_path = path = tempfile.mkdtemp(prefix='master_search_tree_')
+    try:
+        return run_refresh_benchmark(path, files, per_dir, touch)
+    finally:
+        if temp_path and not keep:
+            shutil.rmtree(temp_path, ignore_errors=True)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Benchmark Runner
+=================================
+Runs scenarios in fresh processes and writes comparable JSON results.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Each scenario run starts a new Python process, so peak RSS and caches of
+one run do not influence the next one. The result file contains the
+environment (commit, version, Python, CPU count), the corpus manifest and
+per scenario the individual runs plus their median.
+"""
+
+import os
+import sys
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import multiprocessing as mp
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from version import VERSION
+from benchmarks.corpus import load_manifest
+
+# Kennzahlen, die über Wiederholungen gemittelt (Median) und verglichen werden
+METRICS = ('elapsed_s', 'files_per_s', 'mb_per_s', 'peak_rss_mb', 'batch_p95_ms')
+# Für diese Kennzahlen ist ein kleinerer Wert besser
+LOWER_IS_BETTER = ('elapsed_s', 'peak_rss_mb', 'batch_p95_ms')
+
+
+def maxrss_mb(ru_maxrss: int, platform: str = sys.platform) -> float:
+    """ru_maxrss in MB: Bytes unter macOS, Kilobytes unter Linux und den anderen Unix-Systemen."""
+    return round(ru_maxrss / (1024 * 1024 if platform == 'darwin' else 1024), 1)
+
+
+def peak_rss_mb() -> Dict[str, Optional[float]]:
+    """Peak RSS of this process and of its terminated child processes in MB."""
+    if RESOURCE_AVAILABLE:
+        return {'peak_rss_mb': maxrss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss),
+                'peak_rss_children_mb': maxrss_mb(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)}
+    if PSUTIL_AVAILABLE:
+        info = psutil.Process().memory_info()
+        peak = getattr(info, 'peak_wset', info.rss)
+        return {'peak_rss_mb': round(peak / (1024 * 1024), 1), 'peak_rss_children_mb': None}
+    return {'peak_rss_mb': None, 'peak_rss_children_mb': None}
+
+
+def run_child(scenario: str, corpus: str, output: str, mode: str = 'process', workers: Optional[int] = None):
+    """Entry point of a child process: run one scenario and write its metrics to output."""
+    from benchmarks.scenarios import run_scenario
+    metrics = run_scenario(scenario, corpus, mode=mode, workers=workers)
+    metrics.update(peak_rss_mb())
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(metrics, f)
+
+
+def _run_in_subprocess(scenario: str, corpus: str, mode: str, workers: Optional[int]) -> Dict[str, Any]:
+    fd, output = tempfile.mkstemp(prefix='master_search_bench_', suffix='.json')
+    os.close(fd)
+    try:
+        command = [sys.executable, '-m', 'benchmarks', 'child', scenario, corpus, output, '--mode', mode]
+        if workers:
+            command += ['--workers', str(workers)]
+        # Konsolenausgabe der Suche unterdrücken, Fehler bleiben sichtbar
+        subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, check=True)
+        with open(output, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _median(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary = {}
+    for key in METRICS:
+        values = [run[key] for run in runs if run.get(key) is not None]
+        summary[key] = statistics.median(values) if values else None
+    return summary
+
+
+def run_suite(corpus: str, scenarios: List[str], repeat: int = 3, mode: str = 'process',
+              workers: Optional[int] = None, progress=print) -> Dict[str, Any]:
+    """
+    Run the given scenarios repeat times each and return the result document.
+
+    Args:
+        corpus: Corpus directory created by generate_corpus()
+        scenarios: Scenario names (see benchmarks.scenarios.SCENARIOS)
+        repeat: Runs per scenario (the median is reported)
+        mode: 'process' or 'thread' worker pool
+        workers: Worker count (default: engine default)
+        progress: Callback for progress messages
+    """
+    manifest = load_manifest(corpus)
+    manifest.pop('office_files', None)
+    document = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'commit': _git_commit(),
+            'version': VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': mp.cpu_count(),
+            'mode': mode,
+            'workers': workers,
+        },
+        'corpus': manifest,
+        'scenarios': {},
+    }
+    for scenario in scenarios:
+        runs = []
+        for index in range(repeat):
+            run = _run_in_subprocess(scenario, corpus, mode, workers)
+            runs.append(run)
+            progress(f"{scenario:12s} run {index + 1}/{repeat}: {run['elapsed_s']:.3f}s, "
+                     f"{run['files_per_s'] or 0:,.0f} files/s")
+        document['scenarios'][scenario] = {'median': _median(runs), 'runs': runs}
+    return document
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compare two result documents scenario by scenario.
+
+    Returns:
+        One row per scenario and metric with both medians and the change in
+        percent ('better' tells whether the change is an improvement).
+    """
+    rows = []
+    for scenario, data in current['scenarios'].items():
+        if scenario not in baseline['scenarios']:
+            continue
+        old = baseline['scenarios'][scenario]['median']
+        new = data['median']
+        for key in METRICS:
+            if old.get(key) in (None, 0) or new.get(key) is None:
+                continue
+            change = (new[key] - old[key]) / old[key] * 100
+            better = change < 0 if key in LOWER_IS_BETTER else change > 0
+            rows.append({'scenario': scenario, 'metric': key, 'baseline': old[key],
+                         'current': new[key], 'change_percent': round(change, 1), 'better': better})
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """Format compare() rows as a text table."""
+    lines = [f"{'Scenario':12s} {'Metric':14s} {'Baseline':>12s} {'Current':>12s} {'Change':>9s}"]
+    for row in rows:
+        marker = '+' if row['better'] else '-' if row['change_percent'] else ' '
+        lines.append(f"{row['scenario']:12s} {row['metric']:14s} {row['baseline']:12.3f} "
+                     f"{row['current']:12.3f} {row['change_percent']:8.1f}% {marker}")
+    return '\n'.join(lines)
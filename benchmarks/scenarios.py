@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Benchmark Scenarios
+====================================
+Scenario runners that measure the search engine on a generated corpus.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Every scenario returns a metrics dictionary:
+    - elapsed_s: measured time in seconds
+    - files, bytes: amount of input the scenario worked on
+    - files_per_s, mb_per_s: throughput
+    - results: number of search results (or report items)
+    - batches, batch_p95_ms: per-batch latency of the engine (searches only)
+
+Scenarios:
+    - walk: directory walk only (collect_files_and_folders)
+    - walk_cached: same walk with a warm directory skip cache
+    - literal: single literal term
+    - regex: regular expression (ERR-\\d{4})
+    - regex_logs: common log regexes (corpus.LOG_REGEXES), one search each
+    - regex_logs_noprefilter: the same without the regex literal prefilter
+    - many_terms: 16 terms in "any" mode, most of them without hits
+    - office: DOCX/XLSX/PPTX extraction and search, in-process
+    - report: HTML report generation from the literal search results
+    - refresh: change tracking refresh without changes (snapshot diff)
+"""
+
+import os
+import sys
+import time
+import tempfile
+import shutil
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.file_search_tool import FileSearchTool
+from src.report_generator import HTMLReportGenerator
+from src.change_tracker import ChangeTracker
+from src.dir_cache import DirectoryCache, RACY_WINDOW_NS
+from benchmarks.corpus import NEEDLES, REGEX_PATTERN, LOG_REGEXES, MISSING_TERMS, data_dir, load_manifest
+
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile (None for an empty list)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+def _throughput(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    elapsed = metrics['elapsed_s']
+    metrics['files_per_s'] = round(metrics['files'] / elapsed, 1) if elapsed > 0 else None
+    metrics['mb_per_s'] = round(metrics['bytes'] / elapsed / (1024 * 1024), 2) if elapsed > 0 and metrics['bytes'] else None
+    metrics['elapsed_s'] = round(elapsed, 4)
+    return metrics
+
+
+def _make_tool(corpus: str, terms, mode: str = 'process', workers: Optional[int] = None,
+               use_regex: bool = False) -> FileSearchTool:
+    tool = FileSearchTool()
+    tool.search_path = data_dir(corpus)
+    tool.search_terms = list(terms)
+    tool.use_regex = use_regex
+    tool.use_multiprocessing = mode == 'process'
+    if workers:
+        tool.max_workers = workers
+    return tool
+
+
+def _run_search(tool: FileSearchTool, manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a full search and collect engine metrics."""
+    summary = {}
+
+    def on_status(status):
+        if status.get('type') == 'complete':
+            summary.update(status)
+
+    tool.status_callback = on_status
+    start = time.perf_counter()
+    tool.search_files_and_folders()
+    wall = time.perf_counter() - start
+    latencies = tool.batch_latencies
+    p95 = percentile(latencies, 95)
+    return _throughput({
+        # 'complete' wird vor der abschließenden System-Statistik gesendet
+        'elapsed_s': summary.get('elapsed_time', wall),
+        'files': manifest['files'],
+        'bytes': manifest['total_bytes'],
+        'results': tool.get_result_count(),
+        'batches': len(latencies),
+        'batch_p95_ms': round(p95 * 1000, 2) if p95 is not None else None,
+    })
+
+
+def scenario_walk(corpus, manifest, mode='process', workers=None):
+    tool = _make_tool(corpus, [NEEDLES[0]], mode, workers)
+    start = time.perf_counter()
+    all_files, all_folders = tool.collect_files_and_folders()
+    elapsed = time.perf_counter() - start
+    return _throughput({
+        'elapsed_s': elapsed,
+        'files': len(all_files),
+        'bytes': 0,
+        'results': len(all_folders),
+    })
+
+
+def scenario_walk_cached(corpus, manifest, mode='process', workers=None):
+    tool = _make_tool(corpus, [NEEDLES[0]], mode, workers)
+    tool.use_directory_cache = True
+    # Frisch erzeugte Verzeichnisse sind "racy" und würden immer neu gelesen: wie ein ruhendes Archiv altern lassen
+    newest = max(os.stat(root).st_mtime_ns for root, _dirs, _files in os.walk(tool.search_path))
+    time.sleep(max(0.0, (newest + RACY_WINDOW_NS - time.time_ns()) / 1e9 + 0.05))
+    # Nur im Speicher (kein Cache unter ~/.cache); der erste Durchlauf füllt ihn
+    tool.directory_caches[os.path.abspath(tool.search_path)] = DirectoryCache(tool.search_path)
+    tool.collect_files_and_folders()
+    start = time.perf_counter()
+    all_files, all_folders = tool.collect_files_and_folders()
+    elapsed = time.perf_counter() - start
+    return _throughput({
+        'elapsed_s': elapsed,
+        'files': len(all_files),
+        'bytes': 0,
+        'results': len(all_folders),
+        'dirs_reused': tool.directory_cache_stats.dirs_reused,
+    })
+
+
+def scenario_literal(corpus, manifest, mode='process', workers=None):
+    return _run_search(_make_tool(corpus, [NEEDLES[0]], mode, workers), manifest)
+
+
+def scenario_regex(corpus, manifest, mode='process', workers=None):
+    return _run_search(_make_tool(corpus, [REGEX_PATTERN], mode, workers, use_regex=True), manifest)
+
+
+def _run_regex_logs(corpus, manifest, mode, workers, prefilter: bool) -> Dict[str, Any]:
+    elapsed, results, latencies = 0.0, 0, []
+    for pattern in LOG_REGEXES:
+        tool = _make_tool(corpus, [pattern], mode, workers, use_regex=True)
+        tool.use_regex_prefilter = prefilter
+        metrics = _run_search(tool, manifest)
+        elapsed += metrics['elapsed_s']
+        results += metrics['results']
+        latencies.extend(tool.batch_latencies)
+    p95 = percentile(latencies, 95)
+    return _throughput({
+        'elapsed_s': elapsed,
+        'files': manifest['files'] * len(LOG_REGEXES),
+        'bytes': manifest['total_bytes'] * len(LOG_REGEXES),
+        'results': results,
+        'batches': len(latencies),
+        'batch_p95_ms': round(p95 * 1000, 2) if p95 is not None else None,
+    })
+
+
+def scenario_regex_logs(corpus, manifest, mode='process', workers=None):
+    return _run_regex_logs(corpus, manifest, mode, workers, prefilter=True)
+
+
+def scenario_regex_logs_noprefilter(corpus, manifest, mode='process', workers=None):
+    return _run_regex_logs(corpus, manifest, mode, workers, prefilter=False)
+
+
+def scenario_many_terms(corpus, manifest, mode='process', workers=None):
+    return _run_search(_make_tool(corpus, NEEDLES + MISSING_TERMS, mode, workers), manifest)
+
+
+def scenario_office(corpus, manifest, mode='process', workers=None):
+    # Extraktoren direkt messen, unabhängig vom Worker-Pool
+    tool = _make_tool(corpus, [NEEDLES[0]], mode, workers)
+    paths = [os.path.join(data_dir(corpus), name) for name in manifest['office_files']]
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    results = 0
+    start = time.perf_counter()
+    for path in paths:
+        if tool.search_in_file(path):
+            results += 1
+    elapsed = time.perf_counter() - start
+    return _throughput({
+        'elapsed_s': elapsed,
+        'files': len(paths),
+        'bytes': total_bytes,
+        'results': results,
+    })
+
+
+def scenario_report(corpus, manifest, mode='process', workers=None):
+    tool = _make_tool(corpus, [NEEDLES[0]], mode, workers)
+    tool.search_files_and_folders()
+    sink = tool.get_result_sink()
+    output_dir = tempfile.mkdtemp(prefix='master_search_bench_')
+    try:
+        generator = HTMLReportGenerator(search_terms=tool.search_terms, search_path=tool.search_path,
+                                        output_dir=output_dir)
+        start = time.perf_counter()
+        report_path = generator.generate(sink)
+        elapsed = time.perf_counter() - start
+        report_bytes = os.path.getsize(report_path) if report_path else 0
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        if tool.memory_governor is not None:
+            tool.memory_governor.close()
+    # Durchsatz bezogen auf die geschriebenen Report-Daten
+    return _throughput({
+        'elapsed_s': elapsed,
+        'files': len(sink),
+        'bytes': report_bytes,
+        'results': len(sink),
+    })
+
+
+def scenario_refresh(corpus, manifest, mode='process', workers=None):
+    # Snapshot-Abgleich wie beim nächsten Lauf (ohne inotify, das keinen Abgleich bräuchte)
+    tracker = ChangeTracker(data_dir(corpus), use_inotify=False)
+    tracker.refresh()
+    start = time.perf_counter()
+    changes = tracker.refresh()
+    elapsed = time.perf_counter() - start
+    return _throughput({
+        'elapsed_s': elapsed,
+        'files': len(tracker),
+        'bytes': 0,
+        'results': len(changes),
+    })
+
+
+SCENARIOS = {
+    'walk': scenario_walk,
+    'walk_cached': scenario_walk_cached,
+    'literal': scenario_literal,
+    'regex': scenario_regex,
+    'regex_logs': scenario_regex_logs,
+    'regex_logs_noprefilter': scenario_regex_logs_noprefilter,
+    'many_terms': scenario_many_terms,
+    'office': scenario_office,
+    'report': scenario_report,
+    'refresh': scenario_refresh,
+}
+
+
+def run_scenario(name: str, corpus: str, mode: str = 'process', workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run one scenario in the current process.
+
+    Args:
+        name: Scenario name (see SCENARIOS)
+        corpus: Corpus directory created by generate_corpus()
+        mode: 'process' (ProcessPoolExecutor) or 'thread' (ThreadPoolExecutor)
+        workers: Worker count (default: engine default)
+    """
+    manifest = load_manifest(corpus)
+    metrics = SCENARIOS[name](corpus, manifest, mode=mode, workers=workers)
+    metrics['scenario'] = name
+    return metrics
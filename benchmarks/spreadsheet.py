@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Spreadsheet Extraction Benchmark
+=================================================
+Measures the XLSX extractor on a generated workbook.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Usage (from the repository root):
+    python -m benchmarks xlsx --cells 1000000 --sheets 4
+
+The workbook has --columns columns per row, spread over --sheets sheets.
+Cells alternate between shared strings, numbers, inline strings and
+booleans; one marker text sits in the last row of the last sheet.
+
+Measured steps:
+    - generate: writing the workbook (skipped if --path already holds it)
+    - shared_strings: reading xl/sharedStrings.xml into the list
+    - extract: all rows of all sheets through iter_xlsx_lines
+      (cells/s, rows/s, MB/s of uncompressed sheet XML)
+    - search: FileSearchTool.search_in_file for the marker in the last row
+    - peak_mb: tracemalloc peak of a separate extraction pass
+"""
+
+import os
+import sys
+import time
+import shutil
+import zipfile
+import tempfile
+import tracemalloc
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.file_search_tool import FileSearchTool
+from src.ooxml_stream import iter_xlsx_lines, read_shared_strings
+
+MARKER = 'MARKER_LAST_CELL'
+SHARED_WORDS = 5000  # Verschiedene Texte in sharedStrings.xml
+
+_S = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+_R = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+
+
+def _column(index: int) -> str:
+    name = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        name = chr(65 + rest) + name
+    return name
+
+
+def _sheet_rows(sheet: int, rows: int, columns: int, last: bool):
+    yield f'<worksheet {_S}><sheetData>'
+    letters = [_column(c) for c in range(columns)]
+    for row in range(1, rows + 1):
+        cells = []
+        for c, letter in enumerate(letters):
+            ref = f'{letter}{row}'
+            kind = (row + c) % 4
+            if last and row == rows and c == 0:
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{MARKER}</t></is></c>')
+            elif kind == 0:
+                cells.append(f'<c r="{ref}" t="s"><v>{(row * columns + c) % SHARED_WORDS}</v></c>')
+            elif kind == 1:
+                cells.append(f'<c r="{ref}"><v>{row * 1.5 + c}</v></c>')
+            elif kind == 2:
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t>s{sheet} r{row} c{c}</t></is></c>')
+            else:
+                cells.append(f'<c r="{ref}" t="b"><v>{row % 2}</v></c>')
+        yield f'<row r="{row}">{"".join(cells)}</row>'
+    yield '</sheetData></worksheet>'
+
+
+def generate_workbook(path: str, cells: int, sheets: int = 4, columns: int = 10) -> bool:
+    """Write an XLSX with about cells cells; False if path already exists."""
+    if os.path.exists(path):
+        return False
+    rows = max(1, cells // (sheets * columns))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('xl/workbook.xml', f'<workbook {_S} {_R}><sheets>' + ''.join(
+            f'<sheet name="Blatt {i}" sheetId="{i}" r:id="rId{i}"/>' for i in range(1, sheets + 1))
+            + '</sheets></workbook>')
+        zf.writestr('xl/_rels/workbook.xml.rels',
+                    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">' + ''.join(
+                        f'<Relationship Id="rId{i}" Target="worksheets/sheet{i}.xml"/>'
+                        for i in range(1, sheets + 1)) + '</Relationships>')
+        zf.writestr('xl/sharedStrings.xml', f'<sst {_S}>' + ''.join(
+            f'<si><t>Wort {i} Kunde {i * 7 % 1000}</t></si>' for i in range(SHARED_WORDS)) + '</sst>')
+        for sheet in range(1, sheets + 1):
+            with zf.open(f'xl/worksheets/sheet{sheet}.xml', 'w') as stream:
+                for chunk in _sheet_rows(sheet, rows, columns, sheet == sheets):
+                    stream.write(chunk.encode('utf-8'))
+    return True
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def run_spreadsheet_benchmark(path: str, cells: int, sheets: int = 4, columns: int = 10) -> Dict[str, Any]:
+    """Run all steps (see module docstring) and return timings in seconds."""
+    timings: Dict[str, Any] = {'cells': cells, 'sheets': sheets, 'columns': columns}
+    timings['generate_s'], _ = _timed(lambda: generate_workbook(path, cells, sheets, columns))
+    with zipfile.ZipFile(path) as zf:
+        xml_bytes = sum(info.file_size for info in zf.infolist() if info.filename.startswith('xl/worksheets/'))
+        timings['shared_strings_s'], shared = _timed(lambda: read_shared_strings(zf))
+    timings['shared_strings'] = len(shared)
+    timings['file_mb'] = round(os.path.getsize(path) / (1024 * 1024), 1)
+    timings['sheet_xml_mb'] = round(xml_bytes / (1024 * 1024), 1)
+
+    def extract():
+        rows = values = 0
+        for _line_num, line in iter_xlsx_lines(path):
+            rows += 1
+            values += line.count(' | ') + 1
+        return rows, values
+
+    timings['extract_s'], (rows, values) = _timed(extract)
+    timings['rows'], timings['cells_found'] = rows, values
+    timings['cells_per_s'] = int(values / timings['extract_s'])
+    timings['rows_per_s'] = int(rows / timings['extract_s'])
+    timings['mb_per_s'] = round(xml_bytes / (1024 * 1024) / timings['extract_s'], 1)
+
+    tool = FileSearchTool(verbose=False)
+    tool.search_terms = [MARKER]
+    timings['search_s'], matches = _timed(lambda: tool.search_in_file(path))
+    timings['search_hit'] = matches[0]['line_content'] if matches else None
+
+    tracemalloc.start()
+    try:
+        for _line in iter_xlsx_lines(path):
+            pass
+        timings['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+    finally:
+        tracemalloc.stop()
+    return {key: round(value, 4) if isinstance(value, float) else value for key, value in timings.items()}
+
+
+def main(path: Optional[str], cells: int, sheets: int, columns: int, keep: bool) -> Dict[str, Any]:
+    temp_dir = None
+    if path is None:
+        temp_dir = tempfile.mkdtemp(prefix='master_search_xlsx_')
+        path = os.path.join(temp_dir, 'benchmark.xlsx')
+    try:
+        return run_spreadsheet_benchmark(path, cells, sheets, columns)
+    finally:
+        if temp_dir and not keep:
+            shutil.rmtree(temp_dir, ignore_errors=True)
@@ -29,6 +29,11 @@ def main():
         app_dir = os.path.dirname(os.path.abspath(__file__))
         sys.path.insert(0, app_dir)
         
+        # `master-search serve`: Such-Daemon mit warmem Worker-Pool starten/steuern
+        if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+            from src.search_daemon import main as serve_main
+            return serve_main(sys.argv[2:])
+        
         # Set language from config
         from config.language_config import get_active_language
         from src.i18n import set_locale
@@ -49,4 +54,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
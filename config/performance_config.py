@@ -31,24 +31,39 @@ SKIP_LARGE_FILES = True             # Skip files over MAX_FILE_SIZE_MB
 # -----------------
 MAX_MEMORY_USAGE_PERCENT = 80       # Maximum RAM-Nutzung in Prozent
 MEMORY_CHECK_INTERVAL = 100         # Check RAM usage every N files
+MEMORY_PRESSURE_LINE_LENGTH = 200   # Gespeicherte Zeichen pro Treffer, wenn das RAM-Limit erreicht ist
+MEMORY_MIN_AVAILABLE_MB = 256       # Harte Untergrenze: weniger freier System-RAM gilt immer als RAM-Druck
 
 # I/O Optimierungen
 # -----------------
 USE_FAST_SCAN = True                # Schneller Directory-Scan
 BUFFER_SIZE = 8192                  # Buffer size for file reading in bytes
 MAX_LINE_LENGTH = 10000             # Maximum line length for text files
+MATCH_CONTEXT_CHARS = 1000          # Gespeicherter Kontext pro Treffer (Zeichen um den ersten Treffer)
+
+# Abbruch (Stop-Button)
+# ----------------------
+CANCEL_CHECK_INTERVAL = 1000        # Worker prüfen das Abbruch-Signal alle N Zeilen
+CANCEL_GRACE_PERIOD = 2.0           # Sekunden, die laufende Worker nach Abbruch noch erhalten
 
 # Progress Reporting
 # ------------------
 PROGRESS_UPDATE_INTERVAL = 50       # Show progress every N files
 DETAILED_STATS = True               # Zeige detaillierte Statistiken
 SHOW_SYSTEM_STATS = True            # Zeige System-Auslastung (benötigt psutil)
+FILE_STATS_TOP_N = 10               # Anzahl der langsamsten Dateien in Zusammenfassung und Bericht
 
 # Encoding Detection
 # ------------------
-ENCODING_ATTEMPTS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1', 'utf-16']
-MAX_ENCODING_ATTEMPTS = 3           # Maximum number of encoding attempts per file
-FAST_ENCODING_DETECTION = True      # Use fast encoding detection
+# Textdateien werden einmal gelesen: BOM (UTF-8/16/32), sonst UTF-8 mit Rückfall auf cp1252 ohne erneutes Lesen
+ENCODING_CACHE = True               # Entscheidung pro Datei (Größe/mtime) unter ~/.cache/master_search/encodings.pickle
+ENCODING_CACHE_MAX_ENTRIES = 100000 # Nur Dateien, die nicht reines UTF-8 sind, älteste fallen zuerst heraus
+
+# Binary Detection
+# ----------------
+# Dateien ohne Extraktor werden am Inhalt geprüft (Magic Numbers, NUL- und Steuerzeichen-Anteil)
+BINARY_FILES = 'strings'            # 'strings' = druckbare Zeichenfolgen durchsuchen, 'skip' = Inhalt überspringen, 'text' = wie Text dekodieren
+BINARY_SAMPLE_MIDDLE = True         # Bei großen Dateien zusätzlich eine Probe aus der Mitte prüfen
 
 # Error Handling
 # --------------
@@ -67,12 +82,63 @@ MMAP_THRESHOLD_MB = 10              # Schwellenwert für Memory Mapping
 USE_FILE_CACHE = False              # Cache Datei-Metadaten (experimental)
 CACHE_SIZE = 1000                   # Maximum Cache-Einträge
 
+# Change Tracking (inkrementelle Suche nur über geänderte Dateien)
+CHANGE_TRACKER_USE_INOTIFY = True   # inotify unter Linux (über ctypes), sonst Snapshot-Abgleich über mtime/Größe
+CHANGE_TRACKER_PERSIST = True       # Snapshot unter ~/.cache/master_search/snapshots speichern (für spätere Läufe)
+
+# Directory Skip Cache (Auflistungen unveränderter Verzeichnisse wiederverwenden)
+USE_DIRECTORY_CACHE = False         # Verzeichnisse mit unveränderter mtime nicht neu lesen (für wiederholte Suchen in statischen Archiven)
+DIRECTORY_CACHE_VERIFY = False      # Trotzdem alles lesen und Abweichungen zählen (prüft, ob die mtimes des Dateisystems verlässlich sind)
+
+# Regex-Vorfilter (erforderliche Literale einer Regex zuerst per bytes.find/Substring prüfen)
+USE_REGEX_PREFILTER = True          # Dateien ohne das Literal nicht dekodieren, Regex nur auf Zeilen mit dem Literal
+
+# PDF-Extraktion (seitenweise, mit Seiten-Cache)
+PDF_PAGE_CACHE = True               # Seitentexte nach Inhalt-Hash unter ~/.cache/master_search/pdf_pages.pickle (geänderte Seiten werden neu extrahiert)
+PDF_PAGE_CACHE_MAX_MB = 64          # Obergrenze des Seiten-Caches (Zeichen in Mio.), älteste Seiten fallen zuerst heraus
+PDF_PARALLEL_MIN_PAGES = 64         # Ab dieser Seitenzahl werden Seitenbereiche parallel extrahiert
+PDF_PAGES_PER_TASK = 16             # Seiten pro Bereich eines Workers
+
+# Archive (zip, tar, tar.gz/bz2/xz, gz, bz2, xz) - gestreamt, nichts wird auf die Platte entpackt
+ARCHIVE_MAX_DEPTH = 3               # Verschachtelungstiefe (Archiv in Archiv)
+ARCHIVE_MAX_MEMBER_MB = 256         # Entpackte Größe eines Members, größere werden übersprungen
+ARCHIVE_MAX_TOTAL_MB = 1024         # Entpackte Größe eines ganzen Archivs, danach Abbruch
+ARCHIVE_MAX_RATIO = 100             # Entpackt/gepackt (Zip-Bomben-Schutz), pro Zip-Member und pro Archiv
+ARCHIVE_PARALLEL_MIN_MEMBERS = 32   # Ab so vielen Membern wird ein Zip auf die Extraktions-Prozesse verteilt
+ARCHIVE_MEMBERS_PER_TASK = 8        # Member pro Aufgabe eines Workers
+
+# SQLite-Datenbanken: Suche als LIKE/instr in SQLite, große Tabellen in Zeilenbereichen parallel
+SQLITE_PARALLEL_MIN_ROWS = 200000   # Ab so vielen Zeilen (rowid-Spanne) wird eine Tabelle verteilt
+SQLITE_ROWS_PER_TASK = 5000         # Zeilen pro Aufgabe eines Workers (so viele hält der Prozess je Worker)
+
+# Extraktions-Prozesse (Seitenbereiche großer PDFs, Member großer Zip-Archive)
+EXTRACT_WORKERS = 0                 # 0 = Anzahl CPU-Kerne, 1 = nicht parallel
+
+# Extraktoren (src/extractors.py)
+LOAD_EXTRACTOR_PLUGINS = True       # Extraktoren anderer Pakete über den Entry-Point "master_search.extractors" laden
+ROUTE_CPU_EXTRACTORS = True         # Im Threading-Modus CPU-lastige Formate (DOCX, XLSX, PPTX, ...) an einen Prozess-Pool geben
+ROUTE_CPU_MIN_FILES = 8             # Erst ab so vielen solchen Dateien lohnt sich der Pool
+
 # Parallel Directory Walking
 PARALLEL_DIRECTORY_WALK = False     # Paralleles Durchlaufen der Verzeichnisse (experimental)
 
 # Performance Profiling
-ENABLE_PROFILING = False            # Aktiviert Performance-Profiling
-PROFILE_OUTPUT_FILE = "performance_profile.txt"
+ENABLE_PROFILING = False            # Aktiviert Performance-Profiling (Zeiten pro Stufe in Konsole und HTML-Bericht)
+PROFILE_OUTPUT_FILE = "performance_profile.txt"  # Relativ zum Report-Verzeichnis
+PROFILE_WITH_CPROFILE = False       # Zusätzlich cProfile pro Worker-Batch (langsamer, Ausgabe in PROFILE_OUTPUT_FILE)
+
+# Metrics Export (OpenMetrics / Prometheus)
+METRICS_FILE = None                 # Pfad der OpenMetrics-Textdatei (z.B. für den node_exporter textfile collector), None = aus
+METRICS_INTERVAL = 10.0             # Mindestabstand in Sekunden zwischen zwei Schreibvorgängen während einer Suche
+METRICS_HTTP_PORT = None            # Lokaler HTTP-Endpunkt http://127.0.0.1:<port>/metrics, None = aus
+
+# Such-Daemon (master-search serve)
+USE_SEARCH_DAEMON = True            # GUI und CLI nutzen einen laufenden Daemon als Thin Client
+DAEMON_HOST = "127.0.0.1"           # Nur lokal erreichbar
+DAEMON_PORT = 0                     # 0 = freier Port (steht in der Statusdatei)
+DAEMON_STATE_FILE = None            # Adresse und Token des Daemons, None = ~/.cache/master_search/daemon.json
+DAEMON_MAX_QUERIES = 4              # Gleichzeitig laufende Anfragen, weitere warten
+DAEMON_CONNECT_TIMEOUT = 0.5        # Sekunden für die Suche nach einem laufenden Daemon
 
 # Notes:
 # ======
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Measure Script: Speicherbedarf der Suchergebnisse
+=================================================
+
+Vergleicht den Speicherbedarf von 100.000 Treffern als Dicts (altes Format)
+mit den kompakten Match/FileResult-Records aus search_records.py.
+Gemessen wird mit tracemalloc, zusätzlich die Größe der Pickle-Daten,
+die Worker-Prozesse an den Hauptprozess zurückschicken.
+"""
+
+import os
+import sys
+import pickle
+import tracemalloc
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.search_records import Match, FileResult, term_ids_for, clip_line
+
+MATCH_COUNT = 100_000
+MATCHES_PER_FILE = 20
+TERMS = ('error', 'timeout', 'database')
+CONTEXT_CHARS = 1000
+
+
+def make_line(i):
+    """Erzeugt eine typische Log-Zeile mit Treffer."""
+    return f"2025-11-20 12:00:{i % 60:02d} ERROR worker-{i % 16} database timeout after {i} ms " + "x" * 120
+
+
+def build_dicts():
+    """Altes Format: ein Dict pro Treffer und Datei, Begriffe als Listen-Kopien."""
+    results = []
+    for f in range(MATCH_COUNT // MATCHES_PER_FILE):
+        directory = os.path.join('/srv/logs', f'host{f % 50}', 'app')
+        name = f'app{f}.log'
+        matches = []
+        for m in range(MATCHES_PER_FILE):
+            line = make_line(f * MATCHES_PER_FILE + m)
+            matches.append({
+                'line_number': m + 1,
+                'line_content': line,
+                'found_terms': [t for t in TERMS if t in line.lower()],
+            })
+        results.append({
+            'type': 'file',
+            'path': os.path.join(directory, name),
+            'name': name,
+            'matches': matches,
+        })
+    return results
+
+
+def build_records():
+    """Neues Format: __slots__-Records mit Begriffs-Indizes."""
+    results = []
+    for f in range(MATCH_COUNT // MATCHES_PER_FILE):
+        directory = os.path.join('/srv/logs', f'host{f % 50}', 'app')
+        name = f'app{f}.log'
+        matches = []
+        for m in range(MATCHES_PER_FILE):
+            line = make_line(f * MATCHES_PER_FILE + m)
+            found = [t for t in TERMS if t in line.lower()]
+            matches.append(Match(m + 1, clip_line(line, found, CONTEXT_CHARS), term_ids_for(found, TERMS)))
+        results.append(FileResult('file', directory, name, matches, TERMS))
+    return results
+
+
+def measure(builder):
+    """Misst Heap-Zuwachs und Pickle-Größe eines Ergebnis-Builders."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = builder()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    heap = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    pickled = len(pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL))
+    return heap, pickled
+
+
+def main():
+    print(f"Speicherbedarf für {MATCH_COUNT:,} Treffer ({MATCHES_PER_FILE} pro Datei)\n")
+    rows = [('dict', *measure(build_dicts)), ('records', *measure(build_records))]
+    for label, heap, pickled in rows:
+        print(f"  {label:8s}  Heap: {heap / 1024 / 1024:7.1f} MB   Pickle: {pickled / 1024 / 1024:7.1f} MB")
+    saved = 1 - rows[1][1] / rows[0][1]
+    print(f"\n  Einsparung Heap: {saved * 100:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Archive Search
+===============================
+Line generators for zip, tar (also .tar.gz/.tgz/.tar.bz2/.tar.xz) and
+single compressed files (.gz, .bz2, .xz, .lzma) without extracting
+anything to disk.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Members are decompressed as streams (tarfile in stream mode, zipfile,
+gzip, bz2, lzma) and dispatched by extension: nested archives are
+searched recursively, DOCX/XLSX/PPTX go to the streaming OOXML
+extractors, PDFs to pypdf/PyPDF2 if installed, everything else is read as
+text line by line (binary members, i.e. with NUL bytes at the start, are
+skipped). Every line carries its location, the nested path and the line
+in the member: "[logs.tar.gz!/app/2025-10.log:12] text".
+
+Limits (zip-bomb protection, ArchiveLimits):
+    - max_depth: nesting depth of archives in archives
+    - max_member_bytes: decompressed size of one member (member skipped)
+    - max_ratio: decompressed / compressed size of a zip member (member
+      skipped); for tar and gz/bz2/xz streams, whose members have no
+      compressed size, of the whole stream against the archive on disk
+    - max_total_bytes: decompressed bytes of the whole archive
+The sizes are counted while reading, the sizes declared in the archive
+headers are not trusted. Hitting an archive-wide limit ends the archive;
+on_limit(path, reason) is called for every limit hit.
+
+Zip archives with many members can be split across an executor (members
+per task, each worker opens the archive itself); the lines still come in
+member order. Only as many tasks as there are workers are submitted at a
+time (src/task_window.py), and a task returns at most TASK_TEXT_CHARS of
+text: members beyond that are streamed by the searching process itself.
+Workers return their limit hits, on_limit is called for them as well.
+Tar and single compressed streams are sequential by nature.
+"""
+
+import io
+import os
+import bz2
+import gzip
+import lzma
+import tarfile
+import zipfile
+import posixpath
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .ooxml_stream import iter_docx_lines, iter_pptx_lines, iter_xlsx_lines
+from .pdf_pages import PDF_AVAILABLE, PdfReader, page_line
+from .task_window import iter_ordered
+
+CHUNK_SIZE = 1 << 16
+MAX_LINE_BYTES = 1 << 20   # Längere "Zeilen" (Binärdaten ohne Umbruch) werden geteilt
+RATIO_FLOOR = 1 << 20      # Kleine Archive dürfen bis max_ratio * 1 MB entpacken
+SNIFF_BYTES = 8192
+TASK_TEXT_CHARS = 4 << 20  # Text, den eine Zip-Aufgabe höchstens zurückgibt (Rest streamt der Aufrufer)
+
+ARCHIVE_EXTENSIONS = frozenset({'.zip', '.tar', '.tgz', '.tbz', '.tbz2', '.txz',
+                                '.gz', '.gzip', '.bz2', '.bzip2', '.xz', '.lzma'})
+_TAR_SUFFIXES = ('.tar', '.tgz', '.tar.gz', '.tbz', '.tbz2', '.tar.bz2', '.txz', '.tar.xz')
+_COMPRESSION = {'.gz': 'gz', '.gzip': 'gz', '.tgz': 'gz', '.bz2': 'bz2', '.bzip2': 'bz2', '.tbz': 'bz2',
+                '.tbz2': 'bz2', '.xz': 'xz', '.lzma': 'xz', '.txz': 'xz'}
+_DECOMPRESSORS = {'gz': lambda stream: gzip.GzipFile(fileobj=stream), 'bz2': bz2.BZ2File, 'xz': lzma.LZMAFile}
+_OOXML = {'.docx': iter_docx_lines, '.xlsx': iter_xlsx_lines, '.xlsm': iter_xlsx_lines, '.pptx': iter_pptx_lines}
+
+Entry = Tuple[str, int, str]  # (verschachtelter Pfad, Zeile im Member, Text)
+
+
+class ArchiveLimits(NamedTuple):
+    max_depth: int = 3
+    max_member_bytes: int = 256 * 1024 * 1024
+    max_total_bytes: int = 1024 * 1024 * 1024
+    max_ratio: int = 100
+
+
+class ZipTaskResult(NamedTuple):
+    entries: List[Entry]
+    limit_hits: List[Tuple[str, str]]  # (Pfad, Grund) für on_limit im suchenden Prozess
+    rest: Tuple[str, ...]  # Member über TASK_TEXT_CHARS, vom suchenden Prozess gestreamt
+    stopped: bool  # Archivweite Grenze erreicht
+
+
+class ArchiveLimitError(Exception):
+    """An archive-wide limit was hit: stop reading the archive."""
+
+
+class MemberLimitError(ArchiveLimitError):
+    """A member limit was hit: skip the member."""
+
+
+def archive_kind(name: str) -> Optional[str]:
+    """'zip', 'tar', 'gz', 'bz2', 'xz' or None (not an archive)."""
+    name = name.lower()
+    if name.endswith('.zip'):
+        return 'zip'
+    if name.endswith(_TAR_SUFFIXES):
+        return 'tar'
+    if name.endswith(('.gz', '.gzip')):
+        return 'gz'
+    if name.endswith(('.bz2', '.bzip2')):
+        return 'bz2'
+    if name.endswith(('.xz', '.lzma')):
+        return 'xz'
+    return None
+
+
+class _Budget:
+    """Decompressed bytes of one archive (including nested archives)."""
+
+    def __init__(self, limits: ArchiveLimits, compressed_size: int):
+        self.limits = limits
+        self.ratio_limit = limits.max_ratio * max(compressed_size, RATIO_FLOOR)
+        self.total = 0
+        self.unchecked = 0  # Bytes ohne eigene Ratio-Prüfung (Tar- und gz/bz2/xz-Streams)
+
+    def add(self, count: int, ratio_checked: bool = False):
+        self.total += count
+        if self.total > self.limits.max_total_bytes:
+            raise ArchiveLimitError('total size')
+        if not ratio_checked:
+            self.unchecked += count
+            if self.unchecked > self.ratio_limit:
+                raise ArchiveLimitError('compression ratio')
+
+
+class _MemberReader(io.RawIOBase):
+    """Counts the decompressed bytes of a stream against the member limits and/or the budget.
+
+    Tar members are counted only against the member limits, the tar stream itself goes to
+    the budget (so skipped members and headers are counted as well).
+    """
+
+    def __init__(self, stream, budget: _Budget, compressed_size: Optional[int] = None,
+                 member: bool = True, total: bool = True):
+        self.stream = stream
+        self.budget = budget if total else None
+        self.read_bytes = 0
+        limits = budget.limits
+        self.member_limit = limits.max_member_bytes if member else None
+        if member and compressed_size is not None:
+            self.member_limit = min(self.member_limit, limits.max_ratio * max(compressed_size, RATIO_FLOOR))
+        self.max_member_bytes = limits.max_member_bytes
+        self.ratio_checked = member and compressed_size is not None  # Zip-Member: Ratio pro Member geprüft
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        count = len(data)
+        self.read_bytes += count
+        if self.member_limit is not None and self.read_bytes > self.member_limit:
+            raise MemberLimitError('member size' if self.member_limit == self.max_member_bytes
+                                   else 'compression ratio')
+        if self.budget is not None:
+            self.budget.add(count, self.ratio_checked)
+        buffer[:count] = data
+        return count
+
+
+def _clean(name: str) -> str:
+    name = posixpath.normpath(name.replace('\\', '/'))
+    return name.lstrip('/') if name != '.' else ''
+
+
+def _text_lines(stream) -> Iterator[Tuple[int, str]]:
+    """Non-empty lines of a binary stream (utf-8, per line latin-1 as fallback); nothing for binary data."""
+    head = stream.read(SNIFF_BYTES)
+    if b'\x00' in head:
+        return
+    rest = head
+    line_num = 0
+    while True:
+        lines = rest.split(b'\n')
+        rest = lines.pop()
+        if len(rest) > MAX_LINE_BYTES:
+            lines.append(rest)
+            rest = b''
+        for raw in lines:
+            line_num += 1
+            try:
+                text = raw.decode('utf-8')
+            except UnicodeDecodeError:
+                text = raw.decode('latin-1')
+            text = text.strip()
+            if text:
+                yield line_num, text
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        rest += chunk
+    if rest.strip():
+        try:
+            text = rest.decode('utf-8')
+        except UnicodeDecodeError:
+            text = rest.decode('latin-1')
+        yield line_num + 1, text.strip()
+
+
+def _read_all(stream) -> io.BytesIO:
+    buffer = io.BytesIO()
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.write(chunk)
+    buffer.seek(0)
+    return buffer
+
+
+def _pdf_lines(stream) -> Iterator[Tuple[int, str]]:
+    line_num = 0
+    for page_number, page in enumerate(PdfReader(stream).pages, 1):
+        for line in (page.extract_text() or '').split('\n'):
+            line = line.strip()
+            if line:
+                line_num += 1
+                yield line_num, page_line(page_number, line)
+
+
+def _member_entries(path: str, name: str, stream, budget: _Budget, depth: int,
+                    on_limit: Optional[Callable]) -> Iterator[Entry]:
+    """Entries of one member stream (already wrapped by _MemberReader)."""
+    kind = archive_kind(name)
+    ext = os.path.splitext(name)[1].lower()
+    if kind is not None:
+        if depth >= budget.limits.max_depth:
+            if on_limit:
+                on_limit(path, 'depth')
+            return
+        yield from _archive_entries(path, name, stream, budget, depth + 1, on_limit)
+    elif ext in _OOXML:
+        for line_num, text in _OOXML[ext](_read_all(stream)):
+            yield path, line_num, text
+    elif ext == '.pdf':
+        if PDF_AVAILABLE:
+            for line_num, text in _pdf_lines(_read_all(stream)):
+                yield path, line_num, text
+    else:
+        for line_num, text in _text_lines(stream):
+            yield path, line_num, text
+
+
+def _guarded(path: str, name: str, raw, budget: _Budget, depth: int, on_limit: Optional[Callable],
+             compressed_size: Optional[int] = None, total: bool = True) -> Iterator[Entry]:
+    """_member_entries with limit checks; member limits and broken members only skip the member."""
+    reader = io.BufferedReader(_MemberReader(raw, budget, compressed_size, total=total), CHUNK_SIZE)
+    try:
+        yield from _member_entries(path, name, reader, budget, depth, on_limit)
+    except MemberLimitError as e:
+        if on_limit:
+            on_limit(path, str(e))
+    except ArchiveLimitError:
+        raise
+    except Exception:
+        pass  # Defektes Member: übrige Member trotzdem durchsuchen
+
+
+def _compression(name: str) -> Optional[str]:
+    return _COMPRESSION.get(os.path.splitext(name.lower())[1])
+
+
+def _archive_entries(path: str, name: str, stream, budget: _Budget, depth: int,
+                     on_limit: Optional[Callable]) -> Iterator[Entry]:
+    """Entries of an archive stream; path is the nested path of the archive itself."""
+    kind = archive_kind(name)
+    if kind == 'zip':
+        if not stream.seekable():
+            stream = _read_all(stream)  # Verschachteltes Zip: zipfile braucht Seek (begrenzt durch max_member_bytes)
+        with zipfile.ZipFile(stream) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                member = _clean(info.filename)
+                with archive.open(info) as raw:
+                    yield from _guarded(f'{path}!/{member}', member, raw, budget, depth, on_limit,
+                                        info.compress_size)
+        return
+
+    compression = _compression(name)
+    decompressed = _DECOMPRESSORS[compression](stream) if compression else stream
+    inner = os.path.splitext(posixpath.basename(name))[0] if compression else posixpath.basename(name)
+    if kind != 'tar' and not inner.lower().endswith('.tar'):
+        # Einzelne komprimierte Datei: app.log.gz enthält app.log
+        with decompressed:
+            yield from _guarded(f'{path}!/{inner}', inner, decompressed, budget, depth, on_limit)
+        return
+
+    # Tar (auch backup.tar.gzip): Stream-Modus, Member in Archiv-Reihenfolge ohne Seek
+    counted = io.BufferedReader(_MemberReader(decompressed, budget, member=False), CHUNK_SIZE)
+    with tarfile.open(fileobj=counted, mode='r|') as archive:
+        for info in archive:
+            if not info.isfile():
+                continue
+            member = _clean(info.name)
+            yield from _guarded(f'{path}!/{member}', member, archive.extractfile(info), budget, depth,
+                                on_limit, total=False)
+
+
+def _lines(entries: Iterator[Entry], start: int = 0) -> Iterator[Tuple[int, str]]:
+    line_counter = start
+    for nested, member_line, text in entries:
+        line_counter += 1
+        yield line_counter, f'[{nested}:{member_line}] {text}'
+
+
+def _zip_member(archive: zipfile.ZipFile, display: str, name: str, budget: _Budget,
+                on_limit: Optional[Callable]) -> Iterator[Entry]:
+    info = archive.getinfo(name)
+    member = _clean(name)
+    with archive.open(info) as raw:
+        yield from _guarded(f'{display}!/{member}', member, raw, budget, 1, on_limit, info.compress_size)
+
+
+def zip_member_lines(file_path: str, names: Tuple[str, ...], limits: ArchiveLimits,
+                     max_chars: Optional[int] = None) -> ZipTaskResult:
+    """Entries of some members of a zip archive; runs in a worker for parallel archive search.
+
+    Stops before the member whose text would exceed max_chars (default TASK_TEXT_CHARS) and
+    returns it with the following ones as rest.
+    """
+    max_chars = max_chars or TASK_TEXT_CHARS
+    budget = _Budget(limits, os.path.getsize(file_path))
+    display = os.path.basename(file_path)
+    entries, limit_hits = [], []
+    chars = 0
+    with zipfile.ZipFile(file_path) as archive:
+        for index, name in enumerate(names):
+            start = len(entries)
+            try:
+                for entry in _zip_member(archive, display, name, budget,
+                                         lambda path, reason: limit_hits.append((path, reason))):
+                    entries.append(entry)
+                    chars += len(entry[2])
+                    if chars > max_chars:
+                        del entries[start:]
+                        return ZipTaskResult(entries, limit_hits, tuple(names[index:]), False)
+            except ArchiveLimitError as e:
+                limit_hits.append((display, str(e)))
+                return ZipTaskResult(entries, limit_hits, (), True)
+    return ZipTaskResult(entries, limit_hits, (), False)
+
+
+def iter_archive_lines(file_path: str, limits: Optional[ArchiveLimits] = None, executor=None,
+                       parallel_min_members: int = 32, members_per_task: int = 8,
+                       on_limit: Optional[Callable] = None) -> Iterator[Tuple[int, str]]:
+    """(line_number, "[archive!/member:line] text") for every text line in the archive.
+
+    line_number counts the lines over all members.
+    """
+    limits = limits or ArchiveLimits()
+    display = os.path.basename(file_path)
+    budget = _Budget(limits, os.path.getsize(file_path))
+    with open(file_path, 'rb') as stream:
+        if executor is not None and archive_kind(file_path) == 'zip':
+            with zipfile.ZipFile(stream) as archive:
+                members = [(info.filename, info.file_size) for info in archive.infolist() if not info.is_dir()]
+            if len(members) >= parallel_min_members:
+                yield from _lines(_parallel_zip(file_path, members, limits, executor, members_per_task,
+                                                budget, on_limit))
+                return
+            stream.seek(0)
+        try:
+            yield from _lines(_archive_entries(display, file_path, stream, budget, 1, on_limit))
+        except ArchiveLimitError as e:
+            if on_limit:
+                on_limit(display, str(e))
+
+
+def _zip_tasks(members: List[Tuple[str, int]], members_per_task: int) -> Iterator[Tuple[str, ...]]:
+    """Member names per task: at most members_per_task and about TASK_TEXT_CHARS (declared sizes)."""
+    task, task_size = [], 0
+    for name, size in members:
+        if task and (len(task) >= members_per_task or task_size + size > TASK_TEXT_CHARS):
+            yield tuple(task)
+            task, task_size = [], 0
+        task.append(name)
+        task_size += size
+    if task:
+        yield tuple(task)
+
+
+def _parallel_zip(file_path, members, limits, executor, members_per_task, budget, on_limit):
+    display = os.path.basename(file_path)
+    results = iter_ordered(executor, ((zip_member_lines, (file_path, names, limits))
+                                      for names in _zip_tasks(members, members_per_task)))
+    try:
+        for result in results:
+            for path, reason in result.limit_hits:
+                if on_limit:
+                    on_limit(path, reason)
+            for nested, member_line, text in result.entries:
+                # Jeder Worker zählt nur seine Member: Archiv-Limits hier über den gelieferten Text
+                budget.add(len(text), ratio_checked=True)
+                yield nested, member_line, text
+            if result.stopped:
+                return
+            if result.rest:
+                # Zu viel Text für eine Aufgabe: diese Member hier streamen statt im Ganzen zu übertragen
+                with zipfile.ZipFile(file_path) as archive:
+                    for name in result.rest:
+                        yield from _zip_member(archive, display, name, budget, on_limit)
+    except ArchiveLimitError as e:
+        if on_limit:
+            on_limit(display, str(e))
+    finally:
+        results.close()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Binary Content Detection
+=========================================
+Decides from the content, not the extension, whether a file is text.
+Extensions alone let .pyc, .class, .jar, .sqlite, .db, .ibd, .woff, .png
+and similar files through as "text", which were then decoded line by line.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Detection (classify):
+    1. UTF-16/32 by BOM or NUL pattern (text_encoding.sniff_encoding) is text.
+    2. Magic numbers at the start of the file (PNG, JPEG, PDF, ZIP/JAR,
+       SQLite, Java class, ELF, OLE2, gzip, bzip2, xz, 7z, RAR, WOFF, ...).
+    3. NUL bytes or more than CONTROL_RATIO control characters (without
+       tab, newlines, form feed, backspace and ESC) in the head sample or,
+       for large files, in a sample from the middle of the file (text
+       headers in front of binary data, e.g. database pages).
+
+BinaryDetector keeps the decision per file path with size and mtime_ns in
+memory, one detector per process (shared_detector), so repeated searches
+in the daemon and in warm worker processes read each file head only once.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .text_encoding import WIDE_ENCODINGS, sniff_encoding
+
+HEAD_BYTES = 8192
+MIDDLE_BYTES = 4096
+CONTROL_RATIO = 0.05
+
+# Umgang mit Binärdateien, deren Endung als Text gilt
+BINARY_AS_TEXT = 'text'        # Wie bisher zeilenweise dekodieren
+BINARY_SKIP = 'skip'           # Inhalt nicht durchsuchen (Dateiname weiterhin)
+BINARY_STRINGS = 'strings'     # Nur druckbare Zeichenfolgen durchsuchen
+BINARY_MODES = (BINARY_AS_TEXT, BINARY_SKIP, BINARY_STRINGS)
+
+# (Offset, Signatur, Name); nur eindeutige Signaturen, der Rest fällt über NUL/Steuerzeichen auf
+MAGIC = (
+    (0, b'\x89PNG\r\n\x1a\n', 'png'),
+    (0, b'\xff\xd8\xff', 'jpeg'),
+    (0, b'GIF87a', 'gif'),
+    (0, b'GIF89a', 'gif'),
+    (0, b'%PDF-', 'pdf'),
+    (0, b'PK\x03\x04', 'zip'),
+    (0, b'PK\x05\x06', 'zip'),
+    (0, b'SQLite format 3\x00', 'sqlite'),
+    (0, b'\xca\xfe\xba\xbe', 'java-class'),
+    (0, b'\x7fELF', 'elf'),
+    (0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'ole2'),
+    (0, b'\x1f\x8b', 'gzip'),
+    (4, b'1AY&SY', 'bzip2'),
+    (0, b'\xfd7zXZ\x00', 'xz'),
+    (0, b'7z\xbc\xaf\x27\x1c', '7z'),
+    (0, b'Rar!\x1a\x07', 'rar'),
+    (0, b'wOFF', 'woff'),
+    (0, b'wOF2', 'woff2'),
+    (0, b'OggS', 'ogg'),
+    (0, b'fLaC', 'flac'),
+    (4, b'ftyp', 'mp4'),
+)
+
+_TEXT_CONTROLS = b'\t\n\r\f\b\x1b\v'
+_CONTROL_BYTES = bytes(byte for byte in range(32) if byte not in _TEXT_CONTROLS) + b'\x7f'
+
+
+def classify(head: bytes, middle: bytes = b'') -> Optional[str]:
+    """Why the content is binary ('nul', 'control' or a magic name), None for text."""
+    if not head:
+        return None
+    if sniff_encoding(head) in WIDE_ENCODINGS:
+        return None
+    for offset, magic, name in MAGIC:
+        if head.startswith(magic, offset):
+            return name
+    for sample in (head, middle):
+        if not sample:
+            continue
+        if b'\x00' in sample:
+            return 'nul'
+        controls = len(sample) - len(sample.translate(None, _CONTROL_BYTES))
+        if controls > len(sample) * CONTROL_RATIO:
+            return 'control'
+    return None
+
+
+class BinaryDetector:
+    """classify() on a head sample (and a middle sample) per file, cached by (size, mtime_ns)."""
+
+    def __init__(self, max_entries: int = 100000, sample_middle: bool = True):
+        self.max_entries = max_entries
+        self.sample_middle = sample_middle
+        self.entries: 'OrderedDict[str, Tuple[int, int, str]]' = OrderedDict()  # '' = Text
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def detect(self, file_path: str, stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """Reason the file is binary (see classify), None for text; OSError if it cannot be read."""
+        if stat is None:
+            stat = os.stat(file_path)
+        with self.lock:
+            known = self.entries.get(file_path)
+            if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+                self.hits += 1
+                self.entries.move_to_end(file_path)
+                return known[2] or None
+            self.misses += 1
+        middle = b''
+        with open(file_path, 'rb') as f:
+            head = f.read(HEAD_BYTES)
+            if self.sample_middle and stat.st_size > HEAD_BYTES * 4:
+                f.seek(stat.st_size // 2)
+                middle = f.read(MIDDLE_BYTES)
+        reason = classify(head, middle)
+        with self.lock:
+            self.entries[file_path] = (stat.st_size, stat.st_mtime_ns, reason or '')
+            self.entries.move_to_end(file_path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return reason
+
+
+_shared_detectors: Dict[bool, BinaryDetector] = {}
+
+
+def shared_detector(sample_middle: bool = True) -> BinaryDetector:
+    """Detector of this process (search process or worker), cache kept between searches."""
+    detector = _shared_detectors.get(sample_middle)
+    if detector is None:
+        detector = _shared_detectors.setdefault(sample_middle, BinaryDetector(sample_middle=sample_middle))
+    return detector
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Change Tracking
+================================
+Finds the files changed since the last refresh, so a rescan only touches them.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Two backends share one snapshot (directory -> mtime, file signatures, subdirectories):
+
+    - inotify (Linux, through ctypes, no extra dependency): every directory
+      is watched; a refresh only reads the queued events and stats the
+      files they name. A no-change refresh does not touch the file system.
+      Queue overflow or too few watches (fs.inotify.max_user_watches) fall
+      back to the snapshot diff.
+    - snapshot diff (everywhere else, and between runs through the persisted
+      snapshot): directories whose mtime is unchanged have the same entries,
+      so they are not listed again; only their known files are stat'ed.
+      Writing to a file does not change its directory's mtime, therefore
+      the files themselves are always compared by size and mtime.
+
+refresh() returns a ChangeSet; the first refresh (no snapshot yet) reports
+every file as added. ChangeTracker is not thread-safe.
+"""
+
+import os
+import sys
+import time
+import errno
+import struct
+import pickle
+import hashlib
+import ctypes
+import ctypes.util
+from stat import S_ISDIR
+from typing import Dict, Iterator, List, Optional, Set
+
+SNAPSHOT_VERSION = 1
+
+# inotify-Konstanten (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW)
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def default_snapshot_path(root: str) -> str:
+    """Snapshot file of a search root in the user cache."""
+    key = hashlib.md5(os.path.abspath(root).encode('utf-8')).hexdigest()
+    return os.path.join(os.path.expanduser('~/.cache/master_search/snapshots'), f'{key}.pickle')
+
+
+def _signature(stat_result) -> int:
+    # Ein int statt eines (Größe, mtime)-Tupels pro Datei: halber Speicher bei Millionen Dateien
+    return hash((stat_result.st_size, stat_result.st_mtime_ns))
+
+
+class ChangeSet:
+    """Files added, modified and deleted since the previous refresh."""
+
+    def __init__(self):
+        self.added: Set[str] = set()
+        self.modified: Set[str] = set()
+        self.deleted: Set[str] = set()
+        self.initial = False     # Erster Abgleich ohne Snapshot: alle Dateien sind "added"
+        self.backend = 'snapshot'
+        self.dirs_listed = 0     # Verzeichnisse, deren Einträge neu gelesen wurden
+        self.dirs_reused = 0     # Verzeichnisse mit unveränderter mtime (nicht neu gelistet)
+        self.files_stated = 0
+        self.elapsed = 0.0
+
+    @property
+    def changed(self) -> Set[str]:
+        """Files that have to be searched again (added or modified)."""
+        return self.added | self.modified
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.modified) + len(self.deleted)
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            'backend': self.backend,
+            'initial': self.initial,
+            'added': len(self.added),
+            'modified': len(self.modified),
+            'deleted': len(self.deleted),
+            'dirs_listed': self.dirs_listed,
+            'dirs_reused': self.dirs_reused,
+            'files_stated': self.files_stated,
+            'elapsed_s': round(self.elapsed, 4),
+        }
+
+
+class _Inotify:
+    """Minimal inotify binding over ctypes (Linux only)."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 fehlgeschlagen')
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        return wd
+
+    def remove_watch(self, wd: int):
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[tuple]:
+        """All queued events as (wd, mask, name); empty list if none are queued."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def inotify_available() -> bool:
+    """True if inotify can be used on this system."""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        _Inotify().close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+class ChangeTracker:
+    """Tracks file changes below a root directory (see module docstring)."""
+
+    def __init__(self, root: str, snapshot_path: Optional[str] = None, use_inotify: bool = True):
+        self.root = os.path.abspath(root)
+        self.snapshot_path = snapshot_path
+        # Verzeichnis -> [mtime_ns, {Dateiname: Signatur}, (Unterverzeichnisse)]
+        self.dirs: Dict[str, list] = {}
+        self._inotify = None
+        self._watches: Dict[int, str] = {}
+        self._watch_failed = False
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+        if snapshot_path:
+            self.load()
+
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._inotify is not None else 'snapshot'
+
+    # Snapshot ---------------------------------------------------------------
+
+    def load(self) -> bool:
+        """Load the persisted snapshot (False if missing, foreign or outdated)."""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return False
+        if data.get('version') != SNAPSHOT_VERSION or data.get('root') != self.root:
+            return False
+        self.dirs = data['dirs']
+        return True
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Persist the snapshot atomically (temp file + os.replace)."""
+        path = path or self.snapshot_path or default_snapshot_path(self.root)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'version': SNAPSHOT_VERSION, 'root': self.root, 'dirs': self.dirs}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return path
+
+    def files(self) -> Iterator[str]:
+        """All files of the current snapshot."""
+        for directory, (_mtime, files, _subdirs) in self.dirs.items():
+            for name in files:
+                yield os.path.join(directory, name)
+
+    def __len__(self) -> int:
+        return sum(len(state[1]) for state in self.dirs.values())
+
+    # Abgleich ---------------------------------------------------------------
+
+    def refresh(self) -> ChangeSet:
+        """Changes since the previous refresh (or since the loaded snapshot)."""
+        start = time.perf_counter()
+        changes = ChangeSet()
+        changes.backend = self.backend
+        if not self.dirs:
+            changes.initial = True
+        if self._inotify is not None and self._watches and not self._watch_failed:
+            if not self._apply_events(changes):
+                self._diff_tree(self.root, changes)  # Überlauf der Event-Queue: vollständiger Abgleich
+        else:
+            self._diff_tree(self.root, changes)
+        if self._inotify is not None and self._watch_failed:
+            changes.backend = 'snapshot'  # Zu wenige Watches: künftig Snapshot-Abgleich
+        changes.elapsed = time.perf_counter() - start
+        if self.snapshot_path and (changes or changes.dirs_listed):
+            self.save()
+        return changes
+
+    def _watch(self, directory: str):
+        if self._inotify is None or self._watch_failed:
+            return
+        try:
+            self._watches[self._inotify.add_watch(directory)] = directory
+        except OSError as e:
+            if e.errno in (errno.ENOSPC, errno.ENOMEM):
+                self._watch_failed = True  # fs.inotify.max_user_watches erreicht
+
+    def _diff_tree(self, top: str, changes: ChangeSet):
+        """Snapshot diff of a subtree; updates self.dirs and fills changes."""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            old = self.dirs.get(directory)
+            self._watch(directory)  # Vor dem Lesen beobachten, damit keine Änderung verloren geht
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._drop_subtree(directory, changes)
+                continue
+            if old is not None and old[0] == mtime and self._stat_known_files(directory, old, changes):
+                changes.dirs_reused += 1
+                subdirs = old[2]
+            else:
+                subdirs = self._list_directory(directory, mtime, old, changes)
+            stack.extend(os.path.join(directory, name) for name in subdirs)
+
+    def _stat_known_files(self, directory: str, state: list, changes: ChangeSet) -> bool:
+        """Compare the known files of an unchanged directory; False if its entries changed after all."""
+        files = state[1]
+        updates = {}
+        for name, signature in files.items():
+            path = os.path.join(directory, name)
+            try:
+                current = _signature(os.stat(path, follow_symlinks=False))
+            except OSError:
+                return False  # mtime gleich, Eintrag fehlt: unzuverlässige mtime, Verzeichnis neu lesen
+            changes.files_stated += 1
+            if current != signature:
+                updates[name] = current
+        for name, current in updates.items():
+            files[name] = current
+            changes.modified.add(os.path.join(directory, name))
+        return True
+
+    def _list_directory(self, directory: str, mtime: int, old: Optional[list], changes: ChangeSet):
+        changes.dirs_listed += 1
+        files = {}
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_dir():
+                            continue  # Symlink auf ein Verzeichnis: wie os.walk nicht betreten
+                        else:
+                            files[entry.name] = _signature(entry.stat(follow_symlinks=False))
+                            changes.files_stated += 1
+                    except OSError:
+                        continue
+        except OSError:
+            self._drop_subtree(directory, changes)
+            return ()
+        old_files = old[1] if old is not None else {}
+        for name, signature in files.items():
+            previous = old_files.get(name)
+            if previous is None:
+                changes.added.add(os.path.join(directory, name))
+            elif previous != signature:
+                changes.modified.add(os.path.join(directory, name))
+        for name in old_files.keys() - files.keys():
+            changes.deleted.add(os.path.join(directory, name))
+        if old is not None:
+            for name in set(old[2]) - set(subdirs):
+                self._drop_subtree(os.path.join(directory, name), changes)
+        subdirs = tuple(subdirs)
+        self.dirs[directory] = [mtime, files, subdirs]
+        return subdirs
+
+    def _drop_subtree(self, directory: str, changes: ChangeSet):
+        """Forget a removed directory; all its files count as deleted."""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            state = self.dirs.pop(current, None)
+            if state is None:
+                continue
+            changes.deleted.update(os.path.join(current, name) for name in state[1])
+            stack.extend(os.path.join(current, name) for name in state[2])
+
+    # inotify ----------------------------------------------------------------
+
+    def _apply_events(self, changes: ChangeSet) -> bool:
+        """Apply queued inotify events; False on queue overflow (full diff needed)."""
+        dirty_files = set()
+        dirty_dirs = set()
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                return False
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue  # *_SELF-Ereignisse: das Elternverzeichnis meldet die Änderung ebenfalls
+            if mask & IN_ISDIR:
+                dirty_dirs.add(directory)  # Unterverzeichnis neu, entfernt oder umbenannt
+            else:
+                dirty_files.add(os.path.join(directory, name))
+        for directory in dirty_dirs:
+            self._relist(directory, changes)
+        for path in dirty_files:
+            self._update_file(path, changes)
+        return True
+
+    def _relist(self, directory: str, changes: ChangeSet):
+        """Read one directory again; new subdirectories are scanned completely."""
+        old = self.dirs.get(directory)
+        if old is None:
+            return
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._drop_subtree(directory, changes)
+            return
+        known = set(old[2])
+        for name in self._list_directory(directory, mtime, old, changes):
+            if name not in known:
+                self._diff_tree(os.path.join(directory, name), changes)
+
+    def _update_file(self, path: str, changes: ChangeSet):
+        directory, name = os.path.split(path)
+        state = self.dirs.get(directory)
+        if state is None:
+            return
+        files = state[1]
+        previous = files.get(name)
+        try:
+            stat_result = os.stat(path, follow_symlinks=False)
+        except OSError:
+            stat_result = None
+        changes.files_stated += 1
+        if stat_result is None or S_ISDIR(stat_result.st_mode):
+            if previous is not None:
+                del files[name]
+                if path in changes.added:
+                    changes.added.discard(path)  # Seit dem letzten Abgleich angelegt und wieder gelöscht
+                else:
+                    changes.modified.discard(path)
+                    changes.deleted.add(path)
+        else:
+            signature = _signature(stat_result)
+            if previous is None:
+                if path in changes.deleted:
+                    changes.deleted.discard(path)
+                    changes.modified.add(path)
+                else:
+                    changes.added.add(path)
+            elif previous != signature and path not in changes.added:
+                changes.modified.add(path)
+            files[name] = signature
+        try:
+            # Alle Änderungen des Verzeichnisses sind übernommen: Snapshot-Abgleich kann es wiederverwenden
+            state[0] = os.stat(directory).st_mtime_ns
+        except OSError:
+            pass
+
+    def close(self):
+        """Stop watching (the snapshot stays usable)."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            self._watches.clear()
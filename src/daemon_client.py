@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Search Daemon Client
+=====================================
+Thin client for a running `master-search serve` daemon (see src/search_daemon.py).
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+The daemon writes its address and access token to a state file (mode 0600,
+default ~/.cache/master_search/daemon.json). discover() reads it and checks
+GET /health; GUI and CLI use the returned client instead of searching
+themselves. This module does not import the search engine, so the client
+stays cheap to load.
+
+HTTP/JSON API (all requests need the X-Master-Search-Token header):
+    GET  /health           - {"status": "ok", "version", "pid", "workers", "active_queries"}
+    POST /search           - query as JSON, response is NDJSON (one event per line)
+    POST /cancel/<id>      - stops a running query
+    POST /shutdown         - stops the daemon
+"""
+
+import os
+import json
+import http.client
+from typing import Any, Dict, Iterator, Optional
+
+TOKEN_HEADER = 'X-Master-Search-Token'
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+def default_state_file() -> str:
+    """Default location of the daemon state file."""
+    return os.path.expanduser('~/.cache/master_search/daemon.json')
+
+
+class DaemonError(Exception):
+    """Error response of the search daemon."""
+
+
+class DaemonClient:
+    """Client for the HTTP/JSON API of the search daemon."""
+
+    def __init__(self, host: str, port: int, token: str, timeout: float = 0.5):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout  # Sekunden bis zur Antwort (der Ergebnis-Stream selbst hat kein Timeout)
+
+    @classmethod
+    def discover(cls, state_file: Optional[str] = None, timeout: float = 0.5) -> Optional['DaemonClient']:
+        """Client for the running daemon, or None if none is running."""
+        try:
+            with open(state_file or default_state_file(), encoding='utf-8') as f:
+                state = json.load(f)
+            client = cls(state['host'], int(state['port']), state['token'], timeout)
+            client.health()
+            return client
+        except (OSError, ValueError, KeyError, TypeError, DaemonError):
+            return None
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None, stream: bool = False):
+        """Send a request; returns (connection, response). Raises DaemonError on HTTP errors."""
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {TOKEN_HEADER: self.token}
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            sock = connection.sock  # Nach getresponse() gehört der Socket der Antwort
+            response = connection.getresponse()
+            if stream:
+                sock.settimeout(None)  # Zwischen zwei Ereignissen kann beliebig viel Zeit vergehen
+        except BaseException:
+            connection.close()
+            raise
+        if response.status != 200:
+            try:
+                message = json.loads(response.read().decode('utf-8')).get('error', response.reason)
+            except ValueError:
+                message = response.reason
+            connection.close()
+            raise DaemonError(f'HTTP {response.status}: {message}')
+        return connection, response
+
+    def _json(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        connection, response = self._request(method, path, body)
+        try:
+            return json.loads(response.read().decode('utf-8'))
+        finally:
+            connection.close()
+
+    def health(self) -> Dict[str, Any]:
+        return self._json('GET', '/health')
+
+    def cancel(self, query_id: str) -> bool:
+        """Stop a running query; False if the daemon no longer knows it."""
+        try:
+            return bool(self._json('POST', f'/cancel/{query_id}').get('cancelled'))
+        except (OSError, DaemonError):
+            return False
+
+    def shutdown(self) -> Dict[str, Any]:
+        return self._json('POST', '/shutdown')
+
+    def search(self, query: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Run a query and yield its events as they arrive.
+
+        Events: started, queued, progress/memory/limit_reached/complete (status
+        updates of the engine), result (one per file or folder), error, done.
+        Closing the generator closes the connection, which also stops the query.
+        """
+        connection, response = self._request('POST', '/search', query, stream=True)
+        try:
+            for line in response:
+                line = line.strip()
+                if line:
+                    yield json.loads(line.decode('utf-8'))
+        finally:
+            connection.close()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Directory Skip Cache
+=====================================
+Reuses cached directory listings for directories whose mtime is unchanged.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Creating, deleting or renaming an entry changes the mtime of its directory,
+so a directory with the same mtime as at the last listing still has the
+same entries. DirectoryCache.walk() behaves like os.walk() (top-down, no
+symlinked directories entered) but only stats such directories instead of
+listing them again. The cache is persisted per search root (directory ->
+mtime, listing time, listing hash, files, subdirectories).
+
+Directory mtimes are not reliable everywhere, so a cached listing is only
+reused when:
+    - the file system is not known for coarse or cached mtimes (FAT, SMB,
+      NFS, FUSE, ...; checked on Linux through /proc/self/mounts),
+    - the mtime is older than the listing by RACY_WINDOW_NS (an entry
+      created in the same timestamp tick as the listing would otherwise go
+      unnoticed; 2 seconds also cover FAT's granularity),
+    - no earlier verification found a divergence for this root.
+
+Verify mode lists every directory anyway and counts the directories whose
+cached listing would have been reused although the entries differ. A
+divergence marks the root as unreliable, later walks then list everything.
+"""
+
+import os
+import sys
+import time
+import pickle
+import hashlib
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+CACHE_VERSION = 1
+RACY_WINDOW_NS = 2_000_000_000
+MAX_REPORTED_DIVERGENCES = 20
+
+# Dateisysteme mit groben, gecachten oder fehlenden Verzeichnis-mtimes
+UNRELIABLE_FILESYSTEMS = frozenset({
+    'vfat', 'msdos', 'fat', 'exfat', 'nfs', 'nfs4', 'cifs', 'smb', 'smb3', 'smbfs',
+    '9p', 'fuse', 'fuseblk', 'fuse.sshfs', 'fuse.rclone', 'fuse.s3fs', 'davfs', 'afs',
+})
+
+
+def default_cache_path(root: str) -> str:
+    """Cache file of a search root in the user cache."""
+    key = hashlib.md5(os.path.abspath(root).encode('utf-8')).hexdigest()
+    return os.path.join(os.path.expanduser('~/.cache/master_search/dircache'), f'{key}.pickle')
+
+
+def listing_hash(files, subdirs) -> str:
+    """Stable hash of a directory listing (used by verify mode)."""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in sorted(files):
+        digest.update(b'f' + os.fsencode(name) + b'\0')
+    for name in sorted(subdirs):
+        digest.update(b'd' + os.fsencode(name) + b'\0')
+    return digest.hexdigest()
+
+
+def _unescape_mount(field: str) -> str:
+    # /proc/self/mounts schreibt Leerzeichen usw. als Oktal-Escape (\040)
+    return field.encode('latin-1').decode('unicode_escape') if '\\' in field else field
+
+
+def filesystem_type(path: str) -> Optional[str]:
+    """File system type of path (Linux only, None elsewhere or if unknown)."""
+    if not sys.platform.startswith('linux'):
+        return None
+    path = os.path.realpath(path)
+    best, fstype = '', None
+    try:
+        with open('/proc/self/mounts', 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = _unescape_mount(fields[1])
+                prefix = mount_point.rstrip('/') + '/'
+                if (path == mount_point or path.startswith(prefix)) and len(mount_point) >= len(best):
+                    best, fstype = mount_point, fields[2]
+    except OSError:
+        return None
+    return fstype
+
+
+class WalkStats:
+    """Counters of one DirectoryCache.walk()."""
+
+    def __init__(self):
+        self.dirs_listed = 0     # Verzeichnisse mit scandir gelesen
+        self.dirs_reused = 0     # Verzeichnisse aus dem Cache übernommen
+        self.dirs_racy = 0       # mtime unverändert, aber zu nah an der letzten Auflistung
+        self.divergences = 0     # Verify-Modus: Cache hätte eine falsche Auflistung geliefert
+        self.divergent_dirs: List[str] = []
+        self.disabled: Optional[str] = None  # Grund, warum der Cache nicht genutzt wurde
+        self.verify = False
+        self.complete = False
+        self.elapsed = 0.0
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            'dirs_listed': self.dirs_listed,
+            'dirs_reused': self.dirs_reused,
+            'dirs_racy': self.dirs_racy,
+            'divergences': self.divergences,
+            'divergent_dirs': list(self.divergent_dirs),
+            'disabled': self.disabled,
+            'verify': self.verify,
+            'elapsed_s': round(self.elapsed, 4),
+        }
+
+
+class DirectoryCache:
+    """Directory listings of a search root, reused while the directory mtime is unchanged."""
+
+    def __init__(self, root: str, cache_path: Optional[str] = None, verify: bool = False):
+        self.root = os.path.abspath(root)
+        self.cache_path = cache_path
+        self.verify = verify
+        # Verzeichnis -> (mtime_ns, gelistet_ns, listing_hash, Dateien, Unterverzeichnisse, Symlinks)
+        self.entries: Dict[str, Tuple] = {}
+        self.unreliable: Optional[str] = None  # Ergebnis einer früheren Verifikation
+        self.stats = WalkStats()
+        if cache_path:
+            self.load()
+
+    # Persistenz -------------------------------------------------------------
+
+    def load(self) -> bool:
+        """Load the persisted cache (False if missing, foreign or outdated)."""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return False
+        if data.get('version') != CACHE_VERSION or data.get('root') != self.root:
+            return False
+        self.entries = data['entries']
+        self.unreliable = data.get('unreliable')
+        return True
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Persist the cache atomically (temp file + os.replace)."""
+        path = path or self.cache_path or default_cache_path(self.root)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'  # Daemon: mehrere Suchen pro Prozess
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'root': self.root, 'entries': self.entries,
+                         'unreliable': self.unreliable}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return path
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # Durchlauf --------------------------------------------------------------
+
+    def disabled_reason(self) -> Optional[str]:
+        """Why cached listings must not be reused for this root (None = usable)."""
+        if self.unreliable:
+            return self.unreliable
+        fstype = filesystem_type(self.root)
+        if fstype in UNRELIABLE_FILESYSTEMS or (fstype or '').startswith('fuse.'):
+            return f'filesystem {fstype}'
+        return None
+
+    def walk(self) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """os.walk(root) replacement; removing names from dirs prunes them like with os.walk.
+
+        The cache is saved when the walk completes (not if it is abandoned).
+        """
+        stats = self.stats = WalkStats()
+        stats.verify = self.verify
+        stats.disabled = self.disabled_reason()
+        start = time.perf_counter()
+        if stats.disabled and not self.verify:
+            # Unzuverlässige mtimes: normaler Durchlauf, Cache bleibt unverändert
+            for entry in os.walk(self.root):
+                stats.dirs_listed += 1
+                yield entry
+            stats.complete = True
+            stats.elapsed = time.perf_counter() - start
+            return
+
+        visited = set()
+        pruned = False
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            listing = self._listing(directory, stats)
+            if listing is None:
+                continue
+            visited.add(directory)
+            files, subdirs, links = listing
+            dirs = list(subdirs)
+            yield directory, dirs, list(files)
+            if len(dirs) != len(subdirs):
+                pruned = True  # Nicht besuchte Unterbäume bleiben im Cache
+            # Symlinks auf Verzeichnisse werden wie bei os.walk gemeldet, aber nicht betreten
+            stack.extend(os.path.join(directory, name) for name in reversed(dirs) if name not in links)
+
+        stats.complete = True
+        stats.elapsed = time.perf_counter() - start
+        if not pruned:
+            for directory in self.entries.keys() - visited:
+                del self.entries[directory]
+        if self.verify:
+            self.unreliable = f'{stats.divergences} divergences in verify mode' if stats.divergences else None
+        if self.cache_path and (stats.dirs_listed or self.verify):
+            try:
+                self.save()
+            except OSError:
+                pass  # Cache ist nur eine Beschleunigung
+
+    def _listing(self, directory: str, stats: WalkStats):
+        """(files, subdirs, symlinked subdirs) of directory, from the cache if it is still valid."""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self.entries.pop(directory, None)
+            return None
+        cached = self.entries.get(directory)
+        reusable = False
+        if cached is not None and cached[0] == mtime:
+            if mtime and mtime < cached[1] - RACY_WINDOW_NS:
+                reusable = True
+            else:
+                stats.dirs_racy += 1
+        if reusable and not self.verify:
+            stats.dirs_reused += 1
+            return cached[3], cached[4], cached[5]
+
+        listed_at = time.time_ns()  # Vor dem Lesen: spätere Änderungen im selben Tick gelten als "racy"
+        files, subdirs, links = [], [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        subdirs.append(entry.name)
+                        if entry.is_symlink():
+                            links.append(entry.name)
+                    else:
+                        files.append(entry.name)
+        except OSError:
+            self.entries.pop(directory, None)
+            return None
+        stats.dirs_listed += 1
+        listing = (tuple(files), tuple(subdirs), frozenset(links))
+        digest = listing_hash(files, subdirs)
+        if reusable and cached[2] != digest:
+            stats.divergences += 1
+            if len(stats.divergent_dirs) < MAX_REPORTED_DIVERGENCES:
+                stats.divergent_dirs.append(directory)
+        self.entries[directory] = (mtime, listed_at, digest) + listing
+        return listing
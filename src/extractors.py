@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Extractor Registry
+===================================
+Text extractors for non-plain-text formats and the registry that picks
+one by file extension. Both search paths (threads and worker processes)
+dispatch through the registry.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+An Extractor declares:
+    - name: shown in the file statistics ("docx", "pdf", ...)
+    - extensions: lower-case extensions with dot
+    - extract(file_path, context): (line_number, text) pairs, a list or a
+      generator (streaming=True: extracted while the matcher reads, so a
+      search that stops early never extracts the rest)
+    - cost: COST_CHEAP, COST_IO or COST_CPU
+    - version: part of cache_key ("pdf@2"), bump it when the text an
+      extractor produces changes so cached texts are not reused
+    - affinity: where the scheduler runs files of this format; CPU-heavy
+      formats default to "process" (worker processes), everything else to
+      "thread". Extractors that need the searching process (PDF page
+      cache, OCR handler, extraction pool) declare "thread".
+    - enabled(context): optional switch, e.g. OCR only with use_ocr
+
+select_file() also looks at the content: a file without extractor whose
+content is binary (src/binary_detect.py) goes to the "strings" extractor
+(printable runs) or to "binary" (nothing), as context.binary_files says.
+
+Later registrations override earlier ones for the same extension, so a
+plugin can replace a built-in extractor.
+
+Third-party extractors are found through the entry point group
+"master_search.extractors". An entry point may load an Extractor, an
+iterable of Extractors, or a callable returning either:
+
+    [project.entry-points."master_search.extractors"]
+    epub = "my_package.epub:EPUB_EXTRACTOR"
+
+Entry points that fail to load are recorded in load_errors and skipped.
+
+Worker processes build their own default_registry(), so extractors that
+are only registered at runtime (not through an entry point) should use
+affinity "thread".
+"""
+
+import os
+import re
+import csv
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .ooxml_stream import iter_docx_lines, iter_pptx_lines, iter_xlsx_lines, sheet_row_line
+from .pdf_pages import PDF_AVAILABLE, iter_pdf_pages, page_line
+from .archive_search import ARCHIVE_EXTENSIONS, iter_archive_lines
+from .text_encoding import open_detected
+from .binary_detect import BINARY_AS_TEXT, BINARY_SKIP, BINARY_STRINGS, shared_detector
+from .printable_runs import iter_printable_runs, offset_line
+from .sqlite_search import SQLITE_EXTENSIONS, is_sqlite, iter_sqlite_lines
+from .structured_search import csv_columns, iter_csv_lines, iter_json_lines, json_paths
+
+COST_CHEAP = 'cheap'
+COST_IO = 'io'
+COST_CPU = 'cpu'
+COSTS = (COST_CHEAP, COST_IO, COST_CPU)
+
+AFFINITY_THREAD = 'thread'
+AFFINITY_PROCESS = 'process'
+
+ENTRY_POINT_GROUP = 'master_search.extractors'
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff', '.webp')
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+Lines = Iterable[Tuple[int, str]]
+
+
+class ExtractContext:
+    """What an extractor may use besides the file: limits, shared caches and pools.
+
+    pdf_cache, executor and encoding_cache are factories (called on first use),
+    so files that need neither never create the caches or the extraction pool.
+    Worker processes use a context without cache, pool and OCR handler.
+    """
+
+    def __init__(self, archive_limits=None, pdf_cache: Optional[Callable] = None, executor: Optional[Callable] = None,
+                 ocr_handler=None, use_ocr: bool = False, on_limit: Optional[Callable] = None,
+                 pdf_parallel_min_pages: int = 64, pdf_pages_per_task: int = 16,
+                 archive_parallel_min_members: int = 32, archive_members_per_task: int = 8,
+                 encoding_cache: Optional[Callable] = None, binary_files: str = BINARY_AS_TEXT,
+                 binary_detector: Optional[Callable] = None, literal_condition=None,
+                 sqlite_parallel_min_rows: int = 200000, sqlite_rows_per_task: int = 5000,
+                 projection: Tuple[tuple, ...] = ()):
+        self.archive_limits = archive_limits
+        self._pdf_cache = pdf_cache
+        self._executor = executor
+        self.ocr_handler = ocr_handler
+        self.use_ocr = use_ocr
+        self.on_limit = on_limit
+        self.pdf_parallel_min_pages = pdf_parallel_min_pages
+        self.pdf_pages_per_task = pdf_pages_per_task
+        self.archive_parallel_min_members = archive_parallel_min_members
+        self.archive_members_per_task = archive_members_per_task
+        self._encoding_cache = encoding_cache
+        self.binary_files = binary_files
+        self._binary_detector = binary_detector or shared_detector
+        self.literal_condition = literal_condition  # QueryPlan.literal_condition der Suche (Zeilen-Modus)
+        self.sqlite_parallel_min_rows = sqlite_parallel_min_rows
+        self.sqlite_rows_per_task = sqlite_rows_per_task
+        self.projection = projection  # QueryPlan.projection: col:/json: der Abfrage
+
+    def pdf_cache(self):
+        return self._pdf_cache() if self._pdf_cache is not None else None
+
+    def executor(self):
+        return self._executor() if self._executor is not None else None
+
+    def encoding_cache(self):
+        return self._encoding_cache() if self._encoding_cache is not None else None
+
+    def binary_detector(self):
+        return self._binary_detector()
+
+
+class Extractor:
+    """A text extractor for some extensions (see module docstring)."""
+
+    def __init__(self, name: str, extensions: Iterable[str], extract: Callable[[str, ExtractContext], Lines],
+                 cost: str = COST_IO, streaming: bool = False, version: int = 1, affinity: Optional[str] = None,
+                 enabled: Optional[Callable[[ExtractContext], bool]] = None):
+        if cost not in COSTS:
+            raise ValueError(f"cost muss einer von {', '.join(COSTS)} sein")
+        if affinity not in (None, AFFINITY_THREAD, AFFINITY_PROCESS):
+            raise ValueError(f"affinity muss '{AFFINITY_THREAD}' oder '{AFFINITY_PROCESS}' sein")
+        self.name = name
+        self.extensions = tuple(ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in extensions)
+        self.extract = extract
+        self.cost = cost
+        self.streaming = streaming
+        self.version = version
+        self.affinity = affinity or (AFFINITY_PROCESS if cost == COST_CPU else AFFINITY_THREAD)
+        self.enabled = enabled
+
+    @property
+    def cache_key(self) -> str:
+        return f'{self.name}@{self.version}'
+
+    def is_enabled(self, context: Optional[ExtractContext]) -> bool:
+        return self.enabled is None or bool(self.enabled(context or ExtractContext()))
+
+    def __repr__(self):
+        return (f'Extractor({self.name!r}, {list(self.extensions)!r}, cost={self.cost!r}, '
+                f'streaming={self.streaming}, version={self.version}, affinity={self.affinity!r})')
+
+
+class ExtractorRegistry:
+    """Extractors by extension; the last registration for an extension wins."""
+
+    def __init__(self, extractors: Iterable[Extractor] = ()):
+        self._by_extension: Dict[str, Extractor] = {}
+        self._by_name: Dict[str, Extractor] = {}
+        self.load_errors: List[Tuple[str, str]] = []  # (Entry Point, Fehler)
+        for extractor in extractors:
+            self.register(extractor)
+
+    def register(self, extractor: Extractor) -> Extractor:
+        if not isinstance(extractor, Extractor):
+            raise TypeError(f'Kein Extractor: {extractor!r}')
+        self._by_name[extractor.name] = extractor
+        for ext in extractor.extensions:
+            self._by_extension[ext] = extractor
+        return extractor
+
+    def get(self, name: str) -> Optional[Extractor]:
+        return self._by_name.get(name)
+
+    def for_extension(self, ext: str) -> Optional[Extractor]:
+        return self._by_extension.get(ext.lower())
+
+    def select(self, ext: str, context: Optional[ExtractContext] = None) -> Optional[Extractor]:
+        """Extractor for ext if one is registered and enabled in context, else None (plain text)."""
+        extractor = self._by_extension.get(ext.lower())
+        if extractor is None or not extractor.is_enabled(context):
+            return None
+        return extractor
+
+    def select_file(self, file_path: str, context: Optional[ExtractContext] = None,
+                    stat: Optional[os.stat_result] = None) -> Optional[Extractor]:
+        """select() by extension; files without extractor with binary content go to 'strings' or 'binary'.
+
+        Content is only checked if context.binary_files is not BINARY_AS_TEXT (stat avoids a second os.stat).
+        """
+        extractor = self.select(os.path.splitext(file_path)[1], context)
+        if extractor is not None or context is None or context.binary_files == BINARY_AS_TEXT:
+            return extractor
+        try:
+            if not context.binary_detector().detect(file_path, stat):
+                return None
+        except OSError:
+            return None  # Nicht lesbar: der Text-Pfad behandelt den Fehler
+        return self.get('strings' if context.binary_files == BINARY_STRINGS else 'binary')
+
+    def extensions(self) -> Tuple[str, ...]:
+        return tuple(sorted(self._by_extension))
+
+    def __iter__(self) -> Iterator[Extractor]:
+        return iter(self._by_name.values())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP, entry_points: Optional[Iterable] = None) -> int:
+        """Register the extractors of all entry points in group; returns how many were registered."""
+        if entry_points is None:
+            entry_points = _entry_points(group)
+        registered = 0
+        for entry_point in entry_points:
+            label = f'{getattr(entry_point, "name", "?")} = {getattr(entry_point, "value", "?")}'
+            try:
+                loaded = entry_point.load()
+                if callable(loaded) and not isinstance(loaded, Extractor):
+                    loaded = loaded()
+                for extractor in ([loaded] if isinstance(loaded, Extractor) else list(loaded)):
+                    self.register(extractor)
+                    registered += 1
+            except Exception as e:
+                self.load_errors.append((label, f'{type(e).__name__}: {e}'))
+        return registered
+
+
+def _entry_points(group: str):
+    try:
+        from importlib import metadata
+    except ImportError:
+        return []  # Python < 3.8
+    try:
+        found = metadata.entry_points()
+        if hasattr(found, 'select'):
+            return list(found.select(group=group))
+        return list(found.get(group, []))  # Python < 3.10
+    except Exception:
+        return []
+
+
+# Eingebaute Extraktoren ------------------------------------------------------
+
+def extract_docx(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """word/document.xml gestreamt (src/ooxml_stream.py), Absätze gehen direkt an den Matcher."""
+    try:
+        yield from iter_docx_lines(file_path)
+    except Exception:
+        pass  # DOCX-Extraktion fehlgeschlagen, wird als Binärdatei behandelt
+
+
+def extract_pptx(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """Folien gestreamt."""
+    try:
+        yield from iter_pptx_lines(file_path)
+    except Exception:
+        pass  # PPTX-Extraktion fehlgeschlagen
+
+
+def extract_xlsx(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """Alle Tabellenblätter gestreamt, jede Zeile mit Position [Blatt!Zeile]."""
+    try:
+        yield from iter_xlsx_lines(file_path)
+    except Exception:
+        pass  # XLSX-Extraktion fehlgeschlagen
+
+
+def extract_xls(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """Altes Excel-Format über xlrd (optional), Zeilen wie bei XLSX mit Position [Blatt!Zeile]."""
+    try:
+        import xlrd
+
+        book = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            for sheet_index, sheet_name in enumerate(book.sheet_names()):
+                sheet = book.sheet_by_index(sheet_index)
+                for row_index in range(sheet.nrows):
+                    values = []
+                    for cell in sheet.row(row_index):
+                        if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                            text = 'TRUE' if cell.value else 'FALSE'
+                        elif cell.ctype == xlrd.XL_CELL_NUMBER and float(cell.value).is_integer():
+                            text = str(int(cell.value))  # 42.0 -> 42 wie in XLSX
+                        elif cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+                            continue
+                        else:
+                            text = str(cell.value).strip()
+                        if text:
+                            values.append(text)
+                    if values:
+                        yield row_index + 1, sheet_row_line(sheet_name, row_index + 1, values)
+                book.unload_sheet(sheet_index)
+        finally:
+            book.release_resources()
+    except ImportError:
+        pass  # xlrd nicht installiert
+    except Exception:
+        pass  # XLS-Extraktion fehlgeschlagen
+
+
+def extract_pdf(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """Seitenweise (src/pdf_pages.py), jede Zeile mit ihrer Seite [Seite N].
+
+    Mit Seiten-Cache und Extraktions-Pool aus dem Kontext (nur im suchenden Prozess).
+    """
+    if not PDF_AVAILABLE:
+        return  # Weder pypdf noch PyPDF2 installiert
+    try:
+        line_counter = 0
+        for page_number, text in iter_pdf_pages(file_path, context.pdf_cache(), context.executor(),
+                                                context.pdf_parallel_min_pages, context.pdf_pages_per_task,
+                                                key_prefix=f'{PDF_EXTRACTOR.cache_key}:'):
+            for line in text.split('\n'):
+                line = line.strip()
+                if line:
+                    line_counter += 1
+                    yield line_counter, page_line(page_number, line)
+    except Exception:
+        pass  # PDF-Extraktion fehlgeschlagen
+
+
+def extract_archive(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """Archive ohne Entpacken auf die Platte, jede Zeile mit Pfad im Archiv [archiv!/member:Zeile]."""
+    try:
+        yield from iter_archive_lines(file_path, context.archive_limits, context.executor(),
+                                      context.archive_parallel_min_members, context.archive_members_per_task,
+                                      context.on_limit)
+    except Exception:
+        pass  # Archiv-Extraktion fehlgeschlagen
+
+
+def extract_csv(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """CSV-Datensätze, Zellen mit " | " verbunden; mit col: in der Abfrage nur diese Spalten.
+
+    Gestreamt, Blöcke ohne die Literale der Suche werden nicht geparst (src/structured_search.py).
+    """
+    try:
+        with open_detected(file_path, cache=context.encoding_cache()) as csvfile:
+            yield from iter_csv_lines(csvfile, csv_columns(context.projection), context.literal_condition)
+    except Exception:
+        pass  # CSV-Extraktion fehlgeschlagen
+
+
+def extract_json(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """JSON/NDJSON mit col:/json: in der Abfrage: pro Datensatz die Werte dieser Pfade.
+
+    Zeilen werden nur geparst, wenn sie die Literale der Suche enthalten (src/structured_search.py).
+    """
+    line_delimited = True if os.path.splitext(file_path)[1].lower() in NDJSON_EXTENSIONS else None
+    try:
+        with open_detected(file_path, cache=context.encoding_cache()) as stream:
+            yield from iter_json_lines(stream, json_paths(context.projection), context.literal_condition,
+                                       line_delimited)
+    except Exception:
+        pass  # JSON-Extraktion fehlgeschlagen
+
+
+def extract_odt(file_path: str, context: ExtractContext) -> List[Tuple[int, str]]:
+    """Absätze aus content.xml (OpenDocument)."""
+    lines = []
+    try:
+        from zipfile import ZipFile
+        from xml.etree import ElementTree as ET
+
+        with ZipFile(file_path, 'r') as zip_ref:
+            root = ET.fromstring(zip_ref.read('content.xml'))
+
+        # Namespace für ODF
+        ns = {
+            'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0',
+            'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
+        }
+
+        # Sammle Absätze
+        line_counter = 0
+        for paragraph in root.findall('.//text:p', ns):
+            text_parts = [text_elem.text for text_elem in paragraph.findall('.//text:span', ns) if text_elem.text]
+            if text_parts:
+                line_counter += 1
+                line_text = ''.join(text_parts).strip()
+                if line_text:
+                    lines.append((line_counter, line_text))
+    except Exception:
+        pass  # ODT-Extraktion fehlgeschlagen
+    return lines
+
+
+def extract_rtf(file_path: str, context: ExtractContext) -> List[Tuple[int, str]]:
+    """Einfaches RTF-Parsing: Steuerwörter und Klammern werden entfernt."""
+    lines = []
+    try:
+        with open(file_path, 'r', encoding='latin-1', errors='ignore') as f:
+            content = f.read()
+
+        content = re.sub(r'\\[a-z]+\d*\s?', ' ', content)
+        content = re.sub(r'[{}]', '', content)
+        content = re.sub(r'\\\?', '', content)
+
+        line_counter = 0
+        for line in content.split('\n'):
+            line = line.strip()
+            if line and len(line) > 2:  # Ignoriere sehr kurze Zeilen
+                line_counter += 1
+                lines.append((line_counter, line))
+    except Exception:
+        pass  # RTF-Extraktion fehlgeschlagen
+    return lines
+
+
+def extract_doc(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """Alte Word-Dateien: Text als druckbare Folgen (8-Bit und UTF-16LE); umbenannte DOCX wie DOCX."""
+    try:
+        if zipfile.is_zipfile(file_path):
+            yield from iter_docx_lines(file_path)
+        else:
+            yield from extract_strings(file_path, context)
+    except Exception:
+        pass  # DOC-Extraktion fehlgeschlagen
+
+
+def extract_log(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """LOG-Dateien wie Textdateien, einmal gelesen mit erkanntem Encoding (Generator).
+
+    Nicht registriert: .log geht im Tool über den Text-Pfad (Vorfilter, frühes Ende).
+    """
+    try:
+        with open_detected(file_path, cache=context.encoding_cache()) as f:
+            for line_num, line in enumerate(f, 1):
+                line_content = line.strip()
+                if line_content:
+                    yield line_num, line_content
+    except Exception:
+        pass
+
+
+def extract_ocr(file_path: str, context: ExtractContext) -> List[Tuple[int, str]]:
+    """Bilddateien per OCR-Handler des Kontexts, Zeilen mit [OCR]."""
+    lines = []
+    try:
+        if context.ocr_handler:
+            ocr_text = context.ocr_handler.extract_text(file_path)
+            if ocr_text and ocr_text.strip():
+                for line_num, line in enumerate(ocr_text.split('\n'), 1):
+                    line_content = line.strip()
+                    if line_content:
+                        lines.append((line_num, f"[OCR] {line_content}"))
+    except Exception:
+        pass  # OCR extraction failed, skip
+    return lines
+
+
+def extract_strings(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """Binärdateien: druckbare 8-Bit- und UTF-16LE-Folgen (wie strings(1)), Zeilen mit [@Byte-Offset]."""
+    for run_num, (offset, text) in enumerate(iter_printable_runs(file_path), 1):
+        yield run_num, offset_line(offset, text)
+
+
+def extract_sqlite(file_path: str, context: ExtractContext) -> Iterator[Tuple[int, str]]:
+    """SQLite-Datenbanken über sqlite3 (src/sqlite_search.py), Zeilen mit [Tabelle.Spalte Zeilen-Id].
+
+    Die Literale der Suche laufen als LIKE/instr in SQLite; andere .db-Dateien wie Binärdateien.
+    """
+    if not is_sqlite(file_path):
+        if context.binary_files != BINARY_SKIP:
+            yield from extract_strings(file_path, context)
+        return
+    try:
+        yield from iter_sqlite_lines(file_path, context.literal_condition, context.executor(),
+                                     context.sqlite_parallel_min_rows, context.sqlite_rows_per_task)
+    except Exception:
+        pass  # Datenbank nicht lesbar (verschlüsselt, beschädigt, ...)
+
+
+def skip_binary(file_path: str, context: ExtractContext) -> List[Tuple[int, str]]:
+    """Binärdateien mit binary_files 'skip': kein durchsuchbarer Inhalt."""
+    return []
+
+
+PDF_EXTRACTOR = Extractor('pdf', ['.pdf'], extract_pdf, COST_CPU, streaming=True, affinity=AFFINITY_THREAD)
+
+BUILTIN_EXTRACTORS = (
+    Extractor('docx', ['.docx'], extract_docx, COST_CPU, streaming=True),
+    Extractor('doc', ['.doc'], extract_doc, COST_CPU, streaming=True, version=2),
+    PDF_EXTRACTOR,  # Seiten-Cache und Seitenbereichs-Pool gehören dem suchenden Prozess
+    Extractor('xlsx', ['.xlsx', '.xlsm'], extract_xlsx, COST_CPU, streaming=True),
+    Extractor('xls', ['.xls'], extract_xls, COST_CPU, streaming=True),
+    Extractor('pptx', ['.pptx'], extract_pptx, COST_CPU, streaming=True),
+    Extractor('odt', ['.odt', '.ods'], extract_odt, COST_CPU),
+    Extractor('rtf', ['.rtf'], extract_rtf, COST_CPU),
+    Extractor('csv', ['.csv'], extract_csv, COST_CHEAP, streaming=True, version=2),
+    # Nur mit col:/json: in der Abfrage, sonst durchsucht der Text-Pfad die Rohzeilen
+    Extractor('json', ['.json'] + list(NDJSON_EXTENSIONS), extract_json, COST_CHEAP, streaming=True,
+              enabled=lambda context: bool(context.projection)),
+    # Verteilt große Zips selbst auf den Extraktions-Pool
+    Extractor('archive', sorted(ARCHIVE_EXTENSIONS), extract_archive, COST_CPU, streaming=True,
+              affinity=AFFINITY_THREAD),
+    # Zeilenbereiche großer Tabellen auf den Extraktions-Pool
+    Extractor('sqlite', SQLITE_EXTENSIONS, extract_sqlite, COST_IO, streaming=True, affinity=AFFINITY_THREAD),
+    Extractor('ocr', IMAGE_EXTENSIONS, extract_ocr, COST_CPU, affinity=AFFINITY_THREAD,
+              enabled=lambda context: context.use_ocr),
+    # Ohne Endung, nur über select_file() für Binärinhalt
+    Extractor('strings', (), extract_strings, COST_IO, streaming=True, version=2),
+    Extractor('binary', (), skip_binary, COST_CHEAP),
+)
+
+_default_registries: Dict[bool, ExtractorRegistry] = {}
+
+
+def default_registry(load_plugins: bool = True) -> ExtractorRegistry:
+    """Registry with the built-in extractors (plus entry points); one per process."""
+    registry = _default_registries.get(load_plugins)
+    if registry is None:
+        registry = ExtractorRegistry(BUILTIN_EXTRACTORS)
+        if load_plugins:
+            registry.load_entry_points()
+        _default_registries[load_plugins] = registry
+    return registry
@@ -35,9 +35,11 @@ from pathlib import Path
 from datetime import datetime
 import mimetypes
 import time
+import contextlib
 import subprocess
 import multiprocessing as mp
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import threading
 from queue import Queue
 
@@ -47,6 +49,69 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from version import VERSION, AUTHOR, EMAIL, COMPANY
 from .report_generator import HTMLReportGenerator
 from .platform_utils import PlatformUtils, get_temp_dir, open_file
+from .memory_governor import MemoryGovernor
+from .search_records import Match, FileResult, term_ids_for, clip_line, as_dict
+from .result_store import MemoryResultSink, ChainedResultSink
+from .profiler import BatchProfile, ProfileCollector
+from .text_encoding import EncodingCache, iter_candidate_lines, open_detected, default_cache_path as default_encoding_cache_path
+from .file_stats import FileStats, DURATION_BUCKETS
+from .metrics import SearchMetrics, OpenMetricsFileSink, MetricsHTTPServer
+from .daemon_client import DaemonClient, DaemonError
+from .change_tracker import ChangeTracker, default_snapshot_path
+from .dir_cache import DirectoryCache, default_cache_path
+from .pdf_pages import PdfPageCache, default_cache_path as default_pdf_cache_path
+from .archive_search import ArchiveLimits
+from .binary_detect import BINARY_MODES, shared_detector
+from .extractors import (ExtractContext, AFFINITY_PROCESS, AFFINITY_THREAD, default_registry, extract_archive, extract_csv,
+                         extract_doc, extract_docx, extract_log, extract_ocr, extract_odt, extract_pdf,
+                         extract_pptx, extract_rtf, extract_xls, extract_xlsx)
+from .query_language import compile_query, compile_terms, parse_query, QuerySyntaxError, ScopedMatcher, SCOPES
+
+# Note: performance_config is in config/, not src/
+config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
+if config_path not in sys.path:
+    sys.path.insert(0, config_path)
+from performance_config import (
+    CANCEL_CHECK_INTERVAL,
+    CANCEL_GRACE_PERIOD,
+    MAX_LINE_LENGTH,
+    MATCH_CONTEXT_CHARS,
+    ENABLE_PROFILING,
+    PROFILE_OUTPUT_FILE,
+    PROFILE_WITH_CPROFILE,
+    FILE_STATS_TOP_N,
+    METRICS_FILE,
+    METRICS_INTERVAL,
+    METRICS_HTTP_PORT,
+    USE_SEARCH_DAEMON,
+    DAEMON_STATE_FILE,
+    DAEMON_CONNECT_TIMEOUT,
+    CHANGE_TRACKER_USE_INOTIFY,
+    CHANGE_TRACKER_PERSIST,
+    USE_DIRECTORY_CACHE,
+    DIRECTORY_CACHE_VERIFY,
+    USE_REGEX_PREFILTER,
+    PDF_PAGE_CACHE,
+    PDF_PAGE_CACHE_MAX_MB,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_PAGES_PER_TASK,
+    ARCHIVE_MAX_DEPTH,
+    ARCHIVE_MAX_MEMBER_MB,
+    ARCHIVE_MAX_TOTAL_MB,
+    ARCHIVE_MAX_RATIO,
+    ARCHIVE_PARALLEL_MIN_MEMBERS,
+    ARCHIVE_MEMBERS_PER_TASK,
+    SQLITE_PARALLEL_MIN_ROWS,
+    SQLITE_ROWS_PER_TASK,
+    EXTRACT_WORKERS,
+    ENCODING_CACHE,
+    ENCODING_CACHE_MAX_ENTRIES,
+    LOAD_EXTRACTOR_PLUGINS,
+    ROUTE_CPU_EXTRACTORS,
+    ROUTE_CPU_MIN_FILES,
+    BINARY_FILES,
+    BINARY_SAMPLE_MIDDLE,
+)
 
 # Cross-platform default report directory
 DEFAULT_REPORT_DIR = get_temp_dir()
@@ -87,14 +152,121 @@ except ImportError:
         def init(*args, **kwargs):
             pass
 
+# Einstellungen, die eine Anfrage an den Such-Daemon mitnimmt (Attribut -> Typ)
+DAEMON_QUERY_FIELDS = {
+    'search_mode': str,
+    'search_query': str,
+    'match_scope': str,
+    'near_lines': int,
+    'use_regex_prefilter': bool,
+    'case_sensitive': bool,
+    'use_regex': bool,
+    'max_matches_per_file': int,
+    'files_with_matches_only': bool,
+    'max_total_results': int,
+    'max_file_size': int,
+    'use_ocr': bool,
+    'use_directory_cache': bool,
+    'directory_cache_verify': bool,
+    'use_pdf_page_cache': bool,
+    'use_encoding_cache': bool,
+    'extract_workers': int,
+    'route_cpu_extractors': bool,
+    'binary_files': str,
+    'category_code': bool, 'category_markup': bool, 'category_documents': bool,
+    'category_spreadsheets': bool, 'category_presentations': bool, 'category_data': bool,
+    'category_databases': bool, 'category_logs': bool, 'category_config': bool,
+    'category_web': bool, 'category_media': bool, 'category_archives': bool,
+    'category_fonts': bool, 'category_text': bool,
+}
+
+# Abbruch-Signal für Worker-Prozesse (wird per Pool-Initializer gesetzt)
+_worker_cancel_event = None
+# Geteilter Pool des Such-Daemons: ein Abbruch-Flag pro Anfrage, Index des laufenden Batches
+_worker_cancel_flags = None
+_worker_cancel_slot = None
+# Encoding-Cache pro Worker-Prozess (siehe _worker_encoding_cache)
+_worker_encoding_cache_instance = None
+
+
+def _init_worker_cancel_event(cancel_event, cancel_flags=None):
+    """Pool-Initializer: übernimmt das geteilte Abbruch-Signal in den Worker-Prozess."""
+    global _worker_cancel_event, _worker_cancel_flags
+    _worker_cancel_event = cancel_event
+    _worker_cancel_flags = cancel_flags
+
+
+def _worker_encoding_cache():
+    """EncodingCache des Worker-Prozesses: beim ersten Textfile geladen, beim Prozessende gespeichert.
+    
+    Jeder Prozess schreibt die Datei ganz (os.replace); überschriebene Einträge werden nur neu erkannt.
+    """
+    global _worker_encoding_cache_instance
+    if _worker_encoding_cache_instance is None:
+        _worker_encoding_cache_instance = EncodingCache(default_encoding_cache_path(), ENCODING_CACHE_MAX_ENTRIES)
+        Finalize(None, _save_worker_encoding_cache, exitpriority=10)
+    return _worker_encoding_cache_instance
+
+
+def _save_worker_encoding_cache():
+    cache = _worker_encoding_cache_instance
+    if cache is not None and cache.dirty:
+        try:
+            cache.save()
+        except OSError:
+            pass  # Cache ist nur eine Beschleunigung
+
+
+def _worker_cancelled():
+    """Prüft im Worker-Prozess, ob ein Abbruch angefordert wurde."""
+    if _worker_cancel_event is not None and _worker_cancel_event.is_set():
+        return True
+    return _worker_cancel_slot is not None and bool(_worker_cancel_flags[_worker_cancel_slot])
+
+
+def _count_lines(lines, scan):
+    """Zählt die gelesenen Zeilen für den Profiler (Datei- und Nähe-Modus)."""
+    for entry in lines:
+        scan.lines += 1
+        yield entry
+
+
+def _text_lines(plan, file_path, profiler=None, cache=None):
+    """(Zeilennummer, Zeile) einer Textdatei, einmal gelesen, mit erkanntem Encoding.
+    
+    Mit Vorfilter des Plans (QueryPlan.may_match) werden nur Blöcke dekodiert, in denen eine Zeile
+    passen kann; UTF-16/32-Dateien immer ganz (ASCII-Literale sind dort keine einzelnen Bytes).
+    """
+    if plan is not None and plan.has_buffer_test:
+        yield from iter_candidate_lines(file_path, plan.may_match, profiler, cache)
+        return
+    with open_detected(file_path, profiler, cache) as f:
+        yield from enumerate(f, 1)
+
+
+def _run_with_cancel_slot(slot, fn, *args):
+    """Führt einen Batch im geteilten Pool aus; _worker_cancelled() prüft dabei das Flag der Anfrage."""
+    global _worker_cancel_slot
+    _worker_cancel_slot = slot
+    try:
+        return fn(*args)
+    finally:
+        _worker_cancel_slot = None
+
+
 class FileSearchTool:
     def __init__(self, verbose=False):
         self.search_terms = []  # Geändert von search_term zu search_terms (Liste)
         self.search_mode = "any"  # "any" (OR) oder "all" (AND)
+        self.search_query = ""  # Abfragesprache (src/query_language.py), ersetzt search_terms/search_mode
+        self.query_plan = None  # QueryPlan der laufenden Suche
+        self.match_scope = "line"  # "line" (Begriffe in einer Zeile), "file" (in der Datei), "near" (innerhalb near_lines Zeilen)
+        self.near_lines = 5
+        self.use_regex_prefilter = USE_REGEX_PREFILTER  # Erforderliche Literale vor der Regex prüfen (src/regex_prefilter.py)
         self.case_sensitive = False
         self.use_regex = False
         self.search_path = ""
-        self.results = []
+        self.results = MemoryResultSink()  # Ergebnisse im Speicher (siehe get_result_sink)
         self.verbose = verbose  # Flag for verbose console output
         self.supported_text_extensions = {
             # Programming Languages
@@ -270,9 +442,75 @@ class FileSearchTool:
         self.progress_lock = threading.Lock()
         self.current_progress = {'files': 0, 'processed': 0, 'matches': 0}
         
-        # Stop-Flag für schnelle Unterbrechung
+        # Stop-Flag für schnelle Unterbrechung (Threads und Worker-Prozesse)
+        self._cancel_event = threading.Event()
+        self._worker_cancel_event = None  # multiprocessing.Event der laufenden Suche
         self.stop_requested = False
         
+        # Early-Termination Optionen (0 = unbegrenzt)
+        self.max_matches_per_file = 0  # Maximale Treffer pro Datei
+        self.files_with_matches_only = False  # Nur Dateien melden, Lesen beim ersten Treffer beenden
+        self.max_total_results = 0  # Maximale Anzahl Ergebnisse (Dateien + Ordner)
+        self.result_limit_reached = False
+        
+        # RAM-Überwachung (MAX_MEMORY_USAGE_PERCENT), wird pro Suche neu erstellt
+        self.memory_governor = None
+        
+        # Dauer jedes Batches (Einreichen bis Ergebnis) der letzten Suche in Sekunden
+        self.batch_latencies = []
+        
+        # Profiling (ENABLE_PROFILING): Zeiten pro Stufe, optional cProfile pro Worker
+        self.enable_profiling = ENABLE_PROFILING
+        self.profile_with_cprofile = PROFILE_WITH_CPROFILE
+        self.profile = ProfileCollector(False)  # Messwerte der letzten Suche
+        
+        # Zeit, Bytes und Dateien pro Extraktor und Dateiendung der letzten Suche
+        self.file_stats = FileStats(FILE_STATS_TOP_N)
+        
+        # Metriken (kumulativ über alle Suchen), Export über Sinks (METRICS_FILE, METRICS_HTTP_PORT)
+        self.metrics = SearchMetrics()
+        self.metrics.register_cache('ocr', self._ocr_cache_stats)
+        self.metrics_file = METRICS_FILE
+        self.metrics_interval = METRICS_INTERVAL
+        self.metrics_http_port = METRICS_HTTP_PORT
+        self._metrics_sinks_configured = False
+        
+        # Such-Daemon: als Thin Client einen laufenden Daemon nutzen; im Daemon selbst der warme Pool
+        self.use_daemon = USE_SEARCH_DAEMON
+        self.worker_pool = None  # WarmWorkerPool (src/search_daemon.py) statt eigenem Prozess-Pool
+        self.result_callback = None  # Wird mit jeder Liste neuer Ergebnisse aufgerufen (Streaming)
+        
+        # Inkrementelle Suche: nur diese Dateien durchsuchen statt search_path zu durchlaufen
+        self.only_files = None
+        self.change_trackers = {}  # search_path -> ChangeTracker (bleibt für weitere Suchen aktiv)
+        
+        # Directory Skip Cache: Auflistungen von Verzeichnissen mit unveränderter mtime wiederverwenden
+        self.use_directory_cache = USE_DIRECTORY_CACHE
+        self.directory_cache_verify = DIRECTORY_CACHE_VERIFY
+        self.directory_caches = {}  # search_path -> DirectoryCache (im Speicher für weitere Suchen)
+        self.directory_cache_stats = None  # WalkStats des letzten Durchlaufs
+        self._walk_cache = None
+        
+        # PDF: Seiten-Cache (nach Inhalt-Hash)
+        self.use_pdf_page_cache = PDF_PAGE_CACHE
+        self.pdf_page_cache = None  # PdfPageCache, beim ersten PDF geladen
+        # Textdateien: Encoding-Entscheidungen pro Datei (nach Größe/mtime)
+        self.use_encoding_cache = ENCODING_CACHE
+        self.encoding_cache = None  # EncodingCache, bei der ersten Textdatei geladen
+        # Archive: Grenzen gegen Zip-Bomben
+        self.archive_limits = ArchiveLimits(ARCHIVE_MAX_DEPTH, ARCHIVE_MAX_MEMBER_MB * 1024 * 1024,
+                                            ARCHIVE_MAX_TOTAL_MB * 1024 * 1024, ARCHIVE_MAX_RATIO)
+        # Prozesse für Seitenbereiche großer PDFs und Member großer Zip-Archive
+        self.extract_workers = EXTRACT_WORKERS  # 0 = Anzahl CPU-Kerne, 1 = nicht parallel
+        self._extract_executor = None
+        self._extract_lock = threading.Lock()
+        # Extraktoren nach Endung (eingebaute und Entry-Points); CPU-lastige im Threading-Modus an Prozesse
+        self.extractor_registry = default_registry(LOAD_EXTRACTOR_PLUGINS)
+        self.route_cpu_extractors = ROUTE_CPU_EXTRACTORS
+        # Dateien ohne Extraktor mit Binärinhalt: 'strings', 'skip' oder 'text' (Entscheidung pro Größe/mtime)
+        self.binary_files = BINARY_FILES
+        self.binary_detector = shared_detector(BINARY_SAMPLE_MIDDLE)
+        
         # Real-time status callback
         self.status_callback = None  # Callback-Funktion für GUI-Updates
         
@@ -301,6 +539,53 @@ class FileSearchTool:
         except:
             pass  # OCR not available
     
+    def _ocr_cache_stats(self):
+        """Cache-Statistik des OCR-Handlers dieses Prozesses für die Metriken."""
+        stats = getattr(self.ocr_handler, 'stats', None)
+        if not stats:
+            return None
+        return {'hits': stats.get('cache_hits', 0), 'misses': stats.get('cache_misses', 0)}
+    
+    def add_metrics_sink(self, sink):
+        """Fügt ein Ziel für den Metrik-Export hinzu (siehe src/metrics.py)."""
+        self.metrics.sinks.append(sink)
+        return sink
+    
+    def _configure_metrics_sinks(self):
+        """Legt beim ersten Suchlauf die konfigurierten Sinks an (Datei und/oder HTTP-Endpunkt)."""
+        if self._metrics_sinks_configured:
+            return
+        self._metrics_sinks_configured = True
+        if self.metrics_file:
+            self.add_metrics_sink(OpenMetricsFileSink(self.metrics_file, self.metrics_interval))
+        if self.metrics_http_port is not None:
+            try:
+                server = self.add_metrics_sink(MetricsHTTPServer(self.metrics_http_port))
+                self.print_colored(f'Metriken: {server.url}', 'info', '📈')
+            except OSError as e:
+                self.print_colored(f'Metrik-Endpunkt nicht verfügbar: {str(e)}', 'warning', '⚠️')
+    
+    def close_metrics(self):
+        """Schreibt die Metriken ein letztes Mal und beendet den HTTP-Endpunkt."""
+        self.metrics.publish(force=True)
+        self.metrics.close()
+        self._metrics_sinks_configured = False
+    
+    @property
+    def stop_requested(self):
+        """True, sobald ein Abbruch angefordert wurde."""
+        return self._cancel_event.is_set()
+    
+    @stop_requested.setter
+    def stop_requested(self, value):
+        if value:
+            self._cancel_event.set()
+            # Abbruch sofort an laufende Worker-Prozesse weiterreichen
+            if self._worker_cancel_event is not None:
+                self._worker_cancel_event.set()
+        else:
+            self._cancel_event.clear()
+    
     def _get_optimal_worker_count(self):
         """Ermittelt die optimale Anzahl von Worker-Threads/Prozessen."""
         try:
@@ -379,7 +664,8 @@ class FileSearchTool:
                    '.haml', '.slim', '.blade', '.jinja', '.jinja2', '.liquid', '.mustache', '.twig', '.freemarker',
                    '.ftl', '.velocity', '.vm'},
             'media': {'.jpg', '.jpeg', '.jpe', '.png', '.gif', '.bmp', '.webp', '.svg', '.ico', '.tiff', '.tif'},
-            'archives': {'.tar', '.gz', '.gzip', '.tgz', '.bz2', '.bzip2', '.xz', '.z'},
+            'archives': {'.zip', '.tar', '.gz', '.gzip', '.tgz', '.tbz', '.tbz2', '.txz', '.bz2', '.bzip2',
+                         '.xz', '.lzma', '.z'},
             'fonts': {'.otf', '.ttf', '.woff', '.woff2', '.eot', '.fon'},
             'text': {'.txt', '.text', '.edcx', '.properties', '.m3u', '.m3u8', '.pls', '.sub', '.srt', '.ass',
                     '.ssa', '.vtt'},
@@ -470,7 +756,8 @@ class FileSearchTool:
                        '.haml', '.slim', '.blade', '.jinja', '.jinja2', '.liquid', '.mustache', '.twig', '.freemarker',
                        '.ftl', '.velocity', '.vm'},
                 'media': {'.jpg', '.jpeg', '.jpe', '.png', '.gif', '.bmp', '.webp', '.svg', '.ico', '.tiff', '.tif'},
-                'archives': {'.tar', '.gz', '.gzip', '.tgz', '.bz2', '.bzip2', '.xz', '.z'},
+                'archives': {'.zip', '.tar', '.gz', '.gzip', '.tgz', '.tbz', '.tbz2', '.txz', '.bz2', '.bzip2',
+                             '.xz', '.lzma', '.z'},
                 'fonts': {'.otf', '.ttf', '.woff', '.woff2', '.eot', '.fon'},
                 'text': {'.txt', '.text', '.edcx', '.properties', '.m3u', '.m3u8', '.pls', '.sub', '.srt', '.ass',
                         '.ssa', '.vtt'},
@@ -534,11 +821,21 @@ class FileSearchTool:
             self.print_colored('• Einzelner Begriff: "config"', 'path', '  ')
             self.print_colored('• Mehrere Begriffe: "config, settings, database"', 'path', '  ')
             self.print_colored('• Mit Anführungszeichen: "error message", warning', 'path', '  ')
+            self.print_colored('• Abfragesprache: q: (error OR fatal) AND NOT debug ext:log size>1M', 'path', '  ')
             print()
             
             search_input = input(f"{self.colors.get('highlight', '')}🔎 Suchbegriffe eingeben: {self.colors.get('reset', '')}").strip()
             
-            if search_input:
+            if search_input[:2].lower() == 'q:':
+                try:
+                    parse_query(search_input[2:].strip())
+                except QuerySyntaxError as e:
+                    self.print_colored(f'Fehler in der Abfrage: {e}', 'error', '❌')
+                    continue
+                self.search_query = search_input[2:].strip()
+                self.print_colored(f'Abfrage erkannt: {self.search_query}', 'success', '✅')
+                break
+            elif search_input:
                 # Parse Suchbegriffe
                 self.search_terms = self.parse_search_terms(search_input)
                 if self.search_terms:
@@ -553,14 +850,18 @@ class FileSearchTool:
         
         print()
         
-        # Suchmodus konfigurieren (falls mehrere Begriffe)
-        if len(self.search_terms) > 1:
+        # Suchmodus konfigurieren (falls mehrere Begriffe; die Abfragesprache enthält ihn selbst)
+        if self.search_query:
+            pass
+        elif len(self.search_terms) > 1:
             self.print_colored('SUCHMODUS WÄHLEN', 'warning', '⚙️')
             self.print_colored('1. ANY (OR) - Findet Dateien mit EINEM der Begriffe', 'info', '🔍')
-            self.print_colored('2. ALL (AND) - Findet Dateien mit ALLEN Begriffen', 'info', '🎯')
+            self.print_colored('2. ALL (Zeile) - Findet Zeilen mit ALLEN Begriffen', 'info', '🎯')
+            self.print_colored('3. ALL (Datei) - Findet Dateien, die ALLE Begriffe enthalten', 'info', '📄')
+            self.print_colored('4. NAHE - Findet Stellen mit ALLEN Begriffen innerhalb von N Zeilen', 'info', '📏')
             
             while True:
-                mode_input = input(f"{self.colors.get('highlight', '')}Modus wählen (1 für ANY, 2 für ALL) [1]: {self.colors.get('reset', '')}").strip()
+                mode_input = input(f"{self.colors.get('highlight', '')}Modus wählen (1-4) [1]: {self.colors.get('reset', '')}").strip()
                 
                 if mode_input == "" or mode_input == "1":
                     self.search_mode = "any"
@@ -568,10 +869,21 @@ class FileSearchTool:
                     break
                 elif mode_input == "2":
                     self.search_mode = "all"
-                    self.print_colored('Modus gesetzt: ALL (AND) - Findet Dateien mit allen Begriffen', 'success', '✅')
+                    self.print_colored('Modus gesetzt: ALL (Zeile) - Alle Begriffe in derselben Zeile', 'success', '✅')
+                    break
+                elif mode_input == "3":
+                    self.search_mode, self.match_scope = "all", "file"
+                    self.print_colored('Modus gesetzt: ALL (Datei) - Alle Begriffe irgendwo in der Datei', 'success', '✅')
+                    break
+                elif mode_input == "4":
+                    self.search_mode, self.match_scope = "all", "near"
+                    near_input = input(f"{self.colors.get('highlight', '')}Maximaler Abstand in Zeilen [{self.near_lines}]: {self.colors.get('reset', '')}").strip()
+                    if near_input.isdigit():
+                        self.near_lines = int(near_input)
+                    self.print_colored(f'Modus gesetzt: NAHE - Alle Begriffe innerhalb von {self.near_lines} Zeilen', 'success', '✅')
                     break
                 else:
-                    self.print_colored('Ungültige Eingabe! Bitte 1 oder 2 wählen.', 'error', '❌')
+                    self.print_colored('Ungültige Eingabe! Bitte 1 bis 4 wählen.', 'error', '❌')
         else:
             self.search_mode = "any"  # Bei einem Begriff ist der Modus irrelevant
         
@@ -609,9 +921,13 @@ class FileSearchTool:
         self.print_colored('SUCHE WIRD GESTARTET', 'header', '🚀')
         
         # Formatiere Suchbegriffe für Anzeige
-        terms_display = ", ".join([f'"{term}"' for term in self.search_terms])
-        self.print_colored(f'Suchbegriffe: {terms_display}', 'highlight', '🎯')
-        self.print_colored(f'Suchmodus: {self.search_mode.upper()}', 'highlight', '⚙️')
+        if self.search_query:
+            self.print_colored(f'Abfrage: {self.search_query}', 'highlight', '🎯')
+        else:
+            terms_display = ", ".join([f'"{term}"' for term in self.search_terms])
+            self.print_colored(f'Suchbegriffe: {terms_display}', 'highlight', '🎯')
+            scope = {'file': ' (Datei)', 'near': f' (innerhalb {self.near_lines} Zeilen)'}.get(self.match_scope, '')
+            self.print_colored(f'Suchmodus: {self.search_mode.upper()}{scope}', 'highlight', '⚙️')
         self.print_colored(f'Suchbereich: "{self.search_path}"', 'path', '🗂️')
         if self.case_sensitive:
             self.print_colored('Groß-/Kleinschreibung wird beachtet', 'warning', '🔤')
@@ -733,379 +1049,413 @@ class FileSearchTool:
         return found_terms
 
     def extract_text_from_docx(self, file_path):
-        """Extrahiert Text aus DOCX Dateien mit Zeilennummern."""
-        lines = []
-        try:
-            from zipfile import ZipFile
-            from xml.etree import ElementTree as ET
-            
-            with ZipFile(file_path, 'r') as zip_ref:
-                xml_content = zip_ref.read('word/document.xml')
-                root = ET.fromstring(xml_content)
-                
-                # Namespace für Word
-                ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-                
-                # Sammle Absätze (Paragraphen = Zeilen)
-                for para_idx, paragraph in enumerate(root.findall('.//w:p', ns), 1):
-                    text_parts = []
-                    for text_elem in paragraph.findall('.//w:t', ns):
-                        if text_elem.text:
-                            text_parts.append(text_elem.text)
-                    
-                    if text_parts:
-                        line_text = ''.join(text_parts).strip()
-                        if line_text:
-                            lines.append((para_idx, line_text))
-        except Exception as e:
-            pass  # DOCX-Extraktion fehlgeschlagen, wird als Binärdatei behandelt
+        """Extrahiert Text aus DOCX Dateien mit Zeilennummern.
         
-        return lines
+        Generator: word/document.xml wird gestreamt (src/ooxml_stream.py), Absätze gehen direkt an den Matcher.
+        """
+        return extract_docx(file_path, self.get_extract_context())
     
     def extract_text_from_pdf(self, file_path):
-        """Extrahiert Text aus PDF Dateien mit Zeilennummern."""
-        lines = []
-        try:
-            import PyPDF2
-            
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                line_counter = 0
-                
-                for page_num, page in enumerate(reader.pages, 1):
-                    text = page.extract_text()
-                    for line in text.split('\n'):
-                        line = line.strip()
-                        if line:
-                            line_counter += 1
-                            lines.append((line_counter, line))
-        except ImportError:
-            pass  # PyPDF2 nicht installiert
-        except Exception as e:
-            pass  # PDF-Extraktion fehlgeschlagen
+        """Extrahiert Text aus PDF Dateien mit Zeilennummern.
+        
+        Generator: Seiten werden erst beim Durchsuchen extrahiert (src/pdf_pages.py), jede Zeile
+        beginnt mit ihrer Seite [Seite N]. Seitentexte kommen aus dem Seiten-Cache, große PDFs
+        werden seitenbereichsweise parallel extrahiert.
+        """
+        return extract_pdf(file_path, self.get_extract_context())
+    
+    def get_pdf_page_cache(self):
+        """PdfPageCache (persistiert unter ~/.cache/master_search), None wenn deaktiviert."""
+        if not self.use_pdf_page_cache:
+            return None
+        with self._extract_lock:
+            if self.pdf_page_cache is None:
+                self.pdf_page_cache = PdfPageCache(default_pdf_cache_path(), PDF_PAGE_CACHE_MAX_MB * 1024 * 1024)
+            return self.pdf_page_cache
+    
+    def extract_text_from_archive(self, file_path):
+        """Durchsucht Archive (zip, tar, tar.gz/bz2/xz, gz, bz2, xz) ohne Entpacken auf die Platte.
+        
+        Generator: Member werden gestreamt und nach Endung extrahiert, jede Zeile beginnt mit ihrem
+        Pfad im Archiv [archiv.tar.gz!/member.log:Zeile]. Grenzen aus archive_limits.
+        """
+        return extract_archive(file_path, self.get_extract_context())
+    
+    def get_extract_context(self):
+        """ExtractContext der Extraktoren im suchenden Prozess: Seiten-Cache, Extraktions-Pool, OCR, Grenzen.
+        
+        Cache und Pool werden erst beim ersten PDF/Archiv angelegt.
+        """
+        def on_limit(path, reason):
+            self.print_colored(f'Archiv-Grenze erreicht ({reason}): {path}', 'warning', '📦')
+        
+        return ExtractContext(self.archive_limits, self.get_pdf_page_cache, self._get_extract_executor,
+                              self.ocr_handler, self.use_ocr, on_limit,
+                              PDF_PARALLEL_MIN_PAGES, PDF_PAGES_PER_TASK,
+                              ARCHIVE_PARALLEL_MIN_MEMBERS, ARCHIVE_MEMBERS_PER_TASK, self.get_encoding_cache,
+                              self.binary_files, lambda: self.binary_detector, self._literal_condition(),
+                              SQLITE_PARALLEL_MIN_ROWS, SQLITE_ROWS_PER_TASK,
+                              self.query_plan.projection if self.query_plan is not None else ())
+    
+    def _literal_condition(self):
+        """Literale, die jede passende Zeile enthält (QueryPlan.literal_condition), z.B. als SQL für SQLite.
         
-        return lines
+        None im Datei- und Nähe-Modus: dort dürfen die Begriffe in verschiedenen Zeilen stehen.
+        """
+        if self.match_scope != 'line':
+            return None
+        plan = self.query_plan
+        if plan is None and self.search_terms:
+            plan = compile_terms(tuple(self.search_terms), self.search_mode, self.case_sensitive,
+                                 self.use_regex, self.use_regex_prefilter)
+        return plan.literal_condition if plan is not None else None
+    
+    def _get_extract_executor(self):
+        """Prozess-Pool für Seitenbereiche großer PDFs und Member großer Zips (einer pro Suche).
+        
+        None wenn extract_workers == 1.
+        """
+        workers = self.extract_workers or mp.cpu_count()
+        if workers <= 1:
+            return None
+        with self._extract_lock:
+            if self._extract_executor is None:
+                self._extract_executor = ProcessPoolExecutor(max_workers=workers)
+            return self._extract_executor
+    
+    def _finish_extraction(self):
+        """Nach der Suche: Pool der Extraktions-Prozesse beenden, geänderten Seiten-Cache speichern."""
+        with self._extract_lock:
+            executor, self._extract_executor = self._extract_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for cache in (self.pdf_page_cache, self.encoding_cache):
+            if cache is not None and cache.dirty:
+                try:
+                    cache.save()
+                except OSError:
+                    pass  # Cache ist nur eine Beschleunigung
     
     def extract_text_from_xlsx(self, file_path):
-        """Extrahiert Text aus XLSX Dateien mit Zeilennummern."""
-        lines = []
-        try:
-            from zipfile import ZipFile
-            from xml.etree import ElementTree as ET
-            
-            with ZipFile(file_path, 'r') as zip_ref:
-                xml_content = zip_ref.read('xl/worksheets/sheet1.xml')
-                root = ET.fromstring(xml_content)
-                
-                # Namespace für Excel
-                ns = {'': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-                
-                # Sammle Zeilen
-                for row_idx, row in enumerate(root.findall('.//{}row', ns), 1):
-                    cells = []
-                    for cell in row.findall('.//{}v', ns):
-                        if cell.text:
-                            cells.append(cell.text)
-                    
-                    if cells:
-                        line_text = ' | '.join(cells).strip()
-                        if line_text:
-                            lines.append((row_idx, line_text))
-        except Exception as e:
-            pass  # XLSX-Extraktion fehlgeschlagen
+        """Extrahiert Text aus XLSX Dateien mit Zeilennummern.
         
-        return lines
+        Generator: Shared Strings werden einmal gelesen, alle Tabellenblätter gestreamt;
+        jede Zeile beginnt mit ihrer Position [Blatt!Zeile].
+        """
+        return extract_xlsx(file_path, self.get_extract_context())
+    
+    def extract_text_from_xls(self, file_path):
+        """Extrahiert Text aus XLS (altes Excel-Format) Dateien mit Zeilennummern über xlrd (optional).
+        
+        Generator wie extract_text_from_xlsx: alle Blätter, Zeilen mit Position [Blatt!Zeile].
+        """
+        return extract_xls(file_path, self.get_extract_context())
     
     def extract_text_from_csv(self, file_path):
         """Extrahiert Text aus CSV Dateien mit Zeilennummern."""
-        lines = []
-        try:
-            import csv
-            
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as csvfile:
-                        reader = csv.reader(csvfile)
-                        for row_num, row in enumerate(reader, 1):
-                            line_text = ' | '.join([cell.strip() for cell in row if cell.strip()])
-                            if line_text:
-                                lines.append((row_num, line_text))
-                    return lines
-                except (UnicodeDecodeError, UnicodeError):
-                    continue
-        except Exception as e:
-            pass  # CSV-Extraktion fehlgeschlagen
-        
-        return lines
+        return extract_csv(file_path, self.get_extract_context())
     
     def extract_text_from_pptx(self, file_path):
-        """Extrahiert Text aus PPTX (PowerPoint) Dateien mit Zeilennummern."""
-        lines = []
-        try:
-            from zipfile import ZipFile
-            from xml.etree import ElementTree as ET
-            
-            with ZipFile(file_path, 'r') as zip_ref:
-                # Durchsuche alle Slides
-                slide_files = [f for f in zip_ref.namelist() if f.startswith('ppt/slides/slide') and f.endswith('.xml')]
-                line_counter = 0
-                
-                for slide_file in sorted(slide_files):
-                    xml_content = zip_ref.read(slide_file)
-                    root = ET.fromstring(xml_content)
-                    
-                    # Namespace für PowerPoint
-                    ns = {
-                        'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-                        'p': 'http://schemas.openxmlformats.org/presentationml/2006/main'
-                    }
-                    
-                    # Sammle Text-Elemente
-                    for t_elem in root.findall('.//a:t', ns):
-                        if t_elem.text and t_elem.text.strip():
-                            line_counter += 1
-                            lines.append((line_counter, t_elem.text.strip()))
-        except Exception as e:
-            pass  # PPTX-Extraktion fehlgeschlagen
-        
-        return lines
+        """Extrahiert Text aus PPTX (PowerPoint) Dateien mit Zeilennummern (Generator, streamt jede Folie)."""
+        return extract_pptx(file_path, self.get_extract_context())
     
     def extract_text_from_odt(self, file_path):
         """Extrahiert Text aus ODT (OpenDocument) Dateien mit Zeilennummern."""
-        lines = []
-        try:
-            from zipfile import ZipFile
-            from xml.etree import ElementTree as ET
-            
-            with ZipFile(file_path, 'r') as zip_ref:
-                xml_content = zip_ref.read('content.xml')
-                root = ET.fromstring(xml_content)
-                
-                # Namespace für ODF
-                ns = {
-                    'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0',
-                    'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
-                }
-                
-                # Sammle Absätze
-                line_counter = 0
-                for paragraph in root.findall('.//text:p', ns):
-                    text_parts = []
-                    for text_elem in paragraph.findall('.//text:span', ns):
-                        if text_elem.text:
-                            text_parts.append(text_elem.text)
-                    
-                    if text_parts:
-                        line_counter += 1
-                        line_text = ''.join(text_parts).strip()
-                        if line_text:
-                            lines.append((line_counter, line_text))
-        except Exception as e:
-            pass  # ODT-Extraktion fehlgeschlagen
-        
-        return lines
+        return extract_odt(file_path, self.get_extract_context())
     
     def extract_text_from_rtf(self, file_path):
         """Extrahiert Text aus RTF (Rich Text Format) Dateien mit Zeilennummern."""
-        lines = []
-        try:
-            import re
-            
-            with open(file_path, 'r', encoding='latin-1', errors='ignore') as f:
-                content = f.read()
-            
-            # Einfaches RTF-Parsing: entferne RTF-Befehle
-            # Entferne RTF-Header und Steuerzeichen
-            content = re.sub(r'\\[a-z]+\d*\s?', ' ', content)
-            content = re.sub(r'[{}]', '', content)
-            content = re.sub(r'\\\?', '', content)
-            
-            # Teile in Zeilen
-            line_counter = 0
-            for line in content.split('\n'):
-                line = line.strip()
-                if line and len(line) > 2:  # Ignoriere sehr kurze Zeilen
-                    line_counter += 1
-                    lines.append((line_counter, line))
-        except Exception as e:
-            pass  # RTF-Extraktion fehlgeschlagen
-        
-        return lines
+        return extract_rtf(file_path, self.get_extract_context())
     
     def extract_text_from_doc(self, file_path):
         """Extrahiert Text aus DOC (alte Word) Dateien mit Zeilennummern."""
-        lines = []
-        try:
-            # Versuche python-docx für moderne .doc-Dateien
-            from docx import Document
-            
-            doc = Document(file_path)
-            line_counter = 0
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    line_counter += 1
-                    lines.append((line_counter, paragraph.text.strip()))
-        except ImportError:
-            # Fallback: Versuche text-Extraktion mit Regex
-            try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-                    # Einfacher Text-Extraktion aus Binärdatei
-                    text = ''.join(chr(b) if 32 <= b < 127 else ' ' for b in content)
-                    line_counter = 0
-                    for line in text.split('\n'):
-                        line = line.strip()
-                        if line and len(line) > 5:  # Mindest-Länge
-                            line_counter += 1
-                            lines.append((line_counter, line))
-            except Exception:
-                pass
-        except Exception as e:
-            pass  # DOC-Extraktion fehlgeschlagen
-        
-        return lines
+        return extract_doc(file_path, self.get_extract_context())
     
     def extract_text_from_log(self, file_path):
         """Extrahiert Text aus LOG Dateien mit Zeilennummern (Alias für Textdatei)."""
-        lines = []
-        try:
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        for line_num, line in enumerate(f, 1):
-                            line_content = line.rstrip('\n')  # Behalte Einrückung
-                            if line_content.strip():
-                                lines.append((line_num, line_content.strip()))
-                    return lines
-                except (UnicodeDecodeError, UnicodeError):
-                    continue
-        except Exception as e:
-            pass
-        
-        return lines
+        return extract_log(file_path, self.get_extract_context())
 
-    def search_in_file(self, file_path):
-        """Durchsucht eine Datei nach den Suchbegriffen mit Zeilennummern."""
+    def search_in_file(self, file_path, max_line_length=None, profiler=None, line_matcher=None, selected=None):
+        """Durchsucht eine Datei nach den Suchbegriffen mit Zeilennummern.
+        
+        max_line_length begrenzt den gespeicherten Zeileninhalt pro Treffer (None = MAX_LINE_LENGTH).
+        profiler (StageProfiler des Batches) misst extract/read/decode/match, wenn Profiling aktiv ist.
+        line_matcher: Ergebnis von query_plan.bind() für diese Datei (sonst wird es hier ermittelt).
+        selected: Ergebnis von _select_file_extractor() (sonst wird es hier ermittelt).
+        """
+        if max_line_length is None:
+            max_line_length = MAX_LINE_LENGTH
+        if line_matcher is None and self.query_plan is not None:
+            line_matcher = self.query_plan.bind(file_path, scope=self.match_scope, near_lines=self.near_lines)
+        if line_matcher is False:
+            return []  # Dateifilter schließen die Datei aus, nicht lesen
+        if line_matcher is True:
+            return [self._properties_match()]
         matches = []
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        # Wähle Extraktor basierend auf Dateityp
-        lines_to_search = []
-        
-        if file_ext == '.docx':
-            lines_to_search = self.extract_text_from_docx(file_path)
-        elif file_ext == '.doc':
-            lines_to_search = self.extract_text_from_doc(file_path)
-        elif file_ext == '.pdf':
-            lines_to_search = self.extract_text_from_pdf(file_path)
-        elif file_ext in ['.xlsx', '.xls']:
-            lines_to_search = self.extract_text_from_xlsx(file_path)
-        elif file_ext == '.pptx':
-            lines_to_search = self.extract_text_from_pptx(file_path)
-        elif file_ext in ['.odt', '.ods']:
-            lines_to_search = self.extract_text_from_odt(file_path)
-        elif file_ext == '.rtf':
-            lines_to_search = self.extract_text_from_rtf(file_path)
-        elif file_ext == '.csv':
-            lines_to_search = self.extract_text_from_csv(file_path)
-        elif file_ext == '.log':
-            lines_to_search = self.extract_text_from_log(file_path)
-        elif self.use_ocr and file_ext in ['.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff', '.webp']:
-            # Try OCR extraction for image files
-            try:
-                if self.ocr_handler:
-                    ocr_text = self.ocr_handler.extract_text(file_path)
-                    if ocr_text and ocr_text.strip():
-                        # Split OCR text into lines
-                        for line_num, line in enumerate(ocr_text.split('\n'), 1):
-                            line_content = line.strip()
-                            if line_content:
-                                lines_to_search.append((line_num, f"[OCR] {line_content}"))
-            except Exception:
-                pass  # OCR extraction failed, skip
+        
+        # Wähle Extraktor basierend auf Dateityp und Inhalt (Binärdateien)
+        extractor_name, extractor = selected or self._select_file_extractor(file_path)
+        
+        extract_stage = profiler.stage('extract') if profiler is not None else None
+        if extract_stage is not None:
+            extract_stage.__enter__()
+        
+        if extractor is not None:
+            lines_to_search = extractor(file_path)
         else:
-            # Standard-Textdatei Behandlung
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        for line_num, line in enumerate(f, 1):
-                            line_content = line.strip()
-                            if line_content:
-                                lines_to_search.append((line_num, line_content))
-                    break  # Erfolgreich gelesen
-                except (UnicodeDecodeError, UnicodeError):
-                    continue
-                except Exception as e:
-                    break
+            # Standard-Textdatei Behandlung (Generator, damit das Lesen früh enden kann)
+            lines_to_search = self._iter_text_lines(file_path, profiler)
+            if extract_stage is not None:
+                extract_stage.count = 0  # Keine Extraktion, gemessen wird read/decode
+        
+        decoding = extractor is None
+        # Streamende Extraktoren (Generatoren) extrahieren erst während der Suche: dort gemessen
+        streaming = extractor is not None and not isinstance(lines_to_search, list)
+        if extract_stage is not None:
+            if streaming:
+                extract_stage.count = 0
+            if extract_stage.count:
+                extract_stage.nbytes = os.path.getsize(file_path)
+            extract_stage.__exit__(None, None, None)
+        
+        # Early-Termination: Treffer-Limit pro Datei
+        match_limit = self._get_match_limit()
+        terms = tuple(self.search_terms)
         
         # Durchsuche alle extrahierten Zeilen
-        for line_num, line_content in lines_to_search:
-            if self.match_text(line_content, self.search_terms, 
-                             self.search_mode, self.case_sensitive, self.use_regex):
+        scan = None
+        if profiler is not None:
+            scan = profiler.scan(decoding, 'extract' if streaming else None,
+                                 os.path.getsize(file_path) if streaming and profiler.enabled else 0)
+        if isinstance(line_matcher, ScopedMatcher):
+            return self._search_scoped(line_matcher, lines_to_search, max_line_length, match_limit, scan)
+        is_match, matching_terms = self._line_predicates(line_matcher)
+        hit_position = self.query_plan.hit_position if line_matcher is not None else None
+        perf_counter = time.perf_counter
+        for line_index, (line_num, line_content) in enumerate(lines_to_search, 1):
+            # Abbruch auch innerhalb großer Dateien berücksichtigen
+            if line_index % CANCEL_CHECK_INTERVAL == 0 and (self.stop_requested or self.result_limit_reached):
+                break
+            
+            if scan is not None:
+                scan.lines += 1
+                match_start = perf_counter()
+            
+            if is_match(line_content):
                 
                 # Finde alle passenden Begriffe für Hervorhebung
-                found_terms = self.get_matching_terms(line_content, self.search_terms,
-                                                     self.case_sensitive, self.use_regex)
+                found_terms = matching_terms(line_content)
                 
-                matches.append({
-                    'line_number': line_num,
-                    'line_content': line_content,
-                    'found_terms': found_terms
-                })
+                matches.append(Match(
+                    line_num,
+                    clip_line(line_content, found_terms, min(max_line_length, MATCH_CONTEXT_CHARS),
+                              self.case_sensitive, hit_position),
+                    term_ids_for(found_terms, terms),
+                    terms
+                ))
+                
+                if match_limit and len(matches) >= match_limit:
+                    if scan is not None:
+                        scan.match_wall += perf_counter() - match_start
+                    break  # Datei nicht weiter lesen
+            
+            if scan is not None:
+                scan.match_wall += perf_counter() - match_start
         
+        if scan is not None:
+            scan.finish()
         return matches
     
-    def process_file_batch(self, file_batch):
+    def _search_scoped(self, matcher, lines_to_search, max_line_length, match_limit, scan):
+        """Datei- oder Nähe-Modus: ein Durchlauf über die Zeilen, Abbruch sobald das Ergebnis feststeht."""
+        terms = tuple(self.search_terms)
+        if scan is not None:
+            lines_to_search = _count_lines(lines_to_search, scan)  # Kein getrenntes match_wall in diesem Modus
+        matches = []
+        for line_num, line_content, found_terms in matcher.run(
+                lines_to_search, lambda: self.stop_requested or self.result_limit_reached,
+                CANCEL_CHECK_INTERVAL, match_limit):
+            matches.append(Match(
+                line_num,
+                clip_line(line_content, found_terms, min(max_line_length, MATCH_CONTEXT_CHARS),
+                          self.case_sensitive, self.query_plan.hit_position),
+                term_ids_for(found_terms, terms),
+                terms
+            ))
+        if scan is not None:
+            scan.finish()
+        return matches
+    
+    def _prepare_query(self):
+        """Abfragesprache: search_query parsen und planen; search_terms werden die positiven Begriffe.
+        
+        Regex-Suchen und der Datei- und Nähe-Modus (match_scope) werten auch search_terms/search_mode
+        als Plan aus (Regex-Vorfilter, ein Durchlauf pro Datei).
+        QuerySyntaxError (ValueError) bei ungültiger Abfrage oder ValueError bei unbekanntem match_scope
+        oder binary_files.
+        """
+        if self.match_scope not in SCOPES:
+            raise ValueError(f"match_scope muss einer von {', '.join(SCOPES)} sein")
+        if self.binary_files not in BINARY_MODES:
+            raise ValueError(f"binary_files muss einer von {', '.join(BINARY_MODES)} sein")
+        self.query_plan = None
+        if self.search_query:
+            self.query_plan = compile_query(self.search_query, self.case_sensitive, self.use_regex,
+                                            self.use_regex_prefilter)
+            self.search_terms = list(self.query_plan.terms)
+        elif (self.use_regex or self.match_scope != 'line') and self.search_terms:
+            self.query_plan = compile_terms(tuple(self.search_terms), self.search_mode,
+                                            self.case_sensitive, self.use_regex, self.use_regex_prefilter)
+        return self.query_plan
+    
+    def _line_predicates(self, line_matcher=None):
+        """(Trifft-zu, gefundene Begriffe) für Zeilen und Namen: Abfrage-Matcher oder search_terms/search_mode."""
+        if isinstance(line_matcher, ScopedMatcher):
+            line_matcher = line_matcher.match_line  # Namen werden zeilenweise geprüft
+        if line_matcher is not None:
+            return line_matcher, self.query_plan.found_terms
+        return (lambda text: self.match_text(text, self.search_terms, self.search_mode,
+                                             self.case_sensitive, self.use_regex),
+                lambda text: self.get_matching_terms(text, self.search_terms,
+                                                     self.case_sensitive, self.use_regex))
+    
+    def _properties_match(self):
+        """Treffer für Dateien, die allein über die Dateifilter der Abfrage passen."""
+        terms = tuple(self.search_terms)
+        return Match(0, f'📄 Dateieigenschaften passen: {self.query_plan.describe_filters()}', (), terms)
+    
+    def _select_extractor(self, file_ext):
+        """Wählt den Extraktor für eine Dateiendung über extractor_registry.
+        
+        Gibt (Name, Funktion(file_path)) zurück; für normale Textdateien ('text', None).
+        """
+        context = self.get_extract_context()
+        extractor = self.extractor_registry.select(file_ext, context)
+        if extractor is None:
+            return 'text', None
+        return extractor.name, lambda file_path: extractor.extract(file_path, context)
+    
+    def _select_file_extractor(self, file_path, stat_result=None):
+        """Wie _select_extractor, prüft aber Dateien ohne Extraktor auf Binärinhalt (binary_files).
+        
+        Binärdateien bekommen den Extraktor 'strings' (druckbare Zeichenfolgen) oder 'binary' (nichts).
+        """
+        context = self.get_extract_context()
+        extractor = self.extractor_registry.select_file(file_path, context, stat_result)
+        if extractor is None:
+            return 'text', None
+        return extractor.name, lambda file_path: extractor.extract(file_path, context)
+    
+    def extract_text_with_ocr(self, file_path):
+        """Extrahiert Text aus Bilddateien per OCR mit Zeilennummern."""
+        return extract_ocr(file_path, self.get_extract_context())
+    
+    def _iter_text_lines(self, file_path, profiler=None):
+        """Liest eine Textdatei zeilenweise (Generator), einmal, mit erkanntem Encoding (src/text_encoding.py).
+        
+        Mit Regex-Vorfilter der Abfrage werden Blöcke ohne erforderliches Literal nicht dekodiert.
+        """
+        try:
+            for line_num, line in _text_lines(self.query_plan, file_path, profiler, self.get_encoding_cache()):
+                line_content = line.strip()
+                if line_content:
+                    yield (line_num, line_content)
+        except Exception:
+            return
+    
+    def get_encoding_cache(self):
+        """EncodingCache (persistiert unter ~/.cache/master_search), None wenn deaktiviert."""
+        if not self.use_encoding_cache:
+            return None
+        with self._extract_lock:
+            if self.encoding_cache is None:
+                self.encoding_cache = EncodingCache(default_encoding_cache_path(), ENCODING_CACHE_MAX_ENTRIES)
+            return self.encoding_cache
+    
+    def _get_match_limit(self):
+        """Gibt das Treffer-Limit pro Datei zurück (0 = unbegrenzt)."""
+        if self.files_with_matches_only:
+            return 1
+        return max(0, self.max_matches_per_file or 0)
+    
+    def _is_result_limit_reached(self, result_count):
+        """Prüft, ob max_total_results erreicht wurde."""
+        return bool(self.max_total_results) and result_count >= self.max_total_results
+    
+    def process_file_batch(self, file_batch, max_line_length=None):
         """Verarbeitet einen Batch von Dateien - für Multiprocessing optimiert."""
         batch_results = []
-        
-        for file_info in file_batch:
-            file_path, file_name = file_info
-            
-            try:
-                # Überspringe sehr große Dateien
-                file_size = os.path.getsize(file_path)
-                if file_size > self.max_file_size:
-                    continue
-                
-                matches = []
-                
-                # Prüfe Dateiname mit Multi-Term-Unterstützung
-                if self.match_text(file_name, self.search_terms, self.search_mode, 
-                                 self.case_sensitive, self.use_regex):
-                    found_terms = self.get_matching_terms(file_name, self.search_terms,
-                                                        self.case_sensitive, self.use_regex)
-                    terms_text = ", ".join(found_terms)
-                    matches.append({
-                        'line_number': 0, 
-                        'line_content': f'📄 Dateiname enthält: {terms_text}',
-                        'found_terms': found_terms
-                    })
+        terms = tuple(self.search_terms)
+        batch_profile = BatchProfile(self.profile.enabled, self.profile_with_cprofile)
+        profiler = batch_profile.profiler
+        file_stats = FileStats(FILE_STATS_TOP_N)
+        
+        with batch_profile:
+            for file_info in file_batch:
+                # Ergebnis-Limit erreicht: restliche Dateien des Batches überspringen
+                if self.result_limit_reached or self.stop_requested:
+                    break
                 
-                # Prüfe Dateiinhalt (nur bei Textdateien)
-                if self.is_text_file(file_path):
-                    content_matches = self.search_in_file(file_path)
-                    matches.extend(content_matches)
+                file_path, file_name = file_info
                 
-                # Wenn Treffer gefunden, zu Batch-Ergebnissen hinzufügen
-                if matches:
-                    batch_results.append({
-                        'type': 'file',
-                        'path': file_path,
-                        'name': file_name,
-                        'matches': matches
-                    })
+                try:
+                    # Überspringe sehr große Dateien
+                    with profiler.stage('filter'):
+                        stat_result = os.stat(file_path)
+                        file_size = stat_result.st_size
+                    if file_size > self.max_file_size:
+                        continue
                     
-            except Exception as e:
-                continue  # Ignoriere fehlerhafte Dateien
+                    # Abfragesprache: Dateifilter vor jedem Lesen auswerten
+                    line_matcher = None
+                    if self.query_plan is not None:
+                        with profiler.stage('filter', count=0):
+                            line_matcher = self.query_plan.bind(file_path, file_name, stat_result,
+                                                                self.match_scope, self.near_lines)
+                        if line_matcher is False:
+                            continue
+                        if line_matcher is True:
+                            batch_results.append(FileResult.from_path('file', file_path,
+                                                                      [self._properties_match()], terms))
+                            continue
+                    is_match, matching_terms = self._line_predicates(line_matcher)
+                    
+                    matches = []
+                    
+                    # Prüfe Dateiname mit Multi-Term-Unterstützung
+                    with profiler.stage('match', count=0):
+                        if is_match(file_name):
+                            found_terms = matching_terms(file_name)
+                            terms_text = ", ".join(found_terms)
+                            matches.append(Match(0, f'📄 Dateiname enthält: {terms_text}',
+                                                 term_ids_for(found_terms, terms), terms))
+                    
+                    # Prüfe Dateiinhalt (nur bei Textdateien)
+                    if matches and self.files_with_matches_only:
+                        pass  # Dateiname reicht als Treffer, Inhalt nicht lesen
+                    else:
+                        with profiler.stage('filter', count=0):
+                            is_text = self.is_text_file(file_path)
+                        if is_text:
+                            search_start = time.perf_counter()
+                            with profiler.stage('filter', count=0):
+                                selected = self._select_file_extractor(file_path, stat_result)
+                            content_matches = self.search_in_file(file_path, max_line_length, profiler, line_matcher,
+                                                                  selected)
+                            file_stats.record(file_path, selected[0], time.perf_counter() - search_start, file_size)
+                            matches.extend(content_matches)
+                            match_limit = self._get_match_limit()
+                            if match_limit:
+                                del matches[match_limit:]
+                    
+                    # Wenn Treffer gefunden, zu Batch-Ergebnissen hinzufügen
+                    if matches:
+                        batch_results.append(FileResult.from_path('file', file_path, matches, terms))
+                        
+                except Exception as e:
+                    continue  # Ignoriere fehlerhafte Dateien
         
-        return batch_results
+        return batch_profile.result(batch_results, file_stats.to_dict())
     
     def update_progress(self, processed_files, total_files, matches_found):
         """Thread-sichere Fortschritts-Updates."""
@@ -1132,60 +1482,447 @@ class FileSearchTool:
                     self.print_colored(f'Treffer gefunden: {matches_found}', 'success', '🎯')
                     print()
     
-    def search_files_and_folders(self):
-        """Durchsucht alle Dateien und Ordner nach dem Suchwort - Optimierte Version."""
-        start_time = time.time()
+    def _run_batches(self, executor, submit_batch, file_batches, file_results, total_files, folders_found, error_label):
+        """Reicht Batches ein, sammelt ihre Ergebnisse und reagiert auf Stop, Ergebnis-Limit und RAM-Druck.
+        
+        Es werden nur so viele Batches gleichzeitig eingereicht, wie der Memory-Governor erlaubt.
+        Gibt die Anzahl verarbeiteter Dateien zurück.
+        """
+        governor = self.memory_governor
+        terms = tuple(self.search_terms)
+        processed_files = 0
+        batch_iter = iter(file_batches)
+        future_to_batch = {}
+        submit_times = {}
+        pending = set()
+        
+        def files_found():
+            # Ordner liegen in self.results oder, nach dem Auslagern, im Spill-Sink: nie doppelt zählen
+            return len(self.results) + governor.spilled_count + len(file_results) - folders_found
+        
+        def submit_more():
+            while len(pending) < governor.max_in_flight(self.max_workers):
+                batch = next(batch_iter, None)
+                if batch is None:
+                    return
+                future = submit_batch(batch, governor.max_line_length)
+                future_to_batch[future] = batch
+                submit_times[future] = time.perf_counter()
+                pending.add(future)
+        
+        submit_more()
+        while pending:
+            # Kurzes Timeout, damit ein Stop nicht auf den nächsten fertigen Batch warten muss
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                batch = future_to_batch.pop(future)
+                if future.cancelled():
+                    continue
+                latency = time.perf_counter() - submit_times.pop(future)
+                self.batch_latencies.append(latency)
+                try:
+                    batch_results = future.result()
+                    handling_wall = time.perf_counter()
+                    handling_cpu = time.thread_time()
+                    for result in batch_results:
+                        result.bind_terms(terms)  # Eine gemeinsame Begriffs-Tupel-Instanz
+                    file_results.extend(batch_results)
+                    self._emit_results(batch_results)
+                    processed_files += len(batch)
+                    self.profile.receive(batch_results, time.perf_counter() - handling_wall,
+                                         time.thread_time() - handling_cpu)
+                    self.file_stats.merge(getattr(batch_results, 'file_stats', None))
+                    self.metrics.batch_received(batch_results, latency, DURATION_BUCKETS)
+                    
+                    self.update_progress(processed_files, total_files, files_found())
+                    
+                except Exception as e:
+                    self.print_colored(f'{error_label}: {str(e)}', 'error', '❌')
+            
+            # WICHTIG: Prüfe auf Stop-Flag zwischen Batches
+            if self.stop_requested:
+                self.print_colored('Batch-Verarbeitung abgebrochen!', 'warning', '⏹️')
+                self._cancel_pending_futures(executor, pending)
+                # Teilergebnisse laufender Batches für den Teilbericht einsammeln
+                running = {future for future in pending if not future.cancelled()}
+                done, _ = wait(running, timeout=CANCEL_GRACE_PERIOD)
+                for future in done:
+                    if future.exception() is None:
+                        batch_results = future.result()
+                        for result in batch_results:
+                            result.bind_terms(terms)  # Wie bei fertigen Batches
+                        file_results.extend(batch_results)
+                        self._emit_results(batch_results)
+                        processed_files += len(future_to_batch[future])
+                        self.profile.receive(batch_results)
+                        self.file_stats.merge(getattr(batch_results, 'file_stats', None))
+                        self.metrics.batch_received(batch_results, time.perf_counter() - submit_times[future],
+                                                    DURATION_BUCKETS)
+                break
+            
+            # Early-Termination: Ergebnis-Limit erreicht
+            if self._is_result_limit_reached(folders_found + files_found()):
+                self._handle_result_limit(executor, pending)
+                break
+            
+            # RAM-Überwachung: bei Druck Ergebnisse auslagern und weniger Batches einreichen
+            if governor.check(processed_files):
+                if governor.under_pressure and file_results:
+                    with self.results_lock:
+                        # Bisherige Ergebnisse (Ordner) zuerst auslagern, damit die Reihenfolge erhalten bleibt
+                        governor.spill(self.results)
+                        self.results.clear()
+                    governor.spill(file_results)
+                    file_results.clear()
+                self.send_status_update(governor.get_status())
+            
+            submit_more()
         
-        self.print_colored('HOCHPERFORMANCE-DURCHSUCHUNG GESTARTET', 'header', '🚀')
-        self.print_colored(f'Verwende {self.max_workers} Worker-Threads/Prozesse', 'info', '⚡')
-        if PSUTIL_AVAILABLE:
-            ram_gb = psutil.virtual_memory().total / (1024**3)
-            self.print_colored(f'System: {mp.cpu_count()} CPU-Kerne, {ram_gb:.1f}GB RAM', 'info', '�')
-        self.print_colored('Sammle Dateien...', 'info', '📊')
-        print()
+        return processed_files
+    
+    def _emit_results(self, results):
+        """Reicht neue Ergebnisse an result_callback weiter (z.B. NDJSON-Stream des Daemons)."""
+        if self.result_callback is not None and results:
+            self.result_callback(results)
+    
+    def get_result_count(self):
+        """Anzahl aller Ergebnisse inklusive ausgelagerter Ergebnisse."""
+        spilled = self.memory_governor.spilled_count if self.memory_governor else 0
+        return spilled + len(self.results)
+    
+    def get_result_sink(self):
+        """Alle Ergebnisse als Result-Sink: ausgelagerte (auf Disk) gefolgt von denen im Speicher.
+        
+        Kann beliebig oft iteriert werden, ohne die ausgelagerten Ergebnisse in den Speicher zu laden.
+        """
+        spill_sink = self.memory_governor.spill_sink if self.memory_governor else None
+        if spill_sink is None:
+            return self.results
+        return ChainedResultSink(spill_sink, self.results)
+    
+    def iter_results(self):
+        """Liefert alle Ergebnisse in Suchreihenfolge, inklusive der bei RAM-Druck ausgelagerten."""
+        return iter(self.get_result_sink())
+    
+    def _cancel_pending_futures(self, executor, futures):
+        """Storniert noch nicht gestartete Batches und signalisiert laufenden Workern den Abbruch."""
+        if self._worker_cancel_event is not None:
+            self._worker_cancel_event.set()
+        for pending in futures:
+            pending.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _shutdown_process_pool(self, executor, timeout=None):
+        """Beendet den Prozess-Pool in begrenzter Zeit; hängende Worker werden terminiert."""
+        if timeout is None:
+            timeout = CANCEL_GRACE_PERIOD
+        
+        cancelled = self.stop_requested or self.result_limit_reached
+        # Prozess-Handles vor dem Shutdown sichern (shutdown() leert die Liste)
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=not cancelled, cancel_futures=cancelled)
+        if not cancelled:
+            return
         
-        # Schritt 1: Sammle alle Dateien und Ordner (schnell, single-threaded)
+        deadline = time.time() + timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.time()))
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+    
+    def _handle_result_limit(self, executor, futures):
+        """Beendet die Verarbeitung, sobald max_total_results erreicht ist."""
+        self.result_limit_reached = True
+        self.print_colored(f'Ergebnis-Limit erreicht ({self.max_total_results}) - Suche wird beendet', 'warning', '🛑')
+        self._cancel_pending_futures(executor, futures)
+        self.send_status_update({
+            'type': 'limit_reached',
+            'limit': self.max_total_results
+        })
+    
+    def collect_files_and_folders(self):
+        """Sammelt alle Dateien unter search_path und die Ordner, deren Name passt.
+        
+        Gibt (all_files, all_folders) zurück: all_files als Liste von (Pfad, Dateiname),
+        all_folders als Liste von Ordner-Ergebnissen.
+        """
         all_files = []
         all_folders = []
+        plan = self.query_plan
+        # Abfragesprache: Dateifilter (Name, Pfad, Endung, Größe, Datum) schon beim Durchlauf anwenden
+        file_filter = plan.bind if plan is not None and plan.filters else None
+        
+        if self.only_files is not None:
+            # Inkrementelle Suche: kein Verzeichnisdurchlauf, Ordnernamen wurden schon früher geprüft
+            all_files = [(path, os.path.basename(path)) for path in sorted(self.only_files)
+                         if file_filter is None or file_filter(path) is not False]
+            return all_files, all_folders
         
-        for root, dirs, files in os.walk(self.search_path):
+        for root, dirs, files in self._walk():
             # WICHTIG: Prüfe auf Stop-Flag bei jeder Iteration
             if self.stop_requested:
                 self.print_colored('Dateisammlung abgebrochen!', 'warning', '⏹️')
                 break
             
             # Sammle Ordner mit Multi-Term-Unterstützung
+            search_terms = tuple(self.search_terms)
             for dir_name in dirs:
-                if self.match_text(dir_name, self.search_terms, self.search_mode, 
-                                 self.case_sensitive, self.use_regex):
-                    dir_path = os.path.join(root, dir_name)
-                    found_terms = self.get_matching_terms(dir_name, self.search_terms,
-                                                        self.case_sensitive, self.use_regex)
+                if self._is_result_limit_reached(len(all_folders)):
+                    break
+                if plan is not None:
+                    folder_matches = plan.match_folder(root, dir_name)
+                else:
+                    folder_matches = self.match_text(dir_name, self.search_terms, self.search_mode,
+                                                     self.case_sensitive, self.use_regex)
+                if folder_matches:
+                    if plan is not None:
+                        found_terms = plan.found_terms(dir_name)
+                    else:
+                        found_terms = self.get_matching_terms(dir_name, self.search_terms,
+                                                              self.case_sensitive, self.use_regex)
                     terms_text = ", ".join(found_terms)
-                    all_folders.append({
-                        'type': 'folder',
-                        'path': dir_path,
-                        'name': dir_name,
-                        'matches': [{
-                            'line_number': 0, 
-                            'line_content': f'📁 Ordnername enthält: {terms_text}',
-                            'found_terms': found_terms
-                        }]
-                    })
+                    all_folders.append(FileResult('folder', root, dir_name, [
+                        Match(0, f'📁 Ordnername enthält: {terms_text}',
+                              term_ids_for(found_terms, search_terms), search_terms)
+                    ], search_terms))
+            
+            # Ergebnis-Limit bereits durch Ordner-Treffer erreicht
+            if self._is_result_limit_reached(len(all_folders)):
+                break
             
             # Sammle Dateien mit Pfad-Info
             for file_name in files:
                 file_path = os.path.join(root, file_name)
+                if file_filter is not None and file_filter(file_path, file_name) is False:
+                    continue
                 all_files.append((file_path, file_name))
         
+        self._report_directory_cache()
+        return all_files, all_folders
+    
+    def _walk(self):
+        """os.walk über search_path, mit Directory Skip Cache falls aktiviert."""
+        self._walk_cache = self.directory_cache_stats = None
+        if not self.use_directory_cache:
+            return os.walk(self.search_path)
+        cache = self._walk_cache = self.get_directory_cache()
+        cache.verify = self.directory_cache_verify
+        return cache.walk()
+    
+    def get_directory_cache(self, path=None):
+        """DirectoryCache für path (Standard: search_path); wird pro Pfad wiederverwendet."""
+        root = os.path.abspath(path or self.search_path)
+        cache = self.directory_caches.get(root)
+        if cache is None:
+            cache = self.directory_caches[root] = DirectoryCache(root, default_cache_path(root))
+        return cache
+    
+    def _report_directory_cache(self):
+        """Statistik des Directory Skip Cache ausgeben (Verify-Modus: Abweichungen)."""
+        if self._walk_cache is None:
+            return
+        stats = self.directory_cache_stats = self._walk_cache.stats
+        if stats.disabled and not stats.verify:
+            self.print_colored(f'Verzeichnis-Cache deaktiviert ({stats.disabled})', 'warning', '📂')
+        else:
+            self.print_colored(f'Verzeichnis-Cache: {stats.dirs_reused:,} Verzeichnisse wiederverwendet, '
+                               f'{stats.dirs_listed:,} gelesen', 'info', '📂')
+        if stats.verify:
+            color = 'warning' if stats.divergences else 'success'
+            self.print_colored(f'Verzeichnis-Cache verifiziert: {stats.divergences} Abweichungen', color, '🔎')
+            for directory in stats.divergent_dirs:
+                self.print_colored(f'  {directory}', 'path', '🔸')
+        self.send_status_update({'type': 'directory_cache', **stats.summary()})
+    
+    def get_change_tracker(self, path=None):
+        """ChangeTracker für path (Standard: search_path); wird pro Pfad wiederverwendet."""
+        root = os.path.abspath(path or self.search_path)
+        tracker = self.change_trackers.get(root)
+        if tracker is None:
+            snapshot_path = default_snapshot_path(root) if CHANGE_TRACKER_PERSIST else None
+            tracker = self.change_trackers[root] = ChangeTracker(root, snapshot_path, CHANGE_TRACKER_USE_INOTIFY)
+        return tracker
+    
+    def search_changed_files(self, tracker=None):
+        """Inkrementelle Suche: durchsucht nur die seit dem letzten Abgleich geänderten Dateien.
+        
+        Beim ersten Aufruf (noch kein Snapshot) gelten alle Dateien als neu. Veraltete
+        OCR-Cache-Einträge geänderter und gelöschter Dateien werden sofort entfernt.
+        Gibt das ChangeSet zurück (gelöschte Dateien: changes.deleted).
+        """
+        tracker = tracker or self.get_change_tracker()
+        changes = tracker.refresh()
+        summary = changes.summary()
+        self.print_colored(f"Änderungen ({summary['backend']}): {summary['added']} neu, "
+                           f"{summary['modified']} geändert, {summary['deleted']} gelöscht "
+                           f"in {summary['elapsed_s']:.2f} Sekunden", 'info', '🔄')
+        if self.ocr_handler is not None and (changes.modified or changes.deleted):
+            self.ocr_handler.invalidate(changes.modified | changes.deleted)
+        self.send_status_update({'type': 'changes', **summary})
+        
+        self.only_files = changes.changed
+        try:
+            self.search_files_and_folders()
+        finally:
+            self.only_files = None
+        return changes
+    
+    def to_daemon_query(self):
+        """Aktuelle Sucheinstellungen als JSON-Anfrage für den Such-Daemon."""
+        query = {'path': os.path.abspath(self.search_path), 'terms': list(self.search_terms)}
+        for name in DAEMON_QUERY_FIELDS:
+            query[name] = getattr(self, name)
+        return query
+    
+    def apply_daemon_query(self, query):
+        """Übernimmt eine Anfrage des Such-Daemons (siehe to_daemon_query); ValueError bei ungültigen Werten."""
+        path = query.get('path')
+        terms = query.get('terms')
+        if not isinstance(path, str) or not os.path.isdir(path):
+            raise ValueError(f'Verzeichnis nicht gefunden: {path!r}')
+        if not isinstance(terms, list) or not all(isinstance(t, str) and t for t in terms) \
+                or not (terms or query.get('search_query')):
+            raise ValueError('terms muss eine nicht-leere Liste von Suchbegriffen sein')
+        for name, value in query.items():
+            if name in ('path', 'terms'):
+                continue
+            expected = DAEMON_QUERY_FIELDS.get(name)
+            if expected is None:
+                raise ValueError(f'Unbekannte Einstellung: {name}')
+            if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                raise ValueError(f'{name} muss vom Typ {expected.__name__} sein')
+        if query.get('search_mode', 'any') not in ('any', 'all'):
+            raise ValueError("search_mode muss 'any' oder 'all' sein")
+        if query.get('match_scope', 'line') not in SCOPES:
+            raise ValueError(f"match_scope muss einer von {', '.join(SCOPES)} sein")
+        if query.get('binary_files', BINARY_MODES[0]) not in BINARY_MODES:
+            raise ValueError(f"binary_files muss einer von {', '.join(BINARY_MODES)} sein")
+        if query.get('near_lines', 0) < 0:
+            raise ValueError('near_lines darf nicht negativ sein')
+        if query.get('search_query'):
+            parse_query(query['search_query'])  # QuerySyntaxError ist ein ValueError
+        self.search_path = path
+        self.search_terms = list(terms)
+        for name, value in query.items():
+            if name in DAEMON_QUERY_FIELDS:
+                setattr(self, name, value)
+    
+    def _search_via_daemon(self, client):
+        """Führt die Suche über einen laufenden Such-Daemon aus (Thin Client).
+        
+        Ergebnisse, Status-Updates und Datei-Statistiken werden übernommen, als hätte
+        diese Instanz selbst gesucht. Gibt False zurück, wenn der Daemon nicht erreichbar
+        war, bevor die Suche begann (dann wird lokal gesucht).
+        """
+        start_time = time.time()
+        terms = tuple(self.search_terms)
+        query_id = None
+        finished = threading.Event()
+        
+        def cancel_on_stop():
+            # Stop auch dann weiterreichen, wenn gerade keine Ereignisse eintreffen
+            while not finished.wait(0.2):
+                if self.stop_requested and query_id is not None:
+                    client.cancel(query_id)
+                    return
+        
+        events = client.search(self.to_daemon_query())
+        watcher = threading.Thread(target=cancel_on_stop, daemon=True)
+        try:
+            for event in events:
+                event_type = event.get('type')
+                if event_type == 'started':
+                    query_id = event['id']
+                    if not watcher.is_alive():
+                        watcher.start()
+                    self.print_colored(f'Suche läuft im Such-Daemon (Anfrage {query_id})', 'info', '🛰️')
+                elif event_type == 'result':
+                    with self.results_lock:
+                        self.results.append(FileResult.from_dict(event['result'], terms))
+                elif event_type == 'done':
+                    self.file_stats.merge(event.get('file_stats'))
+                    self.result_limit_reached = bool(event.get('limit_reached'))
+                elif event_type == 'error':
+                    self.print_colored(f'Such-Daemon: {event.get("message")}', 'error', '❌')
+                elif event_type == 'queued':
+                    self.print_colored('Such-Daemon ausgelastet - Anfrage wartet', 'warning', '⏳')
+                else:
+                    if event_type == 'progress':
+                        self.print_progress_bar(event.get('processed', 0), event.get('total', 0) or 1, emoji='⚡')
+                    self.send_status_update(event)
+        except (OSError, ValueError, DaemonError) as e:
+            if query_id is None:
+                self.print_colored(f'Such-Daemon nicht erreichbar ({e}) - suche lokal', 'warning', '⚠️')
+                return False
+            self.print_colored(f'Verbindung zum Such-Daemon unterbrochen: {e}', 'error', '❌')
+        finally:
+            finished.set()
+            events.close()
+        
+        print()
+        self.print_colored(f'Suche über Such-Daemon abgeschlossen: {self.get_result_count()} Treffer '
+                           f'in {time.time() - start_time:.2f} Sekunden', 'success', '🎯')
+        self.print_file_stats()
+        return True
+    
+    def search_files_and_folders(self):
+        """Durchsucht alle Dateien und Ordner nach dem Suchwort - Optimierte Version."""
+        start_time = time.time()
+        self._prepare_query()  # Ungültige Abfrage: QuerySyntaxError vor jeder Arbeit
+        self.result_limit_reached = False
+        self.batch_latencies = []
+        self.profile = ProfileCollector(self.enable_profiling)
+        self.file_stats = FileStats(FILE_STATS_TOP_N)
+        
+        # Memory-Governor für diese Suche (alte Spill-Datei entfernen)
+        if self.memory_governor is not None:
+            self.memory_governor.close()
+        self.memory_governor = MemoryGovernor()
+        
+        # Läuft ein Such-Daemon, sucht er mit warmem Pool und Caches (GUI/CLI werden zum Thin Client)
+        if self.use_daemon and self.worker_pool is None and self.only_files is None:
+            client = DaemonClient.discover(DAEMON_STATE_FILE, DAEMON_CONNECT_TIMEOUT)
+            if client is not None and self._search_via_daemon(client):
+                return
+        
+        self._configure_metrics_sinks()
+        self.metrics.search_started(self.max_workers)
+        try:
+            self._search_files_and_folders(start_time)
+        finally:
+            self._finish_extraction()
+            self.metrics.search_finished(time.time() - start_time,
+                                         self.profile.profiler.rows() if self.profile.enabled else ())
+    
+    def _search_files_and_folders(self, start_time):
+        """Ablauf der Suche (Walk, parallele Dateiverarbeitung, Abschluss-Statistiken)."""
+        self.print_colored('HOCHPERFORMANCE-DURCHSUCHUNG GESTARTET', 'header', '🚀')
+        self.print_colored(f'Verwende {self.max_workers} Worker-Threads/Prozesse', 'info', '⚡')
+        if self.search_query:
+            self.print_colored(f'Abfrage (Auswertungsreihenfolge): {self.query_plan.root!r}', 'info', '🧮')
+        if PSUTIL_AVAILABLE:
+            ram_gb = psutil.virtual_memory().total / (1024**3)
+            self.print_colored(f'System: {mp.cpu_count()} CPU-Kerne, {ram_gb:.1f}GB RAM', 'info', '�')
+        self.print_colored('Sammle Dateien...', 'info', '📊')
+        print()
+        
+        # Schritt 1: Sammle alle Dateien und Ordner (schnell, single-threaded)
+        with self.profile.profiler.stage('walk') as walk_stage:
+            all_files, all_folders = self.collect_files_and_folders()
+            walk_stage.count = len(all_files)
+        
         total_files = len(all_files)
         folders_found = len(all_folders)
+        self.metrics.walk_finished(total_files, folders_found)
         
         self.print_colored(f'Gefunden: {total_files:,} Dateien, {len(all_folders)} passende Ordner', 'success', '📁')
-        
+
         # Füge Ordner-Treffer zu Ergebnissen hinzu
         with self.results_lock:
             self.results.extend(all_folders)
+        self._emit_results(all_folders)
         
         # WICHTIG: Prüfe ob Stop angefordert wurde
         if self.stop_requested:
@@ -1207,65 +1944,117 @@ class FileSearchTool:
         
         processed_files = 0
         file_results = []
+        self.result_limit_reached = self._is_result_limit_reached(folders_found)
         
         # Verwende ProcessPoolExecutor für CPU-intensive Aufgaben
-        if self.use_multiprocessing and len(file_batches) > 1:
+        if self.use_multiprocessing and len(file_batches) > 1 and not self.result_limit_reached:
             self.print_colored(f'Multiprocessing: {len(file_batches)} Batches mit je ~{self.chunk_size} Dateien', 'info', '🔄')
             
+            executor = None
+            thread_executor = None
             try:
-                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                    # Erstelle Worker-Prozesse
-                    filtered_extensions = self.get_filtered_extensions()
-                    future_to_batch = {
-                        executor.submit(self.process_file_batch_static, batch, self.search_terms, 
-                                      self.search_mode, self.case_sensitive, self.use_regex,
-                                      filtered_extensions, self.max_file_size): batch
-                        for batch in file_batches
-                    }
-                    
-                    # Sammle Ergebnisse
-                    for future in as_completed(future_to_batch):
-                        # WICHTIG: Prüfe auf Stop-Flag zwischen Batches
-                        if self.stop_requested:
-                            self.print_colored('Batch-Verarbeitung abgebrochen!', 'warning', '⏹️')
-                            executor.shutdown(wait=False)
-                            break
+                if self.worker_pool is not None:
+                    # Warmer Pool des Daemons: eigene Spur mit fairer Verteilung und eigenem Abbruch-Flag
+                    executor = self.worker_pool.lane()
+                    self._worker_cancel_event = executor.cancel_event
+                else:
+                    # Geteiltes Abbruch-Signal, das Worker zwischen Dateien und alle N Zeilen prüfen
+                    self._worker_cancel_event = mp.Event()
+                    executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                   initializer=_init_worker_cancel_event,
+                                                   initargs=(self._worker_cancel_event,))
+                if self.stop_requested:
+                    self._worker_cancel_event.set()
+                
+                # Erstelle Worker-Prozesse
+                filtered_extensions = self.get_filtered_extensions()
+                
+                # PDF, Archive, SQLite und OCR in Threads dieses Prozesses (Caches, Extraktions-Pool, OCR)
+                process_files, thread_files = self._split_thread_affinity(all_files)
+                thread_batches = [thread_files[i:i + self.chunk_size]
+                                  for i in range(0, len(thread_files), self.chunk_size)]
+                thread_batch_ids = {id(batch) for batch in thread_batches}
+                if thread_batches:
+                    thread_executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers,
+                                                                                len(thread_batches))))
+                    self.print_colored(f'PDF/Archive/SQLite/OCR: {len(thread_files)} Dateien in Threads', 'info', '🧵')
+                
+                def submit_batch(batch, max_line_length):
+                    if id(batch) in thread_batch_ids:
+                        return thread_executor.submit(self.process_file_batch, batch, max_line_length)
+                    return self._submit_static_batch(executor, batch, max_line_length, filtered_extensions)
+                
+                # Sammle Ergebnisse (Thread-Batches zuerst: sie laufen neben den Prozess-Batches weiter)
+                process_batches = [process_files[i:i + self.chunk_size]
+                                   for i in range(0, len(process_files), self.chunk_size)]
+                processed_files = self._run_batches(executor, submit_batch, thread_batches + process_batches,
+                                                    file_results, total_files, folders_found, 'Batch-Fehler')
                         
-                        try:
-                            batch_results = future.result()
-                            file_results.extend(batch_results)
-                            processed_files += len(future_to_batch[future])
-                            
-                            self.update_progress(processed_files, total_files, len(file_results))
-                            
-                        except Exception as e:
-                            self.print_colored(f'Batch-Fehler: {str(e)}', 'error', '❌')
-                            
             except Exception as e:
                 self.print_colored(f'Multiprocessing fehlgeschlagen: {str(e)}', 'error', '❌')
                 self.print_colored('Fallback zu Threading...', 'warning', '🔄')
                 self.use_multiprocessing = False
+            finally:
+                if thread_executor is not None:
+                    thread_executor.shutdown(wait=not (self.stop_requested or self.result_limit_reached),
+                                             cancel_futures=True)
+                if executor is not None:
+                    self._shutdown_process_pool(executor)
+                self._worker_cancel_event = None
         
         # Fallback zu Threading falls Multiprocessing fehlschlägt
-        if not self.use_multiprocessing or len(file_batches) == 1:
+        if (not self.use_multiprocessing or len(file_batches) == 1) and not self.result_limit_reached \
+                and not self.stop_requested:
+            # CPU-lastige Formate (Extraktor mit affinity 'process') an einen Prozess-Pool
+            process_files, thread_files = self._split_by_affinity(all_files)
+            process_executor = None
+            process_batches = []
+            if process_files:
+                try:
+                    self._worker_cancel_event = mp.Event()
+                    process_executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                           initializer=_init_worker_cancel_event,
+                                                           initargs=(self._worker_cancel_event,))
+                    # Kleine Batches, damit sich wenige teure Dateien auf alle Prozesse verteilen
+                    process_chunk = max(1, min(self.chunk_size, -(-len(process_files) // self.max_workers)))
+                    process_batches = [process_files[i:i + process_chunk]
+                                       for i in range(0, len(process_files), process_chunk)]
+                    file_batches = [thread_files[i:i + self.chunk_size]
+                                    for i in range(0, len(thread_files), self.chunk_size)]
+                    self.print_colored(f'CPU-lastige Formate: {len(process_files)} Dateien in '
+                                       f'{len(process_batches)} Batches an {self.max_workers} Prozesse', 'info', '🔄')
+                except Exception as e:
+                    self.print_colored(f'Prozess-Pool für CPU-lastige Formate fehlgeschlagen: {str(e)}', 'warning', '⚠️')
+                    process_executor = None
+                    self._worker_cancel_event = None
+            process_batch_ids = {id(batch) for batch in process_batches}
+            filtered_extensions = self.get_filtered_extensions() if process_batches else None
+            
             self.print_colored(f'Threading: {min(self.max_workers, len(file_batches))} Threads', 'info', '🧵')
             
-            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(file_batches))) as executor:
-                future_to_batch = {
-                    executor.submit(self.process_file_batch, batch): batch
-                    for batch in file_batches
-                }
+            executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(file_batches))))
+            try:
+                def submit_batch(batch, max_line_length):
+                    if id(batch) in process_batch_ids:
+                        return self._submit_static_batch(process_executor, batch, max_line_length,
+                                                         filtered_extensions)
+                    return executor.submit(self.process_file_batch, batch, max_line_length)
                 
-                for future in as_completed(future_to_batch):
-                    try:
-                        batch_results = future.result()
-                        file_results.extend(batch_results)
-                        processed_files += len(future_to_batch[future])
-                        
-                        self.update_progress(processed_files, total_files, len(file_results))
-                        
-                    except Exception as e:
-                        self.print_colored(f'Thread-Fehler: {str(e)}', 'error', '❌')
+                # Prozess-Batches zuerst: sie laufen neben den Thread-Batches weiter
+                processed_files = self._run_batches(executor, submit_batch, process_batches + file_batches,
+                                                    file_results, total_files, folders_found, 'Thread-Fehler')
+            finally:
+                # Laufende Threads beenden sich selbst über stop_requested/result_limit_reached
+                executor.shutdown(wait=not (self.stop_requested or self.result_limit_reached),
+                                  cancel_futures=True)
+                if process_executor is not None:
+                    self._shutdown_process_pool(process_executor)
+                    self._worker_cancel_event = None
+        
+        # Ergebnisse auf max_total_results begrenzen (ausgelagerte Ergebnisse enthalten ggf. die Ordner)
+        spilled_count = self.memory_governor.spilled_count
+        if self.max_total_results:
+            del file_results[max(0, self.max_total_results - len(self.results) - spilled_count):]
         
         # Füge Datei-Ergebnisse zu Hauptergebnissen hinzu
         with self.results_lock:
@@ -1273,7 +2062,7 @@ class FileSearchTool:
         
         # Abschluss-Statistiken
         elapsed_time = time.time() - start_time
-        files_found = len(file_results)
+        files_found = spilled_count + len(self.results) - folders_found
         
         print(f"\n{self.colors.get('reset', '')}")
         self.print_separator('═', 80, 'success')
@@ -1286,7 +2075,7 @@ class FileSearchTool:
         self.print_colored(f'Gesamt durchsucht: {total_files:,} Dateien', 'number', '📁')
         self.print_colored(f'Ordner-Treffer: {folders_found}', 'success', '📁')
         self.print_colored(f'Datei-Treffer: {files_found}', 'success', '📄')
-        self.print_colored(f'Gesamt-Treffer: {len(self.results)}', 'highlight', '🎯')
+        self.print_colored(f'Gesamt-Treffer: {self.get_result_count()}', 'highlight', '🎯')
         self.print_colored(f'Verarbeitungszeit: {elapsed_time:.2f} Sekunden', 'info', '⏱️')
         
         if elapsed_time > 0:
@@ -1294,27 +2083,126 @@ class FileSearchTool:
             self.print_colored(f'Geschwindigkeit: {files_per_sec:.0f} Dateien/Sekunde', 'info', '⚡')
             
         self.print_colored(f'Worker verwendet: {self.max_workers} ({mp.cpu_count()} CPU-Kerne)', 'info', '🔧')
+        self.print_file_stats()
         
         if PSUTIL_AVAILABLE:
             cpu_percent = psutil.cpu_percent(interval=1)
             memory_percent = psutil.virtual_memory().percent
             self.print_colored(f'System-Auslastung: CPU {cpu_percent:.1f}%, RAM {memory_percent:.1f}%', 'info', '💻')
         
+        if spilled_count:
+            self.print_colored(f'RAM-Limit erreicht: {spilled_count:,} Ergebnisse ausgelagert nach {self.memory_governor.spill_path}', 'warning', '💾')
+        
+        # Profiling: Zeiten pro Stufe (auch ohne verbose, da explizit aktiviert)
+        if self.profile.enabled:
+            print()
+            print(f"{self.colors.get('header', '')}⏱️ PERFORMANCE-PROFIL (pro Stufe, über alle Worker){self.colors.get('reset', '')}")
+            print(self.profile.profiler.format_table())
+            profile_path = self.write_profile()
+            print(f"Profil gespeichert: {profile_path}")
+        
         # Sende finale Status-Update an GUI
         self.send_status_update({
             'type': 'complete',
             'total': total_files,
-            'matches': len(self.results),
+            'matches': self.get_result_count(),
             'elapsed_time': elapsed_time,
-            'speed': (total_files / elapsed_time) if elapsed_time > 0 else 0
+            'speed': (total_files / elapsed_time) if elapsed_time > 0 else 0,
+            'file_stats': self.file_stats.summary()
         })
         
         print()
     
+    def _submit_static_batch(self, executor, batch, max_line_length, filtered_extensions):
+        """Reicht einen Batch für process_file_batch_static mit den Einstellungen dieser Suche ein."""
+        return executor.submit(self.process_file_batch_static, batch, self.search_terms, 
+                               self.search_mode, self.case_sensitive, self.use_regex,
+                               filtered_extensions, self.max_file_size,
+                               self.max_matches_per_file, self.files_with_matches_only,
+                               max_line_length, self.profile.enabled, self.profile_with_cprofile,
+                               self.search_query, self.match_scope, self.near_lines,
+                               self.use_regex_prefilter, self.archive_limits, self.binary_files,
+                               self.use_encoding_cache)
+    
+    def _split_by_affinity(self, all_files):
+        """Teilt die Dateien für den Threading-Modus: (für Worker-Prozesse, für Threads).
+        
+        Dateien, deren Extraktor affinity 'process' hat, gehen an Prozesse, sobald es mindestens
+        ROUTE_CPU_MIN_FILES sind und mehr als ein Worker erlaubt ist; sonst bleibt alles bei den Threads.
+        """
+        if not self.route_cpu_extractors or self.max_workers <= 1 or self.worker_pool is not None:
+            return [], all_files
+        process_files, thread_files = self._partition_by_affinity(all_files, AFFINITY_PROCESS)
+        if len(process_files) < ROUTE_CPU_MIN_FILES:
+            return [], all_files
+        return process_files, thread_files
+    
+    def _split_thread_affinity(self, all_files):
+        """Teilt die Dateien für den Multiprocessing-Modus: (für Worker-Prozesse, für Threads).
+        
+        Dateien, deren Extraktor affinity 'thread' hat (PDF, Archive, SQLite, OCR), bleiben im suchenden
+        Prozess: nur dort gibt es Seiten-Cache, Extraktions-Pool für Seiten/Member/rowid-Bereiche und
+        den OCR-Handler (im Daemon die warmen).
+        """
+        thread_files, process_files = self._partition_by_affinity(all_files, AFFINITY_THREAD)
+        return process_files, thread_files
+    
+    def _partition_by_affinity(self, all_files, affinity):
+        """(Dateien, deren Extraktor diese affinity hat, alle anderen) in der Reihenfolge von all_files."""
+        context = self.get_extract_context()
+        selected, others = [], []
+        for file_info in all_files:
+            extractor = self.extractor_registry.select(os.path.splitext(file_info[1])[1], context)
+            if extractor is not None and extractor.affinity == affinity:
+                selected.append(file_info)
+            else:
+                others.append(file_info)
+        return selected, others
+    
     @staticmethod
-    def process_file_batch_static(file_batch, search_terms, search_mode, case_sensitive, use_regex, supported_extensions, max_file_size):
-        """Statische Methode für Multiprocessing - Multi-Term-Version."""
+    def process_file_batch_static(file_batch, search_terms, search_mode, case_sensitive, use_regex, supported_extensions, max_file_size,
+                                  max_matches_per_file=0, files_with_matches_only=False, max_line_length=MAX_LINE_LENGTH,
+                                  profile=False, use_cprofile=False, search_query='', match_scope='line', near_lines=5,
+                                  use_regex_prefilter=True, archive_limits=None, binary_files=BINARY_FILES,
+                                  use_encoding_cache=False):
+        """Statische Methode für Multiprocessing - Multi-Term-Version.
+        
+        search_query: Abfragesprache statt search_terms/search_mode (wird pro Prozess einmal geplant).
+        match_scope/near_lines: Geltungsbereich der Begriffe wie FileSearchTool.match_scope.
+        use_regex_prefilter: erforderliche Literale vor der Regex prüfen (wie FileSearchTool._prepare_query).
+        archive_limits: Grenzen für Archive (Member werden im Worker gestreamt, Archive verteilen sich so
+        auf die Prozesse).
+        binary_files: Umgang mit Binärinhalt in Dateien ohne Extraktor ('strings', 'skip', 'text'),
+        entschieden vom Detektor dieses Worker-Prozesses.
+        use_encoding_cache: Encoding-Cache des Worker-Prozesses für Textdateien (_worker_encoding_cache).
+        Dokumente, PDFs, Tabellen und Archive gehen wie im Thread-Pfad an ihren Extraktor aus
+        default_registry() (eingebaute Extraktoren und Entry-Points, einmal pro Prozess geladen).
+        Ohne Seiten-Cache, Extraktions-Pool und OCR-Handler: Dateien mit affinity 'thread' schickt
+        die Suche deshalb nicht hierher (siehe _split_thread_affinity).
+        """
         batch_results = []
+        registry = default_registry(LOAD_EXTRACTOR_PLUGINS)
+        if search_query:
+            plan = compile_query(search_query, case_sensitive, use_regex, use_regex_prefilter)
+        elif (use_regex or match_scope != 'line') and search_terms:
+            plan = compile_terms(tuple(search_terms), search_mode, case_sensitive, use_regex, use_regex_prefilter)
+        else:
+            plan = None
+        # Literale der Suche für Extraktoren wie SQLite (auch ohne Plan aus search_terms)
+        literal_plan = plan
+        if literal_plan is None and search_terms:
+            literal_plan = compile_terms(tuple(search_terms), search_mode, case_sensitive, use_regex,
+                                         use_regex_prefilter)
+        encoding_cache = _worker_encoding_cache() if use_encoding_cache else None
+        extract_context = ExtractContext(
+            archive_limits, encoding_cache=lambda: encoding_cache, binary_files=binary_files, binary_detector=lambda: shared_detector(BINARY_SAMPLE_MIDDLE),
+            literal_condition=literal_plan.literal_condition if literal_plan is not None and match_scope == 'line'
+            else None, projection=plan.projection if plan is not None else ())
+        batch_profile = BatchProfile(profile, use_cprofile)
+        profiler = batch_profile.profiler
+        file_stats = FileStats(FILE_STATS_TOP_N)
+        match_limit = 1 if files_with_matches_only else max(0, max_matches_per_file or 0)
+        terms = tuple(search_terms)
         
         def match_text_static(text, search_terms, mode, case_sensitive, use_regex):
             """Statische Version der match_text Methode."""
@@ -1397,71 +2285,191 @@ class FileSearchTool:
                     return False
             return False
         
-        def search_in_file_static(file_path, search_terms, search_mode, case_sensitive, use_regex):
+        if plan is not None:
+            matching_terms = plan.found_terms
+            hit_position = plan.hit_position
+        else:
+            hit_position = None  # Ohne Plan nur Literale: clip_line sucht sie selbst
+            def matching_terms(text):
+                return get_matching_terms_static(text, search_terms, case_sensitive, use_regex)
+            
+            def default_match(text):
+                return match_text_static(text, search_terms, search_mode, case_sensitive, use_regex)
+        
+        def match_lines(numbered_lines, is_match, scan, matches):
+            """Prüft (Zeilennummer, Zeile)-Paare und hängt Treffer an matches an."""
+            if isinstance(is_match, ScopedMatcher):
+                stripped = ((line_num, line.strip()) for line_num, line in numbered_lines)
+                if scan is not None:
+                    stripped = _count_lines(stripped, scan)
+                for line_num, line_content, found_terms in is_match.run(
+                        stripped, _worker_cancelled, CANCEL_CHECK_INTERVAL, match_limit):
+                    matches.append(Match(
+                        line_num,
+                        clip_line(line_content, found_terms, min(max_line_length, MATCH_CONTEXT_CHARS),
+                                  case_sensitive, plan.hit_position),
+                        term_ids_for(found_terms, terms)
+                    ))
+                return matches
+            perf_counter = time.perf_counter
+            for line_index, (line_num, line) in enumerate(numbered_lines, 1):
+                # Abbruch-Signal auch innerhalb großer Dateien prüfen
+                if line_index % CANCEL_CHECK_INTERVAL == 0 and _worker_cancelled():
+                    return matches
+                
+                line_content = line.strip()
+                if scan is not None:
+                    scan.lines += 1
+                    match_start = perf_counter()
+                
+                if is_match(line_content):
+                    found_terms = matching_terms(line_content)
+                    matches.append(Match(
+                        line_num,
+                        clip_line(line_content, found_terms, min(max_line_length, MATCH_CONTEXT_CHARS),
+                                  case_sensitive, hit_position),
+                        term_ids_for(found_terms, terms)
+                    ))
+                    if match_limit and len(matches) >= match_limit:
+                        return matches  # Datei nicht weiter lesen
+                
+                if scan is not None:
+                    scan.match_wall += perf_counter() - match_start
+            return matches
+        
+        def search_in_file_static(file_path, is_match, extractor):
             """Statische Multi-Term-Version der search_in_file Methode."""
             matches = []
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings:
+            if extractor is not None:
+                # Extraktoren aus extractor_registry (ohne Seiten-Cache, Extraktions-Pool und OCR)
+                streaming = extractor.streaming
+                scan = None
                 try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        for line_num, line in enumerate(f, 1):
-                            line_content = line.strip()
-                            
-                            if match_text_static(line_content, search_terms, search_mode, case_sensitive, use_regex):
-                                found_terms = get_matching_terms_static(line_content, search_terms, case_sensitive, use_regex)
-                                matches.append({
-                                    'line_number': line_num,
-                                    'line_content': line_content,
-                                    'found_terms': found_terms
-                                })
-                    break
-                except (UnicodeDecodeError, UnicodeError):
-                    continue
+                    with profiler.stage('extract') as extract_stage:
+                        lines = extractor.extract(file_path, extract_context)
+                        if streaming:
+                            extract_stage.count = 0  # Extraktion läuft während der Suche
+                        elif profiler.enabled:
+                            extract_stage.nbytes = os.path.getsize(file_path)
+                    scan = profiler.scan(False, 'extract' if streaming else None,
+                                         os.path.getsize(file_path) if streaming and profiler.enabled else 0)
+                    return match_lines(lines, is_match, scan, matches)
                 except Exception:
+                    return matches
+                finally:
+                    if scan is not None:
+                        scan.finish()
+            scan = profiler.scan(True)
+            
+            try:
+                # Einmal lesen, Encoding erkannt, Blöcke ohne erforderliches Literal nicht dekodieren
+                return match_lines(_text_lines(plan, file_path, profiler, encoding_cache), is_match, scan, matches)
+            except Exception:
+                return matches
+            finally:
+                if scan is not None:
+                    scan.finish()
+        
+        with batch_profile:
+            for file_info in file_batch:
+                # Abbruch: bisherige Teilergebnisse des Batches zurückgeben
+                if _worker_cancelled():
                     break
             
-            return matches
-        
-        for file_info in file_batch:
-            file_path, file_name = file_info
+                file_path, file_name = file_info
             
-            try:
-                # Überspringe sehr große Dateien
-                file_size = os.path.getsize(file_path)
-                if file_size > max_file_size:
-                    continue
+                try:
+                    # Überspringe sehr große Dateien
+                    with profiler.stage('filter'):
+                        stat_result = os.stat(file_path)
+                        file_size = stat_result.st_size
+                    if file_size > max_file_size:
+                        continue
+                    
+                    # Abfragesprache: Dateifilter vor jedem Lesen auswerten
+                    is_match = default_match if plan is None else None
+                    if plan is not None:
+                        with profiler.stage('filter', count=0):
+                            is_match = plan.bind(file_path, file_name, stat_result, match_scope, near_lines)
+                        if is_match is False:
+                            continue
+                        if is_match is True:
+                            batch_results.append(FileResult.from_path('file', file_path, [
+                                Match(0, f'📄 Dateieigenschaften passen: {plan.describe_filters()}', ())
+                            ], terms))
+                            continue
                 
-                matches = []
+                    matches = []
                 
-                # Prüfe Dateiname mit Multi-Term-Unterstützung
-                if match_text_static(file_name, search_terms, search_mode, case_sensitive, use_regex):
-                    found_terms = get_matching_terms_static(file_name, search_terms, case_sensitive, use_regex)
-                    terms_text = ", ".join(found_terms)
-                    matches.append({
-                        'line_number': 0, 
-                        'line_content': f'📄 Dateiname enthält: {terms_text}',
-                        'found_terms': found_terms
-                    })
+                    # Prüfe Dateiname mit Multi-Term-Unterstützung
+                    name_match = is_match.match_line if isinstance(is_match, ScopedMatcher) else is_match
+                    with profiler.stage('match', count=0):
+                        if name_match(file_name):
+                            found_terms = matching_terms(file_name)
+                            terms_text = ", ".join(found_terms)
+                            matches.append(Match(0, f'📄 Dateiname enthält: {terms_text}',
+                                                 term_ids_for(found_terms, terms)))
                 
-                # Prüfe Dateiinhalt (nur bei Textdateien)
-                if is_text_file_static(file_path):
-                    content_matches = search_in_file_static(file_path, search_terms, search_mode, case_sensitive, use_regex)
-                    matches.extend(content_matches)
+                    # Prüfe Dateiinhalt (nur bei Textdateien)
+                    if matches and files_with_matches_only:
+                        pass  # Dateiname reicht als Treffer, Inhalt nicht lesen
+                    else:
+                        with profiler.stage('filter', count=0):
+                            is_text = is_text_file_static(file_path)
+                        if is_text:
+                            search_start = time.perf_counter()
+                            with profiler.stage('filter', count=0):
+                                extractor = registry.select_file(file_path, extract_context, stat_result)
+                            content_matches = search_in_file_static(file_path, is_match, extractor)
+                            file_stats.record(file_path, extractor.name if extractor is not None else 'text',
+                                              time.perf_counter() - search_start, file_size)
+                            matches.extend(content_matches)
+                            if match_limit:
+                                del matches[match_limit:]
                 
-                # Wenn Treffer gefunden, zu Batch-Ergebnissen hinzufügen
-                if matches:
-                    batch_results.append({
-                        'type': 'file',
-                        'path': file_path,
-                        'name': file_name,
-                        'matches': matches
-                    })
+                    # Wenn Treffer gefunden, zu Batch-Ergebnissen hinzufügen
+                    if matches:
+                        batch_results.append(FileResult.from_path('file', file_path, matches, terms))
                     
-            except Exception:
-                continue  # Ignoriere fehlerhafte Dateien
+                except Exception:
+                    continue  # Ignoriere fehlerhafte Dateien
         
-        return batch_results
+        return batch_profile.result(batch_results, file_stats.to_dict())
+    
+    def print_file_stats(self):
+        """Gibt Zeit und Durchsatz pro Extraktor, pro Dateiendung und die langsamsten Dateien aus."""
+        if not self.file_stats:
+            return
+        summary = self.file_stats.summary()
+        print()
+        self.print_colored('ZEIT PRO EXTRAKTOR:', 'header', '🧩')
+        for row in summary['extractors']:
+            self.print_colored(f"{row['extractor']:8s} {row['files']:7,d} Dateien ({row['files_percent']:5.1f}%)  "
+                               f"{row['seconds']:8.2f}s ({row['time_percent']:5.1f}%)  "
+                               f"{row['bytes'] / (1024 * 1024):9.1f} MB", 'info', '  ')
+        self.print_colored('ZEIT PRO DATEIENDUNG:', 'header', '📑')
+        for row in summary['extensions']:
+            self.print_colored(f"{row['extension']:8s} {row['files']:7,d} Dateien ({row['files_percent']:5.1f}%)  "
+                               f"{row['seconds']:8.2f}s ({row['time_percent']:5.1f}%)", 'info', '  ')
+        if summary['slowest_files']:
+            self.print_colored(f"LANGSAMSTE DATEIEN (Top {len(summary['slowest_files'])}):", 'header', '🐢')
+            for entry in summary['slowest_files']:
+                self.print_colored(f"{entry['seconds']:8.3f}s  [{entry['extractor']}]  {entry['path']}", 'path', '  ')
+    
+    def get_file_stats_summary(self):
+        """Statistik pro Extraktor/Dateiendung der letzten Suche (None, wenn keine Datei durchsucht wurde)."""
+        return self.file_stats.summary() if self.file_stats else None
+    
+    def get_profile_summary(self):
+        """Zeilen der Profiling-Tabelle der letzten Suche (None, wenn Profiling aus ist)."""
+        return self.profile.profiler.rows() if self.profile.enabled else None
+    
+    def write_profile(self):
+        """Schreibt Stufen-Tabelle und zusammengeführte cProfile-Daten nach PROFILE_OUTPUT_FILE."""
+        path = PROFILE_OUTPUT_FILE
+        if not os.path.isabs(path):
+            path = os.path.join(str(DEFAULT_REPORT_DIR), path)
+        return self.profile.write(path)
     
     def generate_html_report(self):
         """Erstellt eine HTML-Datei mit den Suchergebnissen."""
@@ -1476,10 +2484,17 @@ class FileSearchTool:
                 search_path=self.search_path,
                 case_sensitive=self.case_sensitive,
                 use_regex=self.use_regex,
-                output_dir=str(DEFAULT_REPORT_DIR)
+                output_dir=str(DEFAULT_REPORT_DIR),
+                profile_summary=self.get_profile_summary(),
+                file_stats=self.get_file_stats_summary()
             )
             
-            html_file = generator.generate(self.results, auto_open=False)
+            with self.profile.profiler.stage('report') as report_stage:
+                html_file = generator.generate(self.get_result_sink(), auto_open=False)
+                if html_file:
+                    report_stage.nbytes = os.path.getsize(html_file)
+            if self.profile.enabled:
+                self.write_profile()  # Jetzt inklusive Report-Stufe
             
             if html_file:
                 file_size = os.path.getsize(html_file) / 1024  # KB
@@ -1490,7 +2505,7 @@ class FileSearchTool:
                 self.print_colored(f'Datei: {os.path.basename(html_file)}', 'highlight', '📄')
                 self.print_colored(f'Pfad: {os.path.abspath(html_file)}', 'path', '📁')
                 self.print_colored(f'Größe: {file_size:.1f} KB', 'number', '💾')
-                self.print_colored(f'Inhalt: {len(self.results)} Suchergebnisse', 'number', '📊')
+                self.print_colored(f'Inhalt: {self.get_result_count()} Suchergebnisse', 'number', '📊')
                 
                 return html_file
             else:
@@ -1529,11 +2544,11 @@ class FileSearchTool:
                 self.print_separator('═', 80, 'success')
                 
                 # Finale Statistiken
-                folders = len([r for r in self.results if r['type'] == 'folder'])
-                files = len([r for r in self.results if r['type'] == 'file'])
+                folders = sum(1 for r in self.get_result_sink() if r['type'] == 'folder')
+                files = self.get_result_count() - folders
                 
                 self.print_colored('FINALE ERGEBNISSE:', 'header', '🏆')
-                self.print_colored(f'Gesamte Treffer: {len(self.results)}', 'highlight', '🎯')
+                self.print_colored(f'Gesamte Treffer: {self.get_result_count()}', 'highlight', '🎯')
                 self.print_colored(f'Ordner gefunden: {folders}', 'success', '📁')
                 self.print_colored(f'Dateien gefunden: {files}', 'success', '📄')
                 self.print_colored(f'HTML-Bericht: {html_file}', 'info', '📋')
@@ -1562,6 +2577,10 @@ class FileSearchTool:
             print(f"\n{self.colors.get('error', '')}❌ UNERWARTETER FEHLER{self.colors.get('reset', '')}")
             self.print_colored(f'Fehlermeldung: {str(e)}', 'error', '🚨')
             self.print_colored('Bitte versuchen Sie es erneut oder kontaktieren Sie den Support.', 'warning', '⚠️')
+        finally:
+            # Bericht ist geschrieben: Spill-Datei des Memory-Governors entfernen
+            if self.memory_governor is not None:
+                self.memory_governor.close()
 
 def main():
     """Hauptfunktion des Programms."""
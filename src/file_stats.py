@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - File Throughput Statistics
+===========================================
+Time, bytes and file counts per extractor and per file extension.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Every content search of a file is recorded with its extractor ('pdf',
+'docx', 'xlsx', 'ocr', 'text', ...), extension, duration and size. Each
+batch collects its own FileStats, which is sent back with the batch result
+and merged in the main process. summary() feeds the status callback, the
+CLI summary and the HTML report; the per-extractor duration histograms
+(DURATION_BUCKETS) feed the metrics export.
+"""
+
+import bisect
+import heapq
+import os
+from typing import Any, Dict, List, Optional
+
+# Felder pro Gruppe: Dateien, Sekunden, Bytes
+_FILES, _SECONDS, _BYTES = range(3)
+
+# Obere Grenzen (Sekunden) der Dauer-Histogramme pro Extraktor; letzter Zähler = +Inf
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class FileStats:
+    """Aggregates per-file search timings."""
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.extractors: Dict[str, List[float]] = {}
+        self.extensions: Dict[str, List[float]] = {}
+        self.durations: Dict[str, List[int]] = {}  # Extraktor -> Zähler pro Bucket (nicht kumuliert)
+        self.slowest: List[tuple] = []  # Min-Heap (Sekunden, Pfad, Extraktor, Bytes)
+
+    @staticmethod
+    def _add(groups: Dict[str, List[float]], key: str, files: int, seconds: float, nbytes: int):
+        values = groups.get(key)
+        if values is None:
+            values = groups[key] = [0, 0.0, 0]
+        values[_FILES] += files
+        values[_SECONDS] += seconds
+        values[_BYTES] += nbytes
+
+    def _push_slow(self, entry: tuple):
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def record(self, path: str, extractor: str, seconds: float, nbytes: int):
+        """Record the content search of one file."""
+        extension = os.path.splitext(path)[1].lower() or '(ohne)'
+        self._add(self.extractors, extractor, 1, seconds, nbytes)
+        self._add(self.extensions, extension, 1, seconds, nbytes)
+        buckets = self.durations.get(extractor)
+        if buckets is None:
+            buckets = self.durations[extractor] = [0] * (len(DURATION_BUCKETS) + 1)
+        buckets[bisect.bisect_left(DURATION_BUCKETS, seconds)] += 1
+        if self.top_n:
+            self._push_slow((seconds, path, extractor, nbytes))
+
+    def __bool__(self) -> bool:
+        return bool(self.extractors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, picklable copy (for the transfer from worker processes)."""
+        return {'extractors': self.extractors, 'extensions': self.extensions, 'durations': self.durations,
+                'slowest': self.slowest}
+
+    def merge(self, data: Optional[Dict[str, Any]]):
+        """Merge the statistics of a batch (see to_dict)."""
+        if not data:
+            return
+        for key, (files, seconds, nbytes) in data['extractors'].items():
+            self._add(self.extractors, key, files, seconds, nbytes)
+        for key, (files, seconds, nbytes) in data['extensions'].items():
+            self._add(self.extensions, key, files, seconds, nbytes)
+        for key, counts in data.get('durations', {}).items():
+            buckets = self.durations.setdefault(key, [0] * (len(DURATION_BUCKETS) + 1))
+            for index, count in enumerate(counts):
+                buckets[index] += count
+        for entry in data['slowest']:
+            self._push_slow(tuple(entry))
+
+    @staticmethod
+    def _rows(groups: Dict[str, List[float]], key_name: str, total_files: int, total_seconds: float,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        ordered = sorted(groups.items(), key=lambda item: -item[1][_SECONDS])
+        rows = []
+        for key, (files, seconds, nbytes) in ordered[:limit]:
+            rows.append({
+                key_name: key,
+                'files': int(files),
+                'seconds': round(seconds, 4),
+                'bytes': int(nbytes),
+                'files_percent': round(files / total_files * 100, 1) if total_files else 0.0,
+                'time_percent': round(seconds / total_seconds * 100, 1) if total_seconds else 0.0,
+                'mb_per_s': round(nbytes / seconds / (1024 * 1024), 2) if seconds > 0 else None,
+            })
+        return rows
+
+    def summary(self, extension_limit: int = 15) -> Dict[str, Any]:
+        """Summary for status callback, CLI and HTML report (sorted by time, descending)."""
+        total_files = sum(values[_FILES] for values in self.extractors.values())
+        total_seconds = sum(values[_SECONDS] for values in self.extractors.values())
+        return {
+            'files': int(total_files),
+            'seconds': round(total_seconds, 4),
+            'extractors': self._rows(self.extractors, 'extractor', total_files, total_seconds),
+            'extensions': self._rows(self.extensions, 'extension', total_files, total_seconds, extension_limit),
+            'slowest_files': [
+                {'path': path, 'extractor': extractor, 'seconds': round(seconds, 4), 'bytes': int(nbytes)}
+                for seconds, path, extractor, nbytes in sorted(self.slowest, reverse=True)
+            ],
+        }
@@ -34,6 +34,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from .file_search_tool import FileSearchTool, DEFAULT_REPORT_DIR
 from .report_generator import HTMLReportGenerator
+from .result_store import DiskResultSink, MemoryResultSink
 # Note: performance_config is in config/, not src/
 # Import it via sys.path manipulation
 import sys
@@ -443,6 +444,7 @@ class MasterSearchGUI:
         mode_frame.grid(row=0, column=1, sticky="w")
 
         ttk.Radiobutton(mode_frame, text=i18n.tr("mode_and"), variable=self.search_mode, value="AND").pack(side="left", padx=5)
+        ttk.Radiobutton(mode_frame, text=i18n.tr("mode_and_file"), variable=self.search_mode, value="AND_FILE").pack(side="left", padx=5)
         ttk.Radiobutton(mode_frame, text=i18n.tr("mode_or"), variable=self.search_mode, value="OR").pack(side="left", padx=5)
 
         check_frame = ttk.Frame(options_frame)
@@ -814,7 +816,14 @@ class MasterSearchGUI:
             self.current_search_tool = search_tool  # Store reference for stop propagation
             search_tool.search_path = search_params["directory"]
             search_tool.search_terms = search_params["terms"]
-            search_tool.search_mode = search_params["mode"].lower() 
+            # "AND": alle Begriffe in einer Zeile, "AND_FILE": alle Begriffe irgendwo in der Datei
+            if search_params["mode"].upper() == "AND":
+                search_tool.search_mode = "all"
+            elif search_params["mode"].upper() == "AND_FILE":
+                search_tool.search_mode = "all"
+                search_tool.match_scope = "file"
+            else:
+                search_tool.search_mode = "any"
             search_tool.case_sensitive = search_params.get("case_sensitive", False)
             search_tool.use_regex = search_params.get("regex", False)
             search_tool.max_workers = search_params["max_workers"]
@@ -846,63 +855,73 @@ class MasterSearchGUI:
             
             # Run search with stop flag checking
             search_tool.search_files_and_folders()
-            results = search_tool.results
+            # Enthält auch Ergebnisse, die bei RAM-Druck ausgelagert wurden
+            all_results = search_tool.get_result_sink()
+            # Wurde ausgelagert, bleibt auch die gefilterte Liste auf der Platte
+            governor = search_tool.memory_governor
+            if governor is not None and governor.spill_sink is not None:
+                results = DiskResultSink()
+            else:
+                results = MemoryResultSink()
             
-            # Filter results by selected file categories
-            excluded_count = 0
-            if results:
-                before_filter = len(results)
-                filtered_results = []
-                for result in results:
-                    if self.is_file_in_selected_categories(result.get('path', '')):
-                        # Mark if any match contains OCR text
-                        is_ocr_match = any('[OCR]' in str(m.get('line_content', '')) for m in result.get('matches', []))
-                        result['is_ocr_match'] = is_ocr_match
+            # Temp-Dateien eines DiskResultSink auch bei Fehlern und Abbruch entfernen
+            with results:
+                # Filter results by selected file categories
+                excluded_count = 0
+                if all_results:
+                    before_filter = len(all_results)
+                    filtered_matches = 0
+                    for result in all_results:
+                        if self.is_file_in_selected_categories(result.get('path', '')):
+                            # Mark if any match contains OCR text
+                            is_ocr_match = any('[OCR]' in str(m.get('line_content', '')) for m in result.get('matches', []))
+                            result['is_ocr_match'] = is_ocr_match
                         
-                        # Add file category
-                        file_category = search_tool.get_file_category(result.get('path', ''))
-                        result['category'] = file_category
+                            # Add file category
+                            file_category = search_tool.get_file_category(result.get('path', ''))
+                            result['category'] = file_category
                         
-                        filtered_results.append(result)
+                            filtered_matches += len(result.get('matches', []))
+                            results.append(result)
                 
-                results = filtered_results
-                after_filter = len(results)
-                excluded_count = before_filter - after_filter
-                if excluded_count > 0:
-                    self.log(f"📁 Filtered by categories: {before_filter} → {after_filter} results")
-                    self.log(f"   🚫 Außerhalb des Filters: {excluded_count} Dateien")
+                    after_filter = len(results)
+                    excluded_count = before_filter - after_filter
+                    if excluded_count > 0:
+                        self.log(f"📁 Filtered by categories: {before_filter} → {after_filter} results")
+                        self.log(f"   🚫 Außerhalb des Filters: {excluded_count} Dateien")
                 
-                # Count filtered matches
-                filtered_matches = sum(len(result.get('matches', [])) for result in results)
-                self.matches_found_var.set(f"🎯 Matches: {filtered_matches:,}")
-                self.files_processed_var.set(f"📁 Files: {after_filter:,}")
-                if excluded_count > 0:
-                    self.excluded_files_var.set(f"🚫 {excluded_count:,} ausgeschlossen")
+                    # Count filtered matches
+                    self.matches_found_var.set(f"🎯 Matches: {filtered_matches:,}")
+                    self.files_processed_var.set(f"📁 Files: {after_filter:,}")
+                    if excluded_count > 0:
+                        self.excluded_files_var.set(f"🚫 {excluded_count:,} ausgeschlossen")
             
-            # Check if user stopped the search
-            if self.stop_search_flag:
-                self.log(i18n.tr("search_interrupted"))
-                matches_count = len(results) if results else 0
-                self.log(i18n.tr("collected_results", count=matches_count))
-            else:
-                matches_count = len(results) if results else 0
-                self.log(i18n.tr("search_finished") + f": {matches_count} files")
-                self.update_status(i18n.tr("search_finished") + f" - {matches_count} files")
-
-            # Generate report with collected data (whether search was stopped or not)
-            # Ensure report directory exists
-            # Cross-platform default report directory
-            report_dir = DEFAULT_REPORT_DIR or get_temp_dir()
-            Path(report_dir).mkdir(parents=True, exist_ok=True)
+                # Check if user stopped the search
+                if self.stop_search_flag:
+                    self.log(i18n.tr("search_interrupted"))
+                    matches_count = len(results) if results else 0
+                    self.log(i18n.tr("collected_results", count=matches_count))
+                else:
+                    matches_count = len(results) if results else 0
+                    self.log(i18n.tr("search_finished") + f": {matches_count} files")
+                    self.update_status(i18n.tr("search_finished") + f" - {matches_count} files")
+
+                # Generate report with collected data (whether search was stopped or not)
+                # Ensure report directory exists
+                # Cross-platform default report directory
+                report_dir = DEFAULT_REPORT_DIR or get_temp_dir()
+                Path(report_dir).mkdir(parents=True, exist_ok=True)
             
-            report_gen = HTMLReportGenerator(
-                search_terms=search_params["terms"],
-                search_path=search_params["directory"],
-                case_sensitive=search_tool.case_sensitive,
-                use_regex=search_tool.use_regex,
-                output_dir=str(report_dir)
-            )
-            report_path = report_gen.generate(results=results)
+                report_gen = HTMLReportGenerator(
+                    search_terms=search_params["terms"],
+                    search_path=search_params["directory"],
+                    case_sensitive=search_tool.case_sensitive,
+                    use_regex=search_tool.use_regex,
+                    output_dir=str(report_dir),
+                    profile_summary=search_tool.get_profile_summary(),
+                    file_stats=search_tool.get_file_stats_summary()
+                )
+                report_path = report_gen.generate(results=results)
 
             self.last_report_path = report_path
             if report_path:
@@ -927,6 +946,10 @@ class MasterSearchGUI:
             self.root.after(0, lambda: messagebox.showerror(i18n.tr("error"), error_msg))
 
         finally:
+            # Bericht ist geschrieben: Spill-Datei des Memory-Governors entfernen
+            search_tool = self.current_search_tool
+            if search_tool is not None and search_tool.memory_governor is not None:
+                search_tool.memory_governor.close()
             # Clean up search tool reference
             self.current_search_tool = None
             self.root.after(0, self.search_finished)
@@ -970,6 +993,12 @@ class MasterSearchGUI:
                     
                     self.root.update_idletasks()
                 
+                elif status_data.get('type') == 'memory':
+                    # Memory-Governor: Hinweis bei erreichtem RAM-Limit
+                    if status_data.get('state') == 'pressure':
+                        self.excluded_files_var.set(
+                            f"💾 RAM {status_data.get('percent', 0):.0f}% - {status_data.get('spilled', 0):,} ausgelagert")
+                
                 elif status_data.get('type') == 'complete':
                     # Final update - progress bar at 100%
                     total = status_data.get('total', 0)
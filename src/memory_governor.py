@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Memory Governor
+================================
+Enforces MAX_MEMORY_USAGE_PERCENT while a search is running.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+The governor samples the resident memory (RSS) of the search process every
+MEMORY_CHECK_INTERVAL files. psutil is used when available (including worker
+child processes), otherwise /proc/self/statm and /proc/meminfo are read.
+The limit is this process's budget (MAX_MEMORY_USAGE_PERCENT of the total
+memory); other programs only count when the available system memory drops
+below MEMORY_MIN_AVAILABLE_MB. When the limit is exceeded the search engine:
+    - submits fewer batches at once (throttling)
+    - spills accumulated results to an on-disk result sink (NDJSON)
+    - stores less line content per match
+"""
+
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+from .result_store import DiskResultSink
+
+# Add config directory to path for imports
+config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
+if config_path not in sys.path:
+    sys.path.insert(0, config_path)
+from performance_config import (
+    MAX_MEMORY_USAGE_PERCENT,
+    MEMORY_CHECK_INTERVAL,
+    MAX_LINE_LENGTH,
+    MEMORY_PRESSURE_LINE_LENGTH,
+    MEMORY_MIN_AVAILABLE_MB,
+)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+STATE_OK = 'ok'
+STATE_PRESSURE = 'pressure'
+
+
+def _read_meminfo() -> Dict[str, int]:
+    """Read /proc/meminfo (values in bytes)."""
+    values = {}
+    with open('/proc/meminfo', 'r', encoding='ascii') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            parts = rest.split()
+            if parts:
+                values[key] = int(parts[0]) * 1024
+    return values
+
+
+def sample_memory() -> Optional[Dict[str, int]]:
+    """
+    Sample memory usage of this process and the system.
+
+    Returns:
+        Dict with 'rss', 'total' and 'available' in bytes, or None if
+        memory information is not available on this platform.
+    """
+    if PSUTIL_AVAILABLE:
+        try:
+            process = psutil.Process()
+            rss = process.memory_info().rss
+            # Worker-Prozesse des Pools mitzählen
+            for child in process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            vm = psutil.virtual_memory()
+            return {'rss': rss, 'total': vm.total, 'available': vm.available}
+        except Exception:
+            pass
+
+    try:
+        with open('/proc/self/statm', 'r', encoding='ascii') as f:
+            rss_pages = int(f.read().split()[1])
+        meminfo = _read_meminfo()
+        total = meminfo.get('MemTotal', 0)
+        available = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
+        return {
+            'rss': rss_pages * os.sysconf('SC_PAGE_SIZE'),
+            'total': total,
+            'available': available,
+        }
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class MemoryGovernor:
+    """
+    Watches memory usage during a search and decides how the engine reacts.
+
+    Usage percent is the RSS share of the search (with its workers) of the
+    total memory, compared against its budget max_percent. A machine that
+    is busy with other programs triggers the pressure state only through the
+    hard floor min_available_mb, not through their share of the memory.
+    """
+
+    def __init__(self, max_percent: float = MAX_MEMORY_USAGE_PERCENT,
+                 check_interval: int = MEMORY_CHECK_INTERVAL,
+                 max_line_length: int = MAX_LINE_LENGTH,
+                 pressure_line_length: int = MEMORY_PRESSURE_LINE_LENGTH,
+                 sampler=sample_memory, min_available_mb: float = MEMORY_MIN_AVAILABLE_MB):
+        """
+        Initialize the governor.
+
+        Args:
+            max_percent: Memory budget of the search in percent of the total memory
+            check_interval: Sample memory every N processed files
+            max_line_length: Line content cap per match in normal state
+            pressure_line_length: Line content cap per match under pressure
+            sampler: Function returning a memory sample (see sample_memory)
+            min_available_mb: Pressure whenever less system memory is available
+        """
+        self.max_percent = max_percent
+        self.check_interval = max(1, check_interval)
+        self.normal_line_length = max_line_length
+        self.pressure_line_length = pressure_line_length
+        self.sampler = sampler
+        self.min_available = min_available_mb * 1024 * 1024
+
+        self.state = STATE_OK
+        self.last_sample = None
+        self.usage_percent = 0.0
+        self.peak_rss = 0
+        self._next_check = 0
+
+        # Spill-Sink (NDJSON-Segmentdatei) für ausgelagerte Ergebnisse
+        self.spill_sink = None
+
+    @property
+    def under_pressure(self) -> bool:
+        """True while memory usage is above the limit."""
+        return self.state == STATE_PRESSURE
+
+    @property
+    def max_line_length(self) -> int:
+        """Line content cap for matches collected from now on."""
+        return self.pressure_line_length if self.under_pressure else self.normal_line_length
+
+    def max_in_flight(self, workers: int) -> int:
+        """Number of batches that may be submitted at the same time."""
+        workers = max(1, workers)
+        return max(1, workers // 2) if self.under_pressure else workers * 2
+
+    def check(self, files_processed: int, force: bool = False) -> bool:
+        """
+        Sample memory if the check interval has been reached.
+
+        Returns:
+            True if a new sample was taken
+        """
+        if not force and files_processed < self._next_check:
+            return False
+        self._next_check = files_processed + self.check_interval
+
+        sample = self.sampler()
+        if not sample or not sample.get('total'):
+            return False
+
+        self.last_sample = sample
+        self.peak_rss = max(self.peak_rss, sample['rss'])
+        self.usage_percent = sample['rss'] / sample['total'] * 100
+        low_memory = sample['available'] < self.min_available
+        self.state = STATE_PRESSURE if self.usage_percent >= self.max_percent or low_memory else STATE_OK
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        """Status dictionary for the GUI/status callback."""
+        rss = self.last_sample['rss'] if self.last_sample else 0
+        return {
+            'type': 'memory',
+            'state': self.state,
+            'percent': round(self.usage_percent, 1),
+            'limit_percent': self.max_percent,
+            'rss_mb': round(rss / (1024 * 1024), 1),
+            'available_mb': round(self.last_sample['available'] / (1024 * 1024), 1) if self.last_sample else None,
+            'peak_rss_mb': round(self.peak_rss / (1024 * 1024), 1),
+            'spilled': self.spilled_count,
+            'max_line_length': self.max_line_length,
+        }
+
+    @property
+    def spill_path(self) -> Optional[str]:
+        """Path of the spill segment file (None if nothing was spilled)."""
+        return self.spill_sink.path if self.spill_sink is not None else None
+
+    @property
+    def spilled_count(self) -> int:
+        """Number of results moved to disk."""
+        return len(self.spill_sink) if self.spill_sink is not None else 0
+
+    def spill(self, results: List[Dict[str, Any]]) -> int:
+        """
+        Append results to the on-disk spill sink and return how many were written.
+
+        The caller clears its in-memory list afterwards.
+        """
+        if not results:
+            return 0
+        if self.spill_sink is None:
+            self.spill_sink = DiskResultSink()
+        self.spill_sink.extend(results)
+        return len(results)
+
+    def iter_spilled(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all spilled results in their original order."""
+        if self.spill_sink is not None:
+            yield from self.spill_sink
+
+    def close(self):
+        """Remove the spill file."""
+        if self.spill_sink is not None:
+            self.spill_sink.close()
+        self.spill_sink = None
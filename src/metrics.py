@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Metrics Export
+===============================
+Counters, gauges and histograms of the search engine in OpenMetrics text format.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+The engine records into a MetricsRegistry (SearchMetrics knows the metric
+names) and publishes it to any number of sinks:
+
+    - OpenMetricsFileSink: writes the text format atomically (temp file +
+      os.replace) at most every METRICS_INTERVAL seconds, e.g. for the
+      node_exporter textfile collector of scheduled searches
+    - MetricsHTTPServer: optional local endpoint serving GET /metrics
+    - StubMetricsSink: keeps every published snapshot (tests, embedding)
+
+Counters are cumulative over all searches of an engine instance, so a
+long-running process (GUI, daemon) can be scraped like any other service.
+Caches register a stats callable (hits/misses) with register_cache().
+"""
+
+import os
+import math
+import bisect
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Obere Grenzen (Sekunden) für Batch- und Stufen-Latenzen
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if value.is_integer():
+            return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if math.isinf(bound) else repr(float(bound))
+
+
+class _Metric:
+    """Metric family with one value per label set."""
+
+    type = 'unknown'
+
+    def __init__(self, name: str, documentation: str, unit: str = ''):
+        self.name = name
+        self.documentation = documentation
+        self.unit = unit
+        self.values: Dict[Tuple[Tuple[str, str], ...], object] = {}
+
+    @staticmethod
+    def _key(labels: Optional[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(sorted((labels or {}).items()))
+
+    def header(self) -> List[str]:
+        lines = [f'# TYPE {self.name} {self.type}']
+        if self.unit:
+            lines.append(f'# UNIT {self.name} {self.unit}')
+        lines.append(f'# HELP {self.name} {_escape(self.documentation)}')
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing value (rendered with the _total suffix)."""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError('Counter können nur steigen')
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [f'{self.name}_total{_format_labels(key)} {_format_value(value)}'
+                for key, value in sorted(self.values.items())]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type = 'gauge'
+
+    def set(self, value: float, **labels):
+        self.values[self._key(labels)] = value
+
+    def get(self, **labels) -> Optional[float]:
+        return self.values.get(self._key(labels))
+
+    def samples(self) -> List[str]:
+        return [f'{self.name}{_format_labels(key)} {_format_value(value)}'
+                for key, value in sorted(self.values.items())]
+
+
+class Histogram(_Metric):
+    """Bucketed observations; each label set holds [counts per bucket (last = +Inf), sum]."""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], unit: str = ''):
+        super().__init__(name, documentation, unit)
+        self.buckets = tuple(buckets)
+
+    def _entry(self, labels: Dict[str, str]) -> list:
+        key = self._key(labels)
+        entry = self.values.get(key)
+        if entry is None:
+            entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        return entry
+
+    def observe(self, value: float, **labels):
+        entry = self._entry(labels)
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def add_counts(self, counts: Sequence[int], total: float, **labels):
+        """Merge pre-bucketed observations (same bucket bounds, counts not cumulative)."""
+        if len(counts) != len(self.buckets) + 1:
+            raise ValueError(f'{self.name}: {len(counts)} Bucket-Zähler, erwartet {len(self.buckets) + 1}')
+        entry = self._entry(labels)
+        for i, count in enumerate(counts):
+            entry[0][i] += count
+        entry[1] += total
+
+    def count(self, **labels) -> int:
+        entry = self.values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = 'le="' + _format_bound(bound) + '"'
+                lines.append(f'{self.name}_bucket{_format_labels(key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(float(total))}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metric families and renders them as OpenMetrics text."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self.lock = threading.RLock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self.lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f'Metrik {metric.name} ist bereits als {existing.type} registriert')
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, unit: str = '') -> Counter:
+        return self._register(Counter(name, documentation, unit))
+
+    def gauge(self, name: str, documentation: str, unit: str = '') -> Gauge:
+        return self._register(Gauge(name, documentation, unit))
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                  unit: str = '') -> Histogram:
+        return self._register(Histogram(name, documentation, buckets, unit))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Complete exposition in OpenMetrics text format (terminated by # EOF)."""
+        with self.lock:
+            lines = []
+            for name in sorted(self._metrics):
+                metric = self._metrics[name]
+                samples = metric.samples()
+                if samples:
+                    lines.extend(metric.header())
+                    lines.extend(samples)
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsSink:
+    """Target of published metrics; subclasses implement write()."""
+
+    def __init__(self, interval: float = 0.0):
+        self.interval = interval
+        self._last_publish = None
+
+    def publish(self, registry: MetricsRegistry, force: bool = False) -> bool:
+        """Write the registry unless the last write is less than interval seconds ago."""
+        now = time.monotonic()
+        if not force and self._last_publish is not None and now - self._last_publish < self.interval:
+            return False
+        self._last_publish = now
+        self.write(registry.render())
+        return True
+
+    def write(self, text: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class StubMetricsSink(MetricsSink):
+    """Keeps every published exposition in memory (offline tests)."""
+
+    def __init__(self, interval: float = 0.0):
+        super().__init__(interval)
+        self.snapshots: List[str] = []
+
+    def write(self, text: str):
+        self.snapshots.append(text)
+
+    @property
+    def last(self) -> str:
+        return self.snapshots[-1] if self.snapshots else ''
+
+    def sample(self, line_prefix: str) -> Optional[float]:
+        """Value of the first sample line in the last snapshot that starts with line_prefix + ' '."""
+        for line in self.last.splitlines():
+            if line.startswith(line_prefix + ' '):
+                return float(line.rsplit(' ', 1)[1].replace('+Inf', 'inf'))
+        return None
+
+
+class OpenMetricsFileSink(MetricsSink):
+    """Writes the exposition atomically to a text file (temp file in the same directory + os.replace)."""
+
+    def __init__(self, path: str, interval: float = 10.0):
+        super().__init__(interval)
+        self.path = os.path.abspath(path)
+
+    def write(self, text: str):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.metrics_', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+class MetricsHTTPServer(MetricsSink):
+    """Local HTTP endpoint (GET /metrics) serving the last published exposition.
+
+    Binds to 127.0.0.1 by default; port 0 picks a free port (see .port).
+    """
+
+    def __init__(self, port: int = 0, host: str = '127.0.0.1'):
+        super().__init__(0.0)
+        self._text = '# EOF\n'
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = sink._text.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keine Zugriffs-Logs auf der Konsole
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/metrics'
+
+    def write(self, text: str):
+        self._text = text
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=2)
+
+
+class SearchMetrics:
+    """Metric names of the search engine and the hooks the engine calls."""
+
+    PREFIX = 'master_search'
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, sinks: Sequence[MetricsSink] = ()):
+        self.registry = registry or MetricsRegistry()
+        self.sinks: List[MetricsSink] = list(sinks)
+        self._caches: Dict[str, Callable[[], Optional[Dict[str, float]]]] = {}
+        self._busy_seconds = 0.0
+        self._started = None
+        self._workers = 1
+
+        r, p = self.registry, self.PREFIX
+        self.searches = r.counter(f'{p}_searches', 'Completed searches.')
+        self.files_walked = r.counter(f'{p}_files_walked', 'Files found by the directory walk.')
+        self.files_searched = r.counter(f'{p}_files_searched', 'Files whose content was searched.')
+        self.bytes_read = r.counter(f'{p}_read_bytes', 'Bytes of searched files.', 'bytes')
+        self.results = r.counter(f'{p}_results', 'Matching files and folders.')
+        self.matches = r.counter(f'{p}_matches', 'Matching lines in file contents.')
+        self.batch_latency = r.histogram(f'{p}_batch_latency_seconds',
+                                         'Time from batch submission to result.', LATENCY_BUCKETS, 'seconds')
+        self.stage_seconds = r.counter(f'{p}_stage_seconds', 'Wall time per pipeline stage.', 'seconds')
+        self.cache_hits = r.counter(f'{p}_cache_hits', 'Cache hits per cache.')
+        self.cache_misses = r.counter(f'{p}_cache_misses', 'Cache misses per cache.')
+        self.cache_hit_ratio = r.gauge(f'{p}_cache_hit_ratio', 'Hits / lookups per cache since start.')
+        self.worker_utilization = r.gauge(f'{p}_worker_utilization',
+                                          'Busy time of all workers / (elapsed time * workers), current search.')
+        self.workers = r.gauge(f'{p}_workers', 'Worker threads/processes of the current search.')
+        self.running = r.gauge(f'{p}_search_running', '1 while a search is running.')
+        self.last_duration = r.gauge(f'{p}_last_search_duration_seconds', 'Duration of the last search.',
+                                     'seconds')
+        self.last_finished = r.gauge(f'{p}_last_search_timestamp_seconds',
+                                     'Unix time the last search finished.', 'seconds')
+        self._file_durations = None
+        self._cache_totals: Dict[str, Tuple[float, float]] = {}
+
+    def register_cache(self, name: str, stats: Callable[[], Optional[Dict[str, float]]]):
+        """Register a cache; stats() returns cumulative {'hits': n, 'misses': n} (or None)."""
+        self._caches[name] = stats
+
+    def file_duration_histogram(self, buckets: Sequence[float]) -> Histogram:
+        if self._file_durations is None:
+            self._file_durations = self.registry.histogram(
+                f'{self.PREFIX}_file_duration_seconds', 'Content search time per file and extractor.',
+                buckets, 'seconds')
+        return self._file_durations
+
+    def search_started(self, workers: int):
+        with self.registry.lock:
+            self._started = time.perf_counter()
+            self._busy_seconds = 0.0
+            self._workers = max(1, workers)
+            self.workers.set(self._workers)
+            self.worker_utilization.set(0.0)
+            self.running.set(1)
+        self.publish(force=True)
+
+    def walk_finished(self, files: int, folders: int):
+        with self.registry.lock:
+            self.files_walked.inc(files)
+            self.results.inc(folders)
+
+    def batch_received(self, batch_results, latency: float, duration_buckets: Sequence[float] = ()):
+        """Record one finished batch (list of FileResults, optionally a BatchResult)."""
+        with self.registry.lock:
+            self.batch_latency.observe(latency)
+            self.results.inc(len(batch_results))
+            self.matches.inc(sum(len(result.matches) for result in batch_results))
+            self._busy_seconds += getattr(batch_results, 'busy_seconds', 0.0) or 0.0
+            self._update_utilization()
+            file_stats = getattr(batch_results, 'file_stats', None)
+            if file_stats:
+                for extractor, (files, _seconds, nbytes) in file_stats['extractors'].items():
+                    self.files_searched.inc(files, extractor=extractor)
+                    self.bytes_read.inc(nbytes, extractor=extractor)
+                if duration_buckets:
+                    histogram = self.file_duration_histogram(duration_buckets)
+                    for extractor, counts in file_stats.get('durations', {}).items():
+                        histogram.add_counts(counts, file_stats['extractors'][extractor][1], extractor=extractor)
+        self.publish()
+
+    def search_finished(self, elapsed: float, stage_rows: Sequence[Dict] = ()):
+        """Record the end of a search; stage_rows as returned by StageProfiler.rows()."""
+        with self.registry.lock:
+            self.searches.inc()
+            for row in stage_rows:
+                self.stage_seconds.inc(row['wall_s'], stage=row['stage'])
+            self._update_utilization()
+            self.running.set(0)
+            self.last_duration.set(round(elapsed, 6))
+            self.last_finished.set(round(time.time(), 3))
+        self.publish(force=True)
+
+    def _update_utilization(self):
+        if self._started is None:
+            return
+        elapsed = time.perf_counter() - self._started
+        if elapsed > 0:
+            self.worker_utilization.set(round(min(1.0, self._busy_seconds / (elapsed * self._workers)), 4))
+
+    def _collect_caches(self):
+        for name, stats in list(self._caches.items()):
+            try:
+                data = stats()
+            except Exception:
+                continue
+            if not data:
+                continue
+            hits, misses = float(data.get('hits', 0)), float(data.get('misses', 0))
+            last_hits, last_misses = self._cache_totals.get(name, (0.0, 0.0))
+            # Quellen zählen kumulativ; nur Zuwachs übernehmen (Reset der Quelle -> neu beginnen)
+            self.cache_hits.inc(hits - last_hits if hits >= last_hits else hits, cache=name)
+            self.cache_misses.inc(misses - last_misses if misses >= last_misses else misses, cache=name)
+            self._cache_totals[name] = (hits, misses)
+            total_hits, total_misses = self.cache_hits.get(cache=name), self.cache_misses.get(cache=name)
+            if total_hits + total_misses:
+                self.cache_hit_ratio.set(round(total_hits / (total_hits + total_misses), 4), cache=name)
+
+    def publish(self, force: bool = False):
+        """Publish to all sinks (each sink throttles to its own interval unless force)."""
+        if not self.sinks:
+            return
+        with self.registry.lock:
+            self._collect_caches()
+        for sink in self.sinks:
+            try:
+                sink.publish(self.registry, force)
+            except OSError:
+                pass  # Metriken dürfen die Suche nie abbrechen
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
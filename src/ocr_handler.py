@@ -70,6 +70,9 @@ class OCRHandler:
         self.lock = threading.Lock()
         self.extraction_lock = threading.Lock()
         
+        # Bekannte Cache-Datei je Pfad-Präfix (veraltete Version beim Speichern gezielt löschen)
+        self._cache_files = {}
+        
         # Statistics
         self.stats = {
             'total_processed': 0,
@@ -157,15 +160,51 @@ class OCRHandler:
             return None
         return self.available_engines[self.preferred_engine]['name']
     
+    @staticmethod
+    def _cache_prefix(image_path: str) -> str:
+        """Cache file prefix of an image path (shared by all versions of the file)."""
+        return hashlib.md5(os.path.abspath(image_path).encode()).hexdigest()
+    
     def _get_cache_key(self, image_path: str) -> str:
         """Generate cache key from image file path and modification time."""
         try:
             stat = os.stat(image_path)
-            key_data = f"{image_path}_{stat.st_mtime}_{stat.st_size}"
-            return hashlib.md5(key_data.encode()).hexdigest()
+            version = hashlib.md5(f"{stat.st_mtime_ns}_{stat.st_size}".encode()).hexdigest()[:16]
+            return f"{self._cache_prefix(image_path)}_{version}"
         except:
             return None
     
+    def invalidate(self, image_paths) -> int:
+        """
+        Remove cached OCR results of changed or deleted files (e.g. from the change tracker).
+        
+        Args:
+            image_paths: Paths of changed/deleted files (non-image paths are ignored)
+        
+        Returns:
+            Number of removed cache files
+        """
+        if not self.use_cache or not os.path.isdir(self.cache_dir):
+            return 0
+        prefixes = {self._cache_prefix(path) for path in image_paths}
+        if not prefixes:
+            return 0
+        with self.lock:
+            for prefix in prefixes:
+                self._cache_files.pop(prefix, None)
+        removed = 0
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.split('_', 1)[0] in prefixes:
+                    try:
+                        os.remove(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass
+        with self.lock:
+            self.stats['invalidated'] = self.stats.get('invalidated', 0) + removed
+        return removed
+    
     def _load_from_cache(self, image_path: str) -> Optional[str]:
         """Load OCR result from cache."""
         if not self.use_cache:
@@ -184,6 +223,7 @@ class OCRHandler:
                 
                 with self.lock:
                     self.stats['cache_hits'] += 1
+                    self._cache_files[cache_key.split('_', 1)[0]] = cache_file
                 
                 return text
         except Exception as e:
@@ -203,6 +243,18 @@ class OCRHandler:
             
             cache_file = os.path.join(self.cache_dir, f"{cache_key}.txt")
             
+            # Ältere Version derselben Datei ist veraltet; nur die bekannte löschen statt
+            # das Cache-Verzeichnis zu durchsuchen (Versionen früherer Läufe entfernt invalidate()
+            # nach der Aktualisierung durch den Change-Tracker)
+            prefix = cache_key.split('_', 1)[0]
+            with self.lock:
+                previous = self._cache_files.get(prefix)
+                self._cache_files[prefix] = cache_file
+            if previous and previous != cache_file:
+                try:
+                    os.remove(previous)
+                except OSError:
+                    pass
             with open(cache_file, 'w', encoding='utf-8') as f:
                 f.write(text)
         except Exception as e:
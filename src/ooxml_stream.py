@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Streaming OOXML Extraction
+===========================================
+Line generators for DOCX, XLSX and PPTX that parse the XML parts
+incrementally instead of building the whole tree.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+The parts are read from the zip member stream with ElementTree.iterparse.
+iter_complete() yields every target element (paragraph, row, text run)
+as soon as its end tag is parsed and afterwards removes it from its
+parent, so only the currently open elements are held in memory: peak
+memory no longer grows with the document size, and the first lines
+reach the matcher while the rest of the part is still compressed.
+
+XLSX: the shared strings are read once into a list, then every worksheet
+(in workbook order, names from xl/workbook.xml) is streamed. Cells are
+resolved by type: shared string, inline string, boolean, or the value as
+written (numbers, formula results, errors). Each row becomes one line
+"[Sheet!Row] a | b | c" so a match shows where it is.
+
+All generators yield (line_number, text) like the other extractors.
+"""
+
+import re
+import posixpath
+from typing import Iterator, List, Tuple
+from zipfile import ZipFile
+from xml.etree import ElementTree as ET
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+A_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+S_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_SHEET_MEMBER_RE = re.compile(r'^xl/worksheets/sheet(\d+)\.xml$')
+
+Line = Tuple[int, str]
+
+
+def iter_complete(stream, targets) -> Iterator[ET.Element]:
+    """Yield each element whose tag is in targets once it is complete.
+
+    The element and its children are valid until the next element is
+    requested; then it is cleared and detached from its parent. Elements
+    outside of targets are dropped as soon as they end.
+    """
+    stack = []
+    open_targets = 0  # Offene Ziel-Elemente: deren Inhalt wird noch gebraucht
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            if elem.tag in targets:
+                open_targets += 1
+            continue
+        stack.pop()
+        if elem.tag in targets:
+            open_targets -= 1
+            yield elem
+        if not open_targets:
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)  # Fertig verarbeitet: auch nicht als leeres Element behalten
+
+
+def _text(elem: ET.Element, tag: str) -> str:
+    return ''.join(node.text for node in elem.iter(tag) if node.text)
+
+
+def iter_docx_lines(file_path: str) -> Iterator[Line]:
+    """Paragraphs of word/document.xml (line number = paragraph number)."""
+    with ZipFile(file_path, 'r') as zip_ref, zip_ref.open('word/document.xml') as stream:
+        paragraph = 0
+        for elem in iter_complete(stream, (W_NS + 'p',)):
+            paragraph += 1
+            line_text = _text(elem, W_NS + 't').strip()
+            if line_text:
+                yield paragraph, line_text
+
+
+def iter_pptx_lines(file_path: str) -> Iterator[Line]:
+    """Text runs of all slides (line number counts the non-empty runs)."""
+    with ZipFile(file_path, 'r') as zip_ref:
+        slide_files = [f for f in zip_ref.namelist() if f.startswith('ppt/slides/slide') and f.endswith('.xml')]
+        line_counter = 0
+        for slide_file in sorted(slide_files):
+            with zip_ref.open(slide_file) as stream:
+                for elem in iter_complete(stream, (A_NS + 't',)):
+                    if elem.text and elem.text.strip():
+                        line_counter += 1
+                        yield line_counter, elem.text.strip()
+
+
+def _xlsx_sheets(zip_ref: ZipFile) -> List[Tuple[str, str]]:
+    """(name, zip member) of every worksheet in workbook order."""
+    members = set(zip_ref.namelist())
+    sheets = []
+    try:
+        workbook = ET.fromstring(zip_ref.read('xl/workbook.xml'))
+        relations = ET.fromstring(zip_ref.read('xl/_rels/workbook.xml.rels'))
+    except (KeyError, ET.ParseError):
+        workbook = relations = None
+    if workbook is not None:
+        targets = {rel.get('Id'): rel.get('Target', '') for rel in relations.iter(REL_NS + 'Relationship')}
+        for sheet in workbook.iter(S_NS + 'sheet'):
+            target = targets.get(sheet.get(R_NS + 'id'), '')
+            # Ziele sind relativ zu xl/ oder absolut im Paket
+            member = target.lstrip('/') if target.startswith('/') else posixpath.normpath('xl/' + target)
+            if member in members:
+                sheets.append((sheet.get('name') or posixpath.basename(member), member))
+    if not sheets:
+        # Ohne (lesbare) workbook.xml: Blätter nach Nummer sortiert
+        numbered = [(int(match.group(1)), name) for name in members
+                    for match in [_SHEET_MEMBER_RE.match(name)] if match]
+        sheets = [(f'Sheet{number}', name) for number, name in sorted(numbered)]
+    return sheets
+
+
+def _string_item(elem: ET.Element) -> str:
+    """Text of a shared string <si> or inline string <is>: plain <t> or rich text runs (without phonetics)."""
+    text = elem.find(S_NS + 't')
+    if text is not None:
+        return text.text or ''
+    return ''.join(run.findtext(S_NS + 't') or '' for run in elem.findall(S_NS + 'r'))
+
+
+def read_shared_strings(zip_ref: ZipFile) -> List[str]:
+    """xl/sharedStrings.xml as a list (index = value of cells with t="s"), streamed."""
+    try:
+        stream = zip_ref.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    with stream:
+        return [_string_item(elem) for elem in iter_complete(stream, (S_NS + 'si',))]
+
+
+def _cell_text(cell: ET.Element, shared: List[str]) -> str:
+    cell_type = cell.get('t')
+    if cell_type == 'inlineStr':
+        inline = cell.find(S_NS + 'is')
+        return _string_item(inline) if inline is not None else ''
+    value = cell.findtext(S_NS + 'v')
+    if not value:
+        return ''
+    if cell_type == 's':
+        try:
+            return shared[int(value)]
+        except (ValueError, IndexError):
+            return ''
+    if cell_type == 'b':
+        return 'TRUE' if value == '1' else 'FALSE'
+    return value  # Zahl, Datum (als Seriennummer), Formel-Ergebnis (t="str") oder Fehler (t="e")
+
+
+def sheet_row_line(sheet: str, row: int, values: List[str]) -> str:
+    """Line of a spreadsheet row with its location: "[Sheet!Row] a | b"."""
+    return f'[{sheet}!{row}] ' + ' | '.join(values)
+
+
+def iter_xlsx_lines(file_path: str) -> Iterator[Line]:
+    """Rows of all worksheets; line number = row number, the text starts with [Sheet!Row].
+
+    Shared strings are read once, every sheet is streamed row by row.
+    """
+    with ZipFile(file_path, 'r') as zip_ref:
+        shared = read_shared_strings(zip_ref)
+        for sheet_name, member in _xlsx_sheets(zip_ref):
+            with zip_ref.open(member) as stream:
+                row_index = 0
+                for row in iter_complete(stream, (S_NS + 'row',)):
+                    try:
+                        row_index = int(row.get('r'))
+                    except (TypeError, ValueError):
+                        row_index += 1
+                    values = []
+                    for cell in row.iter(S_NS + 'c'):
+                        text = _cell_text(cell, shared).strip()
+                        if text:
+                            values.append(text)
+                    if values:
+                        yield row_index, sheet_row_line(sheet_name, row_index, values)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Lazy PDF Page Extraction
+=========================================
+Page-by-page PDF text extraction with a content-addressed page cache and
+page-range parallelism for large documents.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+iter_pdf_pages() yields (page_number, text) one page at a time, so the
+matcher sees page 1 before page 2 is extracted and a search that stops
+early (files-with-matches, match limit, cancel) never extracts the rest.
+
+Page cache: the text of a page is stored under a hash of its content
+stream and fonts (page_key), not under the file. Editing page 1 changes
+only that key, the other pages of the file are served from the cache.
+Computing the key only inflates the content stream, which is much cheaper
+than the text extraction itself. For files with unchanged size and mtime
+the cache also remembers the page keys, then the PDF is not opened at all.
+
+Parallel extraction: with an executor and at least parallel_min_pages
+pages, the uncached pages are split into ranges of pages_per_task pages
+and extracted by the executor's workers (each opens the file itself).
+Pages are still yielded in order; closing the generator cancels ranges
+that have not started yet.
+
+pypdf is used if installed, otherwise PyPDF2 (both optional).
+"""
+
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
+        PdfReader = None
+
+PDF_AVAILABLE = PdfReader is not None
+CACHE_VERSION = 1
+
+
+def default_cache_path() -> str:
+    """Page cache file in the user cache."""
+    return os.path.join(os.path.expanduser('~/.cache/master_search'), 'pdf_pages.pickle')
+
+
+def page_line(page_number: int, line: str) -> str:
+    """Line of a PDF page with its location: "[Seite 3] text"."""
+    return f'[Seite {page_number}] {line}'
+
+
+def page_key(page) -> Optional[str]:
+    """Hash of a page's content stream and fonts (None if the page cannot be read)."""
+    try:
+        get_contents = getattr(page, 'get_contents', None) or page.getContents  # PyPDF2 < 2.0
+        contents = get_contents()
+        digest = hashlib.blake2b(contents.get_data() if contents is not None else b'', digest_size=16)
+        resources = page.get('/Resources')
+        fonts = resources.get_object().get('/Font') if resources is not None else None
+        if fonts is not None:
+            # Gleicher Inhalt mit anderen Fonts (ToUnicode) ergibt anderen Text
+            for name, font in sorted(fonts.get_object().items()):
+                digest.update(f'{name}={getattr(font, "idnum", "")}:{font.get_object().get("/BaseFont")};'.encode())
+        return digest.hexdigest()
+    except Exception:
+        return None
+
+
+def _page_text(page) -> str:
+    try:
+        extract = getattr(page, 'extract_text', None) or page.extractText  # PyPDF2 < 2.0
+        return extract() or ''
+    except Exception:
+        return ''  # Defekte Seite: die übrigen Seiten trotzdem durchsuchen
+
+
+def extract_pages(file_path: str, indices: Sequence[int], reader_factory: Optional[Callable] = None) -> List[str]:
+    """Texts of the pages at indices (0-based); runs in a worker for parallel extraction."""
+    with open(file_path, 'rb') as stream:
+        pages = (reader_factory or PdfReader)(stream).pages
+        return [_page_text(pages[index]) for index in indices]
+
+
+class PdfPageCache:
+    """Page texts by page_key (LRU, bounded by max_chars) plus the page keys of known files."""
+
+    def __init__(self, cache_path: Optional[str] = None, max_chars: int = 64 * 1024 * 1024):
+        self.cache_path = cache_path
+        self.max_chars = max_chars
+        self.pages: 'OrderedDict[str, str]' = OrderedDict()
+        self.files: Dict[str, Tuple[int, int, Tuple[str, ...]]] = {}  # Pfad -> (Größe, mtime_ns, Seiten-Keys)
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+        if cache_path:
+            self.load()
+
+    # Persistenz -------------------------------------------------------------
+
+    def load(self) -> bool:
+        """Load the persisted cache (False if missing or outdated)."""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return False
+        if data.get('version') != CACHE_VERSION:
+            return False
+        self.pages = OrderedDict(data['pages'])
+        self.files = data['files']
+        self.chars = sum(len(text) for text in self.pages.values())
+        return True
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Persist the cache atomically (temp file + os.replace)."""
+        path = path or self.cache_path or default_cache_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with self.lock:
+            data = {'version': CACHE_VERSION, 'pages': list(self.pages.items()), 'files': dict(self.files)}
+            self.dirty = False
+        with open(temp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return path
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    # Seiten -----------------------------------------------------------------
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        with self.lock:
+            text = self.pages.get(key)
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.pages.move_to_end(key)
+            return text
+
+    def put(self, key: Optional[str], text: str):
+        if key is None or len(text) > self.max_chars:
+            return
+        with self.lock:
+            old = self.pages.pop(key, None)
+            self.chars += len(text) - (len(old) if old is not None else 0)
+            self.pages[key] = text
+            while self.chars > self.max_chars:
+                _key, evicted = self.pages.popitem(last=False)
+                self.chars -= len(evicted)
+            self.dirty = True
+
+    def file_pages(self, file_path: str, stat: os.stat_result) -> Optional[List[str]]:
+        """All page texts of an unchanged, fully cached file (None otherwise)."""
+        with self.lock:
+            known = self.files.get(file_path)
+            if known is None or known[:2] != (stat.st_size, stat.st_mtime_ns):
+                return None
+            texts = [self.pages.get(key) for key in known[2]]
+            if any(text is None for text in texts):
+                return None
+            self.hits += len(texts)
+            return texts
+
+    def remember_file(self, file_path: str, stat: os.stat_result, keys: Sequence[Optional[str]]):
+        if any(key is None for key in keys):
+            return
+        with self.lock:
+            self.files[file_path] = (stat.st_size, stat.st_mtime_ns, tuple(keys))
+            self.dirty = True
+
+
+def iter_pdf_pages(file_path: str, cache: Optional[PdfPageCache] = None, executor=None,
+                   parallel_min_pages: int = 64, pages_per_task: int = 16,
+                   reader_factory: Optional[Callable] = None, key_prefix: str = '') -> Iterator[Tuple[int, str]]:
+    """(page_number, text) for every page, extracted lazily (see module docstring).
+
+    reader_factory(stream) -> object with .pages (default: pypdf/PyPDF2 PdfReader);
+    it must be picklable when executor is a process pool.
+    key_prefix is prepended to page keys and file entries (extractor version: "pdf@1:"),
+    texts of another extractor version are not reused.
+    """
+    stat = os.stat(file_path)
+    if cache is not None:
+        texts = cache.file_pages(key_prefix + file_path, stat)
+        if texts is not None:
+            yield from enumerate(texts, 1)
+            return
+
+    with open(file_path, 'rb') as stream:
+        pages = (reader_factory or PdfReader)(stream).pages
+        page_count = len(pages)
+        if executor is not None and page_count >= parallel_min_pages:
+            yield from _iter_parallel(file_path, pages, cache, stat, executor, pages_per_task, reader_factory,
+                                      key_prefix)
+            return
+
+        keys = []
+        for index in range(page_count):
+            page = pages[index]
+            key = _prefixed(key_prefix, page_key(page)) if cache is not None else None
+            text = cache.get(key) if cache is not None else None
+            if text is None:
+                text = _page_text(page)
+                if cache is not None:
+                    cache.put(key, text)
+            keys.append(key)
+            yield index + 1, text
+    if cache is not None:
+        cache.remember_file(key_prefix + file_path, stat, keys)
+
+
+def _prefixed(key_prefix: str, key: Optional[str]) -> Optional[str]:
+    return None if key is None else key_prefix + key
+
+
+def _iter_parallel(file_path, pages, cache, stat, executor, pages_per_task, reader_factory, key_prefix=''):
+    keys = [_prefixed(key_prefix, page_key(pages[index])) if cache is not None else None
+            for index in range(len(pages))]
+    texts = [cache.get(key) if cache is not None else None for key in keys]
+    missing = [index for index, text in enumerate(texts) if text is None]
+    futures = {}  # Seitenindex -> (Future, Position im Bereich)
+    for start in range(0, len(missing), pages_per_task):
+        chunk = tuple(missing[start:start + pages_per_task])
+        future = executor.submit(extract_pages, file_path, chunk, reader_factory)
+        for position, index in enumerate(chunk):
+            futures[index] = (future, position)
+    try:
+        for index, text in enumerate(texts):
+            if text is None:
+                future, position = futures[index]
+                text = future.result()[position]
+                if cache is not None:
+                    cache.put(keys[index], text)
+            yield index + 1, text
+    finally:
+        # Abbruch (Treffer-Limit, Stop): noch nicht gestartete Bereiche verwerfen
+        for future, _position in futures.values():
+            future.cancel()
+    if cache is not None:
+        cache.remember_file(key_prefix + file_path, stat, keys)
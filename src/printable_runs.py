@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Printable Runs
+===============================
+strings(1) for binary files: runs of printable characters, 8-bit and
+UTF-16LE, with their byte offset. Used for binary content without a real
+extractor (databases, class files, ...) and for legacy Word .doc files.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+A run starts with at least min_length printable ASCII characters (tab and
+0x20-0x7E), as single bytes or as UTF-16LE code units (character + NUL),
+and includes the Latin-1 letters (0xA0-0xFF) around that prefix, so
+"Straße" in a cp1252 or UTF-16 document stays one run.
+
+The file is mapped (mmap) and scanned in windows of chunk_bytes. Nothing
+is done per byte in Python: each window is translated into a class mask
+with one bytes.translate() ("p" printable, "h" Latin-1, "z" NUL, " "
+anything else) and the runs are found with a regex that starts with a
+literal ("pppppp", "pzpzpz..."), which the regex engine searches with its
+fast prefix scan. Only the runs themselves are decoded. Runs that reach
+the end of a window are scanned again from their start in the next one.
+"""
+
+import mmap
+import re
+from functools import lru_cache
+from typing import Iterator, Tuple
+
+MIN_LENGTH = 6
+CHUNK_BYTES = 1024 * 1024
+
+
+def _class_mask() -> bytes:
+    mask = bytearray(b' ' * 256)
+    for byte in range(0x20, 0x7f):
+        mask[byte] = ord('p')
+    mask[ord('\t')] = ord('p')
+    for byte in range(0xa0, 0x100):
+        mask[byte] = ord('h')
+    mask[0] = ord('z')
+    return bytes(mask)
+
+
+_CLASS_MASK = _class_mask()
+_NUL_CLASS = ord('z')
+_TEXT_CLASSES = (ord('p'), ord('h'))
+_MAX_LOOKBACK = 64
+
+
+def _extend_back(window: bytes, start: int, wide: bool) -> int:
+    """Start of a run including Latin-1 letters in front of its ASCII prefix ("Straße": "Straß")."""
+    lower = max(0, start - _MAX_LOOKBACK)
+    if wide:
+        while start - 2 >= lower and window[start - 1] == _NUL_CLASS and window[start - 2] in _TEXT_CLASSES:
+            start -= 2
+    else:
+        while start > lower and window[start - 1] in _TEXT_CLASSES:
+            start -= 1
+    return start
+
+
+@lru_cache(maxsize=8)
+def _run_pattern(min_length: int):
+    # Ohne Gruppen: mit Gruppen sucht die Regex-Engine nicht mehr nach dem Literal-Präfix
+    return re.compile(b'p' * min_length + b'[ph]*|' + b'pz' * min_length + b'(?:[ph]z)*')
+
+
+def offset_line(offset: int, text: str) -> str:
+    """Run with its location in the file: "[@0x1a2b] text"."""
+    return f'[@{offset:#x}] {text}'
+
+
+def iter_printable_runs(file_path: str, min_length: int = MIN_LENGTH,
+                        chunk_bytes: int = CHUNK_BYTES) -> Iterator[Tuple[int, str]]:
+    """(byte offset, text) of every printable run, in file order (see module docstring)."""
+    pattern = _run_pattern(min_length)
+    wide_start = b'z' + b'pz' * min_length
+    overlap = len(wide_start) + 1  # Folgen, die hier beginnen, prüft das nächste Fenster vollständig
+    chunk_bytes = max(chunk_bytes, 2 * overlap)
+    with open(file_path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Leere Datei
+        with data:
+            size = len(data)
+            pos = 0
+            while pos < size:
+                end = min(pos + chunk_bytes, size)
+                raw = data[pos:end]
+                window = raw.translate(_CLASS_MASK)
+                final = end == size
+                if final:
+                    limit = next_pos = len(window)
+                else:
+                    # Zeichen vor limit, mit denen eine Folge im nächsten Fenster beginnen kann, dort mitlesen
+                    limit = len(window) - overlap
+                    tail = window[max(limit // 2, limit - _MAX_LOOKBACK):limit]
+                    next_pos = limit - (len(tail) - len(tail.rstrip(b'phz')))
+                next_pos += pos
+                for match in pattern.finditer(window):
+                    start, stop = match.span()
+                    if start >= limit:
+                        break
+                    wide = window[start + 1] == _NUL_CLASS
+                    start = _extend_back(window, start, wide)
+                    if not final and stop >= len(window) - len(wide_start):
+                        if start > 0:
+                            next_pos = pos + start  # Kann im nächsten Fenster weitergehen
+                            break
+                        # Sonst länger als ein Fenster: geteilt ausgeben
+                    if not wide and window.startswith(wide_start, stop):
+                        stop -= 1  # Letztes Zeichen beginnt eine UTF-16LE-Folge
+                    next_pos = max(next_pos, pos + stop)  # Rest der Folge nicht im nächsten Fenster
+                    text = raw[start:stop].decode('utf-16-le' if wide else 'latin-1')
+                    text = text.strip()
+                    if text:
+                        yield pos + start, text
+                pos = next_pos
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Stage Profiler
+===============================
+Per-stage timing of a search, enabled with ENABLE_PROFILING.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Stages of the search pipeline:
+    walk      - directory walk (collect_files_and_folders)
+    filter    - size check and text file detection
+    read      - raw file reads (bytes read from disk)
+    decode    - decoding and line splitting of text files
+    extract   - office/PDF/OCR text extraction
+    match     - matching lines and file names against the search terms
+    transfer  - batch result transfer from the worker to the main process
+    report    - HTML report generation
+
+Each batch (thread or worker process) records into its own StageProfiler,
+which is sent back with the batch result and merged in the main process.
+Read, decode and match run interleaved in one line loop; wall time of
+decode is the loop time minus read and match time, and the loop's CPU time
+is split between decode and match by their wall-time share.
+
+With PROFILE_WITH_CPROFILE every batch additionally runs under cProfile;
+the pstats data of all workers is merged and written to PROFILE_OUTPUT_FILE.
+"""
+
+import io
+import os
+import time
+import threading
+import cProfile
+import pstats
+from typing import Any, Dict, Iterable, List, Optional
+
+STAGES = ('walk', 'filter', 'read', 'decode', 'extract', 'match', 'transfer', 'report')
+
+# Felder pro Stufe: Wall-Zeit, CPU-Zeit (Sekunden), Anzahl, gelesene Bytes
+_WALL, _CPU, _COUNT, _BYTES = range(4)
+
+
+class _Stage:
+    """Context manager that records one stage measurement."""
+
+    __slots__ = ('profiler', 'name', 'count', 'nbytes', '_wall', '_cpu')
+
+    def __init__(self, profiler, name, count, nbytes):
+        self.profiler = profiler
+        self.name = name
+        self.count = count
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self._wall, time.thread_time() - self._cpu,
+                          self.count, self.nbytes)
+        return False
+
+
+class _NullStage:
+    """Stage placeholder used while profiling is disabled."""
+
+    count = 0
+    nbytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageProfiler:
+    """Accumulates wall time, CPU time, counts and bytes per stage."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, count: int = 1, nbytes: int = 0):
+        """Context manager measuring a stage; count/nbytes can be set on the returned object."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, count, nbytes)
+
+    def add(self, name: str, wall: float, cpu: float = 0.0, count: int = 1, nbytes: int = 0):
+        """Add a measurement to a stage."""
+        with self._lock:
+            values = self.stages.get(name)
+            if values is None:
+                values = self.stages[name] = [0.0, 0.0, 0, 0]
+            values[_WALL] += wall
+            values[_CPU] += cpu
+            values[_COUNT] += count
+            values[_BYTES] += nbytes
+
+    def total(self, name: str) -> List[float]:
+        """Current [wall, cpu, count, bytes] of a stage."""
+        return list(self.stages.get(name, (0.0, 0.0, 0, 0)))
+
+    def scan(self, decoding: bool, rest_stage: Optional[str] = None, rest_bytes: int = 0):
+        """Timer for a line loop (None while profiling is disabled).
+
+        Without decoding, the loop time outside of matching is booked to
+        rest_stage (e.g. 'extract' for streaming extractors) if given.
+        """
+        return _ScanTimer(self, decoding, rest_stage, rest_bytes) if self.enabled else None
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        """Plain, picklable copy of the measurements."""
+        with self._lock:
+            return {name: list(values) for name, values in self.stages.items()}
+
+    def merge(self, data: Optional[Dict[str, List[float]]]):
+        """Merge measurements of another profiler (see to_dict)."""
+        for name, (wall, cpu, count, nbytes) in (data or {}).items():
+            self.add(name, wall, cpu, count, nbytes)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Stage rows in pipeline order for the summary table and the HTML report."""
+        data = self.to_dict()
+        total_wall = sum(values[_WALL] for values in data.values()) or 1.0
+        names = [name for name in STAGES if name in data] + sorted(set(data) - set(STAGES))
+        return [{
+            'stage': name,
+            'wall_s': round(data[name][_WALL], 4),
+            'cpu_s': round(data[name][_CPU], 4),
+            'count': int(data[name][_COUNT]),
+            'bytes': int(data[name][_BYTES]),
+            'share_percent': round(data[name][_WALL] / total_wall * 100, 1),
+        } for name in names]
+
+    def format_table(self) -> str:
+        """Summary table as text."""
+        lines = [f"{'Stufe':10s} {'Wall (s)':>10s} {'CPU (s)':>10s} {'Anzahl':>10s} {'MB':>10s} {'Anteil':>8s}"]
+        for row in self.rows():
+            lines.append(f"{row['stage']:10s} {row['wall_s']:10.3f} {row['cpu_s']:10.3f} {row['count']:10,d} "
+                         f"{row['bytes'] / (1024 * 1024):10.2f} {row['share_percent']:7.1f}%")
+        return '\n'.join(lines)
+
+
+class _ScanTimer:
+    """Splits the time of a line loop into decode and match (see module docstring)."""
+
+    __slots__ = ('profiler', 'decoding', 'rest_stage', 'rest_bytes', 'match_wall', 'lines', '_wall', '_cpu', '_read')
+
+    def __init__(self, profiler: StageProfiler, decoding: bool, rest_stage: Optional[str] = None,
+                 rest_bytes: int = 0):
+        self.profiler = profiler
+        self.decoding = decoding
+        self.rest_stage = rest_stage
+        self.rest_bytes = rest_bytes
+        self.match_wall = 0.0
+        self.lines = 0
+        self._read = profiler.total('read')
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    def finish(self):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        read = self.profiler.total('read')
+        read_wall = read[_WALL] - self._read[_WALL]
+        read_cpu = read[_CPU] - self._read[_CPU]
+        rest_wall = max(0.0, wall - read_wall)
+        rest_cpu = max(0.0, cpu - read_cpu)
+        match_wall = min(self.match_wall, rest_wall)
+        match_share = match_wall / rest_wall if rest_wall else 1.0
+        self.profiler.add('match', match_wall, rest_cpu * match_share, self.lines)
+        if self.decoding:
+            self.profiler.add('decode', rest_wall - match_wall, rest_cpu * (1 - match_share), self.lines)
+        elif self.rest_stage:
+            self.profiler.add(self.rest_stage, rest_wall - match_wall, rest_cpu * (1 - match_share),
+                              nbytes=self.rest_bytes)
+
+
+class _TimedRawFile(io.RawIOBase):
+    """Unbuffered binary file that records its reads as 'read' stage."""
+
+    def __init__(self, path: str, profiler: StageProfiler):
+        self._file = open(path, 'rb', buffering=0)
+        self._profiler = profiler
+        profiler.add('read', 0.0, 0.0, 1, 0)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        size = self._file.readinto(buffer)
+        self._profiler.add('read', time.perf_counter() - wall, time.thread_time() - cpu, 0, size or 0)
+        return size
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def open_text(path: str, encoding: str, profiler: Optional[StageProfiler] = None):
+    """open(path, 'r', encoding=encoding), with read timing while profiling is enabled."""
+    if profiler is None or not profiler.enabled:
+        return open(path, 'r', encoding=encoding)
+    return io.TextIOWrapper(open_buffered(path, profiler), encoding=encoding)
+
+
+def open_buffered(path: str, profiler: Optional[StageProfiler] = None):
+    """open(path, 'rb'), with read timing while profiling is enabled."""
+    if profiler is None or not profiler.enabled:
+        return open(path, 'rb')
+    return io.BufferedReader(_TimedRawFile(path, profiler))
+
+
+class BatchResult(list):
+    """Batch results plus the batch's profile data and file statistics (pickled together with the list)."""
+
+    def __init__(self, results: Iterable = (), profile: Optional[Dict[str, List[float]]] = None,
+                 pstats_data: Optional[dict] = None, file_stats: Optional[Dict[str, Any]] = None,
+                 busy_seconds: float = 0.0):
+        super().__init__(results)
+        self.profile = profile
+        self.pstats_data = pstats_data
+        self.file_stats = file_stats
+        self.busy_seconds = busy_seconds  # Laufzeit des Batches im Worker (für die Auslastung)
+        self.finished_at = time.time()
+
+
+class BatchProfile:
+    """Profiler and optional cProfile for one batch."""
+
+    def __init__(self, enabled: bool = False, use_cprofile: bool = False):
+        self.profiler = StageProfiler(enabled)
+        self._cprofile = cProfile.Profile() if enabled and use_cprofile else None
+        self._started = time.perf_counter()
+
+    def __enter__(self):
+        if self._cprofile is not None:
+            try:
+                self._cprofile.enable()
+            except ValueError:
+                # Ein anderer Thread profiliert bereits (nur ein Profiler gleichzeitig möglich)
+                self._cprofile = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        return False
+
+    def result(self, results: Iterable, file_stats: Optional[Dict[str, Any]] = None):
+        """Wrap batch results together with profile data and file statistics (see FileStats.to_dict)."""
+        busy_seconds = time.perf_counter() - self._started
+        if not self.profiler.enabled:
+            return BatchResult(results, file_stats=file_stats, busy_seconds=busy_seconds)
+        pstats_data = None
+        if self._cprofile is not None:
+            self._cprofile.create_stats()
+            pstats_data = self._cprofile.stats
+        return BatchResult(results, self.profiler.to_dict(), pstats_data, file_stats, busy_seconds)
+
+
+class _StatsData:
+    """Adapter so pstats.Stats can load raw stats dicts."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class ProfileCollector:
+    """Main-process side: merges batch profiles and cProfile data."""
+
+    def __init__(self, enabled: bool = False):
+        self.profiler = StageProfiler(enabled)
+        self.pstats = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.profiler.enabled
+
+    def receive(self, batch_results, handling_wall: float = 0.0, handling_cpu: float = 0.0):
+        """Merge the profile data attached to a batch result and record the transfer stage."""
+        if not self.enabled or not isinstance(batch_results, BatchResult) or batch_results.profile is None:
+            return
+        self.profiler.merge(batch_results.profile)
+        transfer = max(0.0, time.time() - batch_results.finished_at)
+        self.profiler.add('transfer', transfer + handling_wall, handling_cpu, 1)
+        if batch_results.pstats_data:
+            if self.pstats is None:
+                self.pstats = pstats.Stats(_StatsData(batch_results.pstats_data))
+            else:
+                self.pstats.add(_StatsData(batch_results.pstats_data))
+
+    def write(self, path: str, limit: int = 40) -> str:
+        """Write the stage table and the merged cProfile statistics to path."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('Master Search - Performance Profile\n\n')
+            f.write(self.profiler.format_table() + '\n')
+            if self.pstats is not None:
+                f.write('\n')
+                self.pstats.stream = f
+                self.pstats.sort_stats('cumulative').print_stats(limit)
+        return path
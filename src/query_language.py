@@ -0,0 +1,928 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Query Language
+===============================
+Boolean search queries with phrases, regexes and file filters.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Syntax (FileSearchTool.search_query):
+
+    (error OR fatal) AND NOT debug ext:log size>1M path:/srv/*
+
+    - words are literal terms (regexes if use_regex is set), "quoted text"
+      is a literal phrase, /ERR-\\d{4}/ is always a regex
+    - AND, OR, NOT (upper case) and parentheses; adjacent expressions are
+      combined with AND, -word is short for NOT word
+    - precedence: NOT before AND before OR
+    - file filters: ext:log,txt  name:*.log  path:/srv/*  (globs; without
+      wildcards a substring), size>1M (B, K, M, G, T; also >=, <, <=, =),
+      mtime>2024-01-01 (ISO date), age<7d (s, m, h, d, w)
+    - projection: col:email (CSV column or JSON key, also col:name,email),
+      json:$.user.id (JSON path); the terms are only searched in these
+      values of CSV and JSON files (src/structured_search.py), other files
+      are searched as usual. Only combined with AND, never under OR/NOT.
+
+Terms are evaluated per line, filters per file. bind() with scope 'file'
+evaluates the terms over the whole file instead ("the file contains all
+terms"), scope 'near' over every window of near_lines lines; both run in a
+single pass over the lines (see ScopedMatcher). compile_query() returns a
+QueryPlan; its planner evaluates the cheap predicates first:
+
+    1. name, path and extension filters (known from the walk)
+    2. size, mtime and age filters (one stat, only if still undecided)
+    3. literals, the most selective first (AND) or the least selective
+       first (OR), then regexes
+
+A file whose filters decide the query as False is never opened (and never
+extracted); if the filters alone decide it as True, the file matches
+without being read. With prefilter set, regexes first test a literal every
+match must contain (src/regex_prefilter.py) and may_match() tells from the
+raw bytes of a text file whether any line can match at all. The same
+literals as a plain tree (literal_condition) let extractors push the
+search into other engines, e.g. SQL for SQLite databases.
+"""
+
+import os
+import re
+import time
+import fnmatch
+from datetime import datetime
+from functools import lru_cache
+from collections import deque
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .regex_prefilter import line_prefilter, bytes_prefilter, literal_needles, bytes_finder
+from .structured_search import parse_json_path
+
+KEYWORDS = ('AND', 'OR', 'NOT')
+NAME_FIELDS = ('ext', 'name', 'path')
+STAT_FIELDS = ('size', 'mtime', 'age')
+PROJECTION_FIELDS = ('col', 'json')
+
+_SIZE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3, 't': 1024 ** 4}
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+_SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?$', re.IGNORECASE)
+_DURATION_RE = re.compile(r'^(\d+(?:\.\d+)?)([smhdw])$', re.IGNORECASE)
+_FILTER_RE = re.compile(r'^(ext|name|path|size|mtime|age|col|json)(>=|<=|>|<|=|:)(.*)$', re.IGNORECASE | re.DOTALL)
+
+# Häufige Buchstaben (Deutsch/Englisch) machen ein Literal weniger selektiv
+_COMMON_CHARS = frozenset('etaoinsrhdlu ')
+_RARE_CHARS = frozenset('qxzjyvkw0123456789')
+
+# Geltungsbereich der Begriffe: eine Zeile, die ganze Datei oder ein Fenster von N Zeilen
+SCOPES = ('line', 'file', 'near')
+
+# Kosten pro Prädikat für die Reihenfolge der Auswertung
+COST_NAME, COST_STAT, COST_LITERAL, COST_REGEX = 1, 2, 4, 16
+
+
+class QuerySyntaxError(ValueError):
+    """Invalid query; position is the character offset of the error."""
+
+    def __init__(self, message: str, position: int = 0):
+        super().__init__(f'{message} (Position {position + 1})')
+        self.position = position
+
+
+# AST ------------------------------------------------------------------------
+
+class Term:
+    """Literal, phrase or regex, evaluated per line."""
+
+    __slots__ = ('text', 'kind')
+
+    def __init__(self, text: str, kind: str = 'literal'):
+        self.text = text
+        self.kind = kind  # 'literal', 'phrase' oder 'regex'
+
+    def __repr__(self):
+        if self.kind == 'regex':
+            return f'/{self.text}/'
+        return f'"{self.text}"' if self.kind == 'phrase' or ' ' in self.text else self.text
+
+
+class Filter:
+    """File filter (name, path, extension, size, mtime or age)."""
+
+    __slots__ = ('field', 'op', 'value', 'raw')
+
+    def __init__(self, field: str, op: str, value, raw: str):
+        self.field = field
+        self.op = op
+        self.value = value
+        self.raw = raw
+
+    @property
+    def cost(self) -> int:
+        return COST_STAT if self.field in STAT_FIELDS else COST_NAME
+
+    def __repr__(self):
+        return f'{self.field}{":" if self.op == ":" else self.op}{self.raw}'
+
+
+class Not:
+    __slots__ = ('child',)
+
+    def __init__(self, child):
+        self.child = child
+
+    def __repr__(self):
+        return f'NOT {self.child!r}'
+
+
+class And:
+    __slots__ = ('children',)
+
+    def __init__(self, children):
+        self.children = list(children)
+
+    def __repr__(self):
+        return '(' + ' AND '.join(repr(child) for child in self.children) + ')'
+
+
+class Or:
+    __slots__ = ('children',)
+
+    def __init__(self, children):
+        self.children = list(children)
+
+    def __repr__(self):
+        return '(' + ' OR '.join(repr(child) for child in self.children) + ')'
+
+
+Node = Union[Term, Filter, Not, And, Or]
+
+
+# Parser ---------------------------------------------------------------------
+
+def _read_quoted(text: str, start: int) -> Tuple[str, int]:
+    """Text between the quote at start and the next quote; returns (text, end)."""
+    end = text.find('"', start + 1)
+    if end == -1:
+        raise QuerySyntaxError('Anführungszeichen nicht geschlossen', start)
+    return text[start + 1:end], end + 1
+
+
+def _regex_end(text: str, start: int) -> int:
+    """Closing slash of a /regex/ at start (-1 if it is a plain word like /var/log)."""
+    i = start + 1
+    while i < len(text):
+        char = text[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '/' and i > start + 1 and (i + 1 == len(text) or text[i + 1].isspace() or text[i + 1] == ')'):
+            return i
+        i += 1
+    return -1
+
+
+def tokenize(text: str) -> List[tuple]:
+    """Tokens: ('(', pos), (')', pos), (keyword, pos), ('TERM', pos, Term), ('FILTER', pos, Filter)."""
+    tokens = []
+    i = 0
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char.isspace():
+            i += 1
+            continue
+        if char in '()':
+            tokens.append((char, i))
+            i += 1
+            continue
+        if char == '"':
+            start = i
+            phrase, i = _read_quoted(text, i)
+            if phrase:
+                tokens.append(('TERM', start, Term(phrase, 'phrase')))
+            continue
+        if char == '/':
+            end = _regex_end(text, i)
+            if end != -1:
+                tokens.append(('TERM', i, Term(text[i + 1:end], 'regex')))
+                i = end + 1
+                continue
+        if char == '-' and i + 1 < length and not text[i + 1].isspace() and text[i + 1] != ')':
+            tokens.append(('NOT', i))
+            i += 1
+            continue
+        start = i
+        while i < length and not text[i].isspace() and text[i] not in '()':
+            if text[i] == '"':
+                _value, i = _read_quoted(text, i)  # path:"/mit leerzeichen/*"
+                continue
+            i += 1
+        word = text[start:i]
+        if word in KEYWORDS:
+            tokens.append((word, start))
+            continue
+        match = _FILTER_RE.match(word)
+        if match and match.group(3):
+            tokens.append(('FILTER', start, _make_filter(match.group(1).lower(), match.group(2),
+                                                          match.group(3), start)))
+        else:
+            tokens.append(('TERM', start, Term(word)))
+    return tokens
+
+
+def _parse_size(raw: str, position: int) -> int:
+    match = _SIZE_RE.match(raw.strip())
+    if not match:
+        raise QuerySyntaxError(f'Ungültige Größe: {raw}', position)
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def _parse_date(raw: str, position: int) -> float:
+    try:
+        return datetime.fromisoformat(raw).timestamp()
+    except ValueError:
+        raise QuerySyntaxError(f'Ungültiges Datum (JJJJ-MM-TT): {raw}', position) from None
+
+
+def _parse_duration(raw: str, position: int) -> float:
+    match = _DURATION_RE.match(raw.strip())
+    if not match:
+        raise QuerySyntaxError(f'Ungültige Dauer (z.B. 7d, 12h): {raw}', position)
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2).lower()]
+
+
+def _make_filter(field: str, op: str, raw: str, position: int) -> Filter:
+    value_text = raw[1:-1] if len(raw) >= 2 and raw[0] == raw[-1] == '"' else raw
+    if field in NAME_FIELDS:
+        if op != ':':
+            raise QuerySyntaxError(f'{field} erwartet {field}:Wert', position)
+        if field == 'ext':
+            value = frozenset('.' + ext.strip().lstrip('.').lower() for ext in value_text.split(',') if ext.strip())
+        else:
+            value = value_text
+        return Filter(field, op, value, raw)
+    if field in PROJECTION_FIELDS:
+        if op != ':':
+            raise QuerySyntaxError(f'{field} erwartet {field}:Wert', position)
+        if field == 'col':
+            value = tuple(name.strip() for name in value_text.split(',') if name.strip())
+            if not value:
+                raise QuerySyntaxError('col: ohne Spaltenname', position)
+        else:
+            try:
+                value = parse_json_path(value_text)
+            except ValueError as e:
+                raise QuerySyntaxError(str(e), position) from None
+        return Filter(field, op, value, raw)
+    if field == 'size':
+        return Filter(field, '=' if op == ':' else op, _parse_size(value_text, position), raw)
+    if op in (':', '='):
+        raise QuerySyntaxError(f'{field} erwartet einen Vergleich (<, <=, >, >=)', position)
+    parse = _parse_date if field == 'mtime' else _parse_duration
+    return Filter(field, op, parse(value_text, position), raw)
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def peek(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise QuerySyntaxError('Leere Abfrage', 0)
+        node = self.parse_or()
+        token = self.peek()
+        if token is not None:
+            raise QuerySyntaxError(f'Unerwartetes {token[0]!r}', token[1])
+        return node
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self.peek() is not None and self.peek()[0] == 'OR':
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self) -> Node:
+        children = [self.parse_unary()]
+        while True:
+            token = self.peek()
+            if token is None or token[0] in ('OR', ')'):
+                break
+            if token[0] == 'AND':
+                self.take()
+            children.append(self.parse_unary())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_unary(self) -> Node:
+        token = self.take()
+        if token is None:
+            raise QuerySyntaxError('Ausdruck erwartet', len(self.text))
+        kind = token[0]
+        if kind == 'NOT':
+            return Not(self.parse_unary())
+        if kind == '(':
+            node = self.parse_or()
+            closing = self.take()
+            if closing is None or closing[0] != ')':
+                raise QuerySyntaxError('Klammer nicht geschlossen', token[1])
+            return node
+        if kind in ('TERM', 'FILTER'):
+            return token[2]
+        raise QuerySyntaxError(f'Unerwartetes {kind!r}', token[1])
+
+
+def parse_query(text: str) -> Node:
+    """Parse a query into its AST (QuerySyntaxError on invalid input)."""
+    return _Parser(text).parse()
+
+
+# Planer -----------------------------------------------------------------------
+
+def selectivity(text: str) -> float:
+    """Rough selectivity of a literal: longer and rarer characters match fewer lines."""
+    score = 0.0
+    for char in text.lower():
+        if char in _COMMON_CHARS:
+            score += 1.0
+        elif char in _RARE_CHARS or not char.isalpha():
+            score += 3.0
+        else:
+            score += 2.0
+    return score
+
+
+def _cost(node: Node) -> float:
+    if isinstance(node, Term):
+        return COST_REGEX if node.kind == 'regex' else COST_LITERAL
+    if isinstance(node, Filter):
+        return node.cost
+    if isinstance(node, Not):
+        return _cost(node.child)
+    return sum(_cost(child) for child in node.children)
+
+
+def _selectivity(node: Node) -> float:
+    if isinstance(node, Term):
+        return selectivity(node.text) if node.kind != 'regex' else 0.0
+    if isinstance(node, Not):
+        return 0.0  # Negation trifft meistens zu
+    if isinstance(node, And):
+        return sum(_selectivity(child) for child in node.children)
+    if isinstance(node, Or):
+        return min(_selectivity(child) for child in node.children)
+    return 0.0
+
+
+def _plan_order(node: Node) -> Node:
+    """Reorder AND/OR children: cheap first; AND most selective first, OR least selective first."""
+    if isinstance(node, Not):
+        return Not(_plan_order(node.child))
+    if isinstance(node, And):
+        return And(sorted((_plan_order(child) for child in node.children),
+                          key=lambda child: (_cost(child), -_selectivity(child))))
+    if isinstance(node, Or):
+        return Or(sorted((_plan_order(child) for child in node.children),
+                         key=lambda child: (_cost(child), _selectivity(child))))
+    return node
+
+
+def _walk(node: Node, negated: bool = False):
+    """(node, negated) for every leaf."""
+    if isinstance(node, Not):
+        yield from _walk(node.child, not negated)
+    elif isinstance(node, (And, Or)):
+        for child in node.children:
+            yield from _walk(child, negated)
+    else:
+        yield node, negated
+
+
+def _split_projection(node: Node) -> Tuple[Node, Tuple[tuple, ...]]:
+    """The query without its col:/json: filters and the projection they form: (('col', name), ('json', path))."""
+    projection = []
+
+    def strip(node):
+        if isinstance(node, Filter) and node.field in PROJECTION_FIELDS:
+            if node.field == 'col':
+                projection.extend(('col', name) for name in node.value)
+            else:
+                projection.append(('json', node.value))
+            return None
+        if isinstance(node, And):
+            children = [child for child in (strip(child) for child in node.children) if child is not None]
+            if not children:
+                return None
+            return children[0] if len(children) == 1 else And(children)
+        return node
+
+    stripped = strip(node)
+    if stripped is None:
+        raise QuerySyntaxError('col: und json: wählen nur Werte aus, es fehlt ein Suchbegriff', 0)
+    for leaf, _negated in _walk(stripped):
+        if isinstance(leaf, Filter) and leaf.field in PROJECTION_FIELDS:
+            raise QuerySyntaxError(f'{leaf.field}:{leaf.raw} nur mit AND verknüpfbar, nicht in OR oder NOT', 0)
+    return stripped, tuple(projection)
+
+
+def _glob_match(pattern: str, value: str, case_sensitive: bool) -> bool:
+    if not case_sensitive:
+        pattern, value = pattern.lower(), value.lower()
+    if any(char in pattern for char in '*?['):
+        return fnmatch.fnmatchcase(value, pattern)
+    return pattern in value
+
+
+def _compare(op: str, actual: float, expected: float) -> bool:
+    if op == '>':
+        return actual > expected
+    if op == '>=':
+        return actual >= expected
+    if op == '<':
+        return actual < expected
+    if op == '<=':
+        return actual <= expected
+    return actual == expected
+
+
+def _reduce(node: Node, outcomes) -> Union[bool, Node]:
+    """Partial evaluation: replace decided filters by their outcome (None = unknown)."""
+    if isinstance(node, Filter):
+        outcome = outcomes.get(id(node))
+        return node if outcome is None else outcome
+    if isinstance(node, Term):
+        return node
+    if isinstance(node, Not):
+        child = _reduce(node.child, outcomes)
+        return (not child) if isinstance(child, bool) else Not(child)
+    is_and = isinstance(node, And)
+    children = []
+    for child in node.children:
+        child = _reduce(child, outcomes)
+        if isinstance(child, bool):
+            if child != is_and:
+                return child  # False in AND, True in OR entscheidet
+            continue
+        children.append(child)
+    if not children:
+        return is_and
+    if len(children) == 1:
+        return children[0]
+    return And(children) if is_and else Or(children)
+
+
+LineMatcher = Callable[[str], bool]
+
+
+class QueryPlan:
+    """Compiled query: file filters, line matcher and the positive terms for highlighting."""
+
+    def __init__(self, text: str, case_sensitive: bool = False, use_regex: bool = False,
+                 parsed: Optional[Node] = None, prefilter: bool = True):
+        self.text = text
+        self.case_sensitive = case_sensitive
+        self.use_regex = use_regex
+        self.prefilter = prefilter
+        if parsed is None:
+            parsed = parse_query(text)
+        # Spalten/JSON-Pfade für strukturierte Dateien, kein Teil der Auswertung
+        parsed, self.projection = _split_projection(parsed)
+        self.root = _plan_order(parsed)
+        leaves = list(_walk(parsed))  # Begriffe in der geschriebenen Reihenfolge
+        self.filters = [leaf for leaf, _negated in leaves if isinstance(leaf, Filter)]
+        self.name_filters = [f for f in self.filters if f.field in NAME_FIELDS]
+        self.stat_filters = [f for f in self.filters if f.field in STAT_FIELDS]
+        self.has_terms = any(isinstance(leaf, Term) for leaf, _negated in leaves)
+        # Dateieigenschaften gibt es nur für Dateien: solche Abfragen liefern keine Ordner
+        self.file_only = any(f.field in ('ext', 'size', 'mtime', 'age') for f in self.filters)
+        terms = []
+        for leaf, negated in leaves:
+            if isinstance(leaf, Term) and not negated and leaf.text not in terms:
+                terms.append(leaf.text)
+        self.terms: Tuple[str, ...] = tuple(terms)
+        self._positive = [(leaf.text, self._term_test(leaf)) for leaf, negated in leaves
+                          if isinstance(leaf, Term) and not negated]
+        self._needs_lower = any(isinstance(leaf, Term) and self._term_needs_lower(leaf)
+                                for leaf, _negated in leaves)
+        # Muster der positiven Regex-Begriffe (Fundstelle für den Ausschnitt langer Zeilen)
+        self._patterns = {}
+        for leaf, negated in leaves:
+            if isinstance(leaf, Term) and not negated and leaf.text not in self._patterns:
+                self._patterns[leaf.text] = self._compile_regex(leaf)
+        self._matchers = {}  # Ergebnis der Filter -> kompilierter Zeilen-Matcher
+        # Test der Rohbytes einer Datei (None = jede Datei kann passen)
+        self._buffer_test = self._compile_buffer(self.root) if prefilter else None
+        # Dieselben Literale als Baum für Extraktoren (picklebar, z.B. als SQL-Bedingung)
+        self.literal_condition = self._literal_tree(self.root) if prefilter else None
+
+    def __repr__(self):
+        return f'QueryPlan({self.root!r})'
+
+    @classmethod
+    def from_terms(cls, terms, mode: str = 'any', case_sensitive: bool = False,
+                   use_regex: bool = False, prefilter: bool = True) -> 'QueryPlan':
+        """Plan for classic search_terms/search_mode ('all' = AND, 'any' = OR)."""
+        leaves = [Term(term) for term in terms]
+        parsed = leaves[0] if len(leaves) == 1 else (And(leaves) if mode == 'all' else Or(leaves))
+        return cls(repr(parsed), case_sensitive, use_regex, parsed, prefilter)
+
+    # Dateifilter ------------------------------------------------------------
+
+    def _filter(self, flt: Filter, path: str, name: str, stat) -> bool:
+        field = flt.field
+        if field == 'ext':
+            return os.path.splitext(name)[1].lower() in flt.value
+        if field == 'name':
+            return _glob_match(flt.value, name, self.case_sensitive)
+        if field == 'path':
+            return _glob_match(flt.value, path.replace(os.sep, '/'), self.case_sensitive) or \
+                _glob_match(flt.value, path, self.case_sensitive)
+        if field == 'size':
+            return _compare(flt.op, stat.st_size, flt.value)
+        if field == 'mtime':
+            return _compare(flt.op, stat.st_mtime, flt.value)
+        return _compare(flt.op, time.time() - stat.st_mtime, flt.value)  # age
+
+    def bind(self, path: str, name: Optional[str] = None, stat=None, scope: str = 'line',
+             near_lines: int = 0) -> Union[bool, LineMatcher, 'ScopedMatcher']:
+        """Apply the file filters to one file.
+
+        Returns False (skip the file without reading it), True (the filters alone
+        match) or a matcher for its lines; a ScopedMatcher for scope 'file' and
+        'near'. stat is an os.stat_result or a callable returning one; it is only
+        used if size/mtime/age filters are still undecided.
+        """
+        if not self.filters:
+            return self._bound(self.root, (), scope, near_lines)
+        if name is None:
+            name = os.path.basename(path)
+        outcomes = {}
+        for flt in self.name_filters:
+            outcomes[id(flt)] = self._filter(flt, path, name, None)
+        reduced = _reduce(self.root, outcomes)
+        if self.stat_filters and not isinstance(reduced, bool):
+            if any(isinstance(leaf, Filter) for leaf, _negated in _walk(reduced)):
+                try:
+                    stat_result = stat() if callable(stat) else (stat or os.stat(path))
+                except OSError:
+                    return False
+                for flt in self.stat_filters:
+                    outcomes[id(flt)] = self._filter(flt, path, name, stat_result)
+                reduced = _reduce(self.root, outcomes)
+        if isinstance(reduced, bool):
+            return reduced
+        return self._bound(reduced, tuple(outcomes.get(id(flt)) for flt in self.filters), scope, near_lines)
+
+    def _bound(self, reduced: Node, key: Tuple, scope: str, near_lines: int):
+        """Line matcher (or ScopedMatcher) of the reduced query, cached per filter outcome."""
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            matcher = self._matchers[key] = self._line_matcher(reduced)
+        if scope == 'line':
+            return matcher
+        scoped_key = (key, scope, near_lines)
+        scoped = self._matchers.get(scoped_key)
+        if scoped is None:
+            scoped = self._matchers[scoped_key] = ScopedMatcher(self, reduced, scope, near_lines, matcher)
+        return scoped
+
+    def match_folder(self, path: str, name: str) -> bool:
+        """Folder name match: name/path filters apply, file-only filters exclude folders."""
+        if self.file_only or not self.has_terms:
+            return False
+        matcher = self.bind(os.path.join(path, name), name)
+        return matcher(name) if callable(matcher) else matcher
+
+    # Zeilen -------------------------------------------------------------------
+
+    def _is_regex(self, term: Term) -> bool:
+        return term.kind == 'regex' or (self.use_regex and term.kind == 'literal')
+
+    def _compile_regex(self, term: Term):
+        """Compiled regex of a term, None for literals and invalid regexes (searched as literal)."""
+        if not self._is_regex(term):
+            return None
+        try:
+            return re.compile(term.text, 0 if self.case_sensitive else re.IGNORECASE)
+        except re.error:
+            return None  # Ungültige Regex wie bisher als Literal suchen
+
+    def _term_needs_lower(self, term: Term) -> bool:
+        if self._compile_regex(term) is None:
+            return not self.case_sensitive
+        prefilter = line_prefilter(term.text, not self.case_sensitive) if self.prefilter else None
+        return prefilter is not None and prefilter[1]
+
+    def _term_test(self, term: Term):
+        """test(line, lowered_line) -> bool for one term."""
+        pattern = self._compile_regex(term)
+        if pattern is not None:
+            search = pattern.search
+            prefilter = line_prefilter(term.text, not self.case_sensitive) if self.prefilter else None
+            if prefilter is None:
+                return lambda line, _lowered: search(line) is not None
+            # Regex nur auf Zeilen, die ein erforderliches Literal enthalten
+            factor, use_lowered = prefilter
+            if len(factor) == 1:
+                needle = factor[0]
+                if use_lowered:
+                    return lambda line, lowered: needle in lowered and search(line) is not None
+                return lambda line, _lowered: needle in line and search(line) is not None
+            if use_lowered:
+                return lambda line, lowered: any(n in lowered for n in factor) and search(line) is not None
+            return lambda line, _lowered: any(n in line for n in factor) and search(line) is not None
+        if self.case_sensitive:
+            needle = term.text
+            return lambda line, _lowered: needle in line
+        needle = term.text.lower()
+        return lambda _line, lowered: needle in lowered
+
+    def _compile(self, node: Node):
+        if isinstance(node, Term):
+            return self._term_test(node)
+        if isinstance(node, Not):
+            test = self._compile(node.child)
+            return lambda line, lowered: not test(line, lowered)
+        tests = [self._compile(child) for child in node.children]
+        if isinstance(node, And):
+            def all_of(line, lowered):
+                for test in tests:
+                    if not test(line, lowered):
+                        return False
+                return True
+            return all_of
+
+        def any_of(line, lowered):
+            for test in tests:
+                if test(line, lowered):
+                    return True
+            return False
+        return any_of
+
+    def _line_matcher(self, node: Node) -> LineMatcher:
+        test = self._compile(node)
+        if self._needs_lower:
+            return lambda line: test(line, line.lower())
+        return lambda line: test(line, line)
+
+    def found_terms(self, line: str) -> List[str]:
+        """Positive terms occurring in line (for highlighting and term ids)."""
+        lowered = line.lower() if self._needs_lower else line
+        found = []
+        for text, test in self._positive:
+            if test(line, lowered) and text not in found:
+                found.append(text)
+        return found
+
+    def hit_position(self, line: str, term: str) -> int:
+        """First position of a found term in line (-1 if absent); regex terms by their pattern."""
+        pattern = self._patterns.get(term)
+        if pattern is not None:
+            match = pattern.search(line)
+            return match.start() if match else -1
+        if self.case_sensitive:
+            return line.find(term)
+        return line.lower().find(term.lower())
+
+    def _term_needles(self, term: Term):
+        if self._compile_regex(term) is not None:
+            return bytes_prefilter(term.text, not self.case_sensitive)
+        return literal_needles(term.text, not self.case_sensitive)
+
+    def _compile_buffer(self, node: Node):
+        """test(buffer, lower) -> bool; False only if no line of the buffer can match.
+
+        NOT and file filters can hold for any content and never exclude a buffer.
+        """
+        if isinstance(node, Term):
+            needles = self._term_needles(node)
+            if needles is None:
+                return None
+            find = bytes_finder(needles[0])
+            if needles[1]:
+                return lambda buffer, lower: find(lower())
+            return lambda buffer, _lower: find(buffer)
+        if isinstance(node, (Filter, Not)):
+            return None
+        tests = [self._compile_buffer(child) for child in node.children]
+        if isinstance(node, And):
+            tests = [test for test in tests if test is not None]
+            if not tests:
+                return None
+            return lambda buffer, lower: all(test(buffer, lower) for test in tests)
+        if any(test is None for test in tests):
+            return None
+        return lambda buffer, lower: any(test(buffer, lower) for test in tests)
+
+    def _literal_tree(self, node: Node):
+        """Literals every matching line contains, like _compile_buffer (None = any line can match).
+
+        ('needles', (bytes, ...), lowered): one of the ASCII needles, in the ASCII-lowercased line if lowered
+        ('all', children) / ('any', children): all or one of the conditions
+        """
+        if isinstance(node, Term):
+            needles = self._term_needles(node)
+            return None if needles is None else ('needles', needles[0], needles[1])
+        if isinstance(node, (Filter, Not)):
+            return None
+        children = [self._literal_tree(child) for child in node.children]
+        if isinstance(node, And):
+            children = [child for child in children if child is not None]
+            if not children:
+                return None
+            return children[0] if len(children) == 1 else ('all', tuple(children))
+        if any(child is None for child in children):
+            return None
+        return children[0] if len(children) == 1 else ('any', tuple(children))
+
+    @property
+    def has_buffer_test(self) -> bool:
+        return self._buffer_test is not None
+
+    def may_match(self, buffer: bytes) -> bool:
+        """Can any line of this raw text (utf-8/latin-1/cp1252) match? False = skip the file."""
+        if self._buffer_test is None:
+            return True
+        lowered = []
+
+        def lower():
+            if not lowered:
+                lowered.append(buffer.lower())
+            return lowered[0]
+        return self._buffer_test(buffer, lower)
+
+    def describe_filters(self) -> str:
+        return ' '.join(repr(flt) for flt in self.filters)
+
+
+class ScopedMatcher:
+    """Evaluates the terms of a query over a whole file or a window of lines in one pass.
+
+    Every distinct term is tested once per line. Scope 'file' remembers which
+    terms were seen and re-evaluates the query only when a new one appears: as
+    soon as the result is False (a term under NOT was seen) the file is
+    abandoned; at EOF unseen terms are False. Lines with positive terms are
+    held back until the result is known. Scope 'near' keeps the last line
+    of every term and reports the lines of each window of near_lines lines
+    (before the current line) in which the query holds.
+    """
+
+    def __init__(self, plan: QueryPlan, node: Node, scope: str, near_lines: int, match_line: LineMatcher):
+        if scope not in ('file', 'near'):
+            raise ValueError(f'Unbekannter Geltungsbereich: {scope!r}')
+        self.node = node
+        self.scope = scope
+        self.near_lines = max(0, near_lines)
+        self.match_line = match_line  # Zeilen-Semantik für Datei- und Ordnernamen
+        self._needs_lower = plan._needs_lower
+        self._index = {}  # id(Term) -> Index des Begriffs
+        self._tests: List[Callable[[str, str], bool]] = []
+        self._texts: List[str] = []
+        self._positive: List[bool] = []
+        distinct = {}
+        for leaf, negated in _walk(node):
+            if not isinstance(leaf, Term):
+                continue
+            index = distinct.get((leaf.text, leaf.kind))
+            if index is None:
+                index = distinct[(leaf.text, leaf.kind)] = len(self._tests)
+                self._tests.append(plan._term_test(leaf))
+                self._texts.append(leaf.text)
+                self._positive.append(False)
+            self._index[id(leaf)] = index
+            self._positive[index] = self._positive[index] or not negated
+
+    def __repr__(self):
+        return f'ScopedMatcher({self.scope}, {self.node!r})'
+
+    def _evaluate(self, node: Node, state) -> Optional[bool]:
+        """Three-valued evaluation; state[i] is True/False or None (not known yet)."""
+        if isinstance(node, Term):
+            return state[self._index[id(node)]]
+        if isinstance(node, Not):
+            value = self._evaluate(node.child, state)
+            return None if value is None else not value
+        is_and = isinstance(node, And)
+        unknown = False
+        for child in node.children:
+            value = self._evaluate(child, state)
+            if value is None:
+                unknown = True
+            elif value != is_and:
+                return value
+        return None if unknown else is_and
+
+    def _hits(self, line: str) -> List[int]:
+        lowered = line.lower() if self._needs_lower else line
+        return [index for index, test in enumerate(self._tests) if test(line, lowered)]
+
+    def _found(self, hits: List[int]) -> List[str]:
+        found = []
+        for index in hits:
+            if self._positive[index] and self._texts[index] not in found:
+                found.append(self._texts[index])
+        return found
+
+    def run(self, lines: Iterable[Tuple[int, str]], should_stop: Optional[Callable[[], bool]] = None,
+            check_interval: int = 1000, limit: int = 0) -> Iterator[Tuple[int, str, List[str]]]:
+        """(line_num, line, found_terms) of the lines to report; lines yields (line_num, line).
+
+        Stops reading as soon as the result is decided and nothing is left to
+        report, after limit reported lines, or when should_stop() returns True
+        (checked every check_interval lines).
+        """
+        if self.scope == 'file':
+            return self._run_file(lines, should_stop, check_interval, limit)
+        return self._run_near(lines, should_stop, check_interval, limit)
+
+    def _run_file(self, lines, should_stop, check_interval, limit):
+        seen = [None] * len(self._tests)  # True oder None (noch nicht gesehen)
+        decided = self._evaluate(self.node, seen)
+        if decided is False:
+            return
+        pending = []  # Trefferzeilen, solange das Ergebnis offen ist
+        reported = 0
+        for line_index, (line_num, line) in enumerate(lines, 1):
+            if should_stop is not None and line_index % check_interval == 0 and should_stop():
+                return
+            hits = self._hits(line)
+            if not hits:
+                continue
+            if decided is None and any(seen[index] is None for index in hits):
+                for index in hits:
+                    seen[index] = True
+                decided = self._evaluate(self.node, seen)
+                if decided is False:
+                    return  # Kann nicht mehr zutreffen: Rest der Datei nicht lesen
+            found = self._found(hits)
+            if not found:
+                continue
+            if decided:
+                for entry in pending:
+                    yield entry
+                reported += len(pending)
+                pending = []
+                yield line_num, line, found
+                reported += 1
+                if limit and reported >= limit:
+                    return
+            elif not limit or len(pending) < limit:
+                pending.append((line_num, line, found))
+        if decided is None:
+            decided = self._evaluate(self.node, [value or False for value in seen])
+        if decided:
+            yield from pending
+
+    def _run_near(self, lines, should_stop, check_interval, limit):
+        distance = self.near_lines
+        last = [None] * len(self._tests)  # Letzte Zeile mit dem Begriff
+        window = deque()  # Trefferzeilen der letzten distance Zeilen
+        reported_until = 0
+        reported = 0
+        for line_index, (line_num, line) in enumerate(lines, 1):
+            if should_stop is not None and line_index % check_interval == 0 and should_stop():
+                return
+            hits = self._hits(line)
+            if not hits:
+                continue
+            for index in hits:
+                last[index] = line_num
+            found = self._found(hits)
+            if found:
+                window.append((line_num, line, found))
+            start = line_num - distance
+            while window and window[0][0] < start:
+                window.popleft()
+            if not self._evaluate(self.node, [seen is not None and seen >= start for seen in last]):
+                continue
+            for entry in window:
+                if entry[0] > reported_until:
+                    yield entry
+                    reported += 1
+                    if limit and reported >= limit:
+                        return
+            reported_until = line_num
+
+
+@lru_cache(maxsize=32)
+def compile_query(text: str, case_sensitive: bool = False, use_regex: bool = False,
+                  prefilter: bool = True) -> QueryPlan:
+    """Parse and plan a query (cached, worker processes compile it once per query)."""
+    return QueryPlan(text, case_sensitive, use_regex, prefilter=prefilter)
+
+
+@lru_cache(maxsize=32)
+def compile_terms(terms: Tuple[str, ...], mode: str = 'any', case_sensitive: bool = False,
+                  use_regex: bool = False, prefilter: bool = True) -> QueryPlan:
+    """QueryPlan for search_terms/search_mode (regex searches and the 'file' and 'near' scopes)."""
+    return QueryPlan.from_terms(terms, mode, case_sensitive, use_regex, prefilter)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Regex Literal Prefilter
+========================================
+Required literals of a regular expression, used to skip lines and files
+that cannot match before the regex itself runs.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Most search regexes contain text every match must include: ERR-\\d{4}
+needs "ERR-", (ERROR|FATAL): .*timeout needs "ERROR" or "FATAL" and
+"timeout". required_factors() walks the parsed pattern (sre_parse) and
+collects such factors; each factor is a tuple of alternatives of which at
+least one occurs in every match. best_factor() picks the most selective
+one (longest shortest alternative).
+
+The factor is used twice:
+    - per file: bytes.find() over the raw file content; a file without any
+      of the alternatives is not decoded at all
+    - per line: a substring test before pattern.search()
+
+With IGNORECASE the literals are lowered and compared with the lowered
+line or buffer. Characters whose case-insensitive matches are not covered
+by lower() split a literal: 'i' and 's' (dotless i and long s match them),
+for the byte-level test also 'k' (Kelvin sign) and every non-ASCII
+character. Byte-level needles are ASCII, which all encodings of the text
+fallback (utf-8, latin-1, cp1252, iso-8859-1) encode the same way.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants  # Python 3.11+
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+MIN_NEEDLE_LENGTH = 3  # Kürzere Literale filtern kaum, der Test kostet aber pro Zeile
+
+# Zeichen, deren Groß-/Kleinschreibungs-Varianten lower() nicht abbildet
+LINE_BREAK_CHARS = frozenset('is')
+BYTES_BREAK_CHARS = frozenset('isk')
+
+Factor = Tuple[str, ...]
+
+_REPEATS = tuple(getattr(sre_constants, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+                 if hasattr(sre_constants, name))
+_ATOMIC_GROUP = getattr(sre_constants, 'ATOMIC_GROUP', None)
+
+
+def _factors(items, ignorecase: bool, breaks: frozenset, ascii_only: bool) -> List[Factor]:
+    """Required factors of a parsed (sub)pattern."""
+    factors: List[Factor] = []
+    run: List[str] = []
+
+    def flush():
+        if run:
+            factors.append((''.join(run),))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            char = chr(av)
+            if ignorecase:
+                if not char.isascii() or char.lower() in breaks:
+                    flush()
+                    continue
+                char = char.lower()
+            elif ascii_only and not char.isascii():
+                flush()
+                continue
+            run.append(char)
+        elif op is sre_constants.SUBPATTERN:
+            _group, add_flags, del_flags, sub = av
+            flush()
+            if (add_flags | del_flags) & re.IGNORECASE:
+                continue  # (?i:...)/(?-i:...): Literale wären anders zu vergleichen als der Rest
+            factors.extend(_factors(sub, ignorecase, breaks, ascii_only))
+        elif op in _REPEATS:
+            minimum, _maximum, sub = av
+            flush()
+            if minimum >= 1:
+                factors.extend(_factors(sub, ignorecase, breaks, ascii_only))
+        elif op is _ATOMIC_GROUP:
+            flush()
+            factors.extend(_factors(av, ignorecase, breaks, ascii_only))
+        elif op is sre_constants.BRANCH:
+            flush()
+            alternatives: List[str] = []
+            for branch in av[1]:
+                best = best_factor(_factors(branch, ignorecase, breaks, ascii_only), 1)
+                if best is None:
+                    alternatives = []  # Ein Zweig ohne Literal: die Alternative ist nicht erforderlich
+                    break
+                alternatives.extend(best)
+            if alternatives:
+                factors.append(tuple(dict.fromkeys(alternatives)))
+        else:
+            flush()  # Zeichenklassen, ., Anker, Lookarounds, Rückverweise
+    flush()
+    return factors
+
+
+def required_factors(pattern: str, flags: int = 0, breaks: frozenset = LINE_BREAK_CHARS,
+                     ascii_only: bool = False) -> Tuple[List[Factor], bool]:
+    """(factors, lowered): tuples of alternatives of which every match of pattern contains one.
+
+    The literals are lowered (lowered=True) if the pattern is case-insensitive,
+    also through an inline (?i). Raises re.error for an invalid pattern.
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    ignorecase = bool((parsed.state.flags | flags) & re.IGNORECASE)
+    return _factors(parsed, ignorecase, breaks, ascii_only), ignorecase
+
+
+def best_factor(factors: List[Factor], min_length: int = MIN_NEEDLE_LENGTH) -> Optional[Factor]:
+    """Most selective factor (longest shortest alternative), None if none is long enough."""
+    best, best_length = None, min_length - 1
+    for factor in factors:
+        length = min(len(alternative) for alternative in factor)
+        if length > best_length or (length == best_length and best is not None and len(factor) < len(best)):
+            best, best_length = factor, length
+    return best
+
+
+@lru_cache(maxsize=256)
+def line_prefilter(pattern: str, ignorecase: bool) -> Optional[Tuple[Factor, bool]]:
+    """(factor, lowered) to test on a line before the regex; None = no usable literal.
+
+    lowered: compare with line.lower() instead of the line.
+    """
+    try:
+        factors, lowered = required_factors(pattern, re.IGNORECASE if ignorecase else 0)
+    except (re.error, RecursionError, OverflowError):
+        return None
+    factor = best_factor(factors)
+    return None if factor is None else (factor, lowered)
+
+
+@lru_cache(maxsize=256)
+def bytes_prefilter(pattern: str, ignorecase: bool) -> Optional[Tuple[Tuple[bytes, ...], bool]]:
+    """(ASCII needles, lowered) for the raw file content; None = no usable literal."""
+    try:
+        factors, lowered = required_factors(pattern, re.IGNORECASE if ignorecase else 0,
+                                            BYTES_BREAK_CHARS, ascii_only=True)
+    except (re.error, RecursionError, OverflowError):
+        return None
+    factor = best_factor(factors)
+    if factor is None:
+        return None
+    return tuple(alternative.encode('ascii') for alternative in factor), lowered
+
+
+def literal_needles(text: str, ignorecase: bool) -> Optional[Tuple[Tuple[bytes, ...], bool]]:
+    """Byte-level needles of a literal search term (same rules as for regex literals)."""
+    return bytes_prefilter(re.escape(text), ignorecase)
+
+
+def bytes_finder(needles: Tuple[bytes, ...]):
+    """finder(buffer) -> bool: does the buffer contain one of the needles.
+
+    bytes.find per alternative: the memchr-based search over the buffer was
+    several times faster than one bytes regex alternation for the handful
+    of alternatives a factor has (and there is no Aho-Corasick in the
+    standard library).
+    """
+    if len(needles) == 1:
+        needle = needles[0]
+        return lambda buffer: buffer.find(needle) != -1
+    return lambda buffer: any(buffer.find(needle) != -1 for needle in needles)
@@ -39,7 +39,7 @@ import sys
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 # Add config directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config'))
@@ -135,7 +135,9 @@ class HTMLReportGenerator:
     
     def __init__(self, search_terms: List[str], search_path: str, 
                  case_sensitive: bool = False, use_regex: bool = False,
-                 output_dir: Optional[str] = None):
+                 output_dir: Optional[str] = None,
+                 profile_summary: Optional[List[Dict[str, Any]]] = None,
+                 file_stats: Optional[Dict[str, Any]] = None):
         """
         Initialize the report generator.
         
@@ -145,23 +147,30 @@ class HTMLReportGenerator:
             case_sensitive: Whether search was case-sensitive
             use_regex: Whether regex was used in search
             output_dir: Directory to save reports (default: current dir)
+            profile_summary: Stage rows from StageProfiler.rows() (only with ENABLE_PROFILING)
+            file_stats: Per-extractor/extension statistics from FileStats.summary()
         """
         self.search_terms = search_terms
         self.search_path = search_path
         self.case_sensitive = case_sensitive
         self.use_regex = use_regex
         self.output_dir = output_dir or Path.cwd()
+        self.profile_summary = profile_summary
+        self.file_stats = file_stats
         
         # Ensure output directory exists
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
     
-    def generate(self, results: List[Dict[str, Any]], 
+    def generate(self, results: Iterable[Dict[str, Any]], 
                  auto_open: bool = False) -> Optional[str]:
         """
         Generate HTML report from search results.
         
         Args:
-            results: List of search result dictionaries
+            results: List or result sink of search result dictionaries. The
+                results are iterated twice (statistics, then result items)
+                and written to the file as they are rendered, so on-disk
+                result sinks never have to be loaded into memory.
             auto_open: Whether to automatically open the report in browser
             
         Returns:
@@ -171,11 +180,12 @@ class HTMLReportGenerator:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             html_file = Path(self.output_dir) / f"search_results_{timestamp}.html"
             
-            # Generate HTML content
-            html_content = self._generate_html(results)
-            
-            # Write to file
-            html_file.write_text(html_content, encoding='utf-8')
+            # Generate HTML content and stream it to the file
+            with open(html_file, 'w', encoding='utf-8') as f:
+                for index, part in enumerate(self._iter_html(results)):
+                    if index:
+                        f.write('\n')
+                    f.write(part)
             
             # Auto-open if requested with Windows default app for filetype
             if auto_open:
@@ -193,44 +203,62 @@ class HTMLReportGenerator:
             print(f"❌ Error generating report: {e}")
             return None
     
-    def _generate_html(self, results: List[Dict[str, Any]]) -> str:
+    def _generate_html(self, results: Iterable[Dict[str, Any]]) -> str:
         """Generate complete HTML document."""
+        return '\n'.join(self._iter_html(results))
+    
+    def _count_results(self, results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Count results by type and category in a single pass."""
+        counts = {'total': 0, 'file': 0, 'folder': 0, 'ocr': 0, 'categories': {}}
+        categories = counts['categories']
+        for result in results:
+            counts['total'] += 1
+            result_type = result['type']
+            if result_type in ('file', 'folder'):
+                counts[result_type] += 1
+            is_ocr = result.get('is_ocr_match', False)
+            if is_ocr:
+                counts['ocr'] += 1
+            category = result.get('category', 'other')
+            category_key = f"{category} (OCR)" if is_ocr else category
+            categories[category_key] = categories.get(category_key, 0) + 1
+        return counts
+    
+    def _iter_html(self, results: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the HTML document part by part."""
         search_terms_display = ", ".join(self.search_terms)
         
         # Count results by type
-        file_count = len([r for r in results if r['type'] == 'file'])
-        folder_count = len([r for r in results if r['type'] == 'folder'])
-        ocr_count = len([r for r in results if r.get('is_ocr_match', False)])
-        total_count = len(results)
-        
-        # Build HTML
-        html_parts = [
-            self._get_html_header(search_terms_display),
-            self._get_html_style(),
-            '</head>',
-            '<body>',
-            '    <div class="container">',
-            self._get_html_header_section(),
-            self._get_html_search_info(search_terms_display),
-            self._get_html_stats(total_count, file_count, folder_count, ocr_count),
-        ]
+        counts = self._count_results(results)
+        
+        yield self._get_html_header(search_terms_display)
+        yield self._get_html_style()
+        yield '</head>'
+        yield '<body>'
+        yield '    <div class="container">'
+        yield self._get_html_header_section()
+        yield self._get_html_search_info(search_terms_display)
+        yield self._get_html_stats(counts['total'], counts['file'], counts['folder'], counts['ocr'])
+        if self.file_stats:
+            yield self._get_html_file_stats()
+        if self.profile_summary:
+            yield self._get_html_profile()
         
         # Add category overview if results exist
-        if results:
-            html_parts.append(self._get_category_stats(results))
-            html_parts.append(self._get_html_results(results))
+        if counts['total']:
+            yield self._get_category_stats(results, counts['categories'])
+            yield '        <div class="results">'
+            for result in results:
+                yield self._get_result_item_html(result)
+            yield '        </div>'
         else:
-            html_parts.append(self._get_html_no_results())
+            yield self._get_html_no_results()
         
         # Close HTML
-        html_parts.extend([
-            '    </div>',
-            self._get_html_scripts(),
-            '</body>',
-            '</html>',
-        ])
-        
-        return '\n'.join(html_parts)
+        yield '    </div>'
+        yield self._get_html_scripts()
+        yield '</body>'
+        yield '</html>'
     
     def _get_html_header(self, search_terms: str) -> str:
         """Get HTML head section with title."""
@@ -385,6 +413,25 @@ class HTMLReportGenerator:
             gap: 10px;
         }
         
+        .profile-table {
+            width: 100%;
+            border-collapse: collapse;
+            background: white;
+            font-size: 0.9em;
+        }
+        
+        .profile-table th,
+        .profile-table td {
+            padding: 8px 12px;
+            border-bottom: 1px solid #ffe0b2;
+            text-align: right;
+        }
+        
+        .profile-table th:first-child,
+        .profile-table td:first-child {
+            text-align: left;
+        }
+        
         .category-list {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(120px, 1fr));
@@ -1087,24 +1134,15 @@ class HTMLReportGenerator:
         </div>'''
         return stats_html
     
-    def _get_category_stats(self, results: List[Dict[str, Any]]) -> str:
+    def _get_category_stats(self, results: Iterable[Dict[str, Any]],
+                            category_counts: Optional[Dict[str, int]] = None) -> str:
         """Get category statistics by category type."""
-        if not results:
+        if category_counts is None:
+            # Count results by category (overarching category, not file type)
+            category_counts = self._count_results(results)['categories']
+        if not category_counts:
             return ''
         
-        # Count results by category (overarching category, not file type)
-        category_counts = {}
-        for result in results:
-            category = result.get('category', 'other')
-            is_ocr = result.get('is_ocr_match', False)
-            
-            if is_ocr:
-                category_key = f"{category} (OCR)"
-            else:
-                category_key = category
-            
-            category_counts[category_key] = category_counts.get(category_key, 0) + 1
-        
         # Sort by count (descending), then alphabetically
         sorted_categories = sorted(category_counts.items(), 
                                   key=lambda x: (-x[1], x[0]))
@@ -1156,6 +1194,87 @@ class HTMLReportGenerator:
             </div>
         </div>'''
     
+    def _get_html_file_stats(self) -> str:
+        """Get time/throughput per extractor and file extension plus the slowest files."""
+        def group_table(rows: List[Dict[str, Any]], key: str, label: str) -> str:
+            lines = [f'''                <tr>
+                    <th>{label}</th>
+                    <th>{tr('stats_files')}</th>
+                    <th>{tr('stats_time')}</th>
+                    <th>{tr('stats_time_share')}</th>
+                    <th>MB</th>
+                    <th>MB/s</th>
+                </tr>''']
+            for row in rows:
+                mb_per_s = f"{row['mb_per_s']:.2f}" if row['mb_per_s'] is not None else '-'
+                lines.append(f'''                <tr>
+                    <td>{html.escape(str(row[key]))}</td>
+                    <td>{row['files']:,} ({row['files_percent']:.1f}%)</td>
+                    <td>{row['seconds']:.3f}</td>
+                    <td>{row['time_percent']:.1f}%</td>
+                    <td>{row['bytes'] / (1024 * 1024):.2f}</td>
+                    <td>{mb_per_s}</td>
+                </tr>''')
+            return '\n'.join(lines)
+
+        slowest = []
+        for entry in self.file_stats.get('slowest_files', []):
+            slowest.append(f'''                <tr>
+                    <td>{html.escape(entry['path'])}</td>
+                    <td>{html.escape(entry['extractor'])}</td>
+                    <td>{entry['seconds']:.3f}</td>
+                    <td>{entry['bytes'] / (1024 * 1024):.2f}</td>
+                </tr>''')
+
+        return f'''        <div class="categories file-stats">
+            <h3>🧩 {tr('throughput_by_extractor')}</h3>
+            <table class="profile-table">
+{group_table(self.file_stats.get('extractors', []), 'extractor', tr('stats_extractor'))}
+            </table>
+            <h3>📑 {tr('throughput_by_extension')}</h3>
+            <table class="profile-table">
+{group_table(self.file_stats.get('extensions', []), 'extension', tr('stats_extension'))}
+            </table>
+            <h3>🐢 {tr('slowest_files')}</h3>
+            <table class="profile-table">
+                <tr>
+                    <th>{tr('search_path')}</th>
+                    <th>{tr('stats_extractor')}</th>
+                    <th>{tr('stats_time')}</th>
+                    <th>MB</th>
+                </tr>
+{chr(10).join(slowest)}
+            </table>
+        </div>'''
+
+    def _get_html_profile(self) -> str:
+        """Get performance profile table (per-stage timings)."""
+        rows = []
+        for row in self.profile_summary:
+            rows.append(f'''                <tr>
+                    <td>{html.escape(str(row['stage']))}</td>
+                    <td>{row['wall_s']:.3f}</td>
+                    <td>{row['cpu_s']:.3f}</td>
+                    <td>{row['count']:,}</td>
+                    <td>{row['bytes'] / (1024 * 1024):.2f}</td>
+                    <td>{row['share_percent']:.1f}%</td>
+                </tr>''')
+        
+        return f'''        <div class="categories profile">
+            <h3>⏱️ {tr('performance_profile')}</h3>
+            <table class="profile-table">
+                <tr>
+                    <th>{tr('profile_stage')}</th>
+                    <th>{tr('profile_wall')}</th>
+                    <th>{tr('profile_cpu')}</th>
+                    <th>{tr('profile_count')}</th>
+                    <th>MB</th>
+                    <th>{tr('profile_share')}</th>
+                </tr>
+{chr(10).join(rows)}
+            </table>
+        </div>'''
+    
     def _get_html_results(self, results: List[Dict[str, Any]]) -> str:
         """Get results section."""
         html_parts = ['        <div class="results">']
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Result Store
+=============================
+Result sinks that collect search results in memory or on disk.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+All sinks share the same interface (append, extend, len, iteration,
+index access), so the search engine, the GUI and HTMLReportGenerator can
+work with any of them:
+    - MemoryResultSink: a plain list, used by default
+    - DiskResultSink: append-only NDJSON segment file with an offset index,
+      used when a result set no longer fits into memory
+    - ChainedResultSink: read-only view over several sinks in order
+"""
+
+import os
+import json
+import tempfile
+from abc import ABC, abstractmethod
+from array import array
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .search_records import as_dict
+
+
+class ResultSink(ABC):
+    """Base class for result sinks (a sink without append, iteration, len or index access cannot be created)."""
+
+    @abstractmethod
+    def append(self, result):
+        """Add one result."""
+
+    def extend(self, results: Iterable):
+        for result in results:
+            self.append(result)
+
+    @abstractmethod
+    def __iter__(self) -> Iterator:
+        """Results in the order they were appended."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of results."""
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @abstractmethod
+    def __getitem__(self, index):
+        """Result at index (IndexError if out of range)."""
+
+    def close(self):
+        """Release resources held by the sink."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MemoryResultSink(list, ResultSink):
+    """In-memory sink (a list with the sink interface)."""
+
+    def __repr__(self):
+        return f"MemoryResultSink({len(self)} results)"
+
+
+class DiskResultSink(ResultSink):
+    """
+    Append-only NDJSON segment file with an in-memory offset index.
+
+    Only the offset index (8 bytes per result) stays in memory. Results are
+    written as plain dicts and read back as dicts.
+    """
+
+    def __init__(self, path: Optional[str] = None, directory: Optional[str] = None):
+        """
+        Initialize the sink.
+
+        Args:
+            path: Segment file to write (default: new temp file)
+            directory: Directory for the temp file (default: system temp dir)
+        """
+        self.owns_file = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='master_search_results_', suffix='.ndjson', dir=directory)
+            os.close(fd)
+        self.path = path
+        self._file = open(self.path, 'wb')
+        self._offsets = array('Q')
+        self._size = 0
+
+    def append(self, result):
+        data = (json.dumps(as_dict(result), ensure_ascii=False) + '\n').encode('utf-8')
+        self._offsets.append(self._size)
+        self._file.write(data)
+        self._size += len(data)
+
+    def _flush(self):
+        if self._file and not self._file.closed:
+            self._file.flush()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._flush()
+        count = len(self._offsets)
+        if not count:
+            return
+        with open(self.path, 'rb') as f:
+            for _ in range(count):
+                yield json.loads(f.readline())
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self._offsets)
+        offset = self._offsets[index]  # raises IndexError
+        self._flush()
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def close(self):
+        """Close the segment file and remove it if it is a temp file."""
+        if self._file and not self._file.closed:
+            self._file.close()
+        if self.owns_file:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def __repr__(self):
+        return f"DiskResultSink({len(self)} results, {self.path!r})"
+
+
+class ChainedResultSink(ResultSink):
+    """Read-only view over several sinks, iterated in the given order."""
+
+    def __init__(self, *sinks):
+        self.sinks = [sink for sink in sinks if sink is not None]
+
+    def append(self, result):
+        raise TypeError("ChainedResultSink is read-only")
+
+    def __len__(self) -> int:
+        return sum(len(sink) for sink in self.sinks)
+
+    def __iter__(self) -> Iterator:
+        for sink in self.sinks:
+            yield from sink
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        for sink in self.sinks:
+            if index < len(sink):
+                return sink[index]
+            index -= len(sink)
+        raise IndexError(index)
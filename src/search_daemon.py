@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Search Daemon
+==============================
+Long-lived search service (`master-search serve`) with a warm worker pool.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Every GUI or CLI search otherwise pays Python startup, pool spawn, OCR
+engine probing and the category tables again. The daemon keeps them warm:
+
+    - WarmWorkerPool: one ProcessPoolExecutor for all queries. Each query
+      gets a QueryLane (executor interface for FileSearchTool._run_batches);
+      a dispatcher thread submits the lanes' batches round-robin, so a large
+      query cannot starve a small one. Every lane has its own cancel flag in
+      a shared array, checked by the workers like the cancel event.
+    - SearchDaemon: local HTTP/JSON API (127.0.0.1, token from the state
+      file), results are streamed as NDJSON while the search runs. At most
+      DAEMON_MAX_QUERIES queries run at once, further ones wait.
+    - Warm OCR handler, PDF page cache and encoding cache, shared by all
+      queries. PDFs, archives, SQLite databases and images (extractors with
+      affinity 'thread') are searched on the daemon's threads that use
+      them; the pool workers search the remaining files.
+
+Clients: src/daemon_client.py. FileSearchTool uses a running daemon
+automatically (USE_SEARCH_DAEMON), which turns GUI and CLI into thin clients.
+
+Usage:
+    python cli_main.py serve [--port 8765] [--workers 8]
+    python cli_main.py serve --status | --stop
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import hmac
+import signal
+import secrets
+import argparse
+import threading
+import collections
+import multiprocessing as mp
+from concurrent.futures import Future, ProcessPoolExecutor, CancelledError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+from .file_search_tool import FileSearchTool, _init_worker_cancel_event, _run_with_cancel_slot
+from version import VERSION  # Pfad setzt file_search_tool
+from .search_records import as_dict
+from .daemon_client import DaemonClient, TOKEN_HEADER, NDJSON_CONTENT_TYPE, default_state_file
+
+# Note: performance_config is in config/, not src/
+config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
+if config_path not in sys.path:
+    sys.path.insert(0, config_path)
+from performance_config import (
+    DAEMON_HOST,
+    DAEMON_PORT,
+    DAEMON_STATE_FILE,
+    DAEMON_MAX_QUERIES,
+)
+
+# Abbruch-Flags im geteilten Pool (eine Spur pro laufender Anfrage)
+MAX_LANES = 64
+
+
+class _LaneCancelEvent:
+    """Event-like view of one lane's cancel flag (see _worker_cancelled in file_search_tool)."""
+
+    def __init__(self, flags, slot: int):
+        self._flags = flags
+        self._slot = slot
+
+    def set(self):
+        self._flags[self._slot] = 1
+
+    def is_set(self) -> bool:
+        return bool(self._flags[self._slot])
+
+
+class QueryLane:
+    """Executor interface of one query on the shared pool (submit/shutdown like ProcessPoolExecutor)."""
+
+    def __init__(self, pool: 'WarmWorkerPool', slot: int):
+        self.pool = pool
+        self.slot = slot
+        self.cancel_event = _LaneCancelEvent(pool.cancel_flags, slot)
+        self.queue = collections.deque()  # (future, fn, args)
+        self.in_flight = 0
+        self.closed = False
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        with self.pool.condition:
+            if self.closed:
+                raise RuntimeError('Spur bereits beendet')
+            self.queue.append((future, fn, args))
+            self.pool.condition.notify_all()
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        with self.pool.condition:
+            self.closed = True
+            if cancel_futures:
+                while self.queue:
+                    self.queue.popleft()[0].cancel()
+            if wait:
+                self.pool.condition.wait_for(lambda: not self.queue and not self.in_flight)
+            self.pool._release_if_idle(self)
+
+
+class WarmWorkerPool:
+    """Process pool shared by all queries of the daemon, with round-robin dispatch over lanes."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.cancel_flags = mp.Array('b', MAX_LANES, lock=False)
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_cancel_event,
+                                             initargs=(None, self.cancel_flags))
+        # Zwei Batches pro Worker in Arbeit halten, damit kein Worker auf den Dispatcher wartet
+        self.capacity = workers * 2
+        self.condition = threading.Condition()
+        self._lanes = collections.deque()
+        self._free_slots = list(range(MAX_LANES))
+        self._in_flight = 0
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._dispatch, name='pool-dispatcher', daemon=True)
+        self._dispatcher.start()
+
+    def warm_up(self):
+        """Start all worker processes now instead of on the first query."""
+        futures = [self._executor.submit(os.getpid) for _ in range(self.workers)]
+        return len({future.result() for future in futures})
+
+    def lane(self) -> QueryLane:
+        """New lane for one query (waits while all MAX_LANES are in use)."""
+        with self.condition:
+            self.condition.wait_for(lambda: self._free_slots or self._closed)
+            if self._closed:
+                raise RuntimeError('Pool wurde beendet')
+            slot = self._free_slots.pop()
+            self.cancel_flags[slot] = 0
+            lane = QueryLane(self, slot)
+            self._lanes.append(lane)
+            return lane
+
+    def _release_if_idle(self, lane: QueryLane):
+        # Aufruf mit gehaltener condition; Flag erst freigeben, wenn kein Batch der Spur mehr läuft
+        if lane.closed and not lane.queue and not lane.in_flight and lane in self._lanes:
+            self._lanes.remove(lane)
+            self._free_slots.append(lane.slot)
+            self.condition.notify_all()
+
+    def _next_task(self):
+        # Reihum: jede Spur mit wartenden Batches kommt nacheinander einmal dran
+        for _ in range(len(self._lanes)):
+            if not self._lanes:
+                break
+            lane = self._lanes[0]
+            self._lanes.rotate(-1)
+            while lane.queue:
+                future, fn, args = lane.queue.popleft()
+                if future.set_running_or_notify_cancel():
+                    return lane, future, fn, args
+            self._release_if_idle(lane)
+        return None
+
+    def _dispatch(self):
+        while True:
+            with self.condition:
+                task = None
+                while not self._closed:
+                    if self._in_flight < self.capacity:
+                        task = self._next_task()
+                        if task is not None:
+                            break
+                    self.condition.wait()
+                if task is None:
+                    return
+                lane, future, fn, args = task
+                self._in_flight += 1
+                lane.in_flight += 1
+            try:
+                inner = self._executor.submit(_run_with_cancel_slot, lane.slot, fn, *args)
+            except Exception as e:
+                self._finished(lane, future, None, e)
+                continue
+            inner.add_done_callback(lambda inner, lane=lane, future=future: self._finished(lane, future, inner))
+
+    def _finished(self, lane: QueryLane, future: Future, inner: Optional[Future], error: Exception = None):
+        if inner is not None:
+            if inner.cancelled():
+                error = CancelledError()
+            else:
+                error = inner.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(inner.result())
+        with self.condition:
+            self._in_flight -= 1
+            lane.in_flight -= 1
+            self._release_if_idle(lane)
+            self.condition.notify_all()
+
+    def active_lanes(self) -> int:
+        with self.condition:
+            return len(self._lanes)
+
+    def shutdown(self):
+        with self.condition:
+            self._closed = True
+            for index in range(MAX_LANES):
+                self.cancel_flags[index] = 1
+            for lane in self._lanes:
+                while lane.queue:
+                    lane.queue.popleft()[0].cancel()
+            self.condition.notify_all()
+        self._dispatcher.join(timeout=2)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _QueryStream:
+    """Writes the events of one query as NDJSON; a closed connection stops the query."""
+
+    def __init__(self, wfile, tool: FileSearchTool):
+        self.wfile = wfile
+        self.tool = tool
+        self.lock = threading.Lock()
+        self.disconnected = False
+        self.sent_results = 0
+
+    def emit(self, event: Dict[str, Any]):
+        if self.disconnected:
+            return
+        line = json.dumps(event, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+        with self.lock:
+            try:
+                self.wfile.write(line)
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError, ValueError):
+                self.disconnected = True
+                self.tool.stop_requested = True
+
+    def emit_results(self, results):
+        # Die Engine kürzt auf max_total_results erst am Ende, der Stream schon beim Senden
+        limit = self.tool.max_total_results
+        for result in results:
+            if limit and self.sent_results >= limit:
+                return
+            self.sent_results += 1
+            self.emit({'type': 'result', 'result': as_dict(result)})
+
+
+class SearchDaemon:
+    """HTTP/JSON search service with warm pool, warm OCR handler and caches, and fair scheduling."""
+
+    def __init__(self, host: str = DAEMON_HOST, port: int = DAEMON_PORT, workers: Optional[int] = None,
+                 max_queries: int = DAEMON_MAX_QUERIES, state_file: Optional[str] = DAEMON_STATE_FILE,
+                 verbose: bool = True):
+        self.host = host
+        self.port = port
+        self.state_file = state_file or default_state_file()
+        self.token = secrets.token_urlsafe(24)
+        self.verbose = verbose
+        template = FileSearchTool(verbose=False)  # Lädt Kategorien-Tabellen und Module einmalig
+        self.workers = workers or template.max_workers
+        self.ocr_handler = template.ocr_handler
+        self.pdf_page_cache = template.get_pdf_page_cache()  # None wenn deaktiviert
+        self.encoding_cache = template.get_encoding_cache()
+        self.max_queries = max_queries
+        self._query_slots = threading.BoundedSemaphore(max_queries)
+        self.queries: Dict[str, FileSearchTool] = {}
+        self._queries_lock = threading.Lock()
+        self.pool = None
+        self.server = None
+        self.started = None
+        self.stopping = threading.Event()
+        self._stopped = threading.Event()
+
+    def log(self, message: str):
+        if self.verbose:
+            print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """Start the pool and the HTTP server (non-blocking) and write the state file."""
+        self.pool = WarmWorkerPool(self.workers)
+        self.pool.warm_up()
+        self.server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='search-daemon', daemon=True).start()
+        self.started = time.time()
+        self._write_state_file()
+        self.log(f'Such-Daemon bereit: {self.url} ({self.workers} Worker, max. {self.max_queries} Anfragen)')
+        return self
+
+    def _write_state_file(self):
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        host, port = self.server.server_address[:2]
+        state = {'host': host, 'port': port, 'token': self.token, 'pid': os.getpid(), 'version': VERSION}
+        temp_path = f'{self.state_file}.{os.getpid()}.tmp'
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)  # Token nur für den Benutzer
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_file)
+
+    def _remove_state_file(self):
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                if json.load(f).get('pid') != os.getpid():
+                    return  # Gehört inzwischen einem anderen Daemon
+            os.remove(self.state_file)
+        except (OSError, ValueError):
+            pass
+
+    def shutdown(self):
+        """Stop all queries, the HTTP server and the pool (waits if another thread is already stopping)."""
+        if self.stopping.is_set():
+            self._stopped.wait()
+            return
+        self.stopping.set()
+        with self._queries_lock:
+            for tool in self.queries.values():
+                tool.stop_requested = True
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.pool is not None:
+            self.pool.shutdown()
+        self._remove_state_file()
+        self._stopped.set()
+        self.log('Such-Daemon beendet')
+
+    def health(self) -> Dict[str, Any]:
+        with self._queries_lock:
+            active = len(self.queries)
+        return {'status': 'ok', 'version': VERSION, 'pid': os.getpid(), 'workers': self.workers,
+                'max_queries': self.max_queries, 'active_queries': active,
+                'uptime': round(time.time() - self.started, 1) if self.started else 0.0}
+
+    def cancel(self, query_id: str) -> bool:
+        with self._queries_lock:
+            tool = self.queries.get(query_id)
+        if tool is None:
+            return False
+        tool.stop_requested = True
+        return True
+
+    def create_tool(self, query: Dict[str, Any]) -> FileSearchTool:
+        """Search instance for one query, wired to the warm pool (ValueError on invalid queries)."""
+        tool = FileSearchTool(verbose=False)
+        tool.apply_daemon_query(query)
+        tool.use_daemon = False
+        tool.worker_pool = self.pool
+        tool.use_multiprocessing = True
+        tool.max_workers = self.workers
+        tool.ocr_handler = self.ocr_handler
+        # Warme Caches statt einer Kopie von der Platte pro Anfrage (gespeichert nach jeder Suche)
+        tool.pdf_page_cache = self.pdf_page_cache
+        tool.encoding_cache = self.encoding_cache
+        return tool
+
+    def run_query(self, tool: FileSearchTool, stream: _QueryStream):
+        """Run a search and stream its events (runs in the request thread)."""
+        query_id = uuid.uuid4().hex[:12]
+        with self._queries_lock:
+            self.queries[query_id] = tool
+        try:
+            stream.emit({'type': 'started', 'id': query_id})
+            if not self._query_slots.acquire(blocking=False):
+                stream.emit({'type': 'queued', 'id': query_id})
+                # Warten, aber einen Abbruch (auch Verbindungsabbruch) bemerken
+                while not self._query_slots.acquire(timeout=0.5):
+                    stream.emit({'type': 'queued', 'id': query_id})
+                    if tool.stop_requested:
+                        stream.emit({'type': 'done', 'id': query_id, 'results': 0, 'cancelled': True})
+                        return
+            try:
+                self.log(f'Anfrage {query_id}: {tool.search_terms} in {tool.search_path}')
+                tool.status_callback = stream.emit
+                tool.result_callback = stream.emit_results
+                tool.search_files_and_folders()
+            except Exception as e:
+                stream.emit({'type': 'error', 'id': query_id, 'message': str(e)})
+            finally:
+                self._query_slots.release()
+                if tool.memory_governor is not None:
+                    tool.memory_governor.close()
+            stream.emit({'type': 'done', 'id': query_id, 'results': stream.sent_results,
+                         'cancelled': tool.stop_requested, 'limit_reached': tool.result_limit_reached,
+                         'file_stats': tool.file_stats.to_dict()})
+            self.log(f'Anfrage {query_id}: {stream.sent_results} Treffer'
+                     + (' (abgebrochen)' if tool.stop_requested else ''))
+        finally:
+            with self._queries_lock:
+                self.queries.pop(query_id, None)
+
+    def _handler_class(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            server_version = f'MasterSearch/{VERSION}'
+
+            def log_message(self, format, *args):
+                pass  # Zugriffe werden nicht protokolliert
+
+            def _send_json(self, status: int, data: Dict[str, Any]):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _authorized(self) -> bool:
+                token = self.headers.get(TOKEN_HEADER, '')
+                if hmac.compare_digest(token.encode('utf-8'), daemon.token.encode('utf-8')):
+                    return True
+                self._send_json(403, {'error': 'Ungültiges Token'})
+                return False
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if self.path == '/health':
+                    self._send_json(200, daemon.health())
+                else:
+                    self._send_json(404, {'error': f'Unbekannter Pfad: {self.path}'})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                if self.path == '/search':
+                    self._search()
+                elif self.path.startswith('/cancel/'):
+                    self._send_json(200, {'cancelled': daemon.cancel(self.path[len('/cancel/'):])})
+                elif self.path == '/shutdown':
+                    self._send_json(200, {'status': 'stopping'})
+                    threading.Thread(target=daemon.shutdown, daemon=True).start()
+                else:
+                    self._send_json(404, {'error': f'Unbekannter Pfad: {self.path}'})
+
+            def _search(self):
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    query = json.loads(self.rfile.read(length).decode('utf-8'))
+                    if not isinstance(query, dict):
+                        raise ValueError('Anfrage muss ein JSON-Objekt sein')
+                    tool = daemon.create_tool(query)
+                except ValueError as e:
+                    self._send_json(400, {'error': str(e)})
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', NDJSON_CONTENT_TYPE)
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+                daemon.run_query(tool, _QueryStream(self.wfile, tool))
+
+        return Handler
+
+
+def main(argv=None) -> int:
+    """Command line of `master-search serve`."""
+    parser = argparse.ArgumentParser(prog='master-search serve', description='Master Search Such-Daemon')
+    parser.add_argument('--host', default=DAEMON_HOST)
+    parser.add_argument('--port', type=int, default=DAEMON_PORT, help='0 = freier Port')
+    parser.add_argument('--workers', type=int, default=None, help='Worker-Prozesse (Standard: automatisch)')
+    parser.add_argument('--max-queries', type=int, default=DAEMON_MAX_QUERIES)
+    parser.add_argument('--state-file', default=DAEMON_STATE_FILE)
+    parser.add_argument('--status', action='store_true', help='Status des laufenden Daemons anzeigen')
+    parser.add_argument('--stop', action='store_true', help='Laufenden Daemon beenden')
+    args = parser.parse_args(argv)
+
+    client = DaemonClient.discover(args.state_file)
+    if args.status or args.stop:
+        if client is None:
+            print('Kein Such-Daemon aktiv')
+            return 1
+        print(json.dumps(client.shutdown() if args.stop else client.health(), indent=2))
+        return 0
+    if client is not None:
+        print(f'Such-Daemon läuft bereits (Port {client.port})')
+        return 1
+
+    daemon = SearchDaemon(args.host, args.port, args.workers, args.max_queries, args.state_file).start()
+    terminated = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: terminated.set())
+    try:
+        # Beenden über SIGTERM, Strg+C oder POST /shutdown
+        while not terminated.is_set() and not daemon.stopping.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
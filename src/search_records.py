@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Compact Search Result Records
+==============================================
+Memory-efficient records for search results.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Matches and file results are stored as __slots__ records instead of dicts:
+    - Found terms are stored as indices into the shared search term tuple
+    - Directory prefixes are interned, so files of one folder share one string
+    - Line content is clipped to a context window around the first hit
+
+Both record types behave like read-only dicts ('line_number', 'path', ...)
+so the report generator and the GUI can keep using result['path'] and
+match.get('found_terms'). to_dict() returns a plain dict copy.
+"""
+
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def term_ids_for(found_terms: Iterable[str], terms: Sequence[str]) -> Tuple[int, ...]:
+    """Map found term strings to their indices in the search term sequence."""
+    found = set(found_terms)
+    return tuple(i for i, term in enumerate(terms) if term in found)
+
+
+def clip_line(line: str, terms: Sequence[str], max_length: int, case_sensitive: bool = False,
+              find: Optional[Callable[[str, str], int]] = None) -> str:
+    """
+    Clip a long line to a window of max_length characters around the first hit.
+
+    Lines that fit are returned unchanged. Clipped ends are marked with '...'.
+    find(line, term) returns the position of a term (-1 if absent), e.g. QueryPlan.hit_position
+    for regex terms; by default terms are searched as literals.
+    """
+    if max_length <= 0 or len(line) <= max_length:
+        return line
+
+    if find is None:
+        compare_line = line if case_sensitive else line.lower()
+
+        def find(_line, term):
+            return compare_line.find(term if case_sensitive else term.lower())
+
+    first_hit = -1
+    for term in terms:
+        position = find(line, term)
+        if position != -1 and (first_hit == -1 or position < first_hit):
+            first_hit = position
+
+    if first_hit == -1:
+        return line[:max_length] + '...'
+
+    start = max(0, first_hit - max_length // 2)
+    end = min(len(line), start + max_length)
+    start = max(0, end - max_length)
+    return ('...' if start > 0 else '') + line[start:end] + ('...' if end < len(line) else '')
+
+
+class _RecordView:
+    """Read-only dict interface shared by the record classes."""
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def keys(self):
+        return list(self._fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self.keys()}
+
+
+class Match(_RecordView):
+    """A single matching line (line_number 0 = file or folder name match)."""
+
+    __slots__ = ('line_number', 'line_content', 'term_ids', 'terms')
+    _fields = ('line_number', 'line_content', 'found_terms')
+
+    def __init__(self, line_number: int, line_content: str, term_ids: Tuple[int, ...],
+                 terms: Tuple[str, ...] = ()):
+        self.line_number = line_number
+        self.line_content = line_content
+        self.term_ids = term_ids
+        self.terms = terms
+
+    @property
+    def found_terms(self) -> List[str]:
+        return [self.terms[i] for i in self.term_ids]
+
+    def __reduce__(self):
+        # Terms are not pickled per match, FileResult re-binds them
+        return (Match, (self.line_number, self.line_content, self.term_ids))
+
+    def __repr__(self):
+        return f"Match({self.line_number}, {self.line_content[:40]!r}, {self.term_ids})"
+
+
+class FileResult(_RecordView):
+    """A file or folder with its matches."""
+
+    __slots__ = ('type', 'directory', 'name', 'matches', 'terms', 'extra')
+    _fields = ('type', 'path', 'name', 'matches')
+
+    def __init__(self, type: str, directory: str, name: str, matches: List[Match],
+                 terms: Tuple[str, ...] = (), extra: Optional[Dict[str, Any]] = None):
+        self.type = type
+        self.directory = sys.intern(directory)
+        self.name = name
+        self.matches = matches
+        self.extra = extra
+        self.bind_terms(terms)
+
+    @classmethod
+    def from_path(cls, type: str, path: str, matches: List[Match], terms: Tuple[str, ...] = ()):
+        directory, name = os.path.split(path)
+        return cls(type, directory, name, matches, terms)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], terms: Tuple[str, ...]):
+        """Rebuild a record from to_dict() output (e.g. a result streamed by the search daemon)."""
+        matches = [Match(m['line_number'], m['line_content'], term_ids_for(m.get('found_terms', ()), terms))
+                   for m in data.get('matches', ())]
+        extra = {key: value for key, value in data.items() if key not in cls._fields} or None
+        directory, name = os.path.split(data['path'])
+        return cls(data['type'], directory, data.get('name', name), matches, terms, extra)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, self.name)
+
+    def bind_terms(self, terms: Tuple[str, ...]):
+        """Point this result and all its matches to the shared term tuple."""
+        self.terms = terms
+        for match in self.matches:
+            match.terms = terms
+
+    def __getitem__(self, key):
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        # Zusatzfelder wie 'category' oder 'is_ocr_match' (von der GUI gesetzt)
+        if key in self._fields:
+            raise KeyError(f"{key} is read-only")
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def keys(self):
+        return list(self._fields) + list(self.extra or ())
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'type': self.type,
+            'path': self.path,
+            'name': self.name,
+            'matches': [match.to_dict() for match in self.matches],
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __reduce__(self):
+        return (FileResult, (self.type, self.directory, self.name, self.matches, self.terms, self.extra))
+
+    def __repr__(self):
+        return f"FileResult({self.type!r}, {self.path!r}, {len(self.matches)} matches)"
+
+
+def as_dict(result) -> Dict[str, Any]:
+    """Return a plain dict for a record or an already dict-shaped result."""
+    return result.to_dict() if hasattr(result, 'to_dict') else result
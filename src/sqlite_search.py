@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - SQLite Search
+==============================
+Searches the text columns of SQLite databases through sqlite3 instead of
+reading the database file as text.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+The database is opened read-only and immutable (file URI with
+mode=ro&immutable=1): no journal, no locks, the file is never changed.
+Every table with text columns (declared type with CHAR, CLOB or TEXT, or
+no declared type) is read with a cursor in batches of batch_rows rows, so
+only one batch is in memory at a time. Each text value becomes one line
+with its location: "[users.email 42] bob@example.com" (table, column,
+rowid; the primary key for WITHOUT ROWID tables).
+
+With a literal condition (QueryPlan.literal_condition) the search runs
+inside SQLite: only rows where a text column contains the required
+literals are returned, as LIKE (ASCII case-insensitive, like the lowered
+needles) or instr() (case-sensitive). Terms without such literals read
+all rows and leave the matching to the caller.
+
+Tables of rowid_min .. rowid_max spanning at least parallel_min_rows are
+split into rowid ranges of rows_per_task across an executor; each worker
+opens the database itself and scans its range (B-tree pages of that
+range only). The lines still come in table and rowid order; only as many
+ranges as there are workers are submitted at a time (src/task_window.py),
+so a large table is never held in memory as a whole.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .task_window import iter_ordered
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db', '.db3')
+BATCH_ROWS = 1000
+MAX_SQL_PARAMETERS = 900  # Unter SQLITE_MAX_VARIABLE_NUMBER älterer Versionen (999)
+
+Cell = Tuple[str, str, str, str]  # (Tabelle, Spalte, Zeilen-Id, Wert)
+
+
+def is_sqlite(file_path: str) -> bool:
+    """True if the file starts with the SQLite 3 header."""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def connect_readonly(file_path: str) -> sqlite3.Connection:
+    """Read-only, immutable connection (the file URI escapes '?', '#' and '%' in the path)."""
+    uri = Path(os.path.abspath(file_path)).as_uri() + '?mode=ro&immutable=1'
+    return sqlite3.connect(uri, uri=True)
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _is_text_type(declared: str) -> bool:
+    """Text affinity (or none: the column can hold anything) by SQLite's type affinity rules."""
+    declared = (declared or '').upper()
+    if 'INT' in declared:
+        return False
+    if 'CHAR' in declared or 'CLOB' in declared or 'TEXT' in declared:
+        return True
+    return declared == ''
+
+
+def text_tables(conn: sqlite3.Connection) -> List[Tuple[str, Tuple[str, ...], str]]:
+    """(table, text columns, row id expression) of every table with text columns."""
+    tables = []
+    rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' "
+                        "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' ORDER BY rowid").fetchall()
+    for name, sql in rows:
+        if (sql or '').upper().startswith('CREATE VIRTUAL'):
+            continue  # Modul (FTS, R-Tree, ...) evtl. nicht geladen; Inhalte liegen in Schattentabellen
+        info = conn.execute(f'PRAGMA table_info({quote_ident(name)})').fetchall()
+        columns = tuple(column[1] for column in info if _is_text_type(column[2]))
+        if not columns:
+            continue
+        try:
+            conn.execute(f'SELECT rowid FROM {quote_ident(name)} LIMIT 0')
+            rowid = 'rowid'
+        except sqlite3.OperationalError:
+            # WITHOUT ROWID: erste Primärschlüssel-Spalte als Zeilen-Id
+            keys = sorted((column[5], column[1]) for column in info if column[5])
+            rowid = quote_ident(keys[0][1]) if keys else 'NULL'
+        tables.append((name, columns, rowid))
+    return tables
+
+
+def _escape_like(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _condition_sql(condition, column: str, params: list) -> str:
+    kind, value = condition[0], condition[1]
+    if kind == 'needles':
+        tests = []
+        for needle in value:
+            text = needle.decode('ascii')
+            if condition[2]:
+                tests.append(f"{column} LIKE ? ESCAPE '\\'")  # LIKE ignoriert ASCII-Groß-/Kleinschreibung
+                params.append(f'%{_escape_like(text)}%')
+            else:
+                tests.append(f'instr({column}, ?) > 0')
+                params.append(text)
+        return tests[0] if len(tests) == 1 else '(' + ' OR '.join(tests) + ')'
+    joiner = ' AND ' if kind == 'all' else ' OR '
+    return '(' + joiner.join(_condition_sql(child, column, params) for child in value) + ')'
+
+
+def where_clause(condition, columns: Sequence[str]) -> Optional[Tuple[str, list]]:
+    """(SQL, parameters): rows where one text column satisfies condition; None = all rows."""
+    if condition is None:
+        return None
+    params = []
+    sql = ' OR '.join(_condition_sql(condition, quote_ident(column), params) for column in columns)
+    if len(params) > MAX_SQL_PARAMETERS:
+        return None  # Zu viele Platzhalter: alle Zeilen lesen, der Matcher filtert
+    return sql, params
+
+
+def _select(table: str, columns: Sequence[str], rowid: str, where: Optional[Tuple[str, list]],
+            rowid_range: Optional[Tuple[int, int]] = None) -> Tuple[str, list]:
+    sql = f"SELECT {rowid}, {', '.join(quote_ident(column) for column in columns)} FROM {quote_ident(table)}"
+    clauses, params = [], []
+    if rowid_range is not None:
+        clauses.append('rowid >= ? AND rowid < ?')
+        params.extend(rowid_range)
+    if where is not None:
+        clauses.append(f'({where[0]})')
+        params.extend(where[1])
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    return sql, params
+
+
+def _table_cells(conn: sqlite3.Connection, table: str, columns: Sequence[str], rowid: str,
+                 where: Optional[Tuple[str, list]], rowid_range: Optional[Tuple[int, int]] = None,
+                 batch_rows: int = BATCH_ROWS) -> Iterator[Cell]:
+    cursor = conn.execute(*_select(table, columns, rowid, where, rowid_range))
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                return
+            for row in rows:
+                row_id = str(row[0])
+                for column, value in zip(columns, row[1:]):
+                    if isinstance(value, str) and value.strip():
+                        yield table, column, row_id, value
+    finally:
+        cursor.close()
+
+
+def range_cells(file_path: str, table: str, columns: Tuple[str, ...], rowid: str,
+                where: Optional[Tuple[str, list]], rowid_range: Tuple[int, int],
+                batch_rows: int = BATCH_ROWS) -> List[Cell]:
+    """Cells of one rowid range of a table; runs in a worker for parallel database search."""
+    conn = connect_readonly(file_path)
+    try:
+        return list(_table_cells(conn, table, columns, rowid, where, rowid_range, batch_rows))
+    finally:
+        conn.close()
+
+
+def cell_line(table: str, column: str, row_id: str, value: str) -> str:
+    """Text value with its location: "[users.email 42] bob@example.com" (line breaks as spaces)."""
+    return f"[{table}.{column} {row_id}] {' '.join(value.split())}"
+
+
+def _parallel_cells(file_path, table, columns, rowid, where, bounds, executor, rows_per_task, batch_rows):
+    # Kleine Bereiche, höchstens so viele eingereicht wie Worker: die Tabelle liegt nie ganz im Speicher
+    calls = ((range_cells, (file_path, table, columns, rowid, where,
+                            (start, min(start + rows_per_task, bounds[1] + 1)), batch_rows))
+             for start in range(bounds[0], bounds[1] + 1, rows_per_task))
+    for cells in iter_ordered(executor, calls):
+        yield from cells
+
+
+def iter_sqlite_lines(file_path: str, condition=None, executor=None, parallel_min_rows: int = 200000,
+                      rows_per_task: int = 5000, batch_rows: int = BATCH_ROWS) -> Iterator[Tuple[int, str]]:
+    """(line_number, "[table.column rowid] value") for the text values of all tables.
+
+    condition: QueryPlan.literal_condition (pushed into SQLite), None = all rows.
+    """
+    conn = connect_readonly(file_path)
+    try:
+        line_counter = 0
+        for table, columns, rowid in text_tables(conn):
+            where = where_clause(condition, columns)
+            bounds = None
+            if executor is not None and rowid == 'rowid':
+                low, high = conn.execute(f'SELECT min(rowid), max(rowid) FROM {quote_ident(table)}').fetchone()
+                if low is not None and high - low + 1 >= parallel_min_rows:
+                    bounds = (low, high)
+            if bounds is not None:
+                cells = _parallel_cells(file_path, table, columns, rowid, where, bounds, executor,
+                                        rows_per_task, batch_rows)
+            else:
+                cells = _table_cells(conn, table, columns, rowid, where, batch_rows=batch_rows)
+            for cell in cells:
+                line_counter += 1
+                yield line_counter, cell_line(*cell)
+    finally:
+        conn.close()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Structured Data Search
+=======================================
+Streaming search in CSV and JSON/NDJSON exports with column and key
+projection: col:email searches only the "email" column of CSV files (the
+"email" key of JSON records), json:$.user.id only that JSON path.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+CSV: one line per record with the cells joined by " | ", numbered by the
+physical line the record starts on. The delimiter (, ; tab |) is taken
+from the header line; with a projection only the projected columns (by
+header name, case-insensitive as fallback) are in the line and the header
+is not.
+
+JSON: with a projection, every record becomes one line with the values at
+the projected paths (scalars as written in the file, objects and arrays
+as their scalar leaves). A record is a line of NDJSON (.ndjson, .jsonl,
+and .json files whose first line is a complete JSON value) or, for other
+.json files, the whole document; a document with an array at the top is
+split into its elements. Documents above max_document_chars and invalid
+JSON are searched as raw lines. A line holding a top-level array (a
+minified document on one line) is split into its elements as well.
+
+The literals of the search (QueryPlan.literal_condition) are tested on
+blocks of block_chars characters before anything is parsed: a block
+without them is skipped as a whole, and NDJSON lines are only parsed if
+they contain them. Literals that could be written differently in the raw
+file than in the extracted line (quotes, escapes, separators) are not
+used for this test.
+
+Paths: $.key, $.key[0], $.list[*].key, $.*, $['key with spaces'] (quoted in a
+query: json:"$['key with spaces']").
+"""
+
+import io
+import re
+import csv
+import json
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+BLOCK_CHARS = 64 * 1024
+MAX_DOCUMENT_CHARS = 64 * 1024 * 1024
+CSV_DELIMITERS = ',;\t|'
+CSV_UNSAFE = '"|\r\n'
+JSON_UNSAFE = '"\\/|' + ''.join(chr(code) for code in range(32))
+
+# Schritt eines JSON-Pfads: Schlüssel (str), Index (int) oder None für [*] / .*
+JsonPath = Tuple[Optional[object], ...]
+
+_PATH_STEP_RE = re.compile(r"\.([^.\[\]]+)|\[(\d+|-\d+|\*)\]|\['([^']*)'\]|\[\"([^\"]*)\"\]")
+
+
+def parse_json_path(text: str) -> JsonPath:
+    """Steps of a JSON path like $.user.id or $.items[*].sku (ValueError if invalid)."""
+    text = text.strip()
+    if not text.startswith('$'):
+        text = '$.' + text  # json:user.id wie json:$.user.id
+    steps = []
+    pos = 1
+    while pos < len(text):
+        match = _PATH_STEP_RE.match(text, pos)
+        if match is None:
+            raise ValueError(f'Ungültiger JSON-Pfad: {text} (bei {text[pos:]!r})')
+        key, index, single, double = match.groups()
+        if key is not None:
+            steps.append(None if key == '*' else key)
+        elif index is not None:
+            steps.append(None if index == '*' else int(index))
+        else:
+            steps.append(single if single is not None else double)
+        pos = match.end()
+    return tuple(steps)
+
+
+def csv_columns(projection: Sequence[tuple]) -> Tuple[str, ...]:
+    """Column names of a projection: col:name and single-key json paths."""
+    columns = []
+    for field, value in projection:
+        if field == 'col':
+            columns.append(value)
+        elif len(value) == 1 and isinstance(value[0], str):
+            columns.append(value[0])
+    return tuple(columns)
+
+
+def json_paths(projection: Sequence[tuple]) -> Tuple[JsonPath, ...]:
+    """JSON paths of a projection: json:path, col:name as the top-level key."""
+    return tuple((value,) if field == 'col' else value for field, value in projection)
+
+
+# Literal-Vortest ------------------------------------------------------------------
+
+def safe_condition(condition, unsafe: str):
+    """condition without literals that may be written differently in the raw file (None = no test).
+
+    Needles with a character of unsafe or with whitespace at either end can
+    span escapes, quotes or separators that the extracted line does not have.
+    """
+    if condition is None:
+        return None
+    kind, value = condition[0], condition[1]
+    if kind == 'needles':
+        for needle in value:
+            text = needle.decode('ascii')
+            if text[:1].isspace() or text[-1:].isspace() or any(char in unsafe for char in text):
+                return None
+        return condition
+    children = [safe_condition(child, unsafe) for child in value]
+    if kind == 'all':
+        children = [child for child in children if child is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else (kind, tuple(children))
+    if any(child is None for child in children):
+        return None
+    return condition
+
+
+def _compile_condition(condition):
+    kind, value = condition[0], condition[1]
+    if kind == 'needles':
+        needles = tuple(needle.decode('ascii') for needle in value)
+        if condition[2]:
+            return lambda text, lower: any(needle in lower() for needle in needles)
+        return lambda text, _lower: any(needle in text for needle in needles)
+    tests = [_compile_condition(child) for child in value]
+    if kind == 'all':
+        return lambda text, lower: all(test(text, lower) for test in tests)
+    return lambda text, lower: any(test(text, lower) for test in tests)
+
+
+def condition_test(condition) -> Optional[Callable[[str], bool]]:
+    """test(text) -> False if no line of text can satisfy condition; None without condition.
+
+    str.lower() folds at least what the ASCII-lowered needles expect.
+    """
+    if condition is None:
+        return None
+    compiled = _compile_condition(condition)
+
+    def test(text: str) -> bool:
+        lowered = []
+
+        def lower():
+            if not lowered:
+                lowered.append(text.lower())
+            return lowered[0]
+        return compiled(text, lower)
+    return test
+
+
+def _blocks(stream, block_chars: int) -> Iterator[str]:
+    """Text of stream in blocks that end with a line break (the last one may not)."""
+    pending = []
+    while True:
+        chunk = stream.read(block_chars)
+        if not chunk:
+            if pending:
+                yield ''.join(pending)
+            return
+        cut = chunk.rfind('\n') + 1
+        if cut == 0:
+            pending.append(chunk)  # Zeile länger als ein Block
+            continue
+        pending.append(chunk[:cut])
+        yield ''.join(pending)
+        pending = [chunk[cut:]] if cut < len(chunk) else []
+
+
+def _line_count(block: str) -> int:
+    return block.count('\n') + (0 if block.endswith('\n') else 1)
+
+
+def _joined(cells: Iterable[str]) -> str:
+    return ' | '.join([cell.strip() for cell in cells if cell.strip()])
+
+
+# CSV --------------------------------------------------------------------------
+
+def sniff_delimiter(header: str) -> str:
+    """The most frequent of , ; tab | in the header line (comma if none)."""
+    delimiter = max(CSV_DELIMITERS, key=header.count)
+    return delimiter if header.count(delimiter) else ','
+
+
+def _column_indexes(header: List[str], names: Sequence[str]) -> List[int]:
+    folded = [cell.strip().casefold() for cell in header]
+    indexes = []
+    for name in names:
+        if name in header:
+            index = header.index(name)
+        elif name.strip().casefold() in folded:
+            index = folded.index(name.strip().casefold())
+        else:
+            continue
+        if index not in indexes:
+            indexes.append(index)
+    return indexes
+
+
+def iter_csv_lines(stream, columns: Sequence[str] = (), condition=None,
+                   block_chars: int = BLOCK_CHARS) -> Iterator[Tuple[int, str]]:
+    """(line number, cells joined with " | ") per record of a CSV text stream.
+
+    columns: only these columns (by header name), without the header line.
+    condition: QueryPlan.literal_condition; blocks without its literals are not parsed.
+    """
+    first = stream.readline()
+    if not first:
+        return
+    delimiter = sniff_delimiter(first)
+    test = condition_test(safe_condition(condition, CSV_UNSAFE + delimiter))
+    state = {'row_end': 0, 'skipped': 0}  # Zeile (im Reader) des letzten vollständigen Datensatzes
+
+    def lines():
+        yield first
+        for block in _blocks(stream, block_chars):
+            # Nur zwischen zwei Datensätzen überspringen, nicht in einem mehrzeiligen Feld
+            if test is not None and reader.line_num == state['row_end'] and not test(block):
+                state['skipped'] += _line_count(block)
+                continue
+            yield from io.StringIO(block, newline='\n')
+
+    reader = csv.reader(lines(), delimiter=delimiter)
+    indexes = None
+    if columns:
+        header = next(reader, None)
+        if header is None:
+            return
+        indexes = _column_indexes(header, columns)
+        if not indexes:
+            return  # Keine der Spalten vorhanden
+        state['row_end'] = reader.line_num
+    for row in reader:
+        start = state['row_end'] + 1 + state['skipped']
+        state['row_end'] = reader.line_num
+        if indexes is not None:
+            row = [row[index] for index in indexes if index < len(row)]
+        line_text = _joined(row)
+        if line_text:
+            yield start, line_text
+
+
+# JSON -------------------------------------------------------------------------
+
+def resolve(value, path: JsonPath) -> list:
+    """Values at path in value (several for wildcards, none if the path does not exist)."""
+    current = [value]
+    for step in path:
+        following = []
+        for item in current:
+            if step is None:
+                if isinstance(item, dict):
+                    following.extend(item.values())
+                elif isinstance(item, list):
+                    following.extend(item)
+            elif isinstance(step, int):
+                if isinstance(item, list) and -len(item) <= step < len(item):
+                    following.append(item[step])
+            elif isinstance(item, dict) and step in item:
+                following.append(item[step])
+        current = following
+    return current
+
+
+def _leaves(value) -> Iterator:
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _leaves(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _leaves(item)
+    else:
+        yield value
+
+
+def record_line(record, paths: Sequence[JsonPath]) -> str:
+    """Values of record at paths joined with " | " (numbers as written, see _loads)."""
+    texts = []
+    for path in paths:
+        for found in resolve(record, path):
+            for leaf in _leaves(found):
+                texts.append(leaf if isinstance(leaf, str) else json.dumps(leaf))
+    return _joined(texts)
+
+
+def _loads(text: str):
+    # Gleitkommazahlen als geschriebener Text: "1.50" bleibt 1.50 statt 1.5
+    return json.loads(text, parse_float=str)
+
+
+def _first_value_line(block: str) -> Optional[bool]:
+    """Is the first non-empty line a complete JSON value (NDJSON)? None if the block is empty."""
+    for line in io.StringIO(block, newline='\n'):
+        if line.strip():
+            try:
+                _loads(line)
+            except ValueError:
+                return False
+            return True
+    return None
+
+
+def _raw_lines(blocks: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    line_num = 0
+    for block in blocks:
+        for line in io.StringIO(block, newline='\n'):
+            line_num += 1
+            line = line.rstrip('\n')
+            if line.strip():
+                yield line_num, line
+
+
+def _document_lines(blocks: List[str], rest: Iterator[str], paths, test,
+                    max_document_chars: int) -> Iterator[Tuple[int, str]]:
+    size = sum(len(block) for block in blocks)
+    for block in rest:
+        blocks.append(block)
+        size += len(block)
+        if size > max_document_chars:
+            yield from _raw_lines(_chain(blocks, rest))  # Zu groß zum Parsen: wie Text
+            return
+    text = ''.join(blocks)
+    if test is not None and not test(text):
+        return
+    try:
+        document = _loads(text)
+    except ValueError:
+        yield from _raw_lines(blocks)  # Kein gültiges JSON: wie Text
+        return
+    for record_num, record in enumerate(document if isinstance(document, list) else [document], 1):
+        line_text = record_line(record, paths)
+        if line_text:
+            yield record_num, line_text
+
+
+def _chain(blocks: List[str], rest: Iterator[str]) -> Iterator[str]:
+    yield from blocks
+    yield from rest
+
+
+def iter_json_lines(stream, paths: Sequence[JsonPath], condition=None, line_delimited: Optional[bool] = None,
+                    block_chars: int = BLOCK_CHARS,
+                    max_document_chars: int = MAX_DOCUMENT_CHARS) -> Iterator[Tuple[int, str]]:
+    """(line number, values at paths) per JSON record of a text stream.
+
+    line_delimited: True for NDJSON, None = decided by the first line (see module docstring).
+    condition: QueryPlan.literal_condition; only lines containing its literals are parsed.
+    """
+    test = condition_test(safe_condition(condition, JSON_UNSAFE))
+    blocks = _blocks(stream, block_chars)
+    seen = []  # Blöcke vor der Entscheidung NDJSON/Dokument
+    line_num = 0
+    for block in blocks:
+        if line_delimited is None:
+            seen.append(block)
+            line_delimited = _first_value_line(block)
+            if line_delimited is False:
+                yield from _document_lines(seen, blocks, paths, test, max_document_chars)
+                return
+            if line_delimited is None:
+                line_num += _line_count(block)  # Nur Leerzeilen
+                continue
+        if test is not None and not test(block):
+            line_num += _line_count(block)
+            continue
+        for line in io.StringIO(block, newline='\n'):
+            line_num += 1
+            if test is not None and not test(line):
+                continue
+            try:
+                record = _loads(line)
+            except ValueError:
+                continue  # Leere oder ungültige Zeile
+            # Array in einer Zeile (z.B. minifiziertes Dokument): Elemente wie in _document_lines
+            for element in record if isinstance(record, list) else [record]:
+                line_text = record_line(element, paths)
+                if line_text:
+                    yield line_num, line_text
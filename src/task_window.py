@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Task Window
+============================
+Ordered results of executor tasks with a bounded number in flight.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Parallel extraction (rowid ranges of SQLite tables, members of zip
+archives) must not submit all tasks at once: finished results would pile
+up in the searching process while the consumer is still on the first one.
+iter_ordered() keeps at most `window` tasks submitted (by default the
+executor's worker count) and submits the next task only when a result
+is handed to the consumer. Results come in submission order.
+"""
+
+import os
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+Call = Tuple[Callable, tuple]  # (Funktion, Argumente)
+
+
+def in_flight_limit(executor) -> int:
+    """Worker count of the executor (ThreadPoolExecutor/ProcessPoolExecutor), else the CPU count."""
+    return max(1, getattr(executor, '_max_workers', None) or os.cpu_count() or 1)
+
+
+def iter_ordered(executor, calls: Iterable[Call], window: Optional[int] = None) -> Iterator[Any]:
+    """Results of calls in order, at most window tasks submitted at a time.
+
+    Closing the generator (hit limit, stop) cancels the tasks that have not started yet.
+    """
+    window = max(1, window or in_flight_limit(executor))
+    calls = iter(calls)
+    pending = deque()
+    try:
+        for function, args in calls:
+            pending.append(executor.submit(function, *args))
+            if len(pending) >= window:
+                break
+        while pending:
+            result = pending.popleft().result()
+            # Nächste Aufgabe vor der Übergabe einreichen, damit der Pool weiterarbeitet
+            for function, args in calls:
+                pending.append(executor.submit(function, *args))
+                break
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Master Search - Text Encoding Detection
+========================================
+Opens text files once with a detected encoding instead of retrying a list
+of encodings from the start of the file.
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+Created: November 2025
+
+Detection (open_detected):
+    1. Byte order mark: UTF-32 LE/BE, UTF-8, UTF-16 LE/BE (the BOM is not
+       part of the text).
+    2. No BOM: UTF-16 without BOM if the head has NUL bytes in every
+       second position only (ASCII text in UTF-16).
+    3. Otherwise the "detect" codec: UTF-8, validated incrementally per
+       chunk while the file is read. At the first invalid byte:
+         - everything before was ASCII: the rest of the file (including
+           the pending bytes) is decoded with the legacy codepage (cp1252,
+           its five undefined bytes as latin-1). ASCII decodes identically
+           in both, so nothing is read twice.
+         - valid non-ASCII UTF-8 came before: the file is mixed, invalid
+           sequences are decoded with the legacy codepage one by one,
+           valid UTF-8 stays UTF-8.
+
+Decisions other than plain UTF-8 ("legacy", "mixed", UTF-16/32) are kept
+in EncodingCache under the file path with size and mtime, so the next
+search opens the file with the final codec directly. The cache is
+persisted like the PDF page cache (~/.cache/master_search/encodings.pickle).
+
+iter_candidate_lines reads the file once in chunks that end at a line
+break and decodes only the chunks a raw-byte test (QueryPlan.may_match)
+accepts; the lines of the other chunks are only counted.
+"""
+
+import io
+import os
+import codecs
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .profiler import open_buffered
+
+CACHE_VERSION = 1
+SNIFF_BYTES = 4096
+CHUNK_BYTES = 1024 * 1024
+LEGACY_ENCODING = 'cp1252'
+
+DETECT_CODEC = 'master-search-detect'    # UTF-8 mit Rückfall auf die Legacy-Codepage
+LEGACY_CODEC = 'master-search-legacy'    # cp1252, undefinierte Bytes als latin-1
+FALLBACK_ERRORS = 'master-search-legacy'  # Fehler-Handler: ungültige UTF-8-Folgen als cp1252
+
+# Reihenfolge wichtig: der UTF-32-LE-BOM beginnt mit dem UTF-16-LE-BOM
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+WIDE_ENCODINGS = frozenset({'utf-16', 'utf-16-le', 'utf-16-be', 'utf-32'})
+
+# Entscheidung -> Codec zum Öffnen
+_CODECS = {'utf-8': DETECT_CODEC, 'legacy': LEGACY_CODEC, 'mixed': 'utf-8'}
+_ERRORS = {'mixed': FALLBACK_ERRORS, 'utf-8-sig': FALLBACK_ERRORS}  # UTF-16/32: 'replace'
+
+
+def _legacy_table(encoding: str) -> str:
+    chars = []
+    for byte in range(256):
+        try:
+            chars.append(bytes([byte]).decode(encoding))
+        except UnicodeDecodeError:
+            chars.append(chr(byte))  # In cp1252 undefiniert (0x81, 0x8D, ...): wie latin-1
+    return ''.join(chars)
+
+
+_LEGACY_TABLE = _legacy_table(LEGACY_ENCODING)
+
+
+def decode_legacy(data: bytes) -> str:
+    """Single-byte decode with the legacy codepage; never fails."""
+    return codecs.charmap_decode(data, 'strict', _LEGACY_TABLE)[0]
+
+
+def _fallback_errors(error):
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    return decode_legacy(error.object[error.start:error.end]), error.end
+
+
+_utf8_decoder = codecs.getincrementaldecoder('utf-8')
+_current = threading.local()  # Zuletzt in diesem Thread angelegter _DetectingDecoder
+
+
+class _DetectingDecoder(codecs.IncrementalDecoder):
+    """UTF-8 until the first invalid byte, then legacy or mixed (see module docstring)."""
+
+    def __init__(self, errors='strict'):
+        super().__init__(errors)
+        self._utf8 = _utf8_decoder('strict')
+        self.mode = 'utf-8'
+        self.non_ascii = False
+        _current.decoder = self
+
+    def decode(self, input, final=False):
+        if self.mode == 'legacy':
+            return decode_legacy(input)
+        try:
+            text = self._utf8.decode(input, final)
+        except UnicodeDecodeError as e:
+            data = e.object  # Unvollständige Folge vom letzten Block + dieser Block
+            if self.mode == 'utf-8' and not self.non_ascii and data[:e.start].isascii():
+                self.mode = 'legacy'
+                self._utf8.reset()
+                return decode_legacy(data)
+            self.mode = 'mixed'
+            self._utf8 = _utf8_decoder(FALLBACK_ERRORS)
+            text = self._utf8.decode(data, final)
+        if not self.non_ascii and not text.isascii():
+            self.non_ascii = True
+        return text
+
+    def reset(self):
+        self._utf8.reset()
+
+    def getstate(self):
+        return (b'', 0) if self.mode == 'legacy' else self._utf8.getstate()
+
+    def setstate(self, state):
+        if self.mode != 'legacy':
+            self._utf8.setstate(state)
+
+
+class _LegacyDecoder(codecs.IncrementalDecoder):
+    def decode(self, input, final=False):
+        return decode_legacy(input)
+
+
+def _detect_decode(input, errors='strict'):
+    data = bytes(input)
+    return _DetectingDecoder(errors).decode(data, True), len(data)
+
+
+def _legacy_decode(input, errors='strict'):
+    data = bytes(input)
+    return decode_legacy(data), len(data)
+
+
+def _search_codec(name: str) -> Optional[codecs.CodecInfo]:
+    name = name.replace('_', '-')
+    utf8 = codecs.lookup('utf-8')
+    if name == DETECT_CODEC:
+        return codecs.CodecInfo(utf8.encode, _detect_decode, incrementaldecoder=_DetectingDecoder,
+                                incrementalencoder=utf8.incrementalencoder, name=DETECT_CODEC)
+    if name == LEGACY_CODEC:
+        return codecs.CodecInfo(utf8.encode, _legacy_decode, incrementaldecoder=_LegacyDecoder,
+                                incrementalencoder=utf8.incrementalencoder, name=LEGACY_CODEC)
+    return None
+
+
+codecs.register(_search_codec)
+codecs.register_error(FALLBACK_ERRORS, _fallback_errors)
+
+
+def sniff_encoding(head: bytes) -> str:
+    """Encoding from the first bytes: BOM, UTF-16 without BOM, else 'utf-8' (validated while reading)."""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    sample = head[:SNIFF_BYTES & ~1]
+    half = len(sample) // 2
+    if half >= 4:
+        even_nul = sample[0::2].count(0)
+        odd_nul = sample[1::2].count(0)
+        if odd_nul > half * 0.4 and even_nul < half * 0.05:
+            return 'utf-16-le'
+        if even_nul > half * 0.4 and odd_nul < half * 0.05:
+            return 'utf-16-be'
+    return 'utf-8'
+
+
+def ascii_compatible(head: bytes) -> bool:
+    """False for UTF-16/32 text, whose ASCII characters are not single bytes (raw byte prefilters)."""
+    return sniff_encoding(head) not in WIDE_ENCODINGS
+
+
+def default_cache_path() -> str:
+    """Encoding cache file in the user cache."""
+    return os.path.join(os.path.expanduser('~/.cache/master_search'), 'encodings.pickle')
+
+
+class EncodingCache:
+    """Encoding decisions by file path and (size, mtime_ns), LRU bounded by max_entries."""
+
+    def __init__(self, cache_path: Optional[str] = None, max_entries: int = 100000):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, Tuple[int, int, str]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+        if cache_path:
+            self.load()
+
+    def load(self) -> bool:
+        """Load the persisted cache (False if missing or outdated)."""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return False
+        if data.get('version') != CACHE_VERSION:
+            return False
+        self.entries = OrderedDict(data['entries'])
+        return True
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Persist the cache atomically (temp file + os.replace)."""
+        path = path or self.cache_path or default_cache_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with self.lock:
+            data = {'version': CACHE_VERSION, 'entries': list(self.entries.items())}
+            self.dirty = False
+        with open(temp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return path
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, file_path: str, stat: os.stat_result) -> Optional[str]:
+        """Decision for an unchanged file (None if unknown or changed)."""
+        with self.lock:
+            known = self.entries.get(file_path)
+            if known is None or known[:2] != (stat.st_size, stat.st_mtime_ns):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(file_path)
+            return known[2]
+
+    def put(self, file_path: str, stat: os.stat_result, decision: str):
+        with self.lock:
+            if decision == 'utf-8':
+                # Normalfall wird nicht gespeichert (Cache bleibt klein), alte Entscheidung verwerfen
+                if self.entries.pop(file_path, None) is not None:
+                    self.dirty = True
+                return
+            self.entries[file_path] = (stat.st_size, stat.st_mtime_ns, decision)
+            self.entries.move_to_end(file_path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+
+
+class open_detected:
+    """Text stream of a file with detected encoding (context manager, lines like open(path, 'r')).
+
+    decision is the final decision after reading: 'utf-8', 'legacy', 'mixed' or the
+    encoding from BOM/sniffing. With a cache it is remembered when the file is closed.
+    """
+
+    def __init__(self, file_path: str, profiler=None, cache: Optional[EncodingCache] = None):
+        self.file_path = file_path
+        self.cache = cache
+        self._stat = os.stat(file_path) if cache is not None else None
+        self.decision = cache.get(file_path, self._stat) if cache is not None else None
+        self._cached = self.decision
+        buffer = open_buffered(file_path, profiler)
+        try:
+            if self.decision is None:
+                self.decision = sniff_encoding(buffer.peek(SNIFF_BYTES)[:SNIFF_BYTES])
+            _current.decoder = None
+            self.stream = io.TextIOWrapper(buffer, encoding=_CODECS.get(self.decision, self.decision),
+                                           errors=_ERRORS.get(self.decision, 'replace'))
+        except BaseException:
+            buffer.close()
+            raise
+        self._decoder = _current.decoder if self.decision == 'utf-8' else None
+
+    def __enter__(self) -> io.TextIOWrapper:
+        return self.stream
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __iter__(self):
+        return iter(self.stream)
+
+    def close(self):
+        self.stream.close()
+        if self._decoder is not None:
+            self.decision = self._decoder.mode
+        if self.cache is not None and self.decision != self._cached:
+            self.cache.put(self.file_path, self._stat, self.decision)
+
+
+def _count_lines(data: bytes) -> int:
+    """Lines in data as universal newlines count them (\n, \r\n and \r)."""
+    count = data.count(b'\n') + data.count(b'\r') - data.count(b'\r\n')
+    return count + (0 if data.endswith((b'\n', b'\r')) else 1)
+
+
+def iter_candidate_lines(file_path: str, keep: Callable[[bytes], bool], profiler=None,
+                         cache: Optional[EncodingCache] = None,
+                         chunk_bytes: int = CHUNK_BYTES) -> Iterator[Tuple[int, str]]:
+    """(line_number, line) like enumerate(open_detected(...), 1), but only from chunks where keep(raw) holds.
+
+    The file is read once; chunks end at a line break, so keep() sees whole
+    lines. UTF-16/32 files are decoded completely (their ASCII characters
+    are not single bytes, keep() does not apply). Skipped chunks with non-ASCII bytes still go
+    through the decoder, so the decision (legacy/mixed) is the same as
+    after reading everything.
+    """
+    stat = os.stat(file_path) if cache is not None else None
+    cached = cache.get(file_path, stat) if cache is not None else None
+    with open_buffered(file_path, profiler) as buffer:
+        decision = cached or sniff_encoding(buffer.peek(SNIFF_BYTES)[:SNIFF_BYTES])
+        if decision in WIDE_ENCODINGS:
+            if cache is not None and decision != cached:
+                cache.put(file_path, stat, decision)
+            yield from enumerate(io.TextIOWrapper(buffer, encoding=decision, errors='replace'), 1)
+            return
+        decoder = codecs.getincrementaldecoder(_CODECS.get(decision, decision))(_ERRORS.get(decision, 'replace'))
+        line_num = 0
+        pending = []
+        try:
+            while True:
+                chunk = buffer.read(chunk_bytes)
+                final = not chunk
+                if not final:
+                    cut = chunk.rfind(b'\n') + 1
+                    if cut == 0:
+                        pending.append(chunk)  # Zeile länger als ein Block
+                        continue
+                    pending.append(chunk[:cut])
+                data = b''.join(pending)
+                pending = [chunk[cut:]] if not final and cut < len(chunk) else []
+                if keep(data):
+                    for line in io.StringIO(decoder.decode(data, final), newline=None):
+                        line_num += 1
+                        yield line_num, line
+                elif data:
+                    if not data.isascii():
+                        decoder.decode(data, final)
+                    line_num += _count_lines(data)
+                if final:
+                    return
+        finally:
+            if isinstance(decoder, _DetectingDecoder):
+                decision = decoder.mode
+            if cache is not None and decision != cached:
+                cache.put(file_path, stat, decision)
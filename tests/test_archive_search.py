@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die Suche in Archiven (zip, tar.gz, gz) mit Grenzen gegen Zip-Bomben
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import io
+import gzip
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.archive_search import ArchiveLimits, archive_kind, iter_archive_lines
+
+
+class TestArchiveSearch(unittest.TestCase):
+    """Tests für verschachtelte Pfade, Grenzen und die Suche über beide Modi"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('tief/notiz.txt', 'needle im inneren Zip\n')
+            zf.writestr('bild.bin', b'\x00\x01needle')  # Binär: wird übersprungen
+        self.tar = self._tar('logs.tar.gz', {
+            'app/2025-10.log': b'start\nERROR needle timeout\n',
+            'inner.zip': inner.getvalue(),
+        })
+        with gzip.open(os.path.join(self.test_dir, 'app.log.gz'), 'wb') as f:
+            f.write(b'eins\nneedle in gz\n')
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _tar(self, name, members):
+        path = os.path.join(self.test_dir, name)
+        with tarfile.open(path, 'w:gz') as archive:
+            for member, content in members.items():
+                info = tarfile.TarInfo(member)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+        return path
+
+    def _search(self, multiprocessing):
+        tool = FileSearchTool(verbose=False)
+        tool.use_daemon = False
+        tool.search_path = self.test_dir
+        tool.search_terms = ['needle']
+        tool.use_multiprocessing = multiprocessing
+        tool.max_workers = 2
+        tool.search_files_and_folders()
+        return {r['name']: [m['line_content'] for m in r['matches']] for r in tool.results}
+
+    def test_nested_paths(self):
+        """Test: Member von tar.gz, Zip im Tar und gz mit verschachteltem Pfad"""
+        self.assertEqual(archive_kind('a.TAR.GZ'), 'tar')
+        self.assertEqual(archive_kind('a.log.gz'), 'gz')
+        self.assertIsNone(archive_kind('a.docx'))
+        self.assertEqual(list(iter_archive_lines(self.tar)), [
+            (1, '[logs.tar.gz!/app/2025-10.log:1] start'),
+            (2, '[logs.tar.gz!/app/2025-10.log:2] ERROR needle timeout'),
+            (3, '[logs.tar.gz!/inner.zip!/tief/notiz.txt:1] needle im inneren Zip'),
+        ])
+        # Tiefe 1: das innere Zip wird nicht mehr geöffnet
+        limited = []
+        lines = list(iter_archive_lines(self.tar, ArchiveLimits(max_depth=1),
+                                        on_limit=lambda path, reason: limited.append((path, reason))))
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(limited, [('logs.tar.gz!/inner.zip', 'depth')])
+
+    def test_limits_stop_bombs(self):
+        """Test: Entpackte Größe und Kompressionsrate werden beim Lesen geprüft"""
+        bomb = os.path.join(self.test_dir, 'bomb.zip')
+        with zipfile.ZipFile(bomb, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('nullen.txt', b'0' * (50 * 1024 * 1024))  # ~50 KB gepackt
+            zf.writestr('klein.txt', 'needle nach der Bombe\n')
+        limited = []
+        lines = list(iter_archive_lines(bomb, ArchiveLimits(max_ratio=10),
+                                        on_limit=lambda path, reason: limited.append((path, reason))))
+        self.assertEqual(limited, [('bomb.zip!/nullen.txt', 'compression ratio')])
+        self.assertEqual(lines[-1], (len(lines), '[bomb.zip!/klein.txt:1] needle nach der Bombe'))
+
+        limited.clear()
+        list(iter_archive_lines(bomb, ArchiveLimits(max_total_bytes=1024 * 1024),
+                                on_limit=lambda path, reason: limited.append((path, reason))))
+        self.assertEqual(limited, [('bomb.zip', 'total size')])
+
+        # Parallel über Member: gleiche Zeilen in gleicher Reihenfolge
+        many = os.path.join(self.test_dir, 'viele.zip')
+        with zipfile.ZipFile(many, 'w') as zf:
+            for i in range(20):
+                zf.writestr(f'm{i:02d}.txt', f'needle {i}\nzweite {i}\n')
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            parallel = list(iter_archive_lines(many, executor=executor, parallel_min_members=4, members_per_task=3))
+        self.assertEqual(parallel, list(iter_archive_lines(many)))
+        self.assertEqual(len(parallel), 40)
+
+        # Parallel: Grenzen der Worker werden gemeldet, Text über TASK_TEXT_CHARS streamt der Aufrufer,
+        # eingereicht werden nur so viele Aufgaben wie Worker
+        with zipfile.ZipFile(many, 'a') as zf:
+            zf.writestr('m05_gross.txt', 'gross\n' * 2000)
+            zf.writestr('m06_mittel.txt', 'mittel\n' * 50)
+        limited.clear()
+        with ThreadPoolExecutor(max_workers=2) as executor, \
+                mock.patch('src.archive_search.TASK_TEXT_CHARS', 100):
+            submitted = []
+            submit = executor.submit
+            executor.submit = lambda *args: submitted.append(args) or submit(*args)
+            lines = iter_archive_lines(many, ArchiveLimits(max_member_bytes=4096), executor,
+                                       parallel_min_members=4, members_per_task=3,
+                                       on_limit=lambda path, reason: limited.append((path, reason)))
+            next(lines)
+            self.assertEqual(len(submitted), 3)
+            parallel = [line for _num, line in lines]
+        self.assertEqual(limited, [('viele.zip!/m05_gross.txt', 'member size')])
+        sequential = [line for _num, line in iter_archive_lines(many, ArchiveLimits(max_member_bytes=4096))]
+        self.assertEqual([sequential[0]] + parallel, sequential)
+        self.assertEqual(len(sequential), 90)
+
+    def test_search_in_archives(self):
+        """Test: Suche findet Treffer in Archiven im Thread- und im Prozess-Modus"""
+        expected = {
+            'logs.tar.gz': ['[logs.tar.gz!/app/2025-10.log:2] ERROR needle timeout',
+                            '[logs.tar.gz!/inner.zip!/tief/notiz.txt:1] needle im inneren Zip'],
+            'app.log.gz': ['[app.log.gz!/app.log:2] needle in gz'],
+        }
+        for multiprocessing in (False, True):
+            with self.subTest(multiprocessing=multiprocessing):
+                self.assertEqual(self._search(multiprocessing), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
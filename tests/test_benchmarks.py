@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die Benchmark-Suite (Korpus-Generator und Szenarien)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import CorpusSpec, generate_corpus, data_dir
+from benchmarks.scenarios import run_scenario, percentile
+from benchmarks.runner import compare, maxrss_mb
+
+
+def read_tree(path):
+    """Liest alle Dateien eines Verzeichnisses als {relativer Pfad: Inhalt}"""
+    contents = {}
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            with open(file_path, 'rb') as f:
+                contents[os.path.relpath(file_path, path)] = f.read()
+    return contents
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Tests für benchmarks/"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.spec = CorpusSpec(files=40, depth=1, fanout=3, median_size=2048, office_ratio=0.2, seed=7)
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_corpus_is_deterministic(self):
+        """Test: Gleiche Spezifikation erzeugt byte-identische Korpora"""
+        first = os.path.join(self.test_dir, 'a')
+        second = os.path.join(self.test_dir, 'b')
+        manifest = generate_corpus(self.spec, first)
+        generate_corpus(self.spec, second)
+        self.assertEqual(read_tree(first), read_tree(second))
+        self.assertEqual(len(read_tree(data_dir(first))), 40)
+        self.assertEqual(sum(manifest['kinds'].values()), 40)
+        self.assertGreater(manifest['kinds']['office'], 0)
+
+    def test_search_scenario_metrics(self):
+        """Test: Such-Szenario liefert Durchsatz und Batch-Latenz"""
+        generate_corpus(self.spec, self.test_dir)
+        metrics = run_scenario('literal', self.test_dir, mode='thread')
+        self.assertEqual(metrics['files'], 40)
+        self.assertGreater(metrics['results'], 0)
+        self.assertGreater(metrics['batches'], 0)
+        self.assertIsNotNone(metrics['batch_p95_ms'])
+        self.assertIsNotNone(metrics['mb_per_s'])
+
+    def test_compare_and_percentile(self):
+        """Test: Vergleich zweier Ergebnisse und p95-Berechnung"""
+        self.assertEqual(percentile(list(range(1, 101)), 95), 95)
+        self.assertIsNone(percentile([], 95))
+        baseline = {'scenarios': {'literal': {'median': {'elapsed_s': 2.0, 'files_per_s': 100.0}}}}
+        current = {'scenarios': {'literal': {'median': {'elapsed_s': 1.0, 'files_per_s': 200.0}}}}
+        rows = {row['metric']: row for row in compare(baseline, current)}
+        self.assertEqual(rows['elapsed_s']['change_percent'], -50.0)
+        self.assertTrue(rows['elapsed_s']['better'])
+        self.assertTrue(rows['files_per_s']['better'])
+
+    def test_maxrss_units(self):
+        """Test: ru_maxrss in Bytes (macOS) und Kilobytes (Linux) ergibt dieselben MB"""
+        self.assertEqual(maxrss_mb(256 * 1024 * 1024, 'darwin'), 256.0)
+        self.assertEqual(maxrss_mb(256 * 1024, 'linux'), 256.0)
+        self.assertEqual(maxrss_mb(1536, 'freebsd13'), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die Binär-Erkennung (Magic Numbers, NUL-/Steuerzeichen, Cache, strings/skip)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.binary_detect import HEAD_BYTES, BinaryDetector, classify
+
+
+class TestBinaryDetect(unittest.TestCase):
+    """Tests für die Erkennung am Inhalt und das Routing von Binärdateien"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_classify(self):
+        """Test: Magic Numbers, NUL- und Steuerzeichen, Text in UTF-8, cp1252, UTF-16 und mit ANSI-Farben"""
+        cases = {
+            b'\x89PNG\r\n\x1a\n' + b'x' * 20: 'png',
+            b'SQLite format 3\x00' + b'\x10\x00': 'sqlite',
+            b'\xca\xfe\xba\xbe\x00\x00\x00\x34': 'java-class',
+            b'PK\x03\x04\x14\x00': 'zip',
+            b'wOF2\x00\x01': 'woff2',
+            b'\xa7\r\r\n\x00\x00\x00\x00': 'nul',  # .pyc
+            bytes(range(1, 32)) * 4: 'control',
+            'Grüße aus Köln\n'.encode('utf-8'): None,
+            b'Stra\xdfe 5\r\n': None,
+            'hallo welt\n'.encode('utf-16-le'): None,
+            b'\x1b[31mFEHLER\x1b[0m\tlauf 3\n': None,
+            b'': None,
+        }
+        for data, reason in cases.items():
+            with self.subTest(data=data[:12]):
+                self.assertEqual(classify(data), reason)
+
+        # Textkopf vor Binärdaten (Datenbankseiten): nur die Probe aus der Mitte findet sie
+        path = self._write('daten.txt', b'# Kopfzeile\n' * (HEAD_BYTES // 12 + 1) + b'\x00\x01\x02\x03' * HEAD_BYTES)
+        self.assertEqual(BinaryDetector(sample_middle=True).detect(path), 'nul')
+        self.assertIsNone(BinaryDetector(sample_middle=False).detect(path))
+
+    def test_cache_by_size_and_mtime(self):
+        """Test: Entscheidung aus dem Cache bis sich Größe oder mtime ändern"""
+        path = self._write('app.pyc', b'\xa7\r\r\n\x00\x00\x00\x00code')
+        detector = BinaryDetector(max_entries=1)
+        self.assertEqual(detector.detect(path), 'nul')
+        self.assertEqual(detector.detect(path, os.stat(path)), 'nul')
+        self.assertEqual((detector.hits, detector.misses), (1, 1))
+
+        self._write('app.pyc', b'jetzt Text\n')
+        os.utime(path, ns=(0, 1))
+        self.assertIsNone(detector.detect(path))
+        self.assertEqual(detector.misses, 2)
+        detector.detect(self._write('b.txt', b'text'))
+        self.assertEqual(len(detector), 1)  # max_entries
+
+    def test_strings_and_skip(self):
+        """Test: Binärdatei mit Textendung nur über druckbare Zeichenfolgen durchsucht oder übersprungen"""
+        path = self._write('settings.cfg', b'\x00\x01\x02' * 100 + b'password=needle_secret\x00\x00ab\x00needle\x00'
+                                              + b'\x00' * 100 + b'tail needle text')
+        tool = FileSearchTool(verbose=False)
+        tool.search_terms = ['needle']
+        self.assertEqual(tool._select_file_extractor(path)[0], 'strings')
+        self.assertEqual([(m['line_number'], m['line_content']) for m in tool.search_in_file(path)],
+                         [(1, '[@0x12c] password=needle_secret'), (2, '[@0x147] needle'),
+                          (3, '[@0x1b2] tail needle text')])  # ohne 'ab'
+
+        tool.binary_files = 'skip'
+        self.assertEqual(tool.search_in_file(path), [])
+        tool.binary_files = 'text'
+        self.assertEqual(tool._select_file_extractor(path), ('text', None))
+        tool.binary_files = 'hex'
+        with self.assertRaises(ValueError):
+            tool._prepare_query()
+
+        for mode, expected in (('strings', ['[@0x12c] password=needle_secret', '[@0x147] needle',
+                                            '[@0x1b2] tail needle text']), ('skip', [])):
+            with self.subTest(mode=mode):
+                results = FileSearchTool.process_file_batch_static(
+                    [(path, 'settings.cfg')], ['needle'], 'any', False, False, {'.cfg'}, 10 ** 9,
+                    binary_files=mode)
+                self.assertEqual([m['line_content'] for r in results for m in r['matches']], expected)
+                self.assertEqual(list(results.file_stats['extractors']), [mode.replace('skip', 'binary')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für das Change Tracking (inkrementelle Suche)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.change_tracker import ChangeTracker, inotify_available
+from src.ocr_handler import OCRHandler
+
+
+class TestChangeTracker(unittest.TestCase):
+    """Tests für Snapshot-Abgleich, inotify und die inkrementelle Suche"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.test_dir, 'data')
+        os.makedirs(os.path.join(self.root, 'sub', 'deep'))
+        for i in range(4):
+            self._write(f'file{i}.txt', 'kein Treffer\n')
+        self._write(os.path.join('sub', 'deep', 'alt.txt'), 'needle\n')
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, text, mode='w'):
+        with open(os.path.join(self.root, name), mode, encoding='utf-8') as f:
+            f.write(text)
+
+    def _change_tree(self):
+        self._write('file1.txt', 'needle angehängt\n', 'a')
+        os.remove(os.path.join(self.root, 'file2.txt'))
+        os.makedirs(os.path.join(self.root, 'neu'))
+        self._write(os.path.join('neu', 'neu.txt'), 'needle\n')
+        os.rename(os.path.join(self.root, 'sub'), os.path.join(self.root, 'umbenannt'))
+
+    def _relative(self, paths):
+        return sorted(os.path.relpath(path, self.root).replace(os.sep, '/') for path in paths)
+
+    def _assert_changes(self, changes):
+        self.assertEqual(self._relative(changes.added), ['neu/neu.txt', 'umbenannt/deep/alt.txt'])
+        self.assertEqual(self._relative(changes.modified), ['file1.txt'])
+        self.assertEqual(self._relative(changes.deleted), ['file2.txt', 'sub/deep/alt.txt'])
+
+    def test_snapshot_diff_and_persistence(self):
+        """Test: Snapshot-Abgleich findet Änderungen, auch nach Neuladen des Snapshots"""
+        snapshot = os.path.join(self.test_dir, 'snapshot.pickle')
+        tracker = ChangeTracker(self.root, snapshot, use_inotify=False)
+        initial = tracker.refresh()
+        self.assertTrue(initial.initial)
+        self.assertEqual(len(initial.added), 5)
+
+        unchanged = ChangeTracker(self.root, snapshot, use_inotify=False).refresh()
+        self.assertFalse(unchanged)
+        self.assertEqual(unchanged.dirs_listed, 0)  # Alle Verzeichnisse über ihre mtime wiederverwendet
+
+        self._change_tree()
+        self._assert_changes(ChangeTracker(self.root, snapshot, use_inotify=False).refresh())
+        self.assertEqual(len(ChangeTracker(self.root, snapshot, use_inotify=False)), 5)
+
+    @unittest.skipUnless(inotify_available(), 'inotify nicht verfügbar')
+    def test_inotify_refresh(self):
+        """Test: Mit inotify liefert ein Abgleich ohne Änderungen nichts und liest keine Verzeichnisse"""
+        tracker = ChangeTracker(self.root, use_inotify=True)
+        try:
+            tracker.refresh()
+            unchanged = tracker.refresh()
+            self.assertEqual(unchanged.backend, 'inotify')
+            self.assertFalse(unchanged)
+            self.assertEqual(unchanged.files_stated, 0)
+            self._change_tree()
+            self._assert_changes(tracker.refresh())
+        finally:
+            tracker.close()
+
+    def test_incremental_search_invalidates_ocr_cache(self):
+        """Test: Inkrementelle Suche durchsucht nur geänderte Dateien und leert den OCR-Cache"""
+        tool = FileSearchTool(verbose=False)
+        tool.search_path = self.root
+        tool.search_terms = ['needle']
+        tool.use_multiprocessing = False
+        tool.ocr_handler = OCRHandler(use_cache=True, cache_dir=os.path.join(self.test_dir, 'ocr'))
+        tracker = ChangeTracker(self.root, use_inotify=False)
+
+        changes = tool.search_changed_files(tracker)
+        self.assertTrue(changes.initial)
+        self.assertEqual(tool.get_result_count(), 1)
+
+        image = os.path.join(self.root, 'file1.txt')
+        tool.ocr_handler._save_to_cache(image, 'alter OCR-Text')
+        self.assertEqual(tool.ocr_handler._load_from_cache(image), 'alter OCR-Text')
+
+        self._change_tree()
+        tool.results = []
+        changes = tool.search_changed_files(tracker)
+        self.assertEqual(tool.file_stats.summary()['files'], 3)  # Nur neue und geänderte Dateien
+        self.assertEqual(self._relative(r['path'] for r in tool.results),
+                         ['file1.txt', 'neu/neu.txt', 'umbenannt/deep/alt.txt'])
+        self.assertEqual(os.listdir(tool.ocr_handler.cache_dir), [])
+
+    def test_ocr_cache_save_replaces_known_version(self):
+        """Test: Speichern ersetzt die bekannte ältere Version, ohne das Cache-Verzeichnis zu durchsuchen"""
+        handler = OCRHandler(use_cache=True, cache_dir=os.path.join(self.test_dir, 'ocr'))
+        images = [os.path.join(self.root, f'file{i}.txt') for i in range(4)]
+        with mock.patch('src.ocr_handler.os.scandir', side_effect=AssertionError('scandir')):
+            for image in images:
+                handler._save_to_cache(image, 'alt')
+            os.utime(images[0], ns=(0, 10 ** 9))  # Neue Version der ersten Datei
+            handler._save_to_cache(images[0], 'neu')
+        self.assertEqual(len(os.listdir(handler.cache_dir)), 4)
+        self.assertEqual(handler._load_from_cache(images[0]), 'neu')
+        self.assertEqual(handler.invalidate(images[:2]), 2)
+        self.assertEqual(len(os.listdir(handler.cache_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für den Directory Skip Cache
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.dir_cache import DirectoryCache
+
+OLD_MTIME_NS = 1_600_000_000 * 10**9  # Weit außerhalb des "racy"-Fensters
+
+
+class TestDirectoryCache(unittest.TestCase):
+    """Tests für Wiederverwendung, Schutz vor unzuverlässigen mtimes und Verify-Modus"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.test_dir, 'data')
+        self.cache_path = os.path.join(self.test_dir, 'dircache.pickle')
+        for directory in ('archiv/2023', 'archiv/2024', 'berichte'):
+            os.makedirs(os.path.join(self.root, directory))
+        for name in ('archiv/2023/a.txt', 'archiv/2024/b.txt', 'berichte/needle.txt', 'c.txt'):
+            self._write(name, 'needle\n')
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, text):
+        with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def _age_directories(self):
+        for directory, _dirs, _files in os.walk(self.root):
+            os.utime(directory, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+    def _walk(self, verify=False):
+        cache = DirectoryCache(self.root, self.cache_path, verify=verify)
+        entries = list(cache.walk())
+        return cache.stats, entries
+
+    def test_reuses_unchanged_directories(self):
+        """Test: Unveränderte Verzeichnisse werden aus dem persistierten Cache übernommen"""
+        stats, entries = self._walk()
+        self.assertEqual(entries, list(os.walk(self.root)))
+        self.assertEqual(stats.dirs_listed, 5)
+
+        # Gerade gelistete Verzeichnisse sind "racy" und werden erneut gelesen
+        stats, _ = self._walk()
+        self.assertEqual((stats.dirs_reused, stats.dirs_racy), (0, 5))
+
+        self._age_directories()
+        self._walk()
+        stats, entries = self._walk()
+        self.assertEqual((stats.dirs_reused, stats.dirs_listed), (5, 0))
+        self.assertEqual(entries, list(os.walk(self.root)))
+
+        # Neue Datei ändert die mtime ihres Verzeichnisses: nur dieses wird neu gelesen
+        self._write('archiv/2024/neu.txt', 'neu\n')
+        stats, entries = self._walk()
+        self.assertEqual((stats.dirs_reused, stats.dirs_listed), (4, 1))
+        self.assertEqual(entries, list(os.walk(self.root)))
+
+    def test_verify_counts_divergences_and_disables_cache(self):
+        """Test: Verify-Modus erkennt eine trotz gleicher mtime geänderte Auflistung"""
+        self._age_directories()
+        self._walk()
+        # Unzuverlässige mtime simulieren: neue Datei, alte mtime wiederhergestellt
+        self._write('archiv/2023/versteckt.txt', 'needle\n')
+        os.utime(os.path.join(self.root, 'archiv', '2023'), ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+        _stats, entries = self._walk()
+        self.assertNotIn('versteckt.txt', dict((d, f) for d, _s, f in entries)[os.path.join(self.root, 'archiv', '2023')])
+
+        stats, entries = self._walk(verify=True)
+        self.assertEqual(stats.divergences, 1)
+        self.assertEqual(stats.divergent_dirs, [os.path.join(self.root, 'archiv', '2023')])
+        self.assertEqual(entries, list(os.walk(self.root)))
+
+        # Danach gilt der Cache für diesen Pfad als unzuverlässig
+        stats, entries = self._walk()
+        self.assertIn('divergences', stats.disabled)
+        self.assertEqual(stats.dirs_reused, 0)
+        self.assertEqual(entries, list(os.walk(self.root)))
+
+    def test_search_uses_directory_cache(self):
+        """Test: Die Suche nutzt den Cache und findet dieselben Treffer"""
+        self._age_directories()
+        tool = FileSearchTool(verbose=False)
+        tool.search_path = self.root
+        tool.search_terms = ['needle']
+        tool.use_multiprocessing = False
+        tool.use_directory_cache = True
+        tool.directory_caches[os.path.abspath(self.root)] = DirectoryCache(self.root, self.cache_path)
+
+        tool.search_files_and_folders()
+        self.assertEqual(tool.get_result_count(), 4)
+        self.assertEqual(tool.directory_cache_stats.dirs_listed, 5)
+
+        tool.results = []
+        tool.search_files_and_folders()
+        self.assertEqual(tool.get_result_count(), 4)
+        self.assertEqual(tool.directory_cache_stats.dirs_reused, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
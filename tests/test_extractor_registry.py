@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die Extraktor-Registry (Metadaten, Entry-Points, Prozess-Pfad und Routing)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import sqlite3
+import zipfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.extractors import (BUILTIN_EXTRACTORS, COST_CHEAP, ExtractContext, Extractor, ExtractorRegistry,
+                            default_registry)
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def extract_upper(file_path, context):
+    with open(file_path, encoding='utf-8') as f:
+        return [(line_num, line.strip().upper()) for line_num, line in enumerate(f, 1)]
+
+
+class FakeEntryPoint:
+    def __init__(self, name, loaded):
+        self.name = name
+        self.value = f'plugin:{name}'
+        self.loaded = loaded
+
+    def load(self):
+        if isinstance(self.loaded, Exception):
+            raise self.loaded
+        return self.loaded
+
+
+class TestExtractorRegistry(unittest.TestCase):
+    """Tests für Auswahl nach Endung, Plugins und beide Such-Pfade"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _docx(self, name, text):
+        path = os.path.join(self.test_dir, name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('word/document.xml', f'<w:document {W}><w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+                                             '</w:body></w:document>')
+        return path
+
+    def test_metadata_and_override(self):
+        """Test: Kosten, Affinität, Cache-Key, OCR nur mit use_ocr, spätere Registrierung gewinnt"""
+        registry = ExtractorRegistry(BUILTIN_EXTRACTORS)
+        docx = registry.select('.DOCX')
+        self.assertEqual((docx.name, docx.affinity, docx.streaming), ('docx', 'process', True))
+        self.assertEqual(registry.select('.pdf').affinity, 'thread')  # Seiten-Cache im suchenden Prozess
+        self.assertEqual(registry.get('pdf').cache_key, 'pdf@1')
+        self.assertIsNone(registry.select('.txt'))
+        self.assertIsNone(registry.select('.log'))  # Text-Pfad: Vorfilter und frühes Ende
+        self.assertIsNone(registry.select('.png', ExtractContext()))
+        self.assertEqual(registry.select('.png', ExtractContext(use_ocr=True)).name, 'ocr')
+
+        upper = registry.register(Extractor('upper', ['log'], extract_upper, COST_CHEAP, version=2))
+        self.assertIs(registry.select('.log'), upper)
+        self.assertEqual((upper.affinity, upper.cache_key), ('thread', 'upper@2'))
+        with self.assertRaises(ValueError):
+            Extractor('x', ['.x'], extract_upper, cost='teuer')
+
+    def test_entry_points(self):
+        """Test: Extractor, Liste aus Fabrik und fehlerhafte Entry-Points"""
+        registry = ExtractorRegistry()
+        epub = Extractor('epub', ['.epub'], extract_upper)
+        loaded = registry.load_entry_points(entry_points=[
+            FakeEntryPoint('epub', epub),
+            FakeEntryPoint('mehrere', lambda: [Extractor('a', ['.aaa'], extract_upper),
+                                               Extractor('b', ['.bbb'], extract_upper)]),
+            FakeEntryPoint('kaputt', ImportError('No module named plugin')),
+        ])
+        self.assertEqual(loaded, 3)
+        self.assertIs(registry.select('.epub'), epub)
+        self.assertEqual(registry.extensions(), ('.aaa', '.bbb', '.epub'))
+        self.assertEqual(registry.load_errors, [('kaputt = plugin:kaputt', 'ImportError: No module named plugin')])
+
+        # Die Tool-Registry ist die des Prozesses (wie in den Workern)
+        self.assertIs(FileSearchTool(verbose=False).extractor_registry, default_registry())
+
+    def test_process_path_and_routing(self):
+        """Test: Prozess-Pfad durchsucht DOCX-Text statt Bytes, Threading-Modus gibt DOCX an Prozesse"""
+        docx = self._docx('bericht.docx', 'Vertrag needle 2025')
+        results = FileSearchTool.process_file_batch_static([(docx, 'bericht.docx')], ['needle'], 'any', False, False,
+                                                           {'.docx'}, 10 ** 9)
+        self.assertEqual([m['line_content'] for m in results[0]['matches']], ['Vertrag needle 2025'])
+        self.assertEqual(list(results.file_stats['extractors']), ['docx'])
+
+        for i in range(8):
+            self._docx(f'doc{i}.docx', f'needle {i}')
+        with open(os.path.join(self.test_dir, 'notiz.txt'), 'w', encoding='utf-8') as f:
+            f.write('needle als Text\n')
+        tool = FileSearchTool(verbose=False)
+        tool.use_daemon = False
+        tool.search_path = self.test_dir
+        tool.search_terms = ['needle']
+        tool.use_multiprocessing = False
+        tool.max_workers = 2
+        all_files, _folders = tool.collect_files_and_folders()
+        process_files, thread_files = tool._split_by_affinity(all_files)
+        self.assertEqual((len(process_files), [name for _path, name in thread_files]), (9, ['notiz.txt']))
+        tool.route_cpu_extractors = False
+        self.assertEqual(tool._split_by_affinity(all_files), ([], all_files))
+
+        tool.route_cpu_extractors = True
+        tool.search_files_and_folders()
+        self.assertEqual(len(tool.results), 10)
+        self.assertEqual(tool.file_stats.extractors['docx'][0], 9)
+
+    def test_multiprocessing_keeps_thread_affinity_local(self):
+        """Test: Multiprocessing-Modus sucht Archive und SQLite in Threads des suchenden Prozesses"""
+        with zipfile.ZipFile(os.path.join(self.test_dir, 'paket.zip'), 'w') as archive:
+            archive.writestr('innen.txt', 'needle im Archiv\n')
+        conn = sqlite3.connect(os.path.join(self.test_dir, 'daten.db'))
+        conn.execute('CREATE TABLE t (text TEXT)')
+        conn.execute("INSERT INTO t VALUES ('needle in SQLite')")
+        conn.commit()
+        conn.close()
+        for i in range(4):
+            with open(os.path.join(self.test_dir, f'notiz{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write(f'needle {i}\n')
+        tool = FileSearchTool(verbose=False)
+        tool.use_daemon = False
+        tool.search_path = self.test_dir
+        tool.search_terms = ['needle']
+        tool.use_multiprocessing = True
+        tool.max_workers = 2
+        tool.chunk_size = 2
+        all_files, _folders = tool.collect_files_and_folders()
+        process_files, thread_files = tool._split_thread_affinity(all_files)
+        self.assertEqual(sorted(name for _path, name in thread_files), ['daten.db', 'paket.zip'])
+        self.assertEqual(len(process_files), 4)
+
+        local_batches = []
+        process_file_batch = tool.process_file_batch
+
+        def record_batch(batch, max_line_length=None):
+            local_batches.append([name for _path, name in batch])
+            return process_file_batch(batch, max_line_length)
+
+        tool.process_file_batch = record_batch
+        tool.search_files_and_folders()
+        self.assertEqual(sorted(name for batch in local_batches for name in batch), ['daten.db', 'paket.zip'])
+        self.assertEqual(len(tool.results), 6)
+        self.assertLessEqual({'archive', 'sqlite'}, set(tool.file_stats.extractors))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -256,5 +256,194 @@ class TestConfigurationValidation(unittest.TestCase):
         self.assertTrue(self.tool.use_multiprocessing)
 
 
+class TestEarlyTermination(unittest.TestCase):
+    """Tests für max_matches_per_file, files_with_matches_only und max_total_results"""
+    
+    def setUp(self):
+        """Setup mit mehreren Dateien voller Treffer"""
+        self.tool = FileSearchTool()
+        self.tool.use_multiprocessing = False
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(5):
+            with open(os.path.join(self.temp_dir, f"data{i}.txt"), "w", encoding="utf-8") as f:
+                f.write("needle line\n" * 20)
+        self.tool.search_path = self.temp_dir
+        self.tool.search_terms = ["needle"]
+    
+    def tearDown(self):
+        """Cleanup"""
+        import shutil
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def test_max_matches_per_file(self):
+        """Test: Treffer pro Datei werden begrenzt"""
+        self.tool.max_matches_per_file = 3
+        matches = self.tool.search_in_file(os.path.join(self.temp_dir, "data0.txt"))
+        self.assertEqual(len(matches), 3)
+    
+    def test_files_with_matches_only(self):
+        """Test: Nur der erste Treffer pro Datei wird gemeldet"""
+        self.tool.files_with_matches_only = True
+        self.tool.search_files_and_folders()
+        self.assertEqual(len(self.tool.results), 5)
+        for result in self.tool.results:
+            self.assertEqual(len(result['matches']), 1)
+    
+    def test_max_total_results(self):
+        """Test: Gesamtanzahl der Ergebnisse wird begrenzt"""
+        self.tool.chunk_size = 1
+        self.tool.max_total_results = 2
+        self.tool.search_files_and_folders()
+        self.assertEqual(len(self.tool.results), 2)
+        self.assertTrue(self.tool.result_limit_reached)
+    
+    def test_static_worker_respects_limits(self):
+        """Test: Multiprocessing-Worker beachtet die Limits"""
+        batch = [(os.path.join(self.temp_dir, "data0.txt"), "data0.txt")]
+        results = FileSearchTool.process_file_batch_static(
+            batch, ["needle"], "any", False, False, {'.txt'}, 50 * 1024 * 1024,
+            max_matches_per_file=4)
+        self.assertEqual(len(results[0]['matches']), 4)
+        results = FileSearchTool.process_file_batch_static(
+            batch, ["needle"], "any", False, False, {'.txt'}, 50 * 1024 * 1024,
+            files_with_matches_only=True)
+        self.assertEqual(len(results[0]['matches']), 1)
+
+
+class TestCancellation(unittest.TestCase):
+    """Tests für den kooperativen Abbruch (Stop-Button)"""
+    
+    def setUp(self):
+        """Setup"""
+        self.tool = FileSearchTool()
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(3):
+            with open(os.path.join(self.temp_dir, f"data{i}.txt"), "w", encoding="utf-8") as f:
+                f.write("needle line\n" * 10)
+    
+    def tearDown(self):
+        """Cleanup"""
+        import shutil
+        import src.file_search_tool as fst_module
+        fst_module._init_worker_cancel_event(None)
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def test_stop_requested_sets_worker_event(self):
+        """Test: stop_requested reicht den Abbruch an das Worker-Signal weiter"""
+        import multiprocessing
+        self.tool._worker_cancel_event = multiprocessing.Event()
+        self.tool.stop_requested = True
+        self.assertTrue(self.tool.stop_requested)
+        self.assertTrue(self.tool._worker_cancel_event.is_set())
+        self.tool.stop_requested = False
+        self.assertFalse(self.tool.stop_requested)
+    
+    def test_static_worker_stops_on_cancel(self):
+        """Test: Worker-Prozess bricht bei gesetztem Signal vor der nächsten Datei ab"""
+        import threading
+        import src.file_search_tool as fst_module
+        cancel_event = threading.Event()
+        fst_module._init_worker_cancel_event(cancel_event)
+        batch = [(os.path.join(self.temp_dir, f"data{i}.txt"), f"data{i}.txt") for i in range(3)]
+        
+        results = FileSearchTool.process_file_batch_static(
+            batch, ["needle"], "any", False, False, {'.txt'}, 50 * 1024 * 1024)
+        self.assertEqual(len(results), 3)
+        
+        cancel_event.set()
+        results = FileSearchTool.process_file_batch_static(
+            batch, ["needle"], "any", False, False, {'.txt'}, 50 * 1024 * 1024)
+        self.assertEqual(results, [])
+    
+    def test_partial_results_share_term_tuple(self):
+        """Test: Teilergebnisse laufender Batches beim Stop binden die Begriffe wie fertige Batches"""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from src.memory_governor import MemoryGovernor
+        self.tool.search_terms = ["needle"]
+        self.tool.max_workers = 2
+        self.tool.memory_governor = MemoryGovernor()
+        batches = [[(os.path.join(self.temp_dir, f"data{i}.txt"), f"data{i}.txt")] for i in range(2)]
+        
+        def run_batch(batch):
+            if batch is batches[0]:
+                self.tool.stop_requested = True  # Stop, während der zweite Batch noch läuft
+            else:
+                time.sleep(0.3)
+            return FileSearchTool.process_file_batch_static(
+                batch, ["needle"], "any", False, False, {'.txt'}, 50 * 1024 * 1024)
+        
+        file_results = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.tool._run_batches(executor, lambda batch, _length: executor.submit(run_batch, batch),
+                                   batches, file_results, 2, 0, 'Thread-Fehler')
+        self.assertEqual(len(file_results), 2)
+        terms = file_results[0].terms
+        self.assertTrue(all(r.terms is terms and r.matches[0].terms is terms for r in file_results))
+    
+    def test_stopped_search_returns_without_processing(self):
+        """Test: Ein vorab gestoppte Suche verarbeitet keine Dateien"""
+        self.tool.search_path = self.temp_dir
+        self.tool.search_terms = ["needle"]
+        self.tool.stop_requested = True
+        self.tool.search_files_and_folders()
+        self.assertEqual(len(self.tool.results), 0)
+
+
+class TestFileStats(unittest.TestCase):
+    """Tests für die Statistik pro Extraktor und Dateiendung"""
+
+    def setUp(self):
+        """Setup mit Text- und CSV-Dateien"""
+        self.tool = FileSearchTool()
+        self.tool.use_multiprocessing = False
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(3):
+            with open(os.path.join(self.temp_dir, f"data{i}.txt"), "w", encoding="utf-8") as f:
+                f.write("needle line\n" * 10)
+        with open(os.path.join(self.temp_dir, "table.csv"), "w", encoding="utf-8") as f:
+            f.write("a,needle\nb,c\n")
+        self.tool.search_path = self.temp_dir
+        self.tool.search_terms = ["needle"]
+
+    def tearDown(self):
+        """Cleanup"""
+        import shutil
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_stats_per_extractor_and_extension(self):
+        """Test: Zeit, Bytes und Dateien werden pro Extraktor und Endung erfasst"""
+        statuses = []
+        self.tool.status_callback = statuses.append
+        self.tool.search_files_and_folders()
+
+        summary = self.tool.get_file_stats_summary()
+        extractors = {row['extractor']: row for row in summary['extractors']}
+        extensions = {row['extension']: row for row in summary['extensions']}
+        self.assertEqual(extractors['text']['files'], 3)
+        self.assertEqual(extractors['csv']['files'], 1)
+        self.assertEqual(extensions['.txt']['bytes'], 3 * len("needle line\n" * 10))
+        self.assertEqual(len(summary['slowest_files']), 4)
+
+        complete = [s for s in statuses if s.get('type') == 'complete'][0]
+        self.assertEqual(complete['file_stats']['files'], 4)
+
+    def test_top_n_across_batches(self):
+        """Test: Die langsamsten Dateien werden über alle Batches bestimmt"""
+        from src.file_stats import FileStats
+        total = FileStats(top_n=2)
+        for offset in (0, 10):
+            batch = FileStats(top_n=2)
+            for i in range(5):
+                batch.record(f"/data/file{offset + i}.pdf", 'pdf', float(offset + i), 100)
+            total.merge(batch.to_dict())
+        slowest = total.summary()['slowest_files']
+        self.assertEqual([entry['path'] for entry in slowest], ["/data/file14.pdf", "/data/file13.pdf"])
+        self.assertEqual(total.summary()['extractors'][0]['files'], 10)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
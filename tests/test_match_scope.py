@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für den Datei- und Nähe-Modus (match_scope)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.query_language import compile_query, compile_terms
+
+
+class TestMatchScope(unittest.TestCase):
+    """Tests für ALL über die ganze Datei, frühes Aufgeben und Nähe-Suche"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self._write('beide.txt', 'alpha am Anfang\n' + 'füller\n' * 20 + 'beta am Ende\n')
+        self._write('nur_alpha.txt', 'alpha allein\nnichts\n')
+        self._write('nah.txt', 'alpha\nzwei\nbeta\n' + 'füller\n' * 10 + 'alpha weit weg\n')
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, text):
+        with open(os.path.join(self.test_dir, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def _search(self, scope, multiprocessing=False, query=''):
+        tool = FileSearchTool(verbose=False)
+        tool.use_daemon = False
+        tool.search_path = self.test_dir
+        tool.search_terms = ['alpha', 'beta']
+        tool.search_mode = 'all'
+        tool.search_query = query
+        tool.match_scope = scope
+        tool.near_lines = 3
+        tool.use_multiprocessing = multiprocessing
+        tool.max_workers = 2
+        tool.search_files_and_folders()
+        return {r['name']: [m['line_number'] for m in r['matches']] for r in tool.results}
+
+    def test_file_scope_all_terms(self):
+        """Test: ALL im Datei-Modus findet Begriffe in verschiedenen Zeilen"""
+        self.assertEqual(self._search('line'), {})
+        self.assertEqual(self._search('file'), {'beide.txt': [1, 22], 'nah.txt': [1, 3, 14]})
+        self.assertEqual(self._search('file', query='alpha -füller'), {'nur_alpha.txt': [0, 1]})  # Name und Zeile 1
+        with self.assertRaises(ValueError):
+            self._search('absatz')
+
+    def test_file_scope_abandons_early(self):
+        """Test: Die Datei wird nicht weiter gelesen, sobald das Ergebnis feststeht"""
+        read = []
+
+        def lines(count):
+            for line_num in range(1, count + 1):
+                read.append(line_num)
+                yield line_num, 'debug alpha' if line_num == 2 else 'alpha'
+
+        matcher = compile_query('alpha -debug').bind('/x/a.log', scope='file')
+        self.assertEqual(list(matcher.run(lines(1000))), [])
+        self.assertEqual(read, [1, 2])  # NOT-Begriff gesehen: Abbruch
+
+        matcher = compile_terms(('alpha', 'beta'), 'all').bind('/x/a.log', scope='file')
+        read.clear()
+        self.assertEqual([hit[0] for hit in matcher.run(lines(1000), limit=5)], [])
+        self.assertEqual(len(read), 1000)  # beta fehlt erst am Dateiende sicher
+
+        matcher = compile_terms(('alpha', 'debug'), 'all').bind('/x/a.log', scope='file')
+        read.clear()
+        self.assertEqual([hit[0] for hit in matcher.run(lines(1000), limit=3)], [1, 2, 3])
+        self.assertEqual(read, [1, 2, 3])  # Limit erreicht: Rest nicht lesen
+
+    def test_near_scope(self):
+        """Test: Nähe-Modus im Thread- und im Prozess-Modus"""
+        for multiprocessing in (False, True):
+            with self.subTest(multiprocessing=multiprocessing):
+                self.assertEqual(self._search('near', multiprocessing), {'nah.txt': [1, 3]})
+                self.assertEqual(self._search('file', multiprocessing),
+                                 {'beide.txt': [1, 22], 'nah.txt': [1, 3, 14]})
+
+
+if __name__ == '__main__':
+    unittest.main()
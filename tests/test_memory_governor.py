@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für den Memory-Governor
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.memory_governor import MemoryGovernor, sample_memory, STATE_OK, STATE_PRESSURE
+
+
+GB = 1024 ** 3
+
+
+def make_sampler(rss, available, total=8 * GB):
+    """Erstellt einen Sampler mit festen Werten"""
+    return lambda: {'rss': rss, 'available': available, 'total': total}
+
+
+class TestMemoryGovernor(unittest.TestCase):
+    """Tests für MemoryGovernor"""
+
+    def test_sample_memory(self):
+        """Test: Speicher-Sample enthält RSS und Gesamtspeicher (falls verfügbar)"""
+        sample = sample_memory()
+        if sample is None:
+            self.skipTest("Keine Speicherinformationen auf dieser Plattform")
+        self.assertGreater(sample['rss'], 0)
+        self.assertGreater(sample['total'], 0)
+
+    def test_state_ok_below_limit(self):
+        """Test: Unter dem Limit bleibt der Zustand OK"""
+        governor = MemoryGovernor(max_percent=80, check_interval=1,
+                                  sampler=make_sampler(1 * GB, 6 * GB))
+        self.assertTrue(governor.check(1))
+        self.assertEqual(governor.state, STATE_OK)
+        self.assertEqual(governor.max_in_flight(4), 8)
+
+    def test_busy_system_only_below_floor(self):
+        """Test: Fremder RAM-Verbrauch zählt nicht zum Budget, nur die harte Untergrenze"""
+        governor = MemoryGovernor(max_percent=80, check_interval=1, min_available_mb=256,
+                                  sampler=make_sampler(1 * GB, 1 * GB))  # System zu 87% belegt
+        governor.check(1)
+        self.assertEqual(governor.state, STATE_OK)
+        self.assertEqual(governor.usage_percent, 12.5)
+        governor.sampler = make_sampler(1 * GB, 100 * 1024 * 1024)
+        governor.check(2)
+        self.assertEqual(governor.state, STATE_PRESSURE)
+        self.assertEqual(governor.get_status()['available_mb'], 100.0)
+
+    def test_pressure_throttles_and_caps_lines(self):
+        """Test: Über dem Limit werden Batches gedrosselt und Zeilen gekürzt"""
+        governor = MemoryGovernor(max_percent=80, check_interval=1, max_line_length=10000,
+                                  pressure_line_length=200, sampler=make_sampler(7 * GB, 1 * GB))
+        governor.check(1)
+        self.assertEqual(governor.state, STATE_PRESSURE)
+        self.assertEqual(governor.max_in_flight(4), 2)
+        self.assertEqual(governor.max_line_length, 200)
+        self.assertEqual(governor.get_status()['state'], STATE_PRESSURE)
+
+    def test_check_interval(self):
+        """Test: Es wird nur alle N Dateien gemessen"""
+        calls = []
+
+        def sampler():
+            calls.append(1)
+            return {'rss': GB, 'available': 6 * GB, 'total': 8 * GB}
+
+        governor = MemoryGovernor(check_interval=100, sampler=sampler)
+        governor.check(0)
+        governor.check(50)
+        governor.check(100)
+        self.assertEqual(len(calls), 2)
+
+    def test_spill_roundtrip(self):
+        """Test: Ausgelagerte Ergebnisse können wieder gelesen werden"""
+        governor = MemoryGovernor(sampler=make_sampler(GB, 6 * GB))
+        results = [{'type': 'file', 'path': f'/tmp/f{i}', 'name': f'f{i}', 'matches': []} for i in range(3)]
+        self.assertEqual(governor.spill(results), 3)
+        self.assertEqual(list(governor.iter_spilled()), results)
+        spill_path = governor.spill_path
+        governor.close()
+        self.assertFalse(os.path.exists(spill_path))
+
+
+class TestSearchUnderMemoryPressure(unittest.TestCase):
+    """Tests für die Suche bei erreichtem RAM-Limit"""
+
+    def setUp(self):
+        """Setup"""
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(6):
+            with open(os.path.join(self.temp_dir, f"data{i}.txt"), "w", encoding="utf-8") as f:
+                f.write("needle " + "x" * 2000 + "\n")
+
+    def tearDown(self):
+        """Cleanup"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_results_are_spilled_and_reported(self):
+        """Test: Ergebnisse werden ausgelagert und bleiben über iter_results verfügbar"""
+        tool = FileSearchTool()
+        tool.use_multiprocessing = False
+        tool.chunk_size = 1
+        tool.max_workers = 1
+        tool.search_path = self.temp_dir
+        tool.search_terms = ["needle"]
+        updates = []
+        tool.status_callback = updates.append
+
+        def governor_factory():
+            return MemoryGovernor(check_interval=1, pressure_line_length=100,
+                                  sampler=make_sampler(7 * GB, 1 * GB))
+
+        with mock.patch('src.file_search_tool.MemoryGovernor', governor_factory):
+            tool.search_files_and_folders()
+
+        self.assertGreater(tool.memory_governor.spilled_count, 0)
+        self.assertEqual(tool.get_result_count(), 6)
+        self.assertEqual(len(list(tool.iter_results())), 6)
+        self.assertTrue(any(u.get('type') == 'memory' for u in updates))
+        tool.memory_governor.close()
+
+    def test_result_limit_counts_spilled_folders_once(self):
+        """Test: Ausgelagerte Ordner-Treffer zählen beim Ergebnis-Limit nicht doppelt"""
+        for i in range(3):
+            os.makedirs(os.path.join(self.temp_dir, f"needle_ordner{i}"))
+        for i in range(6, 30):
+            with open(os.path.join(self.temp_dir, f"data{i}.txt"), "w", encoding="utf-8") as f:
+                f.write("needle\n")
+        tool = FileSearchTool()
+        tool.use_multiprocessing = False
+        tool.chunk_size = 2
+        tool.max_workers = 1
+        tool.max_total_results = 20
+        tool.search_path = self.temp_dir
+        tool.search_terms = ["needle"]
+
+        def governor_factory():
+            return MemoryGovernor(check_interval=1, sampler=make_sampler(7 * GB, 1 * GB))
+
+        with mock.patch('src.file_search_tool.MemoryGovernor', governor_factory):
+            tool.search_files_and_folders()
+
+        self.assertGreater(tool.memory_governor.spilled_count, 3)
+        self.assertEqual(tool.get_result_count(), 20)
+        self.assertEqual(sum(1 for r in tool.iter_results() if r['type'] == 'folder'), 3)
+        tool.memory_governor.close()
+
+    def test_run_removes_spill_file(self):
+        """Test: Die CLI (run) entfernt die Spill-Datei, nachdem der Bericht geschrieben ist"""
+        tool = FileSearchTool()
+        tool.use_multiprocessing = False
+        tool.chunk_size = 1
+        tool.max_workers = 1
+        spill_paths = []
+
+        def get_user_input():
+            tool.search_path = self.temp_dir
+            tool.search_terms = ["needle"]
+
+        def generate_html_report():
+            spill_paths.append(tool.memory_governor.spill_path)
+            self.assertTrue(os.path.exists(spill_paths[0]))  # Der Bericht liest die ausgelagerten Ergebnisse
+
+        def governor_factory():
+            return MemoryGovernor(check_interval=1, sampler=make_sampler(7 * GB, 1 * GB))
+
+        with mock.patch('src.file_search_tool.MemoryGovernor', governor_factory), \
+                mock.patch.object(tool, 'get_user_input', get_user_input), \
+                mock.patch.object(tool, 'generate_html_report', generate_html_report):
+            tool.run()
+
+        self.assertIsNotNone(spill_paths[0])
+        self.assertFalse(os.path.exists(spill_paths[0]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für den Metrik-Export (OpenMetrics)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import urllib.request
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.metrics import (MetricsRegistry, SearchMetrics, StubMetricsSink, OpenMetricsFileSink,
+                         MetricsHTTPServer, CONTENT_TYPE)
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests für MetricsRegistry, Sinks und die Metriken der Suche"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.test_dir, 'data')
+        os.makedirs(self.data_dir)
+        for i in range(4):
+            with open(os.path.join(self.data_dir, f'file{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write('kein Treffer\n' * 20 + 'needle eins\nneedle zwei\n')
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_render_openmetrics(self):
+        """Test: Counter, Gauge und Histogramm werden im OpenMetrics-Format ausgegeben"""
+        registry = MetricsRegistry()
+        registry.counter('demo_files', 'Files.').inc(3, extractor='pdf')
+        registry.gauge('demo_ratio', 'Ratio "quoted".').set(0.5)
+        histogram = registry.histogram('demo_seconds', 'Latency.', (0.1, 1.0), 'seconds')
+        for value in (0.05, 0.5, 2.0):
+            histogram.observe(value)
+
+        text = registry.render()
+        self.assertIn('# TYPE demo_files counter', text)
+        self.assertIn('demo_files_total{extractor="pdf"} 3', text)
+        self.assertIn('# HELP demo_ratio Ratio \\"quoted\\".', text)
+        self.assertIn('demo_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('demo_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('demo_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('demo_seconds_count 3', text)
+        self.assertTrue(text.endswith('# EOF\n'))
+
+    def test_file_sink_interval_and_http_endpoint(self):
+        """Test: Datei-Sink schreibt atomar im Intervall, HTTP-Endpunkt liefert /metrics"""
+        registry = MetricsRegistry()
+        counter = registry.counter('demo_runs', 'Runs.')
+        path = os.path.join(self.test_dir, 'out', 'search.prom')
+        sink = OpenMetricsFileSink(path, interval=3600)
+        counter.inc()
+        self.assertTrue(sink.publish(registry))
+        counter.inc()
+        self.assertFalse(sink.publish(registry))  # Innerhalb des Intervalls
+        with open(path, encoding='utf-8') as f:
+            self.assertIn('demo_runs_total 1', f.read())
+        self.assertTrue(sink.publish(registry, force=True))
+        with open(path, encoding='utf-8') as f:
+            self.assertIn('demo_runs_total 2', f.read())
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['search.prom'])  # Keine Temp-Dateien
+
+        server = MetricsHTTPServer(0)
+        try:
+            server.publish(registry)
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                self.assertEqual(response.headers['Content-Type'], CONTENT_TYPE)
+                self.assertIn('demo_runs_total 2', response.read().decode('utf-8'))
+        finally:
+            server.close()
+
+    def test_search_metrics(self):
+        """Test: Suche exportiert Dateien, Bytes, Treffer, Cache-Raten und Auslastung"""
+        tool = FileSearchTool(verbose=False)
+        tool.search_path = self.data_dir
+        tool.search_terms = ['needle']
+        tool.use_multiprocessing = False
+        stub = tool.add_metrics_sink(StubMetricsSink())
+        ocr_stats = {'hits': 3, 'misses': 1}
+        tool.metrics.register_cache('demo', lambda: ocr_stats)
+        tool.search_files_and_folders()
+
+        p = SearchMetrics.PREFIX
+        self.assertEqual(stub.sample(f'{p}_files_walked_total'), 4)
+        self.assertEqual(stub.sample(f'{p}_files_searched_total{{extractor="text"}}'), 4)
+        self.assertEqual(stub.sample(f'{p}_read_bytes_total{{extractor="text"}}'),
+                         4 * os.path.getsize(os.path.join(self.data_dir, 'file0.txt')))
+        self.assertEqual(stub.sample(f'{p}_results_total'), 4)
+        self.assertEqual(stub.sample(f'{p}_matches_total'), 8)
+        self.assertEqual(stub.sample(f'{p}_file_duration_seconds_count{{extractor="text"}}'), 4)
+        self.assertEqual(stub.sample(f'{p}_cache_hit_ratio{{cache="demo"}}'), 0.75)
+        self.assertEqual(stub.sample(f'{p}_search_running'), 0)
+        self.assertEqual(stub.sample(f'{p}_searches_total'), 1)
+        utilization = stub.sample(f'{p}_worker_utilization')
+        self.assertGreater(utilization, 0)
+        self.assertLessEqual(utilization, 1)
+
+        # Zweite Suche: Counter sind kumulativ, Cache zählt nur den Zuwachs
+        ocr_stats['hits'] = 5
+        tool.results = []
+        tool.search_files_and_folders()
+        self.assertEqual(stub.sample(f'{p}_files_walked_total'), 8)
+        self.assertEqual(stub.sample(f'{p}_cache_hits_total{{cache="demo"}}'), 5)
+        tool.close_metrics()
+
+
+if __name__ == '__main__':
+    unittest.main()
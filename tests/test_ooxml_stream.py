@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die streamenden DOCX/XLSX/PPTX-Extraktoren
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import tracemalloc
+import zipfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.ooxml_stream import iter_docx_lines, iter_pptx_lines, iter_xlsx_lines
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+A = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+S = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+
+
+class TestOoxmlStream(unittest.TestCase):
+    """Tests für Inhalt, Speicherbedarf und frühes Ergebnis der streamenden Extraktoren"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _zip(self, name, members):
+        path = os.path.join(self.test_dir, name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for member, content in members.items():
+                with zf.open(member, 'w') as stream:
+                    for chunk in ([content] if isinstance(content, str) else content):
+                        stream.write(chunk.encode('utf-8'))
+        return path
+
+    def _docx(self, name, body):
+        return self._zip(name, {'word/document.xml': [f'<w:document {W}><w:body>', *body, '</w:body></w:document>']})
+
+    def test_extracted_lines(self):
+        """Test: Absätze (auch in Tabellen), Folientexte und Zellwerte mit Zeilennummern"""
+        docx = self._docx('a.docx', [
+            '<w:p><w:r><w:t>Erster </w:t></w:r><w:r><w:t>Absatz</w:t></w:r></w:p>',
+            '<w:p/>',
+            '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>In Tabelle</w:t></w:r></w:p></w:tc></w:tr></w:tbl>',
+        ])
+        self.assertEqual(list(iter_docx_lines(docx)), [(1, 'Erster Absatz'), (3, 'In Tabelle')])
+
+        pptx = self._zip('b.pptx', {
+            f'ppt/slides/slide{i}.xml': f'<p:sld {A} xmlns:p="p"><a:p><a:r><a:t> Folie {i} </a:t></a:r></a:p></p:sld>'
+            for i in (1, 2)})
+        self.assertEqual(list(iter_pptx_lines(pptx)), [(1, 'Folie 1'), (2, 'Folie 2')])
+
+        xlsx = self._zip('c.xlsx', {'xl/worksheets/sheet1.xml': (
+            f'<worksheet {S}><sheetData><row r="1"><c r="A1"><v>42</v></c><c r="B1"><v>7</v></c></row>'
+            '<row r="2"/><row r="3"><c r="A3"><v>x</v></c></row></sheetData></worksheet>')})
+        self.assertEqual(list(iter_xlsx_lines(xlsx)), [(1, '[Sheet1!1] 42 | 7'), (3, '[Sheet1!3] x')])
+
+    def test_memory_independent_of_document_size(self):
+        """Test: Spitzen-Speicher bleibt klein, auch wenn document.xml viele MB groß ist"""
+        paragraph = '<w:p><w:r><w:t>{} Lorem ipsum dolor sit amet, consectetur adipiscing elit</w:t></w:r></w:p>'
+        docx = self._docx('gross.docx', (paragraph.format(i) for i in range(150_000)))
+        with zipfile.ZipFile(docx) as zf:
+            xml_size = zf.getinfo('word/document.xml').file_size
+        self.assertGreater(xml_size, 10 * 1024 * 1024)
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _line in iter_docx_lines(docx))
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 150_000)
+        self.assertLess(peak, 2 * 1024 * 1024)
+
+    def test_search_reads_only_until_match(self):
+        """Test: Treffer aus dem Anfang kommen an, auch wenn der Rest des Dokuments defekt ist"""
+        docx = self._docx('defekt.docx', [
+            '<w:p><w:r><w:t>needle am Anfang</w:t></w:r></w:p>',
+            '<w:p><w:r><w:t>needle danach</w:t></w:r></w:p>',
+            '<w:p><w:r><w:t>abgeschnitten',  # Kein gültiges XML mehr
+        ])
+        tool = FileSearchTool(verbose=False)
+        tool.search_terms = ['needle']
+        self.assertEqual([m['line_number'] for m in tool.search_in_file(docx)], [1, 2])
+        tool.max_matches_per_file = 1
+        self.assertEqual([m['line_number'] for m in tool.search_in_file(docx)], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die seitenweise PDF-Extraktion (Seiten-Cache, parallele Seitenbereiche)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pdf_pages import PdfPageCache, iter_pdf_pages, page_line
+
+EXTRACTED = []  # Seiten, deren Text (im Testprozess) extrahiert wurde
+
+
+class _Contents:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+
+class FakePage(dict):
+    """Seite mit der Schnittstelle von pypdf: get_contents() und extract_text()."""
+
+    def __init__(self, number, text):
+        super().__init__()
+        self.number = number
+        self.text = text
+
+    def get_contents(self):
+        return _Contents(self.text.encode('utf-8'))
+
+    def extract_text(self):
+        EXTRACTED.append(self.number)
+        return self.text
+
+
+def fake_reader(stream):
+    """Testdatei: eine Seite pro Zeile (statt echtem PDF, pypdf/PyPDF2 sind optional)."""
+    lines = stream.read().decode('utf-8').split('\n')
+    return type('Reader', (), {'pages': [FakePage(i, text) for i, text in enumerate(lines, 1)]})()
+
+
+class TestPdfPages(unittest.TestCase):
+    """Tests für faules Extrahieren, Seiten-Cache und Reihenfolge bei paralleler Extraktion"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.pdf = os.path.join(self.test_dir, 'bericht.pdf')
+        self._write([f'Seite {i} Inhalt' for i in range(1, 11)])
+        EXTRACTED.clear()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, pages):
+        with open(self.pdf, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(pages))
+
+    def test_pages_extracted_lazily(self):
+        """Test: Nur die gelesenen Seiten werden extrahiert (frühes Ende ohne Rest)"""
+        pages = iter_pdf_pages(self.pdf, reader_factory=fake_reader)
+        self.assertEqual(next(pages), (1, 'Seite 1 Inhalt'))
+        self.assertEqual(next(pages), (2, 'Seite 2 Inhalt'))
+        pages.close()
+        self.assertEqual(EXTRACTED, [1, 2])
+        self.assertEqual(page_line(2, 'Treffer'), '[Seite 2] Treffer')
+
+    def test_cache_reextracts_only_changed_pages(self):
+        """Test: Nach Änderung von Seite 1 wird nur diese neu extrahiert, unveränderte Dateien gar nicht"""
+        cache_path = os.path.join(self.test_dir, 'cache', 'pages.pickle')
+        cache = PdfPageCache(cache_path)
+        first = list(iter_pdf_pages(self.pdf, cache, reader_factory=fake_reader))
+        self.assertEqual(len(EXTRACTED), 10)
+        cache.save()
+
+        cache = PdfPageCache(cache_path)  # Neu geladen wie bei der nächsten Suche
+        EXTRACTED.clear()
+        self.assertEqual(list(iter_pdf_pages(self.pdf, cache, reader_factory=fake_reader)), first)
+        self.assertEqual(EXTRACTED, [])
+
+        self._write(['Seite 1 geändert'] + [f'Seite {i} Inhalt' for i in range(2, 11)])
+        os.utime(self.pdf, ns=(0, 1))  # mtime sicher geändert
+        self.assertEqual(list(iter_pdf_pages(self.pdf, cache, reader_factory=fake_reader))[0],
+                         (1, 'Seite 1 geändert'))
+        self.assertEqual(EXTRACTED, [1])
+
+    def test_parallel_page_ranges_in_order(self):
+        """Test: Seitenbereiche in Worker-Prozessen, Seiten kommen trotzdem in Reihenfolge"""
+        cache = PdfPageCache()
+        cache.put(None, 'x')  # Ohne Key (Seite nicht lesbar) wird nichts gespeichert
+        self.assertEqual(len(cache), 0)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            pages = list(iter_pdf_pages(self.pdf, cache, executor, parallel_min_pages=4, pages_per_task=3,
+                                        reader_factory=fake_reader))
+            self.assertEqual(pages, [(i, f'Seite {i} Inhalt') for i in range(1, 11)])
+            self.assertEqual(EXTRACTED, [])  # In den Workern extrahiert
+            self.assertEqual(len(cache), 10)
+
+            # Nur die Bereiche der nicht gecachten Seiten gehen an die Worker
+            self._write([f'Seite {i} Inhalt' for i in range(1, 10)] + ['Seite 10 neu'])
+            os.utime(self.pdf, ns=(0, 2))
+            self.assertEqual(list(iter_pdf_pages(self.pdf, cache, executor, parallel_min_pages=4,
+                                                 reader_factory=fake_reader))[-1], (10, 'Seite 10 neu'))
+            self.assertEqual(cache.misses, 10 + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
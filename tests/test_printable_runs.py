@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für druckbare Folgen in Binärdateien (8-Bit, UTF-16LE, Byte-Offsets, alte .doc-Dateien)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import zipfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extractors import ExtractContext, extract_doc
+from src.printable_runs import iter_printable_runs, offset_line
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+class TestPrintableRuns(unittest.TestCase):
+    """Tests für den strings(1)-artigen Extraktor"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_runs_with_offsets(self):
+        """Test: 8-Bit- und UTF-16LE-Folgen mit Offset, Umlaute in der Folge, kurze Folgen entfallen"""
+        data = (b'\x00\x01ab\x02' + 'Kunde Müller\r'.encode('cp1252') + b'\xff\x00\x00\x00'
+                + 'Straße 5, Köln'.encode('utf-16-le') + b'\x00\x00\x07' + b'zu\x00kurz\x00')
+        path = self._write('daten.db', data)
+        self.assertEqual(list(iter_printable_runs(path)), [
+            (5, 'Kunde Müller'),
+            (22, 'Straße 5, Köln'),
+        ])
+        self.assertEqual(list(iter_printable_runs(path, min_length=2)),
+                         [(2, 'ab'), (5, 'Kunde Müller'), (22, 'Straße 5, Köln'), (53, 'zu'), (56, 'kurz')])
+        self.assertEqual(offset_line(22, 'Straße'), '[@0x16] Straße')
+        self.assertEqual(list(iter_printable_runs(self._write('leer.db', b''))), [])
+
+    def test_window_boundaries(self):
+        """Test: Folgen über Fenstergrenzen werden genau einmal und vollständig gefunden"""
+        parts = []
+        for i in range(300):
+            parts.append(b'\x00' * (i % 7) + f'eintrag nummer {i}'.encode('ascii'))
+            parts.append(b'\x01' * (i % 5) + f'wide {i:04d}'.encode('utf-16-le'))
+        path = self._write('index.ibd', b''.join(parts))
+        expected = list(iter_printable_runs(path, chunk_bytes=1 << 30))
+        self.assertEqual(len(expected), 600)
+        for chunk_bytes in (64, 100, 257, 4096):
+            with self.subTest(chunk_bytes=chunk_bytes):
+                self.assertEqual(list(iter_printable_runs(path, chunk_bytes=chunk_bytes)), expected)
+
+    def test_doc_extractor(self):
+        """Test: alte .doc über druckbare Folgen, umbenannte DOCX über den DOCX-Parser"""
+        doc = self._write('alt.doc', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 512
+                          + 'Angebot für Firma Schulz'.encode('utf-16-le') + b'\x00' * 64)
+        self.assertEqual(list(extract_doc(doc, ExtractContext())), [(1, '[@0x208] Angebot für Firma Schulz')])
+
+        renamed = os.path.join(self.test_dir, 'neu.doc')
+        with zipfile.ZipFile(renamed, 'w') as zf:
+            zf.writestr('word/document.xml', f'<w:document {W}><w:body><w:p><w:r><w:t>Angebot als DOCX</w:t></w:r>'
+                                             '</w:p></w:body></w:document>')
+        self.assertEqual([text for _num, text in extract_doc(renamed, ExtractContext())], ['Angebot als DOCX'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für das Profiling (ENABLE_PROFILING)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import pickle
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.profiler import StageProfiler, BatchProfile, BatchResult, ProfileCollector
+from src.report_generator import HTMLReportGenerator
+
+
+class TestProfiler(unittest.TestCase):
+    """Tests für StageProfiler und die Profiling-Hooks der Suche"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        for i in range(5):
+            with open(os.path.join(self.test_dir, f'file{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write('kein Treffer\n' * 50 + 'hier ist needle\n')
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test: Ohne ENABLE_PROFILING werden keine Messwerte gesammelt"""
+        profiler = StageProfiler(False)
+        with profiler.stage('walk') as stage:
+            stage.count = 10
+        self.assertEqual(profiler.rows(), [])
+        self.assertIsNone(profiler.scan(True))
+        self.assertIsNone(BatchProfile(False).result([1, 2]).profile)
+
+    def test_merge_batch_results(self):
+        """Test: Messwerte aus Worker-Batches werden zusammengeführt"""
+        batch = BatchProfile(True, use_cprofile=True)
+        with batch:
+            with batch.profiler.stage('filter', nbytes=100):
+                sum(range(1000))
+        result = pickle.loads(pickle.dumps(batch.result(['a'])))
+        self.assertIsInstance(result, BatchResult)
+        self.assertEqual(list(result), ['a'])
+
+        collector = ProfileCollector(True)
+        collector.receive(result)
+        collector.receive(result)
+        rows = {row['stage']: row for row in collector.profiler.rows()}
+        self.assertEqual(rows['filter']['count'], 2)
+        self.assertEqual(rows['filter']['bytes'], 200)
+        self.assertEqual(rows['transfer']['count'], 2)
+        self.assertIsNotNone(collector.pstats)
+
+    def test_search_with_profiling(self):
+        """Test: Suche misst die Stufen und der Bericht enthält die Tabelle"""
+        tool = FileSearchTool()
+        tool.search_path = self.test_dir
+        tool.search_terms = ['needle']
+        tool.use_multiprocessing = False
+        tool.enable_profiling = True
+        tool.write_profile = lambda: None
+        tool.search_files_and_folders()
+
+        rows = {row['stage']: row for row in tool.get_profile_summary()}
+        for stage in ('walk', 'filter', 'read', 'decode', 'match', 'transfer'):
+            self.assertIn(stage, rows)
+        self.assertEqual(rows['walk']['count'], 5)
+        self.assertGreaterEqual(rows['read']['bytes'], 5 * 50 * len('kein Treffer\n'))
+
+        generator = HTMLReportGenerator(search_terms=['needle'], search_path=self.test_dir,
+                                        output_dir=self.test_dir, profile_summary=tool.get_profile_summary())
+        with open(generator.generate(tool.get_result_sink()), encoding='utf-8') as f:
+            self.assertIn('profile-table', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
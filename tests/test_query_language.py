@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die Abfragesprache (AND/OR/NOT, Phrasen, Dateifilter)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.query_language import compile_query, parse_query, QuerySyntaxError
+
+
+class TestQueryLanguage(unittest.TestCase):
+    """Tests für Parser, Planer und die Suche mit search_query"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.srv = os.path.join(self.test_dir, 'srv', 'fatal-reports')
+        os.makedirs(self.srv)
+        os.makedirs(os.path.join(self.test_dir, 'other'))
+        self._write('srv/fatal-reports/app.log', 'error one\nfatal debug\nall fine\nERROR debug\n')
+        self._write('srv/fatal-reports/notes.txt', 'error in text\n')
+        self._write('srv/fatal-reports/big.log', 'fatal big\n' * 2000)
+        self._write('other/old.log', 'error other\n')
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, text):
+        with open(os.path.join(self.test_dir, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def _search(self, query, multiprocessing=False):
+        tool = FileSearchTool(verbose=False)
+        tool.use_daemon = False
+        tool.search_path = self.test_dir
+        tool.search_query = query
+        tool.use_multiprocessing = multiprocessing
+        tool.max_workers = 2
+        tool.search_files_and_folders()
+        return {os.path.relpath(r['path'], self.test_dir).replace(os.sep, '/'): [m['line_number'] for m in r['matches']]
+                for r in tool.results}
+
+    def test_parser_precedence_and_errors(self):
+        """Test: NOT vor AND vor OR, implizites AND, Phrasen, Regex und Syntaxfehler"""
+        self.assertEqual(repr(parse_query('a b OR NOT c -d')), '((a AND b) OR (NOT c AND NOT d))')
+        self.assertEqual(repr(parse_query('"disk full" OR /ERR-\\d{4}/ /var/log')),
+                         '("disk full" OR (/ERR-\\d{4}/ AND /var/log))')
+        size = parse_query('size>=1.5M')
+        self.assertEqual((size.field, size.op, size.value), ('size', '>=', int(1.5 * 1024 * 1024)))
+        self.assertEqual(parse_query('ext:.LOG,txt').value, frozenset({'.log', '.txt'}))
+        for invalid in ('(a OR b', 'a AND', 'size>viel', 'mtime:2024-01-01', 'age<bald', '"offen', ')'):
+            with self.assertRaises(QuerySyntaxError):
+                parse_query(invalid)
+
+    def test_planner_orders_cheap_and_selective_first(self):
+        """Test: Dateifilter vor Literalen, seltene Literale vor häufigen, Regex zuletzt"""
+        plan = compile_query('/ERR-\\d+/ the size>1K zyxq ext:log')
+        order = [repr(child) for child in plan.root.children]
+        self.assertEqual(order, ['ext:log', 'size>1K', 'zyxq', 'the', '/ERR-\\d+/'])
+        self.assertEqual(plan.terms, ('ERR-\\d+', 'the', 'zyxq'))  # Wie geschrieben, für die Anzeige
+
+        # Entscheiden die Dateifilter, wird die Datei nicht geöffnet und size nicht geprüft
+        stat = mock.Mock()
+        self.assertIs(plan.bind('/x/app.txt', stat=stat), False)
+        stat.assert_not_called()
+        self.assertIs(compile_query('ext:log OR error').bind('/x/app.log'), True)
+        matcher = compile_query('(error OR fatal) -debug').bind('/x/app.txt')
+        self.assertEqual([matcher(line) for line in ('An Error', 'fatal debug', 'nichts')], [True, False, False])
+
+    def test_search_with_query(self):
+        """Test: Suche mit search_query im Thread- und im Prozess-Modus"""
+        expected = {
+            '(error OR fatal) AND NOT debug ext:log path:*/srv/*': {
+                'srv/fatal-reports/app.log': [1], 'srv/fatal-reports/big.log': list(range(1, 2001))},
+            'error -ext:log': {'srv/fatal-reports/notes.txt': [1]},
+            'ext:log size<1K': {'srv/fatal-reports/app.log': [0], 'other/old.log': [0]},
+            'fatal path:*/srv/*': {'srv/fatal-reports': [0], 'srv/fatal-reports/app.log': [2],
+                                   'srv/fatal-reports/big.log': list(range(1, 2001))},
+            'fatal NOT ext:log': {},  # Dateifilter: keine Ordner-Treffer
+        }
+        for multiprocessing in (False, True):
+            for query, results in expected.items():
+                with self.subTest(query=query, multiprocessing=multiprocessing):
+                    self.assertEqual(self._search(query, multiprocessing), results)
+
+        tool = FileSearchTool(verbose=False)
+        tool.search_query = 'error AND ('
+        with self.assertRaises(ValueError):
+            tool.search_files_and_folders()
+
+
+if __name__ == '__main__':
+    unittest.main()
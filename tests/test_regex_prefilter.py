@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für den Regex-Vorfilter (erforderliche Literale)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.query_language import compile_terms
+from src.regex_prefilter import required_factors, line_prefilter, bytes_prefilter
+
+
+class TestRegexPrefilter(unittest.TestCase):
+    """Tests für Literal-Extraktion, Zeilen-/Datei-Vorfilter und die Suche"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self._write('app.log', 'start\nERR-1234 disk full\nerr-99 kurz\nok\n')
+        self._write('ruhig.log', 'alles gut\n' * 100)
+        self._write('latin.log', 'Größe überschritten: ERR-0007\n', 'latin-1')
+        self._write('sonder.log', 'ſtatus FAIL\n')  # Langes s passt case-insensitiv auf "s"
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, text, encoding='utf-8'):
+        with open(os.path.join(self.test_dir, name), 'w', encoding=encoding) as f:
+            f.write(text)
+
+    def _search(self, terms, multiprocessing=False, prefilter=True, case_sensitive=False):
+        tool = FileSearchTool(verbose=False)
+        tool.use_daemon = False
+        tool.search_path = self.test_dir
+        tool.search_terms = terms
+        tool.use_regex = True
+        tool.case_sensitive = case_sensitive
+        tool.use_regex_prefilter = prefilter
+        tool.use_multiprocessing = multiprocessing
+        tool.max_workers = 2
+        tool.search_files_and_folders()
+        return {r['name']: [m['line_number'] for m in r['matches']] for r in tool.results}
+
+    def test_required_factors(self):
+        """Test: Erforderliche Literale aus Sequenzen, Alternativen und Wiederholungen"""
+        self.assertEqual(required_factors(r'ERR-\d{4}'), ([('ERR-',)], False))
+        self.assertEqual(required_factors(r'(ERROR|FATAL): .*timeout')[0],
+                         [('ERROR', 'FATAL'), (': ',), ('timeout',)])
+        self.assertEqual(required_factors(r'(foo)?bar(baz)+')[0], [('bar',), ('baz',)])
+        self.assertEqual(required_factors(r'x|\d+')[0], [])  # Ein Zweig ohne Literal
+        self.assertEqual(line_prefilter(r'(?i)Timeout', False), (('meout',), True))  # i und s trennen
+        self.assertEqual(bytes_prefilter(r'Größe: ERR-\d+', False), ((b'e: ERR-',), False))  # Nur ASCII
+        self.assertIsNone(line_prefilter(r'\d+\.\d+', False))
+        self.assertIsNone(line_prefilter(r'ERR-(', False))  # Ungültige Regex
+
+    def test_plan_prefilters(self):
+        """Test: Zeilen- und Datei-Vorfilter liefern dasselbe wie die Regex allein"""
+        lines = ['ERR-1234', 'err-1234', 'ERR-12', 'STATUS', 'ſtatus', 'nichts']
+        for terms, mode in ((('ERR-\\d{4}',), 'any'), (('status',), 'any'), (('err', 'x|\\d'), 'all')):
+            for case_sensitive in (False, True):
+                with self.subTest(terms=terms, case_sensitive=case_sensitive):
+                    fast = compile_terms(terms, mode, case_sensitive, True, True).bind('/x/a.log')
+                    plain = compile_terms(terms, mode, case_sensitive, True, False).bind('/x/a.log')
+                    self.assertEqual([fast(line) for line in lines], [plain(line) for line in lines])
+
+        plan = compile_terms(('ERR-\\d{4}', 'connection (?:reset|refused)'), 'any', False, True)
+        self.assertTrue(plan.may_match(b'... Connection Refused ...'))
+        self.assertFalse(plan.may_match(b'ERR 1234 link down'))
+        self.assertFalse(compile_terms(('ERR-\\d{4}', 'timeout'), 'all', True, True).may_match(b'ERR-1234'))
+        self.assertTrue(compile_terms(('ERR-\\d{4}', '\\d+'), 'any', True, True).may_match(b'nichts'))
+
+    def test_search_same_results_with_prefilter(self):
+        """Test: Regex-Suche mit und ohne Vorfilter im Thread- und im Prozess-Modus"""
+        expected = {
+            ('ERR-\\d{4}',): {'app.log': [2], 'latin.log': [1]},
+            ('status',): {'sonder.log': [1]},
+            ('disk|Größe',): {'app.log': [2], 'latin.log': [1]},
+        }
+        for multiprocessing in (False, True):
+            for terms, results in expected.items():
+                for prefilter in (True, False):
+                    with self.subTest(terms=terms, multiprocessing=multiprocessing, prefilter=prefilter):
+                        self.assertEqual(self._search(list(terms), multiprocessing, prefilter), results)
+        self.assertEqual(self._search(['ERR-\\d{4}', 'err-\\d+'], case_sensitive=True),
+                         {'app.log': [2, 3], 'latin.log': [1]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die Ergebnis-Sinks (Speicher und NDJSON-Datei)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.result_store import ResultSink, MemoryResultSink, DiskResultSink, ChainedResultSink
+from src.search_records import Match, FileResult
+from src.report_generator import HTMLReportGenerator
+
+
+TERMS = ('alpha',)
+
+
+def make_result(i):
+    """Erstellt ein Beispiel-Ergebnis"""
+    return FileResult.from_path('file', os.path.join('/srv', f'file{i}.txt'),
+                                [Match(i + 1, f'alpha {i}', (0,))], TERMS)
+
+
+class TestResultStore(unittest.TestCase):
+    """Tests für MemoryResultSink, DiskResultSink und ChainedResultSink"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_disk_sink_roundtrip(self):
+        """Test: Ergebnisse werden als NDJSON gespeichert und gelesen"""
+        sink = DiskResultSink(directory=self.test_dir)
+        sink.extend(make_result(i) for i in range(5))
+        self.assertEqual(len(sink), 5)
+        self.assertEqual([r['name'] for r in sink], [f'file{i}.txt' for i in range(5)])
+        self.assertEqual(sink[3]['matches'][0]['found_terms'], ['alpha'])
+        self.assertEqual(sink[-1]['path'], os.path.join('/srv', 'file4.txt'))
+        with self.assertRaises(IndexError):
+            sink[5]
+        sink.close()
+        self.assertFalse(os.path.exists(sink.path))
+
+        with self.assertRaises(RuntimeError):  # Als Kontextmanager auch bei Fehlern geschlossen
+            with DiskResultSink(directory=self.test_dir) as sink:
+                sink.append(make_result(0))
+                raise RuntimeError('Report fehlgeschlagen')
+        self.assertFalse(os.path.exists(sink.path))
+
+    def test_chained_sink(self):
+        """Test: Verkettete Sinks behalten die Reihenfolge"""
+        disk = DiskResultSink(directory=self.test_dir)
+        disk.extend(make_result(i) for i in range(3))
+        memory = MemoryResultSink(make_result(i) for i in range(3, 5))
+        chained = ChainedResultSink(disk, memory)
+        self.assertEqual(len(chained), 5)
+        self.assertEqual([r['name'] for r in chained], [f'file{i}.txt' for i in range(5)])
+        self.assertEqual(chained[4]['name'], 'file4.txt')
+        with self.assertRaises(TypeError):
+            chained.append(make_result(5))
+        disk.close()
+
+        class AppendOnlySink(ResultSink):
+            def append(self, result):
+                pass
+
+        with self.assertRaises(TypeError):  # Unvollständiger Sink scheitert beim Anlegen
+            AppendOnlySink()
+
+    def test_report_from_disk_sink(self):
+        """Test: Der HTML-Report wird direkt aus dem Disk-Sink geschrieben"""
+        sink = DiskResultSink(directory=self.test_dir)
+        sink.extend(make_result(i) for i in range(3))
+        generator = HTMLReportGenerator(search_terms=list(TERMS), search_path='/srv',
+                                        output_dir=self.test_dir)
+        report_path = generator.generate(sink)
+        sink.close()
+        self.assertIsNotNone(report_path)
+        with open(report_path, encoding='utf-8') as f:
+            html = f.read()
+        for i in range(3):
+            self.assertIn(f'file{i}.txt', html)
+        self.assertTrue(html.rstrip().endswith('</html>'))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
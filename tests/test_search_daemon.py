@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für den Such-Daemon (master-search serve)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import time
+import os
+import sys
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.search_daemon import SearchDaemon, WarmWorkerPool
+from src.daemon_client import DaemonClient, DaemonError
+
+
+class TestSearchDaemon(unittest.TestCase):
+    """Tests für Daemon, Thin Client und faire Verteilung im warmen Pool"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Ein Daemon mit einem Worker für alle Tests"""
+        cls.test_dir = tempfile.mkdtemp()
+        cls.data_dir = os.path.join(cls.test_dir, 'data')
+        os.makedirs(cls.data_dir)
+        for i in range(250):
+            with open(os.path.join(cls.data_dir, f'file{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write('kein Treffer\n' * 10 + ('needle\n' if i % 5 == 0 else ''))
+        cls.state_file = os.path.join(cls.test_dir, 'daemon.json')
+        cls.daemon = SearchDaemon(port=0, workers=1, state_file=cls.state_file, verbose=False).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Daemon beenden und aufräumen"""
+        cls.daemon.shutdown()
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+
+    def test_stream_and_thin_client(self):
+        """Test: Ergebnisse kommen als NDJSON-Stream, FileSearchTool nutzt den Daemon als Thin Client"""
+        client = DaemonClient.discover(self.state_file)
+        self.assertIsNotNone(client)
+        events = list(client.search({'path': self.data_dir, 'terms': ['needle']}))
+        self.assertEqual(events[0]['type'], 'started')
+        self.assertEqual(events[-1]['type'], 'done')
+        self.assertEqual(sum(1 for e in events if e['type'] == 'result'), 50)
+        self.assertIn('complete', {e['type'] for e in events})
+
+        tool = FileSearchTool(verbose=False)
+        tool.search_path = self.data_dir
+        tool.search_terms = ['needle']
+        with mock.patch('src.file_search_tool.DAEMON_STATE_FILE', self.state_file), \
+                mock.patch.object(tool, '_search_files_and_folders') as local_search:
+            tool.search_files_and_folders()
+        local_search.assert_not_called()
+        self.assertEqual(tool.get_result_count(), 50)
+        self.assertEqual(tool.results[0].matches[0].found_terms, ['needle'])
+        self.assertEqual(tool.get_file_stats_summary()['files'], 250)
+
+    def test_rejects_invalid_requests(self):
+        """Test: Ungültige Anfragen und falsches Token werden abgelehnt"""
+        client = DaemonClient.discover(self.state_file)
+        with self.assertRaises(DaemonError):
+            list(client.search({'path': self.data_dir, 'terms': []}))
+        with self.assertRaises(DaemonError):
+            list(client.search({'path': self.data_dir, 'terms': ['x'], 'max_file_size': 'groß'}))
+        intruder = DaemonClient(client.host, client.port, 'falsch')
+        with self.assertRaises(DaemonError):
+            intruder.health()
+        self.assertIsNone(DaemonClient.discover(os.path.join(self.test_dir, 'fehlt.json')))
+
+    def test_ocr_and_pdf_queries_use_daemon_handler_and_caches(self):
+        """Test: Bilder und PDFs laufen in Threads des Daemons mit seinem OCR-Handler und Seiten-Cache"""
+        ocr_dir = os.path.join(self.test_dir, 'ocr')
+        os.makedirs(ocr_dir)
+        for i in range(150):  # Mehr als ein Batch: Multiprocessing-Pfad über den warmen Pool
+            with open(os.path.join(ocr_dir, f'text{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write('kein Treffer\n')
+        for name in ('scan.png', 'bericht.pdf'):
+            with open(os.path.join(ocr_dir, name), 'wb') as f:
+                f.write(b'\x89PNG\r\n\x1a\n' if name.endswith('.png') else b'%PDF-1.4\n')
+
+        class FakeOcr:
+            stats = {}
+
+            def extract_text(self, path):
+                return 'Rechnung needle 42\n'
+
+        query = {'path': ocr_dir, 'terms': ['needle'], 'use_ocr': True}
+        ocr_handler = self.daemon.ocr_handler
+        self.daemon.ocr_handler = FakeOcr()
+        try:
+            tool = self.daemon.create_tool(query)
+            self.assertIs(tool.get_pdf_page_cache(), self.daemon.pdf_page_cache)
+            self.assertIs(tool.get_encoding_cache(), self.daemon.encoding_cache)
+            all_files, _folders = tool.collect_files_and_folders()
+            _process_files, thread_files = tool._split_thread_affinity(all_files)
+            self.assertEqual(sorted(name for _path, name in thread_files), ['bericht.pdf', 'scan.png'])
+
+            events = list(DaemonClient.discover(self.state_file).search(query))
+        finally:
+            self.daemon.ocr_handler = ocr_handler
+        results = [e['result'] for e in events if e['type'] == 'result']
+        self.assertEqual([(r['name'], [m['line_content'] for m in r['matches']]) for r in results],
+                         [('scan.png', ['[OCR] Rechnung needle 42'])])
+
+    def test_lanes_are_dispatched_round_robin(self):
+        """Test: Eine kleine Anfrage wartet nicht, bis eine große Anfrage fertig ist"""
+        pool = WarmWorkerPool(1)
+        try:
+            pool.warm_up()
+            large, small = pool.lane(), pool.lane()
+            with pool.condition:  # Beide Warteschlangen füllen, bevor der Dispatcher verteilt
+                large_futures = [large.submit(time.monotonic) for _ in range(8)]
+                small_futures = [small.submit(time.monotonic) for _ in range(2)]
+            large_done = sorted(f.result(timeout=10) for f in large_futures)
+            small_done = [f.result(timeout=10) for f in small_futures]
+            self.assertLess(max(small_done), large_done[-3])
+
+            large.cancel_event.set()
+            self.assertTrue(large.cancel_event.is_set())
+            large.shutdown()
+            small.shutdown()
+            self.assertEqual(pool.active_lanes(), 0)
+            self.assertFalse(pool.lane().cancel_event.is_set())  # Freigegebenes Flag wird zurückgesetzt
+        finally:
+            pool.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die kompakten Ergebnis-Records
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import os
+import sys
+import pickle
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.search_records import Match, FileResult, term_ids_for, clip_line
+from src.query_language import compile_query, compile_terms
+
+
+TERMS = ('alpha', 'beta', 'gamma')
+
+
+class TestSearchRecords(unittest.TestCase):
+    """Tests für Match und FileResult"""
+
+    def make_result(self):
+        """Erstellt ein Beispiel-Ergebnis"""
+        matches = [Match(3, 'alpha and gamma', term_ids_for(['alpha', 'gamma'], TERMS))]
+        return FileResult.from_path('file', os.path.join('/srv', 'data', 'a.txt'), matches, TERMS)
+
+    def test_dict_view(self):
+        """Test: Records verhalten sich für den Report wie Dicts"""
+        result = self.make_result()
+        self.assertEqual(result['type'], 'file')
+        self.assertEqual(result['path'], os.path.join('/srv', 'data', 'a.txt'))
+        self.assertEqual(result['name'], 'a.txt')
+        match = result.get('matches')[0]
+        self.assertEqual(match.get('line_number'), 3)
+        self.assertEqual(match['found_terms'], ['alpha', 'gamma'])
+        self.assertIsNone(result.get('category'))
+
+    def test_extra_fields(self):
+        """Test: Zusatzfelder der GUI werden gespeichert"""
+        result = self.make_result()
+        result['category'] = 'text'
+        self.assertEqual(result.get('category'), 'text')
+        self.assertEqual(result.to_dict()['category'], 'text')
+        with self.assertRaises(KeyError):
+            result['path'] = '/other'
+
+    def test_pickle_roundtrip(self):
+        """Test: Records überstehen den Transport aus Worker-Prozessen"""
+        result = pickle.loads(pickle.dumps(self.make_result()))
+        self.assertEqual(result.to_dict(), self.make_result().to_dict())
+
+    def test_directory_is_interned(self):
+        """Test: Verzeichnis-Präfixe werden geteilt"""
+        a = FileResult('file', ''.join(['/srv/', 'data']), 'a.txt', [])
+        b = FileResult('file', ''.join(['/srv/', 'data']), 'b.txt', [])
+        self.assertIs(a.directory, b.directory)
+
+    def test_clip_line(self):
+        """Test: Lange Zeilen werden auf ein Fenster um den Treffer gekürzt"""
+        line = 'x' * 5000 + 'needle' + 'y' * 5000
+        clipped = clip_line(line, ['needle'], 100)
+        self.assertIn('needle', clipped)
+        self.assertLessEqual(len(clipped), 106)
+        self.assertEqual(clip_line('short needle', ['needle'], 100), 'short needle')
+
+    def test_clip_line_regex_terms(self):
+        """Test: Bei Regex-Begriffen bleibt die Fundstelle im Ausschnitt"""
+        line = 'x' * 3000 + ' ERR-1234 ' + 'y' * 3000
+        for plan in (compile_terms(('ERR-\\d+',), 'OR', False, True, True),
+                     compile_query('/err-\\d+/', False, False, True)):
+            found_terms = plan.found_terms(line)
+            clipped = clip_line(line, found_terms, 1000, False, plan.hit_position)
+            self.assertIn('ERR-1234', clipped)
+            self.assertLessEqual(len(clipped), 1006)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die SQLite-Suche (Textspalten, Pushdown per LIKE/instr, parallele rowid-Bereiche)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.query_language import compile_terms
+from src.sqlite_search import iter_sqlite_lines, text_tables, connect_readonly, where_clause
+
+
+class TestSqliteSearch(unittest.TestCase):
+    """Tests für die Suche in SQLite-Datenbanken"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _database(self, name, rows=3):
+        path = os.path.join(self.test_dir, name)
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE kunden (id INTEGER PRIMARY KEY, name TEXT, email VARCHAR(80), alter_ INT, notiz)')
+        conn.execute('CREATE TABLE einstellungen (schluessel TEXT PRIMARY KEY, wert TEXT) WITHOUT ROWID')
+        conn.executemany('INSERT INTO kunden (name, email, alter_, notiz) VALUES (?, ?, ?, ?)',
+                         [(f'Kunde {i}', f'k{i}@example.com', i, None) for i in range(1, rows + 1)])
+        conn.execute("INSERT INTO kunden (name, email, alter_, notiz) VALUES ('Firma NEEDLE', 'info@firma.de', 7, "
+                     "'erste Zeile\nzweite Zeile')")
+        conn.execute("INSERT INTO einstellungen VALUES ('api_url', 'https://needle.example.com')")
+        conn.commit()
+        conn.close()
+        return path
+
+    def test_text_cells(self):
+        """Test: nur Textspalten, Zeilen-Id bzw. Primärschlüssel, Zeilenumbrüche als Leerzeichen"""
+        path = self._database('kunden #1.db', rows=1)
+        conn = connect_readonly(path)
+        try:
+            self.assertEqual(text_tables(conn), [('kunden', ('name', 'email', 'notiz'), 'rowid'),
+                                                 ('einstellungen', ('schluessel', 'wert'), '"schluessel"')])
+        finally:
+            conn.close()
+        self.assertEqual([line for _num, line in iter_sqlite_lines(path)], [
+            '[kunden.name 1] Kunde 1', '[kunden.email 1] k1@example.com',
+            '[kunden.name 2] Firma NEEDLE', '[kunden.email 2] info@firma.de',
+            '[kunden.notiz 2] erste Zeile zweite Zeile',
+            '[einstellungen.schluessel api_url] api_url',
+            '[einstellungen.wert api_url] https://needle.example.com',
+        ])
+
+    def test_pushdown(self):
+        """Test: LIKE ohne, instr() mit Groß-/Kleinschreibung, Escaping von % und _"""
+        path = self._database('app.sqlite')
+        lowered = compile_terms(('needle',), 'any').literal_condition
+        self.assertEqual(where_clause(lowered, ['name'])[1], ['%needle%'])
+        self.assertEqual([line for _num, line in iter_sqlite_lines(path, lowered)], [
+            '[kunden.name 4] Firma NEEDLE', '[kunden.email 4] info@firma.de',
+            '[kunden.notiz 4] erste Zeile zweite Zeile',
+            '[einstellungen.schluessel api_url] api_url',
+            '[einstellungen.wert api_url] https://needle.example.com',
+        ])
+        exact = compile_terms(('NEEDLE',), 'any', True).literal_condition
+        self.assertEqual(len(list(iter_sqlite_lines(path, exact))), 3)
+        underscore = compile_terms(('api_url',), 'any').literal_condition
+        self.assertEqual(where_clause(underscore, ['wert'])[1], ['%\\_url%'])
+        self.assertEqual(len(list(iter_sqlite_lines(path, underscore))), 2)
+
+        tool = FileSearchTool(verbose=False)
+        tool.search_terms = ['needle']
+        self.assertEqual([m['line_content'] for m in tool.search_in_file(path)],
+                         ['[kunden.name 4] Firma NEEDLE', '[einstellungen.wert api_url] https://needle.example.com'])
+
+    def test_parallel_ranges_and_fallback(self):
+        """Test: rowid-Bereiche parallel in Tabellenreihenfolge, statischer Pfad, .db ohne SQLite-Kopf"""
+        path = self._database('gross.db', rows=500)
+        expected = list(iter_sqlite_lines(path))
+        with ThreadPoolExecutor(3) as executor:
+            self.assertEqual(list(iter_sqlite_lines(path, None, executor, parallel_min_rows=10, rows_per_task=37)),
+                             expected)
+
+            # Nur so viele Bereiche eingereicht wie Worker, der nächste erst beim Weiterlesen
+            submitted = []
+            submit = executor.submit
+            executor.submit = lambda *args: submitted.append(args) or submit(*args)
+            lines = iter_sqlite_lines(path, None, executor, parallel_min_rows=10, rows_per_task=37)
+            self.assertEqual(next(lines), expected[0])
+            self.assertEqual(len(submitted), 4)
+            lines.close()
+
+        results = FileSearchTool.process_file_batch_static(
+            [(path, 'gross.db')], ['needle'], 'any', False, False, {'.db'}, 10 ** 9)
+        self.assertEqual([m['line_content'] for r in results for m in r['matches']],
+                         ['[kunden.name 501] Firma NEEDLE',
+                          '[einstellungen.wert api_url] https://needle.example.com'])
+        self.assertEqual(list(results.file_stats['extractors']), ['sqlite'])
+
+        thumbs = os.path.join(self.test_dir, 'Thumbs.db')
+        with open(thumbs, 'wb') as f:
+            f.write(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 56 + b'needle im Vorschaubild\x00')
+        tool = FileSearchTool(verbose=False)
+        tool.search_terms = ['needle']
+        self.assertEqual([m['line_content'] for m in tool.search_in_file(thumbs)], ['[@0x40] needle im Vorschaubild'])
+
+
+if __name__ == '__main__':
+    unittest.main()
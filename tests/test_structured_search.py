@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die strukturierte Suche in CSV und JSON/NDJSON (col:, json:, Literal-Vortest)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import io
+import sys
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.query_language import QuerySyntaxError, compile_query, compile_terms
+from src.structured_search import iter_csv_lines, iter_json_lines, parse_json_path
+
+
+class TestStructuredSearch(unittest.TestCase):
+    """Tests für Spalten- und Schlüssel-Projektion in CSV- und JSON-Dateien"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, text):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_csv_projection_and_blocks(self):
+        """Test: Trennzeichen aus der Kopfzeile, mehrzeilige Felder, Spalten per Name, Blöcke ohne Treffer"""
+        text = ('Name;E-Mail;Notiz\nAlice;alice@x.de;"zwei\nZeilen"\nBob;bob@x.de;x\n'
+                + ''.join(f'n{i};e{i}@y.de;z\n' for i in range(500)) + 'Zed;"zed ""bob"" x";q\n')
+        self.assertEqual(list(iter_csv_lines(io.StringIO(text)))[:3],
+                         [(1, 'Name | E-Mail | Notiz'), (2, 'Alice | alice@x.de | zwei\nZeilen'),
+                          (4, 'Bob | bob@x.de | x')])
+        self.assertEqual(list(iter_csv_lines(io.StringIO(text), ('e-mail', 'Name')))[:2],
+                         [(2, 'alice@x.de | Alice'), (4, 'bob@x.de | Bob')])
+        self.assertEqual(list(iter_csv_lines(io.StringIO(text), ('Telefon',))), [])
+
+        # Blöcke ohne "bob" werden nicht geparst; Zeilennummern bleiben die der Datei
+        condition = compile_terms(('bob',), 'any').literal_condition
+        found = [(num, line) for num, line in iter_csv_lines(io.StringIO(text), ('E-Mail',), condition, 64)
+                 if 'bob' in line]
+        self.assertEqual(found, [(4, 'bob@x.de'), (505, 'zed "bob" x')])
+        skipped = list(iter_csv_lines(io.StringIO(text), ('E-Mail',), condition, 64))
+        self.assertLess(len(skipped), 100)
+
+        # Literale über Anführungszeichen und Trennzeichen hinweg: kein Vortest
+        for term in ('"bob"', 'x | q', 'zed "'):
+            with self.subTest(term=term):
+                condition = compile_terms((term,), 'any').literal_condition
+                lines = [line for _num, line in iter_csv_lines(io.StringIO(text), (), condition, 64)]
+                self.assertIn('Zed | zed "bob" x | q', lines)
+
+    def test_json_records(self):
+        """Test: NDJSON nur mit Literal geparst, Escapes, Zahlen wie geschrieben, Dokumente und Arrays"""
+        self.assertEqual(parse_json_path('$.items[*].sku'), ('items', None, 'sku'))
+        self.assertEqual(parse_json_path("user['e-mail']"), ('user', 'e-mail'))
+        self.assertEqual(parse_json_path('$'), ())
+        with self.assertRaises(ValueError):
+            parse_json_path('$.a[')
+
+        ndjson = ('{"user": {"id": 4711, "mail": "bob@x.de"}, "price": 1.50}\n\n'
+                  '{"user": {"id": 1, "mail": "M\\u00fcller \\"bob\\""}, "tags": ["bob"]}\n'
+                  'kein json bob\n' + '{"user": {"id": 2}}\n' * 300 + '{"user": {"id": 9, "mail": "bob9"}}\n')
+        paths = (parse_json_path('$.user'), parse_json_path('price'))
+        condition = compile_terms(('bob',), 'any').literal_condition
+        expected = [(1, '4711 | bob@x.de | 1.50'), (3, '1 | Müller "bob"'), (305, '9 | bob9')]
+        self.assertEqual(list(iter_json_lines(io.StringIO(ndjson), paths, condition, True, 128)), expected)
+        self.assertEqual(list(iter_json_lines(io.StringIO(ndjson), paths, condition, None, 128)), expected)
+        self.assertEqual(len(list(iter_json_lines(io.StringIO(ndjson), paths, None, True))), 303)
+
+        document = json.dumps([{'user': {'mail': f'bob{i}'}} for i in range(3)], indent=2)
+        self.assertEqual(list(iter_json_lines(io.StringIO(document), (('user', 'mail'),), condition)),
+                         [(1, 'bob0'), (2, 'bob1'), (3, 'bob2')])
+        # Minifiziertes Dokument in einer Zeile: Array in Elemente geteilt wie das formatierte
+        minified = json.dumps([{'user': {'id': 'bob7'}}, {'user': {'id': 'q'}}])
+        self.assertEqual(list(iter_json_lines(io.StringIO(minified), (parse_json_path('$.user.id'),))),
+                         [(1, 'bob7'), (1, 'q')])
+        # Zu groß zum Parsen oder ungültig: Rohzeilen
+        self.assertEqual(list(iter_json_lines(io.StringIO(document), (('user', 'mail'),), condition,
+                                              max_document_chars=40))[:2], [(1, '['), (2, '  {')])
+        self.assertEqual(list(iter_json_lines(io.StringIO('{"a": [1,\n'), (('a',),))), [(1, '{"a": [1,')])
+
+    def test_query_projection(self):
+        """Test: col:/json: in der Abfrage, beide Suchpfade, JSON ohne Projektion als Text"""
+        plan = compile_query('col:email,name json:$.user.id bob ext:csv,jsonl')
+        self.assertEqual(plan.projection, (('col', 'email'), ('col', 'name'), ('json', ('user', 'id'))))
+        self.assertEqual(repr(plan.root), '(ext:csv,jsonl AND bob)')
+        for query in ('col:email', 'bob OR col:email', 'NOT json:$.a bob', 'json:$.a[ bob', 'col>1 bob'):
+            with self.subTest(query=query):
+                with self.assertRaises(QuerySyntaxError):
+                    compile_query(query)
+
+        csv_path = self._write('kunden.csv', 'name,email,notiz\nBob,bob@example.com,x\nAlice,alice@example.com,kennt bob\n')
+        jsonl_path = self._write('events.jsonl', '{"user": {"id": 4711, "name": "bob"}, "msg": "login"}\n'
+                                                  '{"user": {"id": 5, "name": "alice"}, "msg": "bob logged in"}\n')
+        txt_path = self._write('notiz.txt', 'bob war hier\n')
+        expected = {
+            'col:email bob': [('kunden.csv', 2, 'bob@example.com'), ('notiz.txt', 1, 'bob war hier')],
+            'json:$.user.name bob ext:jsonl': [('events.jsonl', 1, 'bob')],
+            'bob ext:jsonl': [('events.jsonl', 1, '{"user": {"id": 4711, "name": "bob"}, "msg": "login"}'),
+                              ('events.jsonl', 2, '{"user": {"id": 5, "name": "alice"}, "msg": "bob logged in"}')],
+        }
+        for query, matches in expected.items():
+            with self.subTest(query=query):
+                tool = FileSearchTool(verbose=False)
+                tool.search_query = query
+                tool._prepare_query()
+                found = []
+                for path in (csv_path, jsonl_path, txt_path):
+                    if tool.query_plan.bind(path) is False:
+                        continue
+                    found.extend((os.path.basename(path), m['line_number'], m['line_content'])
+                                 for m in tool.search_in_file(path))
+                self.assertEqual(found, matches)
+
+                results = FileSearchTool.process_file_batch_static(
+                    [(path, os.path.basename(path)) for path in (csv_path, jsonl_path, txt_path)], [], 'any',
+                    False, False, {'.csv', '.jsonl', '.txt'}, 10 ** 9, search_query=query)
+                self.assertEqual([(r['name'], m['line_number'], m['line_content']) for r in results
+                                  for m in r['matches']], matches)
+
+
+if __name__ == '__main__':
+    unittest.main()
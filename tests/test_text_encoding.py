@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die Encoding-Erkennung (BOM, UTF-8 mit Rückfall, Encoding-Cache)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.profiler import StageProfiler
+from src.text_encoding import EncodingCache, iter_candidate_lines, open_detected
+
+
+class TestTextEncoding(unittest.TestCase):
+    """Tests für einmaliges Lesen mit erkanntem Encoding"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def _read(self, path, profiler=None, cache=None):
+        detected = open_detected(path, profiler, cache)
+        with detected as f:
+            lines = [line.rstrip('\n') for line in f]
+        return detected.decision, lines
+
+    def test_detected_encodings(self):
+        """Test: BOMs, UTF-16 ohne BOM, cp1252 nach ASCII und gemischte Dateien"""
+        cases = {
+            'utf8.txt': ('grüße\r\nzwei'.encode('utf-8'), 'utf-8', ['grüße', 'zwei']),
+            'sig.txt': (b'\xef\xbb\xbfhallo', 'utf-8-sig', ['hallo']),
+            'bom16.txt': ('grüße\nzwei'.encode('utf-16'), 'utf-16', ['grüße', 'zwei']),
+            'bom32.txt': ('grüße'.encode('utf-32'), 'utf-32', ['grüße']),
+            'le16.txt': ('hello world\nzwei'.encode('utf-16-le'), 'utf-16-le', ['hello world', 'zwei']),
+            'cp1252.txt': (b'abc\nStra\xdfe 5 \x80\n', 'legacy', ['abc', 'Straße 5 €']),
+            'mixed.txt': ('grüße\n'.encode('utf-8') + b'caf\xe9', 'mixed', ['grüße', 'café']),
+            # Mehrbyte-Zeichen über der Blockgrenze des Lesepuffers
+            'split.txt': (b'a' * 8191 + 'ü'.encode('utf-8'), 'utf-8', ['a' * 8191 + 'ü']),
+        }
+        for name, (data, decision, lines) in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(self._read(self._write(name, data)), (decision, lines))
+
+    def test_fallback_reads_once_and_is_cached(self):
+        """Test: Rückfall auf cp1252 ohne zweites Lesen, Entscheidung im Cache bis zur Änderung"""
+        data = b'nur ASCII\n' * 20000 + b'sp\xe4t im Text\n'
+        path = self._write('spaet.txt', data)
+        profiler = StageProfiler(True)
+        decision, lines = self._read(path, profiler)
+        self.assertEqual((decision, lines[-1]), ('legacy', 'spät im Text'))
+        self.assertEqual(profiler.total('read')[3], len(data))  # Jedes Byte genau einmal gelesen
+
+        cache_path = os.path.join(self.test_dir, 'cache', 'encodings.pickle')
+        cache = EncodingCache(cache_path)
+        self._read(path, cache=cache)
+        self._read(self._write('rein.txt', b'utf-8 only\n'), cache=cache)
+        self.assertEqual(len(cache), 1)  # Reines UTF-8 wird nicht gespeichert
+        cache.save()
+
+        cache = EncodingCache(cache_path)
+        self.assertEqual(self._read(path, cache=cache)[0], 'legacy')
+        self.assertEqual(cache.hits, 1)
+        self._write('spaet.txt', 'jetzt UTF-8: spät\n'.encode('utf-8'))
+        os.utime(path, ns=(0, 1))
+        self.assertEqual(self._read(path, cache=cache), ('utf-8', ['jetzt UTF-8: spät']))
+        self.assertEqual(len(cache), 0)
+
+    def test_candidate_chunks_read_once(self):
+        """Test: Vorfilter auf Blöcken, jedes Byte einmal gelesen, Zeilennummern und Entscheidung wie beim ganzen Lesen"""
+        data = ('Grüße needle\r\n'.encode('utf-8') + b'filler line\n' * 5000 + b'caf\xe9 needle\rletzte')
+        path = self._write('gemischt.txt', data)
+        with open_detected(path) as f:
+            expected = [(num, line) for num, line in enumerate(f, 1) if 'needle' in line]
+        self.assertEqual([num for num, _line in expected], [1, 5002])
+
+        profiler = StageProfiler(True)
+        cache = EncodingCache()
+        lines = list(iter_candidate_lines(path, lambda raw: b'needle' in raw, profiler, cache, chunk_bytes=4096))
+        self.assertEqual([(num, line) for num, line in lines if 'needle' in line], expected)
+        self.assertLess(len(lines), 1000)  # Blöcke ohne Literal nicht dekodiert
+        self.assertEqual(profiler.total('read')[3], len(data))
+        self.assertEqual(cache.entries[path][2], 'mixed')
+        with open_detected(path) as f:
+            self.assertEqual(list(iter_candidate_lines(path, lambda raw: True, chunk_bytes=7)), list(enumerate(f, 1)))
+
+    def test_search_in_detected_files(self):
+        """Test: Suche in cp1252- und UTF-16-Dateien in beiden Pfaden, auch mit Regex-Vorfilter"""
+        latin = self._write('alt.txt', b'Kunde: M\xfcller\n')
+        wide = self._write('wide.log', 'Kunde: Müller\n'.encode('utf-16'))
+        tool = FileSearchTool(verbose=False)
+        tool.use_encoding_cache = False
+        tool.search_terms = [r'kunde: m.ller']  # Vorfilter-Literal 'kunde: m'
+        tool.use_regex = True
+        self.assertTrue(tool._prepare_query().has_buffer_test)
+        for path in (latin, wide):
+            with self.subTest(path=os.path.basename(path)):
+                self.assertEqual([m['line_content'] for m in tool.search_in_file(path)], ['Kunde: Müller'])
+                results = FileSearchTool.process_file_batch_static(
+                    [(path, os.path.basename(path))], [r'kunde: m.ller'], 'any', False, True,
+                    {'.txt', '.log'}, 10 ** 9)
+                self.assertEqual([m['line_content'] for m in results[0]['matches']], ['Kunde: Müller'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests für die Tabellen-Extraktion (XLSX mit allen Blättern, XLS)
+
+Author: Loony2392
+Email: info@loony-tech.de
+Version: 1.0.0
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+import zipfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search_tool import FileSearchTool
+from src.ooxml_stream import iter_xlsx_lines
+
+S = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+R = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+RELS = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+
+
+class TestXlsxExtraction(unittest.TestCase):
+    """Tests für Shared Strings, Zelltypen, Blattreihenfolge und Positionen [Blatt!Zeile]"""
+
+    def setUp(self):
+        """Setup für jeden Test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.xlsx = self._zip('mappe.xlsx', {
+            # Reihenfolge der Blätter aus workbook.xml, nicht aus den Dateinamen
+            'xl/workbook.xml': (f'<workbook {S} {R}><sheets><sheet name="Kunden" sheetId="1" r:id="rId2"/>'
+                                '<sheet name="Summen" sheetId="2" r:id="rId1"/></sheets></workbook>'),
+            'xl/_rels/workbook.xml.rels': (f'<Relationships {RELS}>'
+                                           '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/>'
+                                           '<Relationship Id="rId2" Target="/xl/worksheets/sheet2.xml"/>'
+                                           '</Relationships>'),
+            'xl/sharedStrings.xml': (f'<sst {S}><si><t>Müller GmbH</t></si>'
+                                     '<si><r><t>Rich </t></r><r><t>Text</t></r><rPh><t>ふりがな</t></rPh></si></sst>'),
+            'xl/worksheets/sheet2.xml': (f'<worksheet {S}><sheetData>'
+                                         '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1"><v>42</v></c></row>'
+                                         '<row r="4"><c r="A4" t="s"><v>1</v></c><c r="B4" t="b"><v>1</v></c>'
+                                         '<c r="C4" t="s"><v>99</v></c></row>'
+                                         '</sheetData></worksheet>'),
+            'xl/worksheets/sheet1.xml': (f'<worksheet {S}><sheetData>'
+                                         '<row r="2"><c r="A2" t="inlineStr"><is><t>Gesamt</t></is></c>'
+                                         '<c r="B2" t="str"><f>SUM(A1:A9)</f><v>1234.5</v></c></row>'
+                                         '</sheetData></worksheet>'),
+        })
+
+    def tearDown(self):
+        """Cleanup nach jedem Test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _zip(self, name, members):
+        path = os.path.join(self.test_dir, name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for member, content in members.items():
+                zf.writestr(member, content)
+        return path
+
+    def test_all_sheets_with_locations(self):
+        """Test: Shared/Inline Strings, Boolesche Werte und Formelergebnisse aus allen Blättern"""
+        self.assertEqual(list(iter_xlsx_lines(self.xlsx)), [
+            (1, '[Kunden!1] Müller GmbH | 42'),
+            (4, '[Kunden!4] Rich Text | TRUE'),  # Phonetik (rPh) und ungültiger Index fallen weg
+            (2, '[Summen!2] Gesamt | 1234.5'),
+        ])
+
+        # Ohne workbook.xml: alle sheetN.xml nach Nummer
+        fallback = self._zip('ohne_workbook.xlsx', {
+            f'xl/worksheets/sheet{i}.xml': f'<worksheet {S}><sheetData><row r="1"><c><v>{i}</v></c></row>'
+                                           '</sheetData></worksheet>' for i in (10, 2)})
+        self.assertEqual(list(iter_xlsx_lines(fallback)), [(1, '[Sheet2!1] 2'), (1, '[Sheet10!1] 10')])
+
+    def test_search_finds_text_on_later_sheets(self):
+        """Test: Die Suche findet Shared-String-Text auf jedem Blatt"""
+        tool = FileSearchTool(verbose=False)
+        tool.search_terms = ['müller']
+        self.assertEqual([(m['line_number'], m['line_content']) for m in tool.search_in_file(self.xlsx)],
+                         [(1, '[Kunden!1] Müller GmbH | 42')])
+        tool.search_terms = ['gesamt']
+        self.assertEqual([m['line_content'] for m in tool.search_in_file(self.xlsx)], ['[Summen!2] Gesamt | 1234.5'])
+
+    def test_xls_routed_to_own_extractor(self):
+        """Test: .xls geht nicht mehr an den XLSX-Parser, .xlsm schon"""
+        tool = FileSearchTool(verbose=False)
+        self.assertEqual(tool._select_extractor('.xls')[0], 'xls')
+        self.assertEqual(tool._select_extractor('.xlsm')[0], 'xlsx')
+
+        try:
+            import xlrd  # noqa: F401
+        except ImportError:
+            # Ohne xlrd: keine Zeilen, kein Fehler
+            broken = os.path.join(self.test_dir, 'alt.xls')
+            with open(broken, 'wb') as f:
+                f.write(b'\xd0\xcf\x11\xe0' + b'\0' * 508)
+            self.assertEqual(list(tool.extract_text_from_xls(broken)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()